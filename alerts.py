@@ -0,0 +1,456 @@
+"""TENKI 價格提醒
+
+所有使用者的提醒存放在行程共用的 AlertEngine：提醒本身以欄位陣列儲存（每筆 41 bytes），
+另外為每個標的維護兩個依價格排序的索引:
+    above    價格 >= 門檻時觸發，尚未觸發的是排序陣列的後段
+    below    價格 <= 門檻時觸發，尚未觸發的是排序陣列的前段
+收到新價格時以二分搜尋找出這次越過的門檻，只處理觸發的提醒，不掃描其他提醒。
+提醒只觸發一次。新增的提醒先放在待合併清單，下一次更新該標的時才排序合併。
+
+背景監看每 TENKI_ALERT_INTERVAL 秒以快取中的最新報價檢查所有有提醒的標的，
+狀態寫入 TENKI_ALERT_STATE 供重新啟動後沿用。每個行程各有自己的狀態檔（見 state_path），
+同一主機上的多個副本不會互相覆寫。
+
+環境變數:
+    TENKI_ALERT_INTERVAL=60      檢查間隔，0 表示不啟動背景監看
+    TENKI_ALERT_STATE=<path>     提醒狀態檔（預設為系統暫存目錄下的 tenki-alerts-<主機名稱>.npz，
+                                 該檔已由同一主機的其他行程使用時改用 tenki-alerts-<主機名稱>-<行程 ID>.npz）
+"""
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import metrics
+from market import get_quotes
+from portfolio import SYMBOL_TABLE, intern_symbol
+
+ALERT_INTERVAL = int(os.environ.get('TENKI_ALERT_INTERVAL', '60'))
+ALERT_STATE = os.environ.get('TENKI_ALERT_STATE')
+MAX_ALERTS_PER_USER = 500
+
+ABOVE = 1
+BELOW = -1
+DIRECTIONS = {'above': ABOVE, 'below': BELOW}
+
+# fired_ts：0 為有效，-1 為已刪除，其餘為觸發時間
+COLUMNS = (
+    ('user_code', np.int32),
+    ('symbol_code', np.int32),
+    ('direction', np.int8),
+    ('threshold', np.float64),
+    ('created_ts', np.int64),
+    ('fired_ts', np.int64),
+    ('fired_price', np.float64)
+)
+
+metrics.describe('tenki_alerts_active', 'Price alerts waiting to fire')
+metrics.describe('tenki_alerts_fired_total', 'Price alerts that fired')
+metrics.describe('tenki_alert_check_duration_seconds', 'Time to apply one round of quotes to the alert index')
+
+logger = logging.getLogger(__name__)
+
+# 提醒觸發時呼叫的函數（參數為觸發提醒的 describe() 清單），例如通知佇列
+LISTENERS = []
+
+def on_fire(listener):
+    """註冊提醒觸發時的處理函數（不可阻塞，價格更新會等它回傳）"""
+    LISTENERS.append(listener)
+    return listener
+
+# ====== 點位 ======
+def level_alerts(rule, level, price):
+    """進出場點位轉為提醒 [(方向, 門檻)]
+
+    level 為指標點位目前的數值（固定價格點位不需要）；區間點位依現價決定由哪一側進入，
+    現價已在區間內或沒有報價時不建立。
+    """
+    if rule is None:
+        return []
+    for op in ('below', 'above'):
+        if op in rule:
+            threshold = level if isinstance(rule[op], str) else rule[op]
+            return [] if threshold is None else [(op, float(threshold))]
+    low, high = rule['range']
+    if price is None or low <= price <= high:
+        return []
+    return [('below', float(high))] if price > high else [('above', float(low))]
+
+# ====== 索引 ======
+class _SymbolIndex:
+    """單一標的的排序門檻；above 觸發前綴、below 觸發後綴，以游標略過已觸發的部分"""
+    __slots__ = ('above_prices', 'above_ids', 'above_start', 'below_prices', 'below_ids', 'below_end',
+                 'pending', 'dead')
+
+    def __init__(self):
+        empty_prices, empty_ids = np.empty(0), np.empty(0, dtype=np.int64)
+        self.above_prices, self.above_ids, self.above_start = empty_prices, empty_ids, 0
+        self.below_prices, self.below_ids, self.below_end = empty_prices, empty_ids, 0
+        self.pending = []
+        # 已刪除但仍在索引中的提醒數
+        self.dead = 0
+
+    def live_ids(self):
+        return np.concatenate([self.above_ids[self.above_start:], self.below_ids[:self.below_end],
+                               np.asarray(self.pending, dtype=np.int64)])
+
+class AlertEngine:
+    """所有使用者的價格提醒與每個標的的排序索引"""
+
+    def __init__(self, capacity=1024):
+        self._size = 0
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS}
+        self._users = []
+        self._user_codes = {}
+        self._by_user = {}
+        self._index = {}
+        self._active = 0
+        self._lock = threading.RLock()
+        self.dirty = False
+
+    def __len__(self):
+        """有效（尚未觸發）的提醒數"""
+        return self._active
+
+    def column(self, name):
+        return self._data[name][:self._size]
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._data.values())
+
+    def _reserve(self, size):
+        capacity = len(self._data['threshold'])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, array in self._data.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._data[name] = grown
+
+    def _user_code(self, user):
+        code = self._user_codes.get(user)
+        if code is None:
+            code = self._user_codes[user] = len(self._users)
+            self._users.append(user)
+            self._by_user[code] = []
+        return code
+
+    # ====== 新增與刪除 ======
+    def add_many(self, users, symbols, directions, thresholds, now=None):
+        """批次新增提醒，回傳提醒 ID 陣列（directions 為 'above' / 'below'）"""
+        now = int(time.time() if now is None else now)
+        with self._lock:
+            start = self._size
+            count = len(thresholds)
+            self._reserve(start + count)
+            user_codes = np.array([self._user_code(user) for user in users], dtype=np.int32)
+            symbol_codes = np.array([intern_symbol(symbol) for symbol in symbols], dtype=np.int32)
+            rows = slice(start, start + count)
+            self._data['user_code'][rows] = user_codes
+            self._data['symbol_code'][rows] = symbol_codes
+            self._data['direction'][rows] = [DIRECTIONS[direction] for direction in directions]
+            self._data['threshold'][rows] = thresholds
+            self._data['created_ts'][rows] = now
+            self._data['fired_ts'][rows] = 0
+            self._data['fired_price'][rows] = np.nan
+            self._size += count
+            self._index_new(start, count)
+            self._active += count
+            self.dirty = True
+        metrics.set_gauge('tenki_alerts_active', self._active)
+        return np.arange(start, start + count)
+
+    def _index_new(self, start, count):
+        ids = np.arange(start, start + count)
+        for code, alert_id in zip(self._data['user_code'][start:start + count].tolist(), ids.tolist()):
+            self._by_user[code].append(alert_id)
+        symbol_codes = self._data['symbol_code'][start:start + count]
+        order = np.argsort(symbol_codes, kind='stable')
+        codes, first = np.unique(symbol_codes[order], return_index=True)
+        for code, group in zip(codes.tolist(), np.split(ids[order], first[1:])):
+            index = self._index.get(code)
+            if index is None:
+                index = self._index[code] = _SymbolIndex()
+            index.pending.extend(group.tolist())
+
+    def add(self, user, symbol, direction, threshold, now=None):
+        """新增單一提醒；同一使用者已有相同的有效提醒時回傳原本的 ID"""
+        with self._lock:
+            for alert in self.user_alerts(user):
+                if (alert['active'] and alert['symbol'] == symbol and alert['direction'] == direction
+                        and alert['threshold'] == threshold):
+                    return alert['id']
+            # 只計算尚未觸發的提醒；已觸發的提醒仍留在使用者清單中顯示
+            ids = self._by_user.get(self._user_codes.get(user), [])
+            if np.count_nonzero(self._data['fired_ts'][ids] == 0) >= MAX_ALERTS_PER_USER:
+                raise ValueError(f'at most {MAX_ALERTS_PER_USER} alerts per user')
+            return int(self.add_many([user], [symbol], [direction], [threshold], now)[0])
+
+    def remove(self, alert_id):
+        """刪除提醒（已觸發的提醒只從使用者清單移除）"""
+        with self._lock:
+            fired_ts = self._data['fired_ts']
+            if fired_ts[alert_id] == 0:
+                self._active -= 1
+                self._index[int(self._data['symbol_code'][alert_id])].dead += 1
+            fired_ts[alert_id] = -1
+            self._by_user[int(self._data['user_code'][alert_id])].remove(alert_id)
+            self.dirty = True
+        metrics.set_gauge('tenki_alerts_active', self._active)
+
+    def remove_symbol(self, user, symbol):
+        """刪除使用者在某個標的的所有提醒"""
+        for alert in self.user_alerts(user):
+            if alert['symbol'] == symbol:
+                self.remove(alert['id'])
+
+    # ====== 查詢 ======
+    def describe(self, alert_id):
+        """單一提醒的內容"""
+        return {
+            'id': int(alert_id),
+            'user': self._users[self._data['user_code'][alert_id]],
+            'symbol': SYMBOL_TABLE[self._data['symbol_code'][alert_id]],
+            'direction': 'above' if self._data['direction'][alert_id] == ABOVE else 'below',
+            'threshold': float(self._data['threshold'][alert_id]),
+            'active': bool(self._data['fired_ts'][alert_id] == 0),
+            'fired_ts': int(self._data['fired_ts'][alert_id]),
+            'fired_price': float(self._data['fired_price'][alert_id])
+        }
+
+    def user_alerts(self, user):
+        """使用者的所有提醒（有效與已觸發）"""
+        with self._lock:
+            code = self._user_codes.get(user)
+            if code is None:
+                return []
+            return [self.describe(alert_id) for alert_id in self._by_user[code]]
+
+    def symbols(self):
+        """有有效提醒的標的"""
+        with self._lock:
+            return [SYMBOL_TABLE[code] for code, index in self._index.items()
+                    if index.pending or index.above_start < len(index.above_ids) or index.below_end > 0]
+
+    # ====== 價格更新 ======
+    def _rebuild(self, index):
+        """合併待合併的提醒並移除已刪除的提醒，重新排序"""
+        ids = index.live_ids()
+        ids = ids[self._data['fired_ts'][ids] == 0]
+        above = ids[self._data['direction'][ids] == ABOVE]
+        below = ids[self._data['direction'][ids] == BELOW]
+        threshold = self._data['threshold']
+        above = above[np.argsort(threshold[above], kind='stable')]
+        below = below[np.argsort(threshold[below], kind='stable')]
+        index.above_prices, index.above_ids, index.above_start = threshold[above], above, 0
+        index.below_prices, index.below_ids, index.below_end = threshold[below], below, len(below)
+        index.pending = []
+        index.dead = 0
+
+    def _crossed(self, index, price):
+        """這次價格越過的提醒 ID（並將游標移過）"""
+        if index.pending or (index.dead > 64 and index.dead * 2 > len(index.above_ids) + len(index.below_ids)):
+            self._rebuild(index)
+        fired = []
+        hi = int(np.searchsorted(index.above_prices, price, side='right'))
+        if hi > index.above_start:
+            fired.append(index.above_ids[index.above_start:hi])
+            index.above_start = hi
+        lo = int(np.searchsorted(index.below_prices, price, side='left'))
+        if lo < index.below_end:
+            fired.append(index.below_ids[lo:index.below_end])
+            index.below_end = lo
+        return fired
+
+    def update(self, prices, now=None):
+        """套用 {標的: 價格}，回傳這次觸發的提醒 ID 陣列"""
+        now = int(time.time() if now is None else now)
+        t0 = time.perf_counter()
+        fired = []
+        with self._lock:
+            fired_ts = self._data['fired_ts']
+            for symbol, price in prices.items():
+                index = self._index.get(intern_symbol(symbol))
+                if index is None or price is None or np.isnan(price):
+                    continue
+                for ids in self._crossed(index, price):
+                    # 已刪除的提醒仍留在索引中，觸發時略過
+                    ids = ids[fired_ts[ids] == 0]
+                    fired_ts[ids] = now
+                    self._data['fired_price'][ids] = price
+                    fired.append(ids)
+            fired = np.concatenate(fired) if fired else np.empty(0, dtype=np.int64)
+            if len(fired):
+                self._active -= len(fired)
+                self.dirty = True
+        metrics.observe('tenki_alert_check_duration_seconds', time.perf_counter() - t0)
+        if len(fired):
+            metrics.inc('tenki_alerts_fired_total', len(fired))
+            metrics.set_gauge('tenki_alerts_active', self._active)
+            if LISTENERS:
+                with self._lock:
+                    details = [self.describe(alert_id) for alert_id in fired]
+                for listener in LISTENERS:
+                    try:
+                        listener(details)
+                    except Exception:
+                        logger.exception('alert listener %r failed', listener)
+        return fired
+
+    # ====== 儲存 ======
+    def to_arrays(self):
+        """匯出為可寫入磁碟的陣列（使用者與標的以字串表儲存）"""
+        with self._lock:
+            arrays = {name: self.column(name).copy() for name, _ in COLUMNS if name != 'symbol_code'}
+            codes, arrays['symbol_index'] = np.unique(self.column('symbol_code'), return_inverse=True)
+            arrays['symbols'] = np.array([SYMBOL_TABLE[code] for code in codes], dtype=str)
+            arrays['users'] = np.array(self._users, dtype=str)
+            return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        size = len(arrays['threshold'])
+        engine = cls(capacity=max(size, 1024))
+        engine._data['symbol_code'][:size] = np.array(
+            [intern_symbol(str(symbol)) for symbol in arrays['symbols']], dtype=np.int32)[arrays['symbol_index']]
+        for name, _ in COLUMNS:
+            if name != 'symbol_code':
+                engine._data[name][:size] = arrays[name]
+        for user in arrays['users']:
+            engine._user_code(str(user))
+        engine._size = size
+        engine._index_new(0, size)
+        # 已刪除的提醒不屬於任何使用者
+        for code, ids in engine._by_user.items():
+            engine._by_user[code] = [alert_id for alert_id in ids if engine._data['fired_ts'][alert_id] != -1]
+        engine._active = int(np.count_nonzero(engine.column('fired_ts') == 0))
+        return engine
+
+    def save(self, path):
+        """以 .npz 原子寫入"""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **self.to_arrays())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls.from_arrays(arrays)
+
+# ====== 行程共用 ======
+_engine = None
+_engine_lock = threading.Lock()
+_state_path = None
+# 持有到行程結束的狀態檔鎖
+_state_lock_file = None
+
+def _claim(path):
+    """取得狀態檔的獨占鎖（非阻塞），同一主機的其他行程已持有時回傳 False"""
+    global _state_lock_file
+    if fcntl is None:
+        return False
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    lock_file = open(path + '.lock', 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _state_lock_file = lock_file
+    return True
+
+def state_path():
+    """這個行程的提醒狀態檔（第一次呼叫時決定）
+
+    預設以主機名稱命名，重新啟動後沿用；同一主機已有其他行程持有該檔（或無法加鎖）時加上行程 ID，
+    不覆寫其他副本的狀態。
+    """
+    global _state_path
+    with _engine_lock:
+        if _state_path is None:
+            if ALERT_STATE:
+                _state_path = ALERT_STATE
+            else:
+                path = os.path.join(tempfile.gettempdir(), f'tenki-alerts-{socket.gethostname()}.npz')
+                _state_path = path if _claim(path) else f'{path[:-len(".npz")]}-{os.getpid()}.npz'
+        return _state_path
+
+def get_engine(path=None):
+    """行程共用的 AlertEngine（第一次使用時由狀態檔還原）"""
+    global _engine
+    path = path or state_path()
+    with _engine_lock:
+        if _engine is None:
+            try:
+                _engine = AlertEngine.load(path) if os.path.exists(path) else AlertEngine()
+            except Exception:
+                logger.exception('could not load alert state from %s', path)
+                _engine = AlertEngine()
+            metrics.set_gauge('tenki_alerts_active', len(_engine))
+        return _engine
+
+def check_alerts(provider=None, path=None):
+    """以最新報價檢查所有有提醒的標的，有變更時寫入狀態檔；回傳觸發的提醒 ID"""
+    path = path or state_path()
+    engine = get_engine(path)
+    symbols = engine.symbols()
+    fired = np.empty(0, dtype=np.int64)
+    if symbols:
+        quotes = get_quotes(symbols, provider)
+        # 最後成功快照的舊報價不觸發提醒
+        fired = engine.update({symbol: quote['price'] for symbol, quote in quotes.items() if not quote.get('stale')})
+    if engine.dirty:
+        engine.save(path)
+    return fired
+
+# ====== 背景監看 ======
+_monitor = None
+_monitor_lock = threading.Lock()
+_stop = threading.Event()
+
+def _run_monitor(interval):
+    while not _stop.wait(interval):
+        try:
+            check_alerts()
+        except Exception:
+            logger.exception('alert check failed')
+
+def start_monitor(interval=None):
+    """啟動背景提醒檢查（每個行程只啟動一次）"""
+    global _monitor
+    interval = ALERT_INTERVAL if interval is None else interval
+    if interval <= 0:
+        return None
+    with _monitor_lock:
+        if _monitor is None:
+            _stop.clear()
+            _monitor = threading.Thread(target=_run_monitor, args=(interval,), name='tenki-alerts', daemon=True)
+            _monitor.start()
+        return _monitor
+
+def stop_monitor():
+    global _monitor
+    with _monitor_lock:
+        if _monitor is not None:
+            _stop.set()
+            _monitor.join()
+            _monitor = None
@@ -0,0 +1,282 @@
+"""TENKI HTTP API
+
+與 Streamlit 頁面使用相同快取函數（cache.py）的獨立行程 JSON API:
+
+    GET  /v1/market?symbols=SPY,QQQ          報價快照（預設為儀表板的標的，一次最多 MAX_SYMBOLS 檔）
+    GET  /v1/history/<symbol>?start=&end=&points=
+                                             降採樣後的長期收盤價（上游故障時為最後成功的結果，stale 為 true）
+    GET  /v1/solutions                       所有預先計算的解決方案
+    GET  /v1/solutions/<risk>/<goal>         單一解決方案
+    POST /v1/portfolio/valuation             {"positions": [{"symbol", "quantity", "entry_price"}]} 的市值與損益
+    GET  /healthz, /metrics
+
+GET 回應帶 ETag 與 Cache-Control，If-None-Match 相符時回 304；
+用戶端接受 gzip 且內容超過 GZIP_MIN_BYTES 時壓縮。序列化結果快取 TENKI_API_RESPONSE_TTL 秒。
+
+    python api_server.py --port 8765
+
+環境變數:
+    TENKI_API_HOST=127.0.0.1
+    TENKI_API_PORT=8765
+    TENKI_API_RESPONSE_TTL=5
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+import metrics
+from cache import TTLCache
+from market import HISTORY_POINTS, HISTORY_TTL, MARKET_SYMBOLS, QUOTE_TTL, get_history_window, get_quotes
+from market_calendar import MarketHoursTTL
+from portfolio import PositionBook, summarize_portfolio
+from solutions import REFRESH_SECONDS, get_solution, snapshot_time, solution_key, start_scheduler
+from strategies import STRATEGIES
+
+API_HOST = os.environ.get('TENKI_API_HOST', '127.0.0.1')
+API_PORT = int(os.environ.get('TENKI_API_PORT', '8765'))
+RESPONSE_TTL = float(os.environ.get('TENKI_API_RESPONSE_TTL', '5'))
+MAX_SYMBOLS = 100
+MAX_POSITIONS = 10000
+GZIP_MIN_BYTES = 1024
+
+metrics.describe('tenki_api_requests_total', 'API requests by route and status code')
+metrics.describe('tenki_api_request_duration_seconds', 'API request latency by route')
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# ====== JSON ======
+def jsonable(value):
+    """轉成可序列化的型別（numpy 數值、日期；NaN 轉為 null）"""
+    if isinstance(value, dict):
+        return {str(k): jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [jsonable(v) for v in value]
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.datetime64):
+        return str(value)
+    return value
+
+def encode(payload):
+    return json.dumps(jsonable(payload), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# ====== 路由 ======
+def _symbols_param(query, default):
+    raw = query.get('symbols', [''])[0]
+    symbols = [s.strip().upper() for s in raw.split(',') if s.strip()] or list(default)
+    if len(symbols) > MAX_SYMBOLS:
+        raise ApiError(400, f'at most {MAX_SYMBOLS} symbols per request')
+    return list(dict.fromkeys(symbols))
+
+def market(query):
+    symbols = _symbols_param(query, MARKET_SYMBOLS)
+    quotes = get_quotes(symbols)
+    return {'quotes': quotes, 'missing': [s for s in symbols if s not in quotes],
+            'stale': [s for s in symbols if quotes.get(s, {}).get('stale')]}
+
+def history(query, symbol):
+    try:
+        points = int(query.get('points', [HISTORY_POINTS])[0])
+        start = query.get('start', [None])[0]
+        end = query.get('end', [None])[0]
+        for day in (start, end):
+            if day is not None:
+                np.datetime64(day, 'D')
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    if not 3 <= points <= 10000:
+        raise ApiError(400, 'points must be between 3 and 10000')
+    days, closes, total, stale = get_history_window(symbol.upper(), start, end, points)
+    # 上游取不到（未知標的或上游故障）且沒有最後成功的結果
+    if stale and not total:
+        raise ApiError(404, f'no history for symbol: {symbol}')
+    return {'symbol': symbol.upper(), 'total': int(total), 'stale': stale, 'days': days, 'close': closes}
+
+def solutions(query):
+    return {
+        'as_of': snapshot_time(),
+        'solutions': {solution_key(risk, goal): get_solution(solution_key(risk, goal)) for risk, goal in STRATEGIES}
+    }
+
+def solution(query, risk, goal):
+    if (risk, goal) not in STRATEGIES:
+        raise ApiError(404, f'unknown strategy: {risk}/{goal}')
+    return {'as_of': snapshot_time(), 'solution': get_solution(solution_key(risk, goal))}
+
+def valuation(body):
+    """以目前報價評價一組持倉（沒有報價的標的以進場價計）"""
+    try:
+        positions = json.loads(body or b'{}')['positions']
+        if len(positions) > MAX_POSITIONS:
+            raise ApiError(400, f'at most {MAX_POSITIONS} positions per request')
+        symbols = [str(p['symbol']).upper() for p in positions]
+        quantities = [float(p['quantity']) for p in positions]
+        entry_prices = [float(p['entry_price']) for p in positions]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ApiError(400, f'invalid positions: {e}')
+    unique = list(dict.fromkeys(symbols))
+    if len(unique) > MAX_SYMBOLS:
+        raise ApiError(400, f'at most {MAX_SYMBOLS} distinct symbols per request')
+    quotes = get_quotes(unique)
+    book = PositionBook(capacity=max(len(positions), 8))
+    for symbol, quantity, entry_price in zip(symbols, quantities, entry_prices):
+        quote = quotes.get(symbol)
+        book.append(symbol, quantity, entry_price, quote['price'] if quote else entry_price, 0)
+    return {
+        'summary': summarize_portfolio(book),
+        'positions': [
+            {'symbol': row['symbol'], 'quantity': row['quantity'], 'entry_price': row['entry_price'],
+             'current_price': row['current_price'], 'market_value': value, 'priced': row['symbol'] in quotes}
+            for row, value in zip(book.rows(), book.market_values())
+        ]
+    }
+
+# (方法, 路徑, 處理函數, Cache-Control max-age 秒數或 MarketHoursTTL)
+ROUTES = [
+    ('GET', re.compile(r'^/v1/market$'), market, MarketHoursTTL(QUOTE_TTL)),
+    ('GET', re.compile(r'^/v1/history/([A-Za-z0-9.^=-]+)$'), history, MarketHoursTTL(HISTORY_TTL)),
+    ('GET', re.compile(r'^/v1/solutions$'), solutions, REFRESH_SECONDS),
+    ('GET', re.compile(r'^/v1/solutions/(\w+)/(\w+)$'), solution, REFRESH_SECONDS),
+    ('POST', re.compile(r'^/v1/portfolio/valuation$'), valuation, 0)
+]
+
+def resolve(method, path):
+    """找出路由，回傳 (路由名稱, 處理函數, 路徑參數, max-age)"""
+    allowed = False
+    for route_method, pattern, handler, max_age in ROUTES:
+        match = pattern.match(path)
+        if match:
+            if route_method == method:
+                return handler.__name__, handler, match.groups(), max_age
+            allowed = True
+    raise ApiError(405 if allowed else 404, 'method not allowed' if allowed else 'not found')
+
+# ====== 回應 ======
+# (路徑, 查詢字串) → (ETag, 原始內容, gzip 內容)
+_responses = TTLCache('api.responses', ttl=RESPONSE_TTL, maxsize=4096)
+
+def render(handler, args, query):
+    body = encode(handler(query, *args))
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    compressed = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    return etag, body, compressed
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in [tag.strip().removeprefix('W/') for tag in header.split(',')]
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'TENKI-API/1'
+    # 標頭與內容分兩次寫入，保持連線時需關閉 Nagle 以免遇上 delayed ACK（約 40ms）
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle(self, method):
+        t0 = time.perf_counter()
+        route = 'unknown'
+        try:
+            url = urlsplit(self.path)
+            if method == 'GET' and url.path == '/healthz':
+                route = 'healthz'
+                status = self._send(200, b'{"status":"ok"}')
+            elif method == 'GET' and url.path == '/metrics':
+                route = 'metrics'
+                status = self._send(200, metrics.render_prometheus().encode('utf-8'),
+                                    content_type='text/plain; version=0.0.4; charset=utf-8')
+            else:
+                route, handler, args, max_age = resolve(method, url.path)
+                if method == 'POST':
+                    length = int(self.headers.get('Content-Length') or 0)
+                    body = encode(handler(self.rfile.read(length)))
+                    status = self._send(200, body, compressed=self._maybe_gzip(body))
+                else:
+                    query = parse_qs(url.query)
+                    etag, body, compressed = _responses.get_or_compute(
+                        (url.path, url.query), lambda: render(handler, args, query))
+                    if callable(max_age):
+                        # 含最後成功快照舊報價的回應與失敗一樣只快取 base 秒，上游恢復後不必等到開盤
+                        max_age = int(max_age(time.time(), None if b'"stale":true' in body else body))
+                    headers = {'ETag': etag, 'Cache-Control': f'max-age={max_age}'}
+                    if etag_matches(self.headers.get('If-None-Match'), etag):
+                        status = self._send(304, b'', headers=headers)
+                    else:
+                        status = self._send(200, body, compressed=compressed, headers=headers)
+        except ApiError as e:
+            status = self._send(e.status, encode({'error': str(e)}))
+        except Exception as e:
+            self.log_error('unhandled error on %s: %r', self.path, e)
+            status = self._send(500, encode({'error': 'internal error'}))
+        metrics.inc('tenki_api_requests_total', route=route, status=str(status))
+        metrics.observe('tenki_api_request_duration_seconds', time.perf_counter() - t0, route=route)
+
+    def _maybe_gzip(self, body):
+        return gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+
+    def _send(self, status, body, compressed=None, headers=None, content_type='application/json; charset=utf-8'):
+        use_gzip = compressed is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        payload = compressed if use_gzip else body
+        self.send_response(status)
+        if status != 304:
+            self.send_header('Content-Type', content_type)
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        if compressed is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+        return status
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host=API_HOST, port=API_PORT):
+    """建立 API 伺服器（port 0 使用任意可用埠，見 server.server_address）"""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TENKI HTTP API')
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+
+    start_scheduler()
+    server = make_server(args.host, args.port)
+    print(f'TENKI API listening on http://{args.host}:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
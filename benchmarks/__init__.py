@@ -0,0 +1 @@
+"""TENKI 離線基準測試"""
@@ -0,0 +1,64 @@
+"""快取編碼與共用後端的基準測試"""
+import tempfile
+import threading
+
+import cache_backends
+from benchmarks.bench_market import fixture_provider
+from benchmarks.harness import case
+from cache import TTLCache
+from market import MARKET_SYMBOLS, fetch_market_data
+from solutions import precompute_solutions
+from strategies import strategy_symbols
+
+_server = None
+
+def resp_backend():
+    """同行程的 resp_server.py（只啟動一次）"""
+    global _server
+    if _server is None:
+        import resp_server
+        _server = resp_server.make_server('127.0.0.1', 0)
+        threading.Thread(target=_server.serve_forever, name='tenki-resp', daemon=True).start()
+    return cache_backends.make_backend(f'redis://127.0.0.1:{_server.server_address[1]}/0')
+
+def solutions_snapshot():
+    return {'as_of': 0.0, 'solutions': precompute_solutions(fetch_market_data(strategy_symbols(), fixture_provider()))}
+
+@case('cache.encode[solutions snapshot]')
+def _():
+    snapshot = solutions_snapshot()
+    return lambda: cache_backends.encode(snapshot, 0.0)
+
+@case('cache.decode[solutions snapshot]')
+def _():
+    blob = cache_backends.encode(solutions_snapshot(), 0.0)
+    return lambda: cache_backends.decode(blob)
+
+@case('cache.get_many[8 local hits]')
+def _():
+    quotes = TTLCache('bench.local', ttl=3600, backend=None)
+    data = fetch_market_data(MARKET_SYMBOLS, fixture_provider())
+    quotes.get_many_or_compute(MARKET_SYMBOLS, lambda keys: {key: data.get(key) for key in keys})
+    return lambda: quotes.get_many_or_compute(MARKET_SYMBOLS, lambda keys: {})
+
+def shared_miss_case(name, backend):
+    """本地快取未命中、由共用後端取得 8 檔報價（模擬其他副本已寫入）"""
+    writer = TTLCache(f'bench.{name}.writer', ttl=3600, backend=backend)
+    reader = TTLCache(f'bench.{name}.reader', ttl=3600, backend=backend)
+    reader.namespace = writer.namespace
+    data = fetch_market_data(MARKET_SYMBOLS, fixture_provider())
+    for symbol in MARKET_SYMBOLS:
+        writer.set(symbol, data.get(symbol))
+
+    def run():
+        reader._data.clear()
+        return reader.get_many_or_compute(MARKET_SYMBOLS, lambda keys: {})
+    return run
+
+@case('cache.get_many[8 shared hits, disk]')
+def _():
+    return shared_miss_case('disk', cache_backends.DiskBackend(tempfile.mkdtemp(prefix='tenki-bench-cache-')))
+
+@case('cache.get_many[8 shared hits, resp]')
+def _():
+    return shared_miss_case('resp', resp_backend())
@@ -0,0 +1,27 @@
+"""報酬相關性完整計算與新 K 棒增量更新的基準測試"""
+import numpy as np
+
+from benchmarks.harness import case
+from correlation import RollingMoments
+
+def make_returns(n, days=253, seed=48):
+    """days 個交易日、n 檔標的的日報酬"""
+    return np.random.default_rng(seed).normal(0.0003, 0.015, size=(days, n))
+
+@case('correlation.full[155x252]')
+def _():
+    returns = make_returns(155)
+    def full():
+        moments = RollingMoments(0, returns[:-1])
+        return moments.correlation()
+    return full
+
+@case('correlation.push[155x252]')
+def _():
+    returns = make_returns(155)
+    moments = RollingMoments(0, returns[:-1])
+    bar = returns[-1]
+    def push():
+        moments.push(1, bar)
+        return moments.correlation()
+    return push
@@ -0,0 +1,32 @@
+"""降採樣與長期走勢圖的基準測試"""
+import numpy as np
+
+from benchmarks.harness import case
+from charts import create_history_chart
+from downsample import lttb, minmax
+from market import HISTORY_POINTS, history_window
+
+def make_series(n, seed=35):
+    rng = np.random.default_rng(seed)
+    days = np.datetime64('2000-01-03') + np.arange(n)
+    return days, 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, size=n)))
+
+@case('downsample.lttb[1M->800]')
+def _():
+    days, closes = make_series(1_000_000)
+    return lambda: lttb(days, closes, HISTORY_POINTS)
+
+@case('downsample.minmax[1M->800]')
+def _():
+    _, closes = make_series(1_000_000)
+    return lambda: minmax(closes, HISTORY_POINTS // 2 - 1)
+
+@case('market.history_window[10y daily]')
+def _():
+    days, closes = make_series(2520)
+    return lambda: history_window(days, closes, start=str(days[-1260]))
+
+@case('charts.create_history_chart[800]')
+def _():
+    days, closes = make_series(HISTORY_POINTS)
+    return lambda: create_history_chart(days, closes, 'SPY')
@@ -0,0 +1,24 @@
+"""技術指標批次與串流模式的基準測試"""
+from benchmarks.bench_screener import make_universe
+from benchmarks.harness import case
+from indicators import IndicatorStream, compute_all
+
+@case('indicators.compute_all[600x252]')
+def _():
+    closes = make_universe(600)['closes']
+    return lambda: compute_all(closes)
+
+@case('indicators.stream_update[600]')
+def _():
+    closes = make_universe(600)['closes']
+    stream = IndicatorStream([f'S{i:04d}' for i in range(len(closes))])
+    stream.seed(closes[:, :-1])
+    bar = closes[:, -1]
+    return lambda: stream.update(bar)
+
+@case('indicators.stream_values[600]')
+def _():
+    closes = make_universe(600)['closes']
+    stream = IndicatorStream([f'S{i:04d}' for i in range(len(closes))])
+    stream.seed(closes)
+    return stream.values
@@ -0,0 +1,33 @@
+"""報價取得、快取與 create_market_chart 的基準測試"""
+from benchmarks.harness import MARKET_FIXTURE, case
+from charts import create_market_chart
+from market import MARKET_SYMBOLS, fetch_market_data, get_quotes, summarize_quote
+from providers import FixtureProvider
+
+_provider = None
+
+def fixture_provider():
+    global _provider
+    if _provider is None:
+        _provider = FixtureProvider(MARKET_FIXTURE)
+    return _provider
+
+@case('market.fetch_market_data[fixture]')
+def _():
+    provider = fixture_provider()
+    return lambda: fetch_market_data(MARKET_SYMBOLS, provider)
+
+@case('market.get_quotes[warm]')
+def _():
+    get_quotes(MARKET_SYMBOLS, fixture_provider())
+    return lambda: get_quotes(MARKET_SYMBOLS)
+
+@case('market.summarize_quote')
+def _():
+    closes = fixture_provider().history('SPY', period='2d')
+    return lambda: summarize_quote('SPY', closes)
+
+@case('charts.create_market_chart')
+def _():
+    market_data = fetch_market_data(MARKET_SYMBOLS, fixture_provider())
+    return lambda: create_market_chart(market_data)
@@ -0,0 +1,96 @@
+"""虛擬投資組合彙總、曝險、圓餅圖與每日淨值的基準測試"""
+import time
+
+import numpy as np
+
+from benchmarks.harness import case
+from charts import create_nav_chart, create_portfolio_chart
+from downsample import minmax
+from exposure import Exposure
+from market import HISTORY_POINTS, MARKET_SYMBOLS
+from portfolio import NavSeries, PositionBook, summarize_portfolio
+
+def make_positions(n, seed=7):
+    """產生 n 筆與「加入虛擬組合」相同結構的持倉"""
+    rng = np.random.default_rng(seed)
+    book = PositionBook(capacity=n)
+    now = int(time.time())
+    quantities = rng.integers(1, 40, size=n) * 10
+    entry_prices = rng.uniform(100, 500, size=n)
+    current_prices = rng.uniform(100, 500, size=n)
+    for i in range(n):
+        book.append(MARKET_SYMBOLS[i % len(MARKET_SYMBOLS)], quantities[i], entry_prices[i], current_prices[i], now)
+    return book
+
+SIZES = {'10': 10, '1k': 1_000, '100k': 100_000}
+
+for label, size in SIZES.items():
+    @case(f'portfolio.summarize_portfolio[{label}]', rounds=5 if size >= 100_000 else 7)
+    def _(size=size):
+        positions = make_positions(size)
+        return lambda: summarize_portfolio(positions)
+
+@case('portfolio.PositionBook.set_price[100k]')
+def _():
+    # 單筆價格變動：彙總以差額更新，與持倉數量無關
+    positions = make_positions(100_000)
+    prices = np.random.default_rng(3).uniform(100, 500, size=1024)
+    ticks = iter(range(1 << 62))
+    def tick():
+        i = next(ticks)
+        positions.set_price(i % 100_000, prices[i % 1024])
+        return summarize_portfolio(positions)
+    return tick
+
+@case('exposure.rebuild[100k]')
+def _():
+    positions = make_positions(100_000)
+    return lambda: Exposure().sync(positions)
+
+@case('exposure.sync_tick[100k]')
+def _():
+    # 單筆價格變動後同步：只更新該持倉所屬的群組
+    positions = make_positions(100_000)
+    exposure = Exposure()
+    exposure.sync(positions)
+    prices = np.random.default_rng(5).uniform(100, 500, size=1024)
+    ticks = iter(range(1 << 62))
+    def tick():
+        i = next(ticks)
+        positions.set_price(i % 100_000, prices[i % 1024])
+        return exposure.sync(positions)
+    return tick
+
+for label in ('10', '1k'):
+    @case(f'charts.create_portfolio_chart[{label}]')
+    def _(size=SIZES[label]):
+        positions = make_positions(size)
+        return lambda: create_portfolio_chart(positions)
+
+def make_nav(days, seed=40):
+    """產生 days 天、偶有加碼的每日淨值"""
+    rng = np.random.default_rng(seed)
+    series = NavSeries(capacity=days + 1)
+    nav = 100_000.0
+    for day in range(days):
+        flow = 10_000.0 if day % 90 == 0 else 0.0
+        nav = nav * (1 + rng.normal(0.0003, 0.01)) + flow
+        series.record(day, nav, flow)
+    return series
+
+@case('portfolio.nav_record[10y, same day]')
+def _():
+    series = make_nav(2520)
+    day = int(series.column('day')[-1])
+    nav = float(series.column('nav')[-1])
+    return lambda: series.record(day, nav * 1.001)
+
+@case('charts.create_nav_chart[10y, downsampled]')
+def _():
+    series = make_nav(2520)
+
+    def build():
+        drawdown = series.drawdown()
+        keep = minmax(drawdown, HISTORY_POINTS // 2 - 1)
+        return create_nav_chart(series.dates()[keep], series.column('nav')[keep], series.returns()[keep], drawdown[keep])
+    return build
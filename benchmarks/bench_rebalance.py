@@ -0,0 +1,43 @@
+"""批次再平衡的基準測試
+
+10k 個策略組合（每個持有該策略的目標標的，數量隨機偏離目標，另有一檔不在目標中的標的），
+整批組成矩陣、計算交易並拆成各組合的交易清單；吞吐量（組合/秒）= 組合數 / 中位數。
+與逐一組合呼叫 rebalance_portfolio 比較。
+"""
+import numpy as np
+
+from benchmarks.harness import case
+from portfolio import PositionBook
+from rebalance import build_batch, plan_rebalance, rebalance_portfolio, trade_lists
+from strategies import STRATEGIES, strategy_symbols
+
+def make_portfolios(n, seed=50):
+    """n 個 (持倉簿, 目標權重, 現金)，策略依序輪流"""
+    rng = np.random.default_rng(seed)
+    symbols = strategy_symbols()
+    prices = dict(zip(symbols, rng.uniform(20, 600, len(symbols)).tolist()))
+    targets = [{target['symbol']: target['allocation'] / 100 for target in strategy['targets']} for strategy in STRATEGIES.values()]
+    portfolios = []
+    for i in range(n):
+        weights = targets[i % len(targets)]
+        book = PositionBook(capacity=len(weights) + 1)
+        capital = rng.uniform(10_000, 200_000)
+        for symbol, weight in weights.items():
+            book.append(symbol, np.floor(capital * weight * rng.uniform(0.7, 1.3) / prices[symbol]), 0, prices[symbol], 0)
+        extra = symbols[rng.integers(len(symbols))]
+        book.append(extra, rng.integers(1, 50), 0, prices[extra], 0)
+        portfolios.append((book, weights, rng.uniform(0, 5_000)))
+    return portfolios, prices
+
+@case('rebalance.batch[10k portfolios]', rounds=5)
+def _():
+    portfolios, prices = make_portfolios(10_000)
+    def run():
+        batch = build_batch(portfolios, prices)
+        return trade_lists(batch, plan_rebalance(batch))
+    return run
+
+@case('rebalance.per_portfolio[1k portfolios]', rounds=5)
+def _():
+    portfolios, prices = make_portfolios(1_000)
+    return lambda: [rebalance_portfolio(book, weights, prices, cash) for book, weights, cash in portfolios]
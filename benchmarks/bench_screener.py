@@ -0,0 +1,37 @@
+"""篩選器的基準測試（合成的 S&P 500 + Nasdaq 100 規模標的池）"""
+import numpy as np
+
+from benchmarks.bench_market import fixture_provider
+from benchmarks.harness import case
+from screener import build_universe, compute_factors, load_universe, screen
+from strategies import STRATEGIES
+
+def make_universe(n, days=252, seed=33):
+    """n 檔標的、days 個交易日的幾何隨機漫步標的池，約 5% 標的缺少前段歷史"""
+    rng = np.random.default_rng(seed)
+    vol = rng.uniform(0.1, 0.6, size=(n, 1)) / np.sqrt(252)
+    closes = rng.uniform(20, 500, size=(n, 1)) * np.exp(np.cumsum(rng.normal(0.0003, vol, size=(n, days)), axis=1))
+    listed = rng.random(n) < 0.05
+    closes[listed, :days // 2] = np.nan
+    return build_universe(
+        [f'S{i:04d}' for i in range(n)],
+        closes,
+        rng.uniform(0.0, 0.06, size=n),
+        rng.uniform(-10.0, 80.0, size=n)
+    )
+
+@case('screener.compute_factors[600x252]')
+def _():
+    universe = make_universe(600)
+    return lambda: compute_factors(universe['closes'], universe['dividend_yield'], universe['pe'])
+
+@case('screener.screen_all_strategies[600x252]')
+def _():
+    universe = make_universe(600)
+    return lambda: [screen(universe, strategy['screen']) for strategy in STRATEGIES.values()]
+
+@case('screener.load_universe[fixture]', rounds=5)
+def _():
+    provider = fixture_provider()
+    symbols = provider.symbols()
+    return lambda: load_universe(symbols, provider)
@@ -0,0 +1,20 @@
+"""generate_solution 與預先計算的基準測試"""
+from benchmarks.bench_market import fixture_provider
+from benchmarks.harness import case
+from market import fetch_market_data
+from solutions import generate_solution, precompute_solutions
+from strategies import STRATEGIES, strategy_symbols
+
+def strategy_quotes():
+    return fetch_market_data(strategy_symbols(), fixture_provider())
+
+for risk, goal in STRATEGIES:
+    @case(f'solutions.generate_solution[{risk}/{goal}]')
+    def _(risk=risk, goal=goal):
+        quotes = strategy_quotes()
+        return lambda: generate_solution(risk, goal, quotes)
+
+@case('solutions.precompute_solutions')
+def _():
+    quotes = strategy_quotes()
+    return lambda: precompute_solutions(quotes)
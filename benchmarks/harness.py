@@ -0,0 +1,122 @@
+"""基準測試框架
+
+每個案例是一個 setup 函數，回傳要計時的零參數 callable:
+
+    @case('portfolio.summarize[1k]')
+    def _():
+        positions = make_positions(1000)
+        return lambda: summarize_portfolio(positions)
+
+run.py 會探索 benchmarks/bench_*.py，執行所有案例並與 baselines.json 比較。
+共用主機的速度會隨時間變動（同一個案例前後兩次可差到 1.5 倍），
+所以每一輪之前先計時一份固定的參考工作量，以「案例耗時 / 參考耗時」的最小值與基準比較。
+受磁碟或記憶體頻寬影響的案例雜訊更大，在 baselines.json 的案例中以 threshold 個別放寬門檻。
+"""
+import json
+import os
+import statistics
+import time
+
+import numpy as np
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+MARKET_FIXTURE = os.path.join(FIXTURE_DIR, 'market_history.json')
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+# 未個別設定時允許的退步比例
+DEFAULT_THRESHOLD = 0.40
+# 與基準相差不到這個秒數時不論比例都視為持平（微秒級案例的比例只是雜訊）
+ABSOLUTE_FLOOR = 5e-6
+
+CASES = {}
+
+_REFERENCE_DATA = np.random.default_rng(0).random(20_000)
+
+def reference_work():
+    """固定的參考工作量（numpy 排序與 Python 迴圈各半）"""
+    np.sort(_REFERENCE_DATA)
+    return sum(i * i for i in range(10_000))
+
+def reference_time(repeat=3):
+    """參考工作量目前的耗時（取最快一次）"""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        reference_work()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+def case(name, rounds=7, min_round_time=0.1):
+    """註冊一個基準測試案例"""
+    def decorator(setup):
+        CASES[name] = {'setup': setup, 'rounds': rounds, 'min_round_time': min_round_time}
+        return setup
+    return decorator
+
+def calibrate(func, min_round_time):
+    """找出每輪需要呼叫的次數，使一輪至少 min_round_time 秒"""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_round_time or number >= 1_000_000:
+            return number
+        number *= 10 if elapsed < min_round_time / 10 else 2
+
+def run_case(name):
+    """執行單一案例，回傳每次呼叫耗時統計（秒）"""
+    spec = CASES[name]
+    func = spec['setup']()
+    func()  # 暖機
+    number = calibrate(func, spec['min_round_time'])
+    timings = []
+    relative = []
+    for _ in range(spec['rounds']):
+        reference = reference_time()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - t0) / number)
+        relative.append(timings[-1] / reference)
+    return {
+        'relative': min(relative),
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'max_s': max(timings),
+        'number': number,
+        'rounds': spec['rounds']
+    }
+
+def load_baselines(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {'default_threshold': DEFAULT_THRESHOLD, 'absolute_floor_s': ABSOLUTE_FLOOR, 'cases': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baselines(baselines, path=BASELINE_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def compare(name, result, baselines):
+    """與基準比較，回傳 (狀態, 變化比例)；狀態為 new / ok / faster / regression
+
+    比較相對於參考工作量的最快一輪（best-of-N，並扣除主機當下的快慢；舊基準沒有 relative 時改用中位數），
+    換算回基準秒數後差距小於 absolute_floor_s 時視為持平。
+    """
+    baseline = baselines['cases'].get(name)
+    if baseline is None:
+        return 'new', None
+    threshold = baseline.get('threshold', baselines.get('default_threshold', DEFAULT_THRESHOLD))
+    floor = baselines.get('absolute_floor_s', ABSOLUTE_FLOOR)
+    key = 'relative' if 'relative' in baseline else 'median_s'
+    ratio = result[key] / baseline[key] - 1
+    if abs(ratio * baseline['median_s']) < floor:
+        return 'ok', ratio
+    if ratio > threshold:
+        return 'regression', ratio
+    if ratio < -threshold:
+        return 'faster', ratio
+    return 'ok', ratio
@@ -0,0 +1,132 @@
+"""HTTP API 吞吐量測試
+
+在同一行程內以任意可用埠啟動 api_server，以 C 個保持連線的用戶端執行緒
+對每個情境持續送出請求 D 秒。行情由錄製的 fixture 提供，不需要網路。
+
+    python -m benchmarks.load_api                       # C = 1, 8, 32，每個情境 3 秒
+    python -m benchmarks.load_api -c 1 16 --duration 5 --output api.json
+
+每個情境與 C 會回報吞吐量（req/s）、延遲百分位數與平均回應大小。
+"""
+import argparse
+import http.client
+import json
+import os
+import threading
+import time
+
+# 在匯入任何 app 模組之前關閉 trace 日誌與 sidecar
+os.environ.setdefault('TENKI_TRACE_LOG', os.devnull)
+os.environ.setdefault('TENKI_METRICS_PORT', '0')
+
+import metrics
+import providers
+from benchmarks.harness import MARKET_FIXTURE
+
+VALUATION_BODY = json.dumps({'positions': [
+    {'symbol': symbol, 'quantity': 10 + i, 'entry_price': 100.0 + i}
+    for i, symbol in enumerate(['SPY', 'QQQ', 'AAPL', 'MSFT', 'GOOGL', 'NVDA', 'TSLA', 'META'] * 4)
+]})
+
+# 名稱 → (方法, 路徑, 內容, 額外標頭)；ETag 標頭於執行時填入
+SCENARIOS = {
+    'market[8]': ('GET', '/v1/market', None, {'Accept-Encoding': 'gzip'}),
+    'market[8] if-none-match': ('GET', '/v1/market', None, {'Accept-Encoding': 'gzip', 'If-None-Match': None}),
+    'market[23] batch': ('GET', '/v1/market?symbols=SPY,QQQ,AAPL,MSFT,GOOGL,NVDA,TSLA,META,VYM,TLT,VNQ,VTI,'
+                                'LQD,ARKK,SOXX,BND,GLD,USMV,VOO,QUAL,SCHD,JEPI,HYG', None, {'Accept-Encoding': 'gzip'}),
+    'solutions': ('GET', '/v1/solutions', None, {'Accept-Encoding': 'gzip'}),
+    'history[800]': ('GET', '/v1/history/SPY', None, {'Accept-Encoding': 'gzip'}),
+    'valuation[32]': ('POST', '/v1/portfolio/valuation', VALUATION_BODY, {'Content-Type': 'application/json'})
+}
+
+def _request(conn, method, path, body, headers):
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    data = response.read()
+    return response.status, response.getheader('ETag'), len(data)
+
+def run_scenario(port, name, clients, duration):
+    method, path, body, headers = SCENARIOS[name]
+    headers = dict(headers)
+    if 'If-None-Match' in headers:
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        headers['If-None-Match'] = _request(conn, method, path, body, {})[1]
+        conn.close()
+
+    latencies = []
+    sizes = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        local_latencies, local_sizes, local_errors = [], [], 0
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            status, _, size = _request(conn, method, path, body, headers)
+            local_latencies.append(time.perf_counter() - t0)
+            local_sizes.append(size)
+            local_errors += status >= 400
+        conn.close()
+        with lock:
+            latencies.extend(local_latencies)
+            sizes.extend(local_sizes)
+            errors.append(local_errors)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        'scenario': name,
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'throughput_rps': len(latencies) / wall if wall else 0.0,
+        'latency_ms': {f'p{int(q * 100)}': metrics.quantile(latencies, q) * 1000 for q in (0.5, 0.95, 0.99)},
+        'mean_bytes': sum(sizes) / len(sizes) if sizes else 0.0
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TENKI HTTP API throughput benchmark')
+    parser.add_argument('-c', dest='clients', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=3.0, help='seconds per scenario and client count')
+    parser.add_argument('-k', dest='keyword', default='', help='only run scenarios whose name contains this text')
+    parser.add_argument('--fixture', default=MARKET_FIXTURE)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    providers.set_provider(providers.FixtureProvider(args.fixture))
+    import api_server
+    import solutions
+    solutions.refresh_solutions()
+    server = api_server.make_server('127.0.0.1', 0)
+    threading.Thread(target=server.serve_forever, name='tenki-api', daemon=True).start()
+    port = server.server_address[1]
+
+    print(f'{"scenario":<26} {"C":>4} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"bytes":>8} {"err":>5}')
+    results = []
+    for name in SCENARIOS:
+        if args.keyword not in name:
+            continue
+        for clients in args.clients:
+            result = run_scenario(port, name, clients, args.duration)
+            results.append(result)
+            latency = result['latency_ms']
+            print(f'{name:<26} {clients:>4} {result["throughput_rps"]:>9.0f} {latency["p50"]:>8.2f} '
+                  f'{latency["p95"]:>8.2f} {latency["p99"]:>8.2f} {result["mean_bytes"]:>8.0f} {result["errors"]:>5}')
+
+    server.shutdown()
+    server.server_close()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""交易時段快取存活時間的模擬
+
+以模擬時鐘重播一段期間內每 N 秒一次的報價請求，比較固定存活時間與
+market_calendar.MarketHoursTTL 的上游呼叫次數（每個標的）。不需要網路，也不會真的等待。
+
+    python -m benchmarks.load_calendar                          # 2026 感恩節那一週，每 60 秒一次
+    python -m benchmarks.load_calendar --start 2026-12-21 --days 14 --every 10 --ttl 300 3600
+"""
+import argparse
+import datetime
+
+import metrics
+from cache import MISSING, TTLCache
+from market_calendar import TIMEZONE, MarketHoursTTL
+
+def replay(ttl, start, days, every):
+    """回傳 (上游呼叫次數, 計入 tenki_cache_fetches_saved_total 的次數)"""
+    cache = TTLCache(f'replay.{ttl!r}', ttl=ttl, maxsize=1, backend=None)
+    t0 = TIMEZONE.localize(datetime.datetime.combine(start, datetime.time())).timestamp()
+    calls = 0
+    for i in range(int(days * 86400 // every)):
+        now = t0 + i * every
+        if cache.get('SPY', now=now) is MISSING:
+            calls += 1
+            cache.set('SPY', {'price': 1.0}, now=now)
+    return calls, metrics.get_counter('tenki_cache_fetches_saved_total', cache=cache.name)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TENKI market-hours TTL replay')
+    parser.add_argument('--start', type=datetime.date.fromisoformat, default=datetime.date(2026, 11, 23))
+    parser.add_argument('--days', type=float, default=7)
+    parser.add_argument('--every', type=float, default=60, help='seconds between requests')
+    parser.add_argument('--ttl', type=int, nargs='+', default=[300], help='regular-hours TTL in seconds')
+    args = parser.parse_args(argv)
+
+    print(f'{"ttl":>6} {"fixed":>8} {"adaptive":>9} {"saved":>8} {"reduction":>10}')
+    for base in args.ttl:
+        fixed, _ = replay(base, args.start, args.days, args.every)
+        adaptive, saved = replay(MarketHoursTTL(base), args.start, args.days, args.every)
+        print(f'{base:>6} {fixed:>8} {adaptive:>9} {saved:>8} {1 - adaptive / fixed:>10.1%}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""通知佇列負載測試
+
+模擬一輪行情觸發大量價格提醒：U 個使用者各有 A 個提醒在 W 波價格更新中陸續觸發，
+經 notifications.enqueue_alerts 寫入佇列，由派送工作池經本機 smtp_sink.py 與 JSON Lines 檔送出。
+回報寫入速率（價格更新執行緒被佔用的時間）、清空佇列的時間、合併比例與觸發到送達的延遲。
+email 受 token bucket 限速，清空時間約為 訊息數 / rate。
+
+    python -m benchmarks.load_notifications                      # 200 使用者 × 5 提醒，3 波
+    python -m benchmarks.load_notifications -u 2000 --email-rate 200 --workers 8
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TENKI notification queue load test')
+    parser.add_argument('-u', dest='users', type=int, default=200)
+    parser.add_argument('-a', dest='alerts', type=int, default=5, help='alerts fired per user')
+    parser.add_argument('-w', dest='waves', type=int, default=3, help='price updates the alerts are spread over')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--coalesce', type=float, default=1.0, help='coalescing window in seconds')
+    parser.add_argument('--email-rate', type=float, help='override the email token bucket rate (per second)')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='tenki-notify-')
+    os.environ['TENKI_NOTIFY_DB'] = os.path.join(workdir, 'queue.sqlite3')
+    os.environ['TENKI_NOTIFY_LOG'] = os.path.join(workdir, 'push.jsonl')
+    os.environ['TENKI_NOTIFY_COALESCE_SECONDS'] = str(args.coalesce)
+    import metrics
+    import notifications
+    from smtp_sink import SinkServer
+
+    sink = SinkServer().start()
+    channels = {name: dict(spec) for name, spec in notifications.CHANNELS.items()}
+    if args.email_rate:
+        channels['email']['rate'] = args.email_rate
+        channels['email']['burst'] = max(channels['email']['burst'], int(args.email_rate))
+    delivered = {}
+    delivered_lock = threading.Lock()
+
+    class Recording:
+        """記錄每位使用者最後一則訊息送達的時間"""
+
+        def __init__(self, name, sender):
+            self.name = name
+            self.sender = sender
+
+        def send(self, user, subject, body):
+            result = self.sender.send(user, subject, body)
+            with delivered_lock:
+                delivered.setdefault(self.name, {})[user] = time.perf_counter()
+            return result
+
+    senders = {
+        'email': Recording('email', notifications.SmtpChannel(port=sink.port)),
+        'push': Recording('push', notifications.LogChannel('push'))
+    }
+    queue = notifications.get_queue()
+    dispatcher = notifications.Dispatcher(queue, senders=senders, workers=args.workers, channels=channels).start()
+    notifications._dispatcher = dispatcher
+
+    users = [f'user:load{i}@example.com' for i in range(args.users)]
+    per_wave = [args.alerts // args.waves + (1 if w < args.alerts % args.waves else 0) for w in range(args.waves)]
+    fired_at = {}
+    enqueue_seconds = 0.0
+    alert_id = 0
+    t_start = time.perf_counter()
+    for wave, count in enumerate(per_wave):
+        fired = []
+        for user in users:
+            for _ in range(count):
+                fired.append({'id': alert_id, 'user': user, 'symbol': f'A{alert_id % 500:03d}',
+                              'direction': 'above' if alert_id % 2 else 'below', 'threshold': 100.0,
+                              'active': False, 'fired_ts': int(time.time()), 'fired_price': 101.0})
+                alert_id += 1
+        t0 = time.perf_counter()
+        notifications.enqueue_alerts(fired)
+        enqueue_seconds += time.perf_counter() - t0
+        for user in users:
+            fired_at.setdefault(user, time.perf_counter())
+        # 波與波之間的間隔短於合併時間，應合併成同一則訊息
+        time.sleep(args.coalesce / (args.waves + 1))
+
+    expected = {'email': len(users), 'push': len(users)}
+    deadline = time.perf_counter() + 600
+    while time.perf_counter() < deadline:
+        with delivered_lock:
+            if all(len(delivered.get(name, {})) >= count for name, count in expected.items()) and queue.depth() == 0:
+                break
+        time.sleep(0.05)
+    drain_seconds = time.perf_counter() - t_start
+    dispatcher.stop()
+    notifications._dispatcher = None
+    sink.stop()
+
+    rows = alert_id * len(expected)
+    print(f'alerts fired      {alert_id:>10} ({args.users} users × {args.alerts}, {args.waves} waves)')
+    print(f'queue rows        {rows:>10}')
+    print(f'enqueue           {rows / enqueue_seconds:>10.0f} rows/s ({enqueue_seconds * 1000:.1f} ms total)')
+    print(f'drain             {drain_seconds:>10.2f} s')
+    print(f'emails received   {len(sink.mailbox):>10}')
+    print(f'coalesced         {metrics.get_counter("tenki_notifications_coalesced_total"):>10}')
+    print(f'{"channel":<8} {"sent":>6} {"p50 s":>8} {"p95 s":>8} {"max s":>8}')
+    for name in expected:
+        latencies = sorted(delivered.get(name, {})[user] - fired_at[user] for user in delivered.get(name, {}))
+        print(f'{name:<8} {len(latencies):>6} {metrics.quantile(latencies, 0.5):>8.2f} '
+              f'{metrics.quantile(latencies, 0.95):>8.2f} {(latencies or [0])[-1]:>8.2f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""多副本共用快取測試
+
+以 R 個子行程模擬負載平衡器後的多個副本，同時冷啟動並各自取得儀表板報價、長期走勢、
+標的池與解決方案快照，統計所有副本合計的上游呼叫次數（provider.history / fundamentals）。
+只用行程內快取時上游呼叫隨副本數倍增；使用共用後端時應只與標的數有關。
+Redis 協定後端預設使用同行程啟動的 resp_server.py。行情由錄製的 fixture 提供，不需要網路。
+
+    python -m benchmarks.load_replicas                          # R = 1, 4, 8；memory 與 redis
+    python -m benchmarks.load_replicas -r 2 16 --backend memory disk redis --output replicas.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import MARKET_FIXTURE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class CountingProvider:
+    """計算上游呼叫次數的 provider"""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.name = provider.name
+        self.calls = {'history': 0, 'fundamentals': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, kind):
+        with self._lock:
+            self.calls[kind] += 1
+
+    def history(self, symbol, period='2d'):
+        self._count('history')
+        return self.provider.history(symbol, period)
+
+    def fundamentals(self, symbol):
+        self._count('fundamentals')
+        return self.provider.fundamentals(symbol)
+
+def worker(start_at, fixture):
+    """單一副本：等到 start_at 後同時冷啟動，輸出 JSON 結果"""
+    import providers
+    provider = CountingProvider(providers.FixtureProvider(fixture))
+    providers.set_provider(provider)
+    from market import MARKET_SYMBOLS, get_market_data, get_price_history
+    from solutions import sync_solutions
+
+    time.sleep(max(0.0, start_at - time.time()))
+    t0 = time.perf_counter()
+    get_market_data()
+    for symbol in MARKET_SYMBOLS:
+        get_price_history(symbol)
+    sync_solutions()
+    elapsed = time.perf_counter() - t0
+    print(json.dumps({'calls': provider.calls, 'elapsed_s': elapsed}))
+
+def run_replicas(replicas, backend, fixture):
+    env = dict(os.environ, TENKI_CACHE_BACKEND=backend, TENKI_TRACE_LOG=os.devnull, TENKI_METRICS_PORT='0')
+    # 本機的 resp_server.py 與所有副本搶同一組 CPU，放寬逾時以免退回本地快取
+    env.setdefault('TENKI_CACHE_TIMEOUT', '5')
+    # 子行程匯入 pandas 與 plotly 約需數秒，統一在之後同時開始
+    start_at = time.time() + 5 + 0.3 * replicas
+    state_dir = tempfile.mkdtemp(prefix='tenki-replicas-')
+    processes = []
+    for i in range(replicas):
+        env['TENKI_INDICATOR_STATE'] = os.path.join(state_dir, f'indicators-{i}.npz')
+        processes.append(subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.load_replicas', '--worker', str(start_at), '--fixture', fixture],
+            cwd=ROOT, env=dict(env), stdout=subprocess.PIPE, text=True))
+    results = [json.loads(process.communicate()[0].strip().splitlines()[-1]) for process in processes]
+    return {
+        'backend': backend.split(':')[0],
+        'replicas': replicas,
+        'history_calls': sum(r['calls']['history'] for r in results),
+        'fundamentals_calls': sum(r['calls']['fundamentals'] for r in results),
+        'max_elapsed_s': max(r['elapsed_s'] for r in results)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TENKI shared cache benchmark across replicas')
+    parser.add_argument('-r', dest='replicas', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--backend', nargs='+', default=['memory', 'redis'],
+                        help='memory, disk, redis (local resp_server) or a redis:// URL')
+    parser.add_argument('--fixture', default=MARKET_FIXTURE)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    parser.add_argument('--worker', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        worker(args.worker, args.fixture)
+        return
+
+    server = None
+    print(f'{"backend":<8} {"R":>4} {"history":>9} {"fundamentals":>13} {"per replica":>12} {"max s":>7}')
+    results = []
+    for name in args.backend:
+        for replicas in args.replicas:
+            if name == 'redis':
+                import resp_server
+                if server is None:
+                    server = resp_server.make_server('127.0.0.1', 0)
+                    threading.Thread(target=server.serve_forever, name='tenki-resp', daemon=True).start()
+                server.store.flushdb([], time.time())
+                spec = f'redis://127.0.0.1:{server.server_address[1]}/0'
+            elif name == 'disk':
+                spec = 'disk:' + tempfile.mkdtemp(prefix='tenki-cache-')
+            else:
+                spec = name
+            result = run_replicas(replicas, spec, args.fixture)
+            results.append(result)
+            total = result['history_calls'] + result['fundamentals_calls']
+            print(f'{result["backend"]:<8} {replicas:>4} {result["history_calls"]:>9} '
+                  f'{result["fundamentals_calls"]:>13} {total / replicas:>12.1f} {result["max_elapsed_s"]:>7.2f}')
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""多 session 負載測試
+
+以 Streamlit 的 AppTest 在同一行程內模擬 N 個同時常駐的 session，每個 session 走完完整流程:
+landing → login → dashboard → 自動導航 → 解決方案 → 虛擬組合。
+行情由錄製的 fixture 提供，不需要網路。
+
+    python -m benchmarks.load_sessions                  # N = 1, 5, 10, 25
+    python -m benchmarks.load_sessions -n 1 10 50 --output load.json
+
+每個 N 會回報 rerun 延遲百分位數、吞吐量（reruns/s）與每個 session 的常駐記憶體增量。
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import time
+
+# 在匯入任何 app 模組之前關閉 trace 日誌與 sidecar
+os.environ.setdefault('TENKI_TRACE_LOG', os.devnull)
+os.environ.setdefault('TENKI_METRICS_PORT', '0')
+
+from streamlit.testing.v1 import AppTest
+
+import metrics
+import providers
+from benchmarks.harness import MARKET_FIXTURE
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+TIMEOUT = 60
+
+def rss_bytes():
+    """目前行程的常駐記憶體（bytes）"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # macOS 回傳 bytes、Linux 回傳 KiB；此處只作為無 /proc 時的近似值
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == 'darwin' else usage * 1024
+
+def _click(at, label=None, key=None):
+    for button in at.button:
+        if (key is not None and button.key == key) or (label is not None and button.label == label):
+            button.click()
+            return
+    raise LookupError(f'button not found: {key or label}')
+
+def _step(at, latencies, action=None):
+    if action is not None:
+        action(at)
+    t0 = time.perf_counter()
+    at.run(timeout=TIMEOUT)
+    latencies.append(time.perf_counter() - t0)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+def _login_label(at):
+    from i18n import TEXTS
+    return TEXTS[at.session_state.language]['login']
+
+def session_flow(index):
+    """一個 session 的流程步驟（None 表示只 rerun）"""
+    def submit_login(a):
+        a.text_input(key='login_email_main').input(f'load{index}@tenki.test')
+        a.text_input(key='login_password_main').input('load-test')
+        _click(a, label=_login_label(a))
+
+    return [
+        None,                                                     # landing
+        lambda a: _click(a, key='get_started_main'),              # → login
+        submit_login,                                             # → dashboard
+        lambda a: _click(a, key='nav_auto_navigation_main'),
+        lambda a: _click(a, key='generate_auto_main'),            # → solution
+        lambda a: _click(a, key='add_portfolio_main'),
+        lambda a: _click(a, key='nav_virtual_portfolio_main')
+    ]
+
+def run_level(n_sessions):
+    """讓 n 個 session 同時常駐並交錯執行流程，回傳統計
+
+    AppTest 每次 run 都會建立行程層級的 runtime，無法在多執行緒中並行；
+    因此各 session 以輪流方式逐步執行，等同單一 replica 依序處理所有 session 的 rerun。
+    """
+    gc.collect()
+    rss_before = rss_bytes()
+    sessions = [AppTest.from_file(APP_PATH, default_timeout=TIMEOUT) for _ in range(n_sessions)]
+    flows = [session_flow(i) for i in range(n_sessions)]
+    latencies = []
+
+    t0 = time.perf_counter()
+    for step in range(len(flows[0])):
+        for at, flow in zip(sessions, flows):
+            _step(at, latencies, flow[step])
+    wall = time.perf_counter() - t0
+
+    gc.collect()
+    rss_after = rss_bytes()
+    latencies.sort()
+    return {
+        'sessions': n_sessions,
+        'reruns': len(latencies),
+        'wall_s': wall,
+        'throughput_rps': len(latencies) / wall if wall else 0.0,
+        'latency_ms': {f'p{int(q * 100)}': metrics.quantile(latencies, q) * 1000 for q in (0.5, 0.95, 0.99)},
+        'latency_max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        'rss_bytes': rss_after,
+        'rss_per_session_bytes': max(0, rss_after - rss_before) / n_sessions
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TENKI multi-session load harness')
+    parser.add_argument('-n', dest='levels', type=int, nargs='+', default=[1, 5, 10, 25])
+    parser.add_argument('--fixture', default=MARKET_FIXTURE)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    providers.set_provider(providers.FixtureProvider(args.fixture))
+
+    print(f'{"N":>4} {"reruns":>7} {"rps":>8} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"MiB/session":>12}')
+    results = []
+    for n_sessions in args.levels:
+        result = run_level(n_sessions)
+        results.append(result)
+        latency = result['latency_ms']
+        print(f'{n_sessions:>4} {result["reruns"]:>7} {result["throughput_rps"]:>8.1f} '
+              f'{latency["p50"]:>9.1f} {latency["p95"]:>9.1f} {latency["p99"]:>9.1f} '
+              f'{result["rss_per_session_bytes"] / 2**20:>12.2f}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
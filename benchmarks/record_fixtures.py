@@ -0,0 +1,115 @@
+"""錄製基準測試用的行情 fixture
+
+    python -m benchmarks.record_fixtures              # 由 yfinance 錄製
+    python -m benchmarks.record_fixtures --synthetic  # 無網路時產生幾何隨機漫步資料
+
+    python -m benchmarks.record_fixtures --universe   # 連同整個篩選器標的池一起錄製
+
+格式:
+    {"source": "yfinance", "recorded_at": "...",
+     "symbols": {"SPY": {"dates": ["2024-01-02", ...], "close": [472.65, ...]}},
+     "fundamentals": {"SPY": {"dividend_yield": 0.012, "pe": 26.3}},
+     "fx": {"TWD": 32.4, "JPY": 151.2}}
+"""
+import argparse
+import json
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import MARKET_FIXTURE
+from fx import BASE_CURRENCY, CURRENCIES
+from market import MARKET_SYMBOLS
+from screener import read_universe
+from strategies import strategy_symbols
+
+# 合成資料的起始價格與年化波動率
+SYNTHETIC_START = {
+    'SPY': (470.0, 0.16), 'QQQ': (400.0, 0.22), 'AAPL': (185.0, 0.26), 'MSFT': (370.0, 0.25),
+    'GOOGL': (140.0, 0.30), 'NVDA': (48.0, 0.50), 'TSLA': (250.0, 0.60), 'META': (350.0, 0.40),
+    'VYM': (112.0, 0.13), 'TLT': (95.0, 0.15), 'VNQ': (88.0, 0.20), 'VTI': (235.0, 0.16),
+    'LQD': (108.0, 0.08), 'ARKK': (50.0, 0.55), 'SOXX': (210.0, 0.35), 'BND': (72.0, 0.06),
+    'GLD': (190.0, 0.14), 'USMV': (80.0, 0.11), 'VOO': (435.0, 0.16), 'QUAL': (150.0, 0.16),
+    'SCHD': (26.0, 0.13), 'JEPI': (54.0, 0.10), 'HYG': (76.0, 0.08)
+}
+
+def record_yfinance(symbols, period):
+    import yfinance as yf
+    out = {}
+    for symbol in symbols:
+        closes = yf.Ticker(symbol).history(period=period)['Close'].dropna()
+        out[symbol] = {
+            'dates': [d.strftime('%Y-%m-%d') for d in closes.index],
+            'close': [round(float(c), 4) for c in closes]
+        }
+    return out
+
+# 合成資料的匯率（1 美元可換得的數量）
+SYNTHETIC_FX = {'TWD': 32.0, 'JPY': 150.0}
+
+def record_yfinance_fx():
+    from providers import YFinanceProvider
+    provider = YFinanceProvider()
+    return {currency: round(float(provider.fx_rate(currency)), 4) for currency in CURRENCIES if currency != BASE_CURRENCY}
+
+def record_yfinance_fundamentals(symbols):
+    from providers import YFinanceProvider
+    provider = YFinanceProvider()
+    return {symbol: provider.fundamentals(symbol) for symbol in symbols}
+
+def record_synthetic_fundamentals(symbols, seed=20250102):
+    # 獨立的亂數序列，不影響收盤價
+    rng = np.random.default_rng(seed)
+    return {
+        symbol: {
+            'dividend_yield': round(float(rng.uniform(0.0, 0.05)), 4),
+            'pe': round(float(rng.uniform(8.0, 60.0)), 2)
+        }
+        for symbol in symbols
+    }
+
+def record_synthetic(symbols, days, seed=20250101):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=date.today(), periods=days)
+    out = {}
+    for symbol in symbols:
+        start, vol = SYNTHETIC_START.get(symbol, (100.0, 0.30))
+        steps = rng.normal(0.0003, vol / np.sqrt(252), size=days)
+        closes = start * np.exp(np.cumsum(steps))
+        out[symbol] = {
+            'dates': [d.strftime('%Y-%m-%d') for d in dates],
+            'close': [round(float(c), 4) for c in closes]
+        }
+    return out
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='record market-data fixtures')
+    parser.add_argument('--synthetic', action='store_true')
+    parser.add_argument('--period', default='2y')
+    parser.add_argument('--universe', action='store_true', help='also record every symbol in the screener universe')
+    parser.add_argument('--output', default=MARKET_FIXTURE)
+    args = parser.parse_args(argv)
+    # 行情頁標的在前，新增的策略標的附加在後（合成資料的亂數序列因此不變）
+    wanted = MARKET_SYMBOLS + [symbol for symbol in strategy_symbols() if symbol not in MARKET_SYMBOLS]
+    if args.universe:
+        wanted += [symbol for symbol in read_universe() if symbol not in wanted]
+
+    if args.synthetic:
+        symbols = record_synthetic(wanted, days=504)
+        fundamentals = record_synthetic_fundamentals(wanted)
+        fx = SYNTHETIC_FX
+        source = 'synthetic'
+    else:
+        symbols = record_yfinance(wanted, args.period)
+        fundamentals = record_yfinance_fundamentals(wanted)
+        fx = record_yfinance_fx()
+        source = 'yfinance'
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'source': source, 'recorded_at': datetime.now().isoformat(timespec='seconds'),
+                   'symbols': symbols, 'fundamentals': fundamentals, 'fx': fx}, f, separators=(',', ':'))
+    print(f'wrote {len(symbols)} symbols to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""執行基準測試並與 JSON 基準比較
+
+    python -m benchmarks.run                     # 執行全部案例
+    python -m benchmarks.run -k portfolio        # 只執行名稱包含 portfolio 的案例
+    python -m benchmarks.run --update-baselines  # 以本次結果覆寫基準
+    python -m benchmarks.run --output bench.json # 另存本次結果
+
+每個案例列出最快一輪與中位數的耗時；以相對於參考工作量的最快一輪與基準比較（見 harness.py），
+超過退步門檻的案例會重跑（最多 --retries 次，取最快的一次），重跑後仍退步時以狀態碼 1 結束。
+"""
+import argparse
+import glob
+import importlib
+import json
+import os
+import platform
+import sys
+
+from benchmarks.harness import CASES, compare, load_baselines, run_case, save_baselines
+
+def discover():
+    """匯入 benchmarks/bench_*.py 以註冊所有案例"""
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'bench_*.py'))):
+        importlib.import_module('benchmarks.' + os.path.basename(path)[:-3])
+
+def format_seconds(value):
+    if value >= 1:
+        return f'{value:.3f} s'
+    if value >= 1e-3:
+        return f'{value * 1e3:.3f} ms'
+    return f'{value * 1e6:.2f} µs'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TENKI offline benchmarks')
+    parser.add_argument('-k', dest='keyword', default='', help='only run cases whose name contains this text')
+    parser.add_argument('--update-baselines', action='store_true', help='write results into baselines.json')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    parser.add_argument('--retries', type=int, default=2, help='re-run a regressed case up to this many times')
+    args = parser.parse_args(argv)
+
+    discover()
+    baselines = load_baselines()
+    results = {}
+    regressions = []
+
+    for name in sorted(CASES):
+        if args.keyword not in name:
+            continue
+        result = run_case(name)
+        status, ratio = compare(name, result, baselines)
+        # 主機一時變慢造成的退步在重跑後會消失，真正的退步不會
+        for _ in range(args.retries):
+            if status != 'regression':
+                break
+            retry = run_case(name)
+            if retry['relative'] < result['relative']:
+                result = retry
+            status, ratio = compare(name, result, baselines)
+        result['status'] = status
+        results[name] = result
+        change = '' if ratio is None else f'{ratio:+.1%}'
+        print(f'{name:<48} {format_seconds(result["min_s"]):>12} {format_seconds(result["median_s"]):>12}  {status:<10} {change}')
+        if status == 'regression':
+            regressions.append(name)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results},
+                      f, indent=2, sort_keys=True)
+
+    if args.update_baselines:
+        for name, result in results.items():
+            entry = baselines['cases'].setdefault(name, {})
+            entry['median_s'] = result['median_s']
+            entry['relative'] = result['relative']
+        save_baselines(baselines)
+        print(f'updated {len(results)} baselines')
+        return 0
+
+    if regressions:
+        print(f'{len(regressions)} regression(s): {", ".join(regressions)}')
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""TENKI 資料快取
+
+不依賴 Streamlit 的 TTL 快取：Streamlit 頁面、背景排程與 API 伺服器（api_server.py）
+呼叫同一組快取函數。與 st.cache_data 不同，命中時直接回傳同一個物件而不複製，
+呼叫端不可修改回傳值。同一個鍵同時未命中時只有一個執行緒向上游取得資料（single-flight）。
+
+設定共用後端（TENKI_CACHE_BACKEND，見 cache_backends.py）時，本地快取之外另外寫入後端，
+其他副本未命中本地快取時先讀後端；向上游取得資料前以後端的 SET NX 鎖協調，
+同一個鍵在所有副本間也只取得一次。後端無法連線時退回只使用本地快取。
+"""
+import functools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+from cache_backends import decode, encode, get_backend, key_string, namespace
+
+metrics.describe('tenki_cache_requests_total', 'Cache lookups by cache name and result (hit/shared_hit/miss)')
+metrics.describe('tenki_cache_entries', 'Entries currently held by each cache')
+metrics.describe('tenki_cache_backend_errors_total', 'Shared cache backend operations that failed')
+metrics.describe('tenki_cache_lock_waits_total', 'Misses that waited for another thread or replica to compute the value')
+metrics.describe('tenki_cache_fetches_saved_total', 'Hits a fixed TTL would have refetched from upstream (adaptive TTLs only)')
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+# 使用行程共用的後端（TENKI_CACHE_BACKEND）
+DEFAULT = object()
+# 取得上游資料的鎖：最長持有秒數與等待時的輪詢間隔
+LOCK_SECONDS = 30
+LOCK_POLL_SECONDS = 0.05
+# 後端故障後只使用本地快取的秒數（避免每次查詢都等待連線逾時）
+BACKEND_RETRY_SECONDS = 5
+_backend_down_until = 0.0
+# 名稱 → TTLCache，供管理頁面與測試一次清除
+CACHES = {}
+
+class TTLCache:
+    """有存活時間與容量上限（LRU）的執行緒安全快取，可選擇共用後端
+
+    version 為值的格式版本：改變快取值的結構時遞增，新舊版本的副本不會讀到對方的值。
+    backend=None 表示只使用本地快取。
+    ttl 可以是秒數或 ttl(now, value) → 秒數（例如 market_calendar.MarketHoursTTL）；
+    後者有 base 屬性時，以 base 為固定存活時間統計省下的上游呼叫。
+    """
+
+    def __init__(self, name, ttl, maxsize=1024, version=1, backend=DEFAULT):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.namespace = namespace(name, version)
+        self._backend = backend
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        # 鍵 → 以固定存活時間（ttl.base）計算時應重新取得的時間
+        self._fixed = {}
+        CACHES[name] = self
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def backend(self):
+        if time.time() < _backend_down_until:
+            return None
+        return get_backend() if self._backend is DEFAULT else self._backend
+
+    def _backend_call(self, method, *args, default=None):
+        global _backend_down_until
+        backend = self.backend
+        if backend is None:
+            return default
+        try:
+            return getattr(backend, method)(self.namespace, *args)
+        except Exception as e:
+            metrics.inc('tenki_cache_backend_errors_total', cache=self.name)
+            logger.warning('cache backend %s failed for %s, using local cache for %ss: %r',
+                           method, self.name, BACKEND_RETRY_SECONDS, e)
+            _backend_down_until = time.time() + BACKEND_RETRY_SECONDS
+            return default
+
+    def ttl_at(self, now, value=None):
+        """now 時寫入 value 的存活秒數"""
+        return self.ttl(now, value) if callable(self.ttl) else self.ttl
+
+    def _store(self, key, expires_at, value, now):
+        base = getattr(self.ttl, 'base', None)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            if base is not None:
+                self._fixed[key] = now + base
+            while len(self._data) > self.maxsize:
+                self._fixed.pop(self._data.popitem(last=False)[0], None)
+            metrics.set_gauge('tenki_cache_entries', len(self._data), cache=self.name)
+
+    def _local(self, key, now):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                refetch_at = self._fixed.get(key)
+                if refetch_at is not None and now >= refetch_at:
+                    # 固定存活時間下這次會向上游重新取得
+                    self._fixed[key] = now + self.ttl.base
+                    metrics.inc('tenki_cache_fetches_saved_total', cache=self.name)
+                return entry[1]
+        return MISSING
+
+    def _shared(self, keys, now):
+        """由共用後端一次取得多個鍵，寫入本地快取（本地副本與共用的值同時到期）"""
+        found = {}
+        if self.backend is None:
+            return found
+        blobs = self._backend_call('get_many', [key_string(key) for key in keys], default=[None] * len(keys))
+        for key, blob in zip(keys, blobs):
+            if blob is not None:
+                expires_at, value = decode(blob)
+                if expires_at > now:
+                    self._store(key, expires_at, value, now)
+                    found[key] = value
+        return found
+
+    def _lookup(self, key, now=None):
+        """回傳 (值或 MISSING, 來源 'hit' / 'shared_hit' / 'miss')"""
+        now = time.time() if now is None else now
+        value = self._local(key, now)
+        if value is not MISSING:
+            return value, 'hit'
+        value = self._shared([key], now).get(key, MISSING)
+        return value, 'miss' if value is MISSING else 'shared_hit'
+
+    def get(self, key, now=None):
+        """取得未過期的值，沒有時回傳 MISSING"""
+        value, result = self._lookup(key, now)
+        metrics.inc('tenki_cache_requests_total', cache=self.name, result=result)
+        return value
+
+    def set(self, key, value, now=None):
+        now = time.time() if now is None else now
+        ttl = self.ttl_at(now, value)
+        expires_at = now + ttl
+        self._store(key, expires_at, value, now)
+        if self.backend is not None:
+            self._backend_call('set', key_string(key), encode(value, expires_at), ttl)
+
+    def expires_at(self, key):
+        """鍵在本地快取的到期時間（不存在時為 None）"""
+        entry = self._data.get(key)
+        return entry[0] if entry is not None else None
+
+    # ====== single-flight ======
+    def _claim(self, key):
+        """取得計算這個鍵的權利；其他執行緒或副本正在計算時回傳 None"""
+        with self._lock:
+            if key in self._inflight:
+                return None
+            local = threading.Lock()
+            local.acquire()
+            self._inflight[key] = local
+        if self.backend is None:
+            return True
+        token = os.urandom(8).hex()
+        # 後端故障時視為取得，退回各自計算
+        if self._backend_call('add', 'lock:' + key_string(key), encode(token, time.time() + LOCK_SECONDS),
+                              LOCK_SECONDS, default=True):
+            return token
+        self._release(key, True)
+        return None
+
+    def _release(self, key, token):
+        with self._lock:
+            self._inflight.pop(key).release()
+        if token is not True:
+            lock_key = 'lock:' + key_string(key)
+            blob = self._backend_call('get', lock_key)
+            # 只釋放自己的鎖（計算超過 LOCK_SECONDS 時鎖可能已屬於其他副本）
+            if blob is not None and decode(blob)[1] == token:
+                self._backend_call('delete', lock_key)
+
+    def _wait(self, key):
+        """等待其他執行緒或副本寫入；對方放棄或逾時回傳 MISSING"""
+        metrics.inc('tenki_cache_lock_waits_total', cache=self.name)
+        with self._lock:
+            local = self._inflight.get(key)
+        if local is not None:
+            with local:
+                pass
+        value = self._lookup(key)[0]
+        if value is not MISSING or self.backend is None:
+            return value
+        deadline = time.time() + LOCK_SECONDS
+        lock_key = 'lock:' + key_string(key)
+        while time.time() < deadline:
+            value = self._lookup(key)[0]
+            if value is not MISSING or self._backend_call('get', lock_key) is None:
+                return value
+            time.sleep(LOCK_POLL_SECONDS)
+        return MISSING
+
+    def get_many_or_compute(self, keys, compute):
+        """批次取得：未命中的鍵以 compute(鍵列表) → {鍵: 值} 一次計算並寫入。
+        其他執行緒或副本正在計算的鍵等待其結果，不重複計算"""
+        now = time.time()
+        values = {key: self._local(key, now) for key in dict.fromkeys(keys)}
+        misses = [key for key, value in values.items() if value is MISSING]
+        # 本地未命中的鍵以一次往返（MGET）向共用後端取得
+        shared = self._shared(misses, now) if misses else {}
+        for key, value in values.items():
+            if value is MISSING:
+                values[key] = shared.get(key, MISSING)
+                result = 'miss' if values[key] is MISSING else 'shared_hit'
+            else:
+                result = 'hit'
+            metrics.inc('tenki_cache_requests_total', cache=self.name, result=result)
+        return self._fill(values, [key for key, value in values.items() if value is MISSING], compute)
+
+    def get_or_compute(self, key, compute):
+        """命中時回傳快取值，否則計算並寫入（同一個鍵只計算一次）"""
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        return self._fill({key: value}, [key], lambda keys: {key: compute()})[key]
+
+    def _fill(self, values, pending, compute):
+        while pending:
+            claimed, waiting = [], []
+            for key in pending:
+                token = self._claim(key)
+                if token is None:
+                    waiting.append(key)
+                    continue
+                # 取得鎖之前可能已由其他副本寫入
+                value = self._lookup(key)[0]
+                if value is MISSING:
+                    claimed.append((key, token))
+                else:
+                    values[key] = value
+                    self._release(key, token)
+            try:
+                if claimed:
+                    computed = compute([key for key, _ in claimed])
+                    for key, _ in claimed:
+                        values[key] = computed[key]
+                        self.set(key, computed[key])
+            finally:
+                for key, token in claimed:
+                    self._release(key, token)
+            for key in waiting:
+                values[key] = self._wait(key)
+            pending = [key for key in waiting if values[key] is MISSING]
+        return values
+
+    def clear(self):
+        """清除本地快取與後端中這個快取的所有鍵"""
+        with self._lock:
+            self._data.clear()
+            self._fixed.clear()
+            metrics.set_gauge('tenki_cache_entries', 0, cache=self.name)
+        if self.backend is not None:
+            self._backend_call('clear')
+
+def cached(ttl, maxsize=256, name=None, version=1):
+    """以 TTLCache 快取函數結果的裝飾器（參數須可雜湊，且 repr 在各行程一致）"""
+    def decorator(func):
+        cache = TTLCache(name or f'{func.__module__}.{func.__name__}', ttl, maxsize, version)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs))
+        wrapper.cache = cache
+        wrapper.clear = cache.clear
+        return wrapper
+    return decorator
+
+def clear_all():
+    for cache in CACHES.values():
+        cache.clear()
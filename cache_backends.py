@@ -0,0 +1,315 @@
+"""TENKI 共用快取後端
+
+TTLCache（cache.py）在行程內保留一份本地快取，設定共用後端時另外寫入後端，
+讓多個 Streamlit 副本與 API 行程共用同一份上游資料:
+    memory            預設，只有行程內快取
+    disk:<dir>        同一台主機的多個行程共用的目錄
+    redis://host:port/db
+                      Redis 協定（RESP）伺服器；本機測試可用 resp_server.py
+
+後端只存位元組。值以 pickle 序列化、超過 COMPRESS_MIN_BYTES 時以 zlib 壓縮，
+前面加上到期時間與格式旗標（見 encode）。鍵以 tenki:v<FORMAT_VERSION>:<快取名稱>:<版本>
+為前綴，改變值的格式時遞增版本即可與舊版本的副本並存。
+後端只應由 TENKI 自己的行程寫入（讀取時會 unpickle）。
+
+環境變數:
+    TENKI_CACHE_BACKEND=memory           memory、disk:<dir> 或 redis://host:port/db
+    TENKI_CACHE_TIMEOUT=1.0              連線 Redis 協定伺服器的逾時秒數
+"""
+import hashlib
+import os
+import pickle
+import re
+import socket
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from urllib.parse import unquote, urlsplit
+
+CACHE_BACKEND = os.environ.get('TENKI_CACHE_BACKEND', 'memory')
+CACHE_TIMEOUT = float(os.environ.get('TENKI_CACHE_TIMEOUT', '1.0'))
+# 值的編碼格式版本（改變 encode 時遞增）
+FORMAT_VERSION = 1
+COMPRESS_MIN_BYTES = 512
+MAX_KEY_LENGTH = 200
+
+# ====== 編碼 ======
+# 到期時間（epoch 秒）與旗標
+_HEADER = struct.Struct('>dB')
+_COMPRESSED = 1
+
+def encode(value, expires_at):
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    flags = 0
+    if len(data) >= COMPRESS_MIN_BYTES:
+        data = zlib.compress(data, 1)
+        flags |= _COMPRESSED
+    return _HEADER.pack(expires_at, flags) + data
+
+def decode(blob):
+    """回傳 (到期時間, 值)"""
+    expires_at, flags = _HEADER.unpack_from(blob)
+    data = memoryview(blob)[_HEADER.size:]
+    if flags & _COMPRESSED:
+        data = zlib.decompress(data)
+    return expires_at, pickle.loads(data)
+
+def namespace(name, version):
+    return f'tenki:v{FORMAT_VERSION}:{name}:{version}'
+
+def key_string(key):
+    """快取鍵轉為後端的鍵（str、數字、None 與其 tuple 的 repr 在各行程一致）"""
+    text = repr(key)
+    if len(text) > MAX_KEY_LENGTH:
+        text = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    return text
+
+# ====== 磁碟 ======
+class DiskBackend:
+    """每個鍵一個檔案，寫入以 os.replace 完成，讀取端不會看到寫到一半的檔案"""
+    shared = True
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ns, key):
+        folder = os.path.join(self.directory, re.sub(r'[^\w.-]', '_', ns))
+        return folder, os.path.join(folder, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def get(self, ns, key):
+        blob = self._read(self._path(ns, key)[1])
+        if blob is None or len(blob) < _HEADER.size or _HEADER.unpack_from(blob)[0] <= time.time():
+            return None
+        return blob
+
+    def get_many(self, ns, keys):
+        return [self.get(ns, key) for key in keys]
+
+    def set(self, ns, key, blob, ttl):
+        folder, path = self._path(ns, key)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def add(self, ns, key, blob, ttl):
+        """鍵不存在（或已過期）時寫入並回傳 True
+
+        內容先寫入暫存檔，再以 os.link 放到鍵的位置（目標已存在時失敗）：鍵的檔案出現時內容已完整，
+        寫入途中當掉的行程只會留下暫存檔，不會留下永遠不會過期的鎖。
+        """
+        folder, path = self._path(ns, key)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            for _ in range(2):
+                try:
+                    os.link(tmp, path)
+                    return True
+                except FileExistsError:
+                    current = self._read(path)
+                    if current is None:
+                        continue
+                    # 不完整的檔案（舊版寫入途中當掉留下的）視為已過期
+                    if len(current) >= _HEADER.size and _HEADER.unpack_from(current)[0] > time.time():
+                        return False
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+            return False
+        finally:
+            os.unlink(tmp)
+
+    def delete(self, ns, key):
+        try:
+            os.unlink(self._path(ns, key)[1])
+        except FileNotFoundError:
+            pass
+
+    def clear(self, ns):
+        folder, _ = self._path(ns, '')
+        if os.path.isdir(folder):
+            for name in os.listdir(folder):
+                try:
+                    os.unlink(os.path.join(folder, name))
+                except FileNotFoundError:
+                    pass
+
+# ====== Redis 協定 ======
+class RespError(Exception):
+    """伺服器回傳的錯誤回覆（-ERR ...）"""
+
+class RespClient:
+    """最小的 RESP2 用戶端：每個執行緒一條連線，連線中斷時重新連線一次"""
+
+    def __init__(self, host='127.0.0.1', port=6379, db=0, password=None, timeout=CACHE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile('rb'))
+        self._local.conn = conn
+        if self.password:
+            self._call(conn, ('AUTH', self.password))
+        if self.db:
+            self._call(conn, ('SELECT', self.db))
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            conn[1].close()
+            conn[0].close()
+
+    def execute(self, *args):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            try:
+                return self._call(conn, args)
+            except OSError:
+                # 閒置連線可能已被伺服器關閉，重新連線再試一次
+                pass
+        return self._call(self._connect(), args)
+
+    def _call(self, conn, args):
+        sock, reader = conn
+        try:
+            sock.sendall(pack_command(args))
+            reply = read_reply(reader)
+        except OSError:
+            self.close()
+            raise
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+def pack_command(args):
+    parts = [b'*%d\r\n' % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode('utf-8')
+        elif not isinstance(arg, (bytes, bytearray, memoryview)):
+            arg = str(arg).encode('ascii')
+        parts.append(b'$%d\r\n' % len(arg))
+        parts.append(bytes(arg))
+        parts.append(b'\r\n')
+    return b''.join(parts)
+
+def read_reply(reader):
+    """讀取一個回覆（錯誤回覆以 RespError 物件回傳，不拋出）"""
+    line = reader.readline()
+    if not line.endswith(b'\r\n'):
+        raise ConnectionError('connection closed by cache server')
+    kind, rest = line[:1], line[1:-2]
+    if kind == b'+':
+        return rest.decode('utf-8')
+    if kind == b'-':
+        return RespError(rest.decode('utf-8'))
+    if kind == b':':
+        return int(rest)
+    if kind == b'$':
+        length = int(rest)
+        if length < 0:
+            return None
+        data = reader.read(length + 2)
+        if len(data) != length + 2:
+            raise ConnectionError('connection closed by cache server')
+        return data[:-2]
+    if kind == b'*':
+        length = int(rest)
+        return None if length < 0 else [read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f'invalid reply from cache server: {line[:20]!r}')
+
+class RedisBackend:
+    """Redis 協定伺服器（Redis、Valkey 或 resp_server.py）"""
+    shared = True
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, ns, key):
+        return self.client.execute('GET', f'{ns}:{key}')
+
+    def get_many(self, ns, keys):
+        return self.client.execute('MGET', *[f'{ns}:{key}' for key in keys])
+
+    def set(self, ns, key, blob, ttl):
+        self.client.execute('SET', f'{ns}:{key}', blob, 'PX', max(1, int(ttl * 1000)))
+
+    def add(self, ns, key, blob, ttl):
+        return self.client.execute('SET', f'{ns}:{key}', blob, 'PX', max(1, int(ttl * 1000)), 'NX') is not None
+
+    def delete(self, ns, key):
+        self.client.execute('DEL', f'{ns}:{key}')
+
+    def clear(self, ns):
+        pattern = re.sub(r'([*?\[\]\\])', r'\\\1', ns) + ':*'
+        cursor = b'0'
+        while True:
+            cursor, keys = self.client.execute('SCAN', cursor, 'MATCH', pattern, 'COUNT', 1000)
+            if keys:
+                self.client.execute('DEL', *keys)
+            if cursor in (b'0', '0'):
+                break
+
+# ====== 設定 ======
+def make_backend(spec):
+    """依設定字串建立後端；memory 回傳 None（只使用行程內快取）"""
+    if spec in ('', 'memory'):
+        return None
+    if spec.startswith('disk:'):
+        return DiskBackend(spec[len('disk:'):])
+    if spec.startswith('redis://'):
+        url = urlsplit(spec)
+        db = int(url.path.lstrip('/') or 0)
+        password = unquote(url.password) if url.password else None
+        return RedisBackend(RespClient(url.hostname or '127.0.0.1', url.port or 6379, db, password))
+    raise ValueError(f'unknown cache backend: {spec}')
+
+_backend = None
+_backend_ready = False
+_backend_lock = threading.Lock()
+
+def get_backend():
+    """行程共用的後端（依 TENKI_CACHE_BACKEND）"""
+    global _backend, _backend_ready
+    if _backend_ready:
+        return _backend
+    with _backend_lock:
+        if not _backend_ready:
+            _backend = make_backend(CACHE_BACKEND)
+            _backend_ready = True
+        return _backend
+
+def set_backend(backend):
+    """替換行程共用的後端（負載測試使用）"""
+    global _backend, _backend_ready
+    with _backend_lock:
+        _backend = backend
+        _backend_ready = True
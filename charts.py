@@ -0,0 +1,541 @@
+"""TENKI 圖表"""
+import plotly.graph_objects as go
+
+from cache import TTLCache
+from fx import BASE_CURRENCY, CURRENCIES
+from i18n import DEFAULT_LANGUAGE, get_texts
+from symbols import display_name
+from tracing import traced
+
+# ====== 圖表規格快取 ======
+# 輸入相同的圖表不重新建立 Figure：快取 JSON 規格（dict，st.plotly_chart 可直接使用），
+# 設定共用快取後端時由所有副本共用
+_specs = TTLCache('charts.specs', ttl=3600, maxsize=256)
+
+def chart_spec(name, key, build):
+    """以 (圖表名稱, 輸入鍵) 快取 build() 產生的圖表規格（build 回傳 None 時為 None）"""
+    def compute():
+        fig = build()
+        return None if fig is None else fig.to_plotly_json()
+    return _specs.get_or_compute((name,) + tuple(key), compute)
+
+def _axis(t, key, currency):
+    """金額軸的標題（附幣別）"""
+    return f'{t[key]} ({currency})'
+
+def _hover_money(field, currency, decimals=2):
+    """plotly hover 的金額格式（例: NT$%{y:,.0f}）"""
+    spec = CURRENCIES[currency]
+    return f"{spec['symbol']}%{{{field}:,.{min(decimals, spec['decimals'])}f}}"
+
+# ====== 修正圖表生成 - 解決重疊問題 ======
+@traced()
+def create_market_chart(market_data, language=DEFAULT_LANGUAGE):
+    """創建修正後的市場概況圖表"""
+    if not market_data:
+        return None
+    
+    t = get_texts(language)
+    
+    symbols = list(market_data.keys())
+    changes = [market_data[symbol]['change_pct'] for symbol in symbols]
+    colors = ['#22c55e' if change >= 0 else '#ef4444' for change in changes]
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=symbols,
+            y=changes,
+            marker_color=colors,
+            marker_line_color='rgba(255,255,255,0.2)',
+            marker_line_width=1.5,
+            text=[f'{change:+.2f}%' for change in changes],
+            textposition='outside',
+            textfont=dict(
+                family='JetBrains Mono, monospace', 
+                size=14, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            customdata=[display_name(symbol) for symbol in symbols],
+            hovertemplate=f'<b>%{{x}}</b> %{{customdata}}<br>{t["chart_change_hover"]}: %{{y:.2f}}%<extra></extra>'
+        )
+    ])
+    
+    fig.update_layout(
+        title=dict(
+            text=f'<b>{t["chart_market_title"]}</b>',
+            font=dict(
+                family='Outfit, Noto Sans JP, sans-serif', 
+                size=24, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            x=0.5,
+            y=0.95,  # 調整標題位置避免重疊
+            xanchor='center',
+            yanchor='top'
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(
+            family='Inter, Noto Sans JP, sans-serif', 
+            color='#e6edf3',
+            size=12
+        ),
+        xaxis=dict(
+            showgrid=False,
+            showline=True,
+            linecolor='rgba(255, 255, 255, 0.1)',
+            tickfont=dict(size=13, color='#c9d1d9', weight='bold'),
+            tickangle=0,  # 水平顯示避免重疊
+            title=dict(
+                text=f'<b>{t["chart_symbol_axis"]}</b>',
+                font=dict(size=14, color='#c9d1d9')
+            )
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            showline=True,
+            linecolor='rgba(255, 255, 255, 0.1)',
+            zeroline=True,
+            zerolinecolor='rgba(255, 255, 255, 0.3)',
+            zerolinewidth=2,
+            tickfont=dict(size=13, color='#c9d1d9', weight='bold'),
+            title=dict(
+                text=f'<b>{t["chart_change_axis"]}</b>',
+                font=dict(size=14, color='#c9d1d9')
+            )
+        ),
+        height=450,  # 增加高度避免重疊
+        margin=dict(l=80, r=80, t=100, b=80),  # 調整邊距
+        showlegend=False,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+def _allocation_pie(labels, values, names, title, t, currency):
+    """配置圓餅圖（names 為滑鼠提示中標籤後的說明）"""
+    colors = [
+        '#0ea5e9', '#8b5cf6', '#22c55e', '#f59e0b', 
+        '#ef4444', '#06b6d4', '#84cc16', '#f97316'
+    ]
+    
+    fig = go.Figure(data=[
+        go.Pie(
+            labels=labels,
+            values=values,
+            hole=0.45,
+            marker=dict(
+                colors=colors[:len(labels)], 
+                line=dict(color='#21262d', width=3)
+            ),
+            textfont=dict(
+                family='Inter, Noto Sans JP, sans-serif', 
+                size=13, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            textinfo='label+percent',
+            textposition='outside',
+            customdata=names,
+            hovertemplate=f'<b>%{{label}}</b> %{{customdata}}<br>{t["chart_value_hover"]}: {_hover_money("value", currency, 0)}<br>{t["chart_share_hover"]}: %{{percent}}<extra></extra>'
+        )
+    ])
+    
+    fig.update_layout(
+        title=dict(
+            text=f'<b>{title}</b>',
+            font=dict(
+                family='Outfit, Noto Sans JP, sans-serif', 
+                size=24, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            x=0.5,
+            y=0.95,
+            xanchor='center',
+            yanchor='top'
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(
+            family='Inter, Noto Sans JP, sans-serif', 
+            color='#e6edf3'
+        ),
+        height=450,
+        margin=dict(l=50, r=50, t=100, b=50),
+        showlegend=True,
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=-0.2,
+            xanchor='center',
+            x=0.5,
+            font=dict(size=12, color='#c9d1d9')
+        )
+    )
+    
+    return fig
+
+@traced()
+def create_portfolio_chart(portfolio_data, language=DEFAULT_LANGUAGE, currency=BASE_CURRENCY, rate=1.0):
+    """創建修正後的投資組合圓餅圖（市值以 rate 換算為 currency）"""
+    if not len(portfolio_data):
+        return None
+    
+    t = get_texts(language)
+    symbols = portfolio_data.symbols()
+    return _allocation_pie(symbols, portfolio_data.market_values() * rate, [display_name(symbol) for symbol in symbols],
+                           t['chart_portfolio_title'], t, currency)
+
+@traced()
+def create_exposure_chart(exposure, title, language=DEFAULT_LANGUAGE, currency=BASE_CURRENCY):
+    """創建曝險圓餅圖（exposure 為 {群組顯示名稱: 已換算的市值}）"""
+    if not exposure:
+        return None
+    
+    t = get_texts(language)
+    return _allocation_pie(list(exposure), list(exposure.values()), [''] * len(exposure), title, t, currency)
+
+@traced()
+def create_exposure_treemap(exposure, language=DEFAULT_LANGUAGE, currency=BASE_CURRENCY):
+    """創建 資產類別 → 產業 的曝險樹狀圖（exposure 為 {(資產類別, 產業): 已換算的市值}）"""
+    if not exposure:
+        return None
+    
+    t = get_texts(language)
+    
+    parents = {}
+    for (parent, _), value in exposure.items():
+        parents[parent] = parents.get(parent, 0.0) + value
+    ids = list(parents) + [f'{parent}/{child}' for parent, child in exposure]
+    
+    fig = go.Figure(data=[
+        go.Treemap(
+            ids=ids,
+            labels=list(parents) + [child for _, child in exposure],
+            parents=[''] * len(parents) + [parent for parent, _ in exposure],
+            values=list(parents.values()) + list(exposure.values()),
+            branchvalues='total',
+            marker=dict(
+                colors=list(parents.values()) + list(exposure.values()),
+                colorscale=[[0, '#0c4a6e'], [1, '#0ea5e9']],
+                line=dict(color='#21262d', width=2)
+            ),
+            textfont=dict(family='Inter, Noto Sans JP, sans-serif', size=13, color='#ffffff'),
+            texttemplate='<b>%{label}</b><br>%{percentRoot:.1%}',
+            hovertemplate=f'<b>%{{label}}</b><br>{t["chart_value_hover"]}: {_hover_money("value", currency, 0)}<br>{t["chart_share_hover"]}: %{{percentRoot:.1%}}<extra></extra>'
+        )
+    ])
+    
+    fig.update_layout(
+        title=dict(
+            text=f'<b>{t["chart_exposure_treemap_title"]}</b>',
+            font=dict(
+                family='Outfit, Noto Sans JP, sans-serif', 
+                size=24, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            x=0.5,
+            y=0.95,
+            xanchor='center',
+            yanchor='top'
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(
+            family='Inter, Noto Sans JP, sans-serif', 
+            color='#e6edf3'
+        ),
+        height=450,
+        margin=dict(l=20, r=20, t=90, b=20)
+    )
+    
+    return fig
+
+@traced()
+def create_history_chart(days, closes, symbol, language=DEFAULT_LANGUAGE, currency=BASE_CURRENCY):
+    """創建長期走勢圖（已降採樣、已換算為 currency 的點，以 WebGL 繪製）"""
+    if not len(closes):
+        return None
+    
+    t = get_texts(language)
+    
+    fig = go.Figure(data=[
+        go.Scattergl(
+            x=days,
+            y=closes,
+            mode='lines',
+            line=dict(color='#0ea5e9', width=2),
+            hovertemplate=f'<b>%{{x|%Y-%m-%d}}</b><br>{t["chart_price_axis"]}: {_hover_money("y", currency)}<extra></extra>'
+        )
+    ])
+    
+    fig.update_layout(
+        title=dict(
+            text=f'<b>{symbol} · {t["chart_history_title"]}</b>',
+            font=dict(
+                family='Outfit, Noto Sans JP, sans-serif', 
+                size=24, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            x=0.5,
+            y=0.95,
+            xanchor='center',
+            yanchor='top'
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(
+            family='Inter, Noto Sans JP, sans-serif', 
+            color='#e6edf3',
+            size=12
+        ),
+        xaxis=dict(
+            showgrid=False,
+            showline=True,
+            linecolor='rgba(255, 255, 255, 0.1)',
+            tickfont=dict(size=13, color='#c9d1d9'),
+            title=dict(
+                text=f'<b>{t["chart_date_axis"]}</b>',
+                font=dict(size=14, color='#c9d1d9')
+            )
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            showline=True,
+            linecolor='rgba(255, 255, 255, 0.1)',
+            tickfont=dict(size=13, color='#c9d1d9'),
+            title=dict(
+                text=f'<b>{_axis(t, "chart_price_axis", currency)}</b>',
+                font=dict(size=14, color='#c9d1d9')
+            )
+        ),
+        height=450,
+        margin=dict(l=80, r=80, t=100, b=80),
+        showlegend=False,
+        dragmode='select',
+        hovermode='x unified'
+    )
+    
+    return fig
+
+@traced()
+def create_nav_chart(days, navs, returns, drawdowns, language=DEFAULT_LANGUAGE, currency=BASE_CURRENCY):
+    """創建每日淨值（已換算為 currency）、累積報酬與回撤圖（三個面板共用日期軸）"""
+    if len(days) < 2:
+        return None
+    
+    t = get_texts(language)
+    
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=days,
+            y=navs,
+            yaxis='y',
+            mode='lines',
+            line=dict(color='#0ea5e9', width=2),
+            hovertemplate=f'{t["chart_nav_axis"]}: {_hover_money("y", currency, 0)}<extra></extra>'
+        ),
+        go.Scatter(
+            x=days,
+            y=returns * 100,
+            yaxis='y2',
+            mode='lines',
+            line=dict(color='#22c55e', width=2),
+            hovertemplate=f'{t["chart_return_axis"]}: %{{y:+.2f}}%<extra></extra>'
+        ),
+        go.Scatter(
+            x=days,
+            y=drawdowns * 100,
+            yaxis='y3',
+            mode='lines',
+            fill='tozeroy',
+            line=dict(color='#ef4444', width=1.5),
+            fillcolor='rgba(239, 68, 68, 0.25)',
+            hovertemplate=f'{t["chart_drawdown_axis"]}: %{{y:.2f}}%<extra></extra>'
+        )
+    ])
+    
+    # 以版面配置直接切出三個面板（比 make_subplots 與逐軸 update 快一個數量級）
+    def panel(title, domain):
+        return dict(
+            domain=domain,
+            showgrid=True,
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            showline=True,
+            linecolor='rgba(255, 255, 255, 0.1)',
+            tickfont=dict(size=12, color='#c9d1d9'),
+            title=dict(
+                text=f'<b>{title}</b>',
+                font=dict(size=13, color='#c9d1d9')
+            )
+        )
+    
+    fig.update_layout(
+        title=dict(
+            text=f'<b>{t["chart_nav_title"]}</b>',
+            font=dict(
+                family='Outfit, Noto Sans JP, sans-serif', 
+                size=24, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            x=0.5,
+            y=0.97,
+            xanchor='center',
+            yanchor='top'
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(
+            family='Inter, Noto Sans JP, sans-serif', 
+            color='#e6edf3',
+            size=12
+        ),
+        xaxis=dict(
+            anchor='y3',
+            showgrid=False,
+            showline=True,
+            linecolor='rgba(255, 255, 255, 0.1)',
+            tickfont=dict(size=12, color='#c9d1d9')
+        ),
+        yaxis=panel(_axis(t, 'chart_nav_axis', currency), [0.6, 1.0]),
+        yaxis2=panel(t['chart_return_axis'], [0.3, 0.56]),
+        yaxis3=panel(t['chart_drawdown_axis'], [0.0, 0.26]),
+        height=650,
+        margin=dict(l=80, r=80, t=100, b=60),
+        showlegend=False,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+@traced()
+def create_latency_chart(samples, label, language=DEFAULT_LANGUAGE):
+    """創建上游延遲分佈圖（samples 為秒，顯示為毫秒）"""
+    if not samples:
+        return None
+    
+    t = get_texts(language)
+    
+    fig = go.Figure(data=[
+        go.Histogram(
+            x=[sample * 1000 for sample in samples],
+            nbinsx=40,
+            marker_color='#0ea5e9',
+            marker_line_color='rgba(255,255,255,0.2)',
+            marker_line_width=1,
+            hovertemplate=f'{t["chart_latency_axis"]}: %{{x}}<br>{t["chart_count_axis"]}: %{{y}}<extra></extra>'
+        )
+    ])
+    
+    fig.update_layout(
+        title=dict(
+            text=f'<b>{t["chart_latency_title"]} · {label}</b>',
+            font=dict(
+                family='Outfit, Noto Sans JP, sans-serif', 
+                size=20, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            x=0.5,
+            xanchor='center'
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(
+            family='Inter, Noto Sans JP, sans-serif', 
+            color='#e6edf3',
+            size=12
+        ),
+        xaxis=dict(
+            showgrid=False,
+            showline=True,
+            linecolor='rgba(255, 255, 255, 0.1)',
+            tickfont=dict(size=12, color='#c9d1d9'),
+            title=dict(text=f'<b>{t["chart_latency_axis"]}</b>', font=dict(size=13, color='#c9d1d9'))
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='rgba(255, 255, 255, 0.1)',
+            tickfont=dict(size=12, color='#c9d1d9'),
+            title=dict(text=f'<b>{t["chart_count_axis"]}</b>', font=dict(size=13, color='#c9d1d9'))
+        ),
+        height=360,
+        margin=dict(l=60, r=40, t=70, b=60),
+        bargap=0.05,
+        showlegend=False
+    )
+    
+    return fig
+
+@traced()
+def create_correlation_heatmap(symbols, matrix, kind='correlation', language=DEFAULT_LANGUAGE):
+    """創建日報酬相關係數或共變異數（年化）熱圖"""
+    if len(symbols) < 2:
+        return None
+    
+    t = get_texts(language)
+    
+    if kind == 'correlation':
+        z, zmin, zmax, spec = matrix, -1.0, 1.0, '.2f'
+    else:
+        z = matrix * 252
+        bound = float(abs(z).max()) or 1.0
+        zmin, zmax, spec = -bound, bound, '.4f'
+    
+    fig = go.Figure(data=[
+        go.Heatmap(
+            z=z,
+            x=symbols,
+            y=symbols,
+            zmin=zmin,
+            zmax=zmax,
+            colorscale='RdBu_r',
+            text=[[f'{value:{spec}}' for value in row] for row in z],
+            texttemplate='%{text}',
+            textfont=dict(family='JetBrains Mono, monospace', size=12),
+            colorbar=dict(tickfont=dict(color='#c9d1d9')),
+            hovertemplate=f'<b>%{{y}} × %{{x}}</b><br>{t[kind]}: %{{z:{spec}}}<extra></extra>'
+        )
+    ])
+    
+    fig.update_layout(
+        title=dict(
+            text=f'<b>{t["chart_correlation_title"] if kind == "correlation" else t["chart_covariance_title"]}</b>',
+            font=dict(
+                family='Outfit, Noto Sans JP, sans-serif', 
+                size=24, 
+                color='#ffffff',
+                weight='bold'
+            ),
+            x=0.5,
+            y=0.95,
+            xanchor='center',
+            yanchor='top'
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(
+            family='Inter, Noto Sans JP, sans-serif', 
+            color='#e6edf3',
+            size=12
+        ),
+        xaxis=dict(
+            showgrid=False,
+            tickfont=dict(size=13, color='#c9d1d9', weight='bold')
+        ),
+        yaxis=dict(
+            showgrid=False,
+            autorange='reversed',
+            tickfont=dict(size=13, color='#c9d1d9', weight='bold')
+        ),
+        height=max(360, 60 * len(symbols) + 140),
+        margin=dict(l=80, r=40, t=100, b=60)
+    )
+    
+    return fig
@@ -0,0 +1,131 @@
+"""TENKI 報酬相關性
+
+一組標的（儀表板的市場標的或組合持倉）在 30 / 90 / 252 個交易日視窗內的日報酬共變異數與相關係數。
+視窗內的報酬以 (視窗 × 標的) 矩陣保存，同時保存各欄的和與交叉乘積和 XᵀX：
+第一次以一次矩陣乘法算出，之後每根新的日 K 棒只加入一列、移出最舊一列（O(標的²)），不重新計算整個視窗。
+結果依 (標的, 視窗, 資料版本) 快取。
+"""
+import threading
+from collections import OrderedDict
+from functools import reduce
+
+import numpy as np
+
+from cache import TTLCache
+from market import HISTORY_TTL, get_price_history
+from market_calendar import MarketHoursTTL
+
+# 視窗 → 報酬筆數（交易日）
+WINDOWS = {'30D': 30, '90D': 90, '1Y': 252}
+DEFAULT_WINDOW = '90D'
+# 計算相關係數至少需要的報酬筆數
+MIN_RETURNS = 3
+# 加入一列、移出一列的秩 2 更新係數
+_PUSH_SIGNS = np.array([[1.0], [-1.0]])
+
+def aligned_closes(histories):
+    """所有標的都有收盤價的交易日與對應的 (日 × 標的) 收盤價矩陣"""
+    days = reduce(np.intersect1d, [history_days for history_days, _ in histories])
+    closes = np.column_stack([history_closes[np.searchsorted(history_days, days)] for history_days, history_closes in histories])
+    return days, closes
+
+class RollingMoments:
+    """固定視窗內報酬的和與交叉乘積和（環狀緩衝區）"""
+
+    def __init__(self, last_day, returns):
+        self.last_day = last_day
+        self._returns = np.array(returns, dtype=np.float64)
+        self._head = 0
+        self._pushes = 0
+        self._recompute()
+
+    def __len__(self):
+        return len(self._returns)
+
+    def _recompute(self):
+        self._sum = self._returns.sum(axis=0)
+        self._cross = self._returns.T @ self._returns
+        self._pushes = 0
+
+    def push(self, day, row):
+        """加入一天的報酬並移出最舊的一天"""
+        pair = np.stack([row, self._returns[self._head]])
+        self._sum += pair[0] - pair[1]
+        # rowᵀrow − oldᵀold 以一次 (標的 × 2) @ (2 × 標的) 乘法完成
+        self._cross += pair.T @ (pair * _PUSH_SIGNS)
+        self._returns[self._head] = row
+        self._head = (self._head + 1) % len(self._returns)
+        self.last_day = day
+        self._pushes += 1
+        # 整個視窗都換過一輪時重算一次，累加的浮點誤差不會無限增長（攤提後仍是每天 O(標的²)）
+        if self._pushes >= len(self._returns):
+            self._recompute()
+
+    def covariance(self):
+        n = len(self._returns)
+        mean = self._sum / n
+        return (self._cross - n * np.outer(mean, mean)) / (n - 1)
+
+    def correlation(self):
+        cov = self.covariance()
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.outer(std, std)
+        np.fill_diagonal(corr, 1.0)
+        return np.clip(corr, -1.0, 1.0)
+
+# (標的, 視窗) → RollingMoments；只在本行程內，供下一根 K 棒增量更新
+MAX_MOMENTS = 64
+_moments = OrderedDict()
+_moments_lock = threading.Lock()
+
+def _update_moments(symbols, size, days, closes):
+    key = (symbols, size)
+    with _moments_lock:
+        moments = _moments.pop(key, None)
+    n = min(size, len(days) - 1)
+    start = None if moments is None else int(np.searchsorted(days, moments.last_day))
+    # 視窗大小相同、上次的最後一天仍在資料中且新交易日不超過一個視窗時，只加入之後的新交易日
+    if start is not None and len(moments) == n and start < len(days) and days[start] == moments.last_day and len(days) - 1 - start <= n:
+        for i in range(start + 1, len(days)):
+            moments.push(days[i], closes[i] / closes[i - 1] - 1)
+    else:
+        tail = closes[-(n + 1):]
+        moments = RollingMoments(days[-1], tail[1:] / tail[:-1] - 1)
+    with _moments_lock:
+        _moments[key] = moments
+        while len(_moments) > MAX_MOMENTS:
+            _moments.popitem(last=False)
+    return moments
+
+_matrices = TTLCache('correlation.matrices', ttl=MarketHoursTTL(HISTORY_TTL), maxsize=128)
+
+def get_matrices(symbols, window=DEFAULT_WINDOW):
+    """視窗內日報酬的 {'symbols', 'missing', 'returns', 'as_of', 'covariance', 'correlation'}
+
+    取不到長期走勢（上游失敗且沒有最後成功的結果）的標的不列入矩陣，列在 missing；
+    可用的標的少於 2 檔或共同交易日不足時回傳 None。
+    資料版本取各標的最後交易日中最早的一天，查詢只需讀取已快取的收盤價；對齊日期只在版本改變時進行。
+    """
+    histories = {symbol: get_price_history(symbol) for symbol in symbols}
+    missing = [symbol for symbol, history in histories.items() if not len(history.days)]
+    symbols = tuple(symbol for symbol in histories if symbol not in missing)
+    if len(symbols) < 2:
+        return None
+    histories = [histories[symbol][:2] for symbol in symbols]
+    version = str(min(history_days[-1] for history_days, _ in histories))
+
+    def compute():
+        days, closes = aligned_closes(histories)
+        if len(days) <= MIN_RETURNS:
+            return None
+        moments = _update_moments(symbols, WINDOWS[window], days, closes)
+        return {
+            'symbols': list(symbols),
+            'returns': len(moments),
+            'as_of': str(days[-1]),
+            'covariance': moments.covariance(),
+            'correlation': moments.correlation()
+        }
+    matrices = _matrices.get_or_compute((symbols, window, version), compute)
+    return None if matrices is None else dict(matrices, missing=missing)
@@ -0,0 +1,70 @@
+"""TENKI 時間序列降採樣
+
+長期走勢圖只把與圖表寬度相當的點數送到瀏覽器:
+    lttb      Largest-Triangle-Three-Buckets，保留視覺上最重要的轉折點
+    minmax    每個區間保留最低與最高點，確保尖峰不會被抹平
+兩者都回傳保留點的索引（遞增、包含首尾兩點）。
+"""
+import numpy as np
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[s]').astype(np.float64)
+    return x.astype(np.float64)
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets 降採樣到 threshold 個點"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    # 首尾之間分成 threshold - 2 個區間
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # 每個區間的平均點（最後一個區間之後是終點）
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    avg_x = np.append(sums_x / sizes, x[n - 1])
+    avg_y = np.append(sums_y / sizes, y[n - 1])
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i + 1] - y[a]))
+        a = lo + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+def minmax(y, buckets):
+    """每個區間保留最低與最高點，最多 2 * buckets + 2 個點"""
+    n = len(y)
+    if 2 * buckets + 2 >= n or buckets < 1:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    starts = np.arange(buckets) * n // buckets
+    bucket = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+    picked = [[0, n - 1]]
+    for extreme in (np.minimum, np.maximum):
+        hits = np.flatnonzero(y == extreme.reduceat(y, starts)[bucket])
+        # 同一區間有多個相同極值時只取第一個
+        first = np.ones(len(hits), dtype=bool)
+        first[1:] = bucket[hits[1:]] != bucket[hits[:-1]]
+        picked.append(hits[first])
+    return np.unique(np.concatenate(picked))
+
+METHODS = ('lttb', 'minmax')
+
+def downsample(x, y, points, method='lttb'):
+    """降採樣到約 points 個點，回傳 (x, y)"""
+    if method == 'lttb':
+        indices = lttb(x, y, points)
+    elif method == 'minmax':
+        indices = minmax(y, points // 2 - 1)
+    else:
+        raise ValueError(f'unknown downsample method: {method}')
+    return np.asarray(x)[indices], np.asarray(y)[indices]
@@ -0,0 +1,147 @@
+"""TENKI 曝險彙總
+
+持倉市值依資產類別、產業、地區（以及畫樹狀圖用的 資產類別 × 產業）彙總。
+每個維度有一張「標的代碼 → 群組」對照陣列（與 portfolio.SYMBOL_TABLE 的代碼對齊，由標的基本資料建立），
+彙總是一次 np.bincount 的向量化 group-by。
+每個持倉簿的彙總結果會快取；之後只把市值有變動的持倉（新增或價格變動）的差額加到它們所屬的群組，
+清空持倉或基本資料更新時才整份重算。
+"""
+import threading
+import weakref
+
+import numpy as np
+
+from portfolio import SYMBOL_TABLE
+from symbols import generation, get_metadata
+
+OTHER = 'other'
+
+def _asset_class(record):
+    return record.get('asset_class') or OTHER
+
+def _sector(record):
+    return record.get('sector') or OTHER
+
+def _region(record):
+    return record.get('region') or OTHER
+
+def _asset_class_sector(record):
+    return f'{_asset_class(record)}/{_sector(record)}'
+
+# 維度 → 由基本資料取得群組名稱（沒有基本資料的標的歸入 other）
+DIMENSIONS = {
+    'asset_class': _asset_class,
+    'sector': _sector,
+    'region': _region,
+    'asset_class_sector': _asset_class_sector
+}
+
+# ====== 標的 → 群組對照 ======
+class GroupTable:
+    """一個維度的群組名稱與「標的代碼 → 群組索引」對照陣列"""
+
+    def __init__(self, dimension):
+        self.key = DIMENSIONS[dimension]
+        self.labels = []
+        self._index = {}
+        self.codes = np.empty(0, dtype=np.intp)
+
+    def _group(self, label):
+        index = self._index.get(label)
+        if index is None:
+            index = self._index[label] = len(self.labels)
+            self.labels.append(label)
+        return index
+
+    def extend(self, size):
+        """對照陣列補到涵蓋前 size 個標的代碼（只查新標的的基本資料）"""
+        start = len(self.codes)
+        if size <= start:
+            return
+        added = [self._group(self.key(get_metadata(SYMBOL_TABLE[code]) or {})) for code in range(start, size)]
+        self.codes = np.concatenate([self.codes, np.array(added, dtype=np.intp)])
+
+_tables = {}
+_tables_generation = None
+_tables_lock = threading.Lock()
+
+def group_tables():
+    """目前基本資料版本的各維度對照（新標的只補上新的部分，基本資料更新時重建）"""
+    global _tables, _tables_generation
+    size = len(SYMBOL_TABLE)
+    with _tables_lock:
+        if _tables_generation != generation():
+            _tables = {dimension: GroupTable(dimension) for dimension in DIMENSIONS}
+            _tables_generation = generation()
+        for table in _tables.values():
+            table.extend(size)
+        return _tables, _tables_generation
+
+# ====== 每個持倉簿的彙總 ======
+class Exposure:
+    """一個持倉簿依各維度彙總的市值"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        # 上次同步時各持倉的標的代碼與市值
+        self._codes = np.empty(0, dtype=np.int32)
+        self._values = np.empty(0)
+        self._sums = {}
+
+    def _rebuild(self, book, tables, table_generation):
+        values = book.market_values()
+        codes = book.symbol_code
+        self._sums = {
+            dimension: np.bincount(table.codes[codes], weights=values, minlength=len(table.labels))
+            for dimension, table in tables.items()
+        }
+        self._codes = codes.copy()
+        self._values = values.copy()
+        self._generation = table_generation
+
+    def _apply(self, book, tables, values, rows):
+        """把 rows 持倉的市值差額加到它們所屬的群組"""
+        seen = len(self._values)
+        if len(book) > seen:
+            self._codes = np.concatenate([self._codes, book.symbol_code[seen:]])
+            self._values = np.concatenate([self._values, np.zeros(len(book) - seen)])
+        delta = values[rows] - self._values[rows]
+        codes = self._codes[rows]
+        for dimension, table in tables.items():
+            sums = self._sums[dimension]
+            if len(sums) < len(table.labels):
+                sums = self._sums[dimension] = np.concatenate([sums, np.zeros(len(table.labels) - len(sums))])
+            np.add.at(sums, table.codes[codes], delta)
+        self._values[rows] = values[rows]
+
+    def sync(self, book):
+        """與持倉簿目前的狀態同步，回傳 {維度: {群組: 市值}}（市值為 0 的群組不列入）"""
+        tables, table_generation = group_tables()
+        with self._lock:
+            seen = len(self._values)
+            # 基本資料更新、持倉減少或既有持倉換了標的（清空後重新加入）時整份重算
+            if table_generation != self._generation or len(book) < seen or np.any(book.symbol_code[:seen] != self._codes):
+                self._rebuild(book, tables, table_generation)
+            else:
+                # 新增的持倉與市值有變動的既有持倉
+                values = book.market_values()
+                rows = np.concatenate([np.flatnonzero(values[:seen] != self._values), np.arange(seen, len(book))])
+                if len(rows):
+                    self._apply(book, tables, values, rows)
+            return {
+                dimension: {table.labels[i]: float(value) for i, value in enumerate(self._sums[dimension]) if abs(value) > 1e-9}
+                for dimension, table in tables.items()
+            }
+
+# 持倉簿 → Exposure；持倉簿被釋放（使用者狀態移出記憶體）時一併釋放
+_exposures = weakref.WeakKeyDictionary()
+_exposures_lock = threading.Lock()
+
+def get_exposure(book):
+    """持倉簿依資產類別、產業、地區的市值彙總（快取並增量更新）"""
+    with _exposures_lock:
+        exposure = _exposures.get(book)
+        if exposure is None:
+            exposure = _exposures[book] = Exposure()
+    return exposure.sync(book)
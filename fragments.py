@@ -0,0 +1,225 @@
+"""TENKI 靜態 HTML 片段
+
+只依賴語言的 HTML（Landing Hero、功能卡片、頁首、訂閱資訊…）在每種語言第一次使用時
+產生一次，之後的 rerun 直接從快取取得字串。
+片段可以是單一字串，或供 st.columns 逐欄顯示的字串 tuple。
+"""
+import threading
+
+import streamlit as st
+
+from i18n import LANGUAGES, get_texts
+from styles import get_logo_base64
+
+FRAGMENTS = {}
+_cache = {}
+_lock = threading.Lock()
+
+def fragment_renderer(name):
+    """註冊片段產生函數（參數為語言目錄）"""
+    def decorator(render):
+        FRAGMENTS[name] = render
+        return render
+    return decorator
+
+def fragment(name, language):
+    """取得已預先產生的片段"""
+    key = (name, language)
+    html = _cache.get(key)
+    if html is None:
+        html = FRAGMENTS[name](get_texts(language))
+        with _lock:
+            _cache[key] = html
+    return html
+
+def show(name, language):
+    """以 st.markdown 顯示片段"""
+    st.markdown(fragment(name, language), unsafe_allow_html=True)
+
+def prerender(languages=LANGUAGES):
+    """一次產生所有語言的所有片段"""
+    for language in languages:
+        for name in FRAGMENTS:
+            fragment(name, language)
+
+# ====== 共用 ======
+@fragment_renderer('disclaimer')
+def _disclaimer(t):
+    return f'''
+    <div class="disclaimer">
+        ⚠️ {t['disclaimer']}
+    </div>
+    '''
+
+@fragment_renderer('nav_bar')
+def _nav_bar(t):
+    logo_b64 = get_logo_base64()
+    if logo_b64:
+        logo_html = f'<img src="{logo_b64}" alt="TENKI Logo" />'
+    else:
+        logo_html = 'T'
+    return f'''
+    <div class="nav-container">
+        <div class="nav-brand">
+            <div class="nav-logo">{logo_html}</div>
+            <span class="nav-title">TENKI</span>
+        </div>
+    </div>
+    '''
+
+def page_header(t, icon, title_key, intro_key, card_icon):
+    return f'''
+    <div class="modern-card">
+        <div class="card-header">
+            <h1 class="card-title">{icon} {t[title_key]}</h1>
+            <div class="card-icon">{card_icon}</div>
+        </div>
+        <p style="color: #c9d1d9; font-size: 1.1rem; line-height: 1.6;">{t[intro_key]}</p>
+    </div>
+    '''
+
+PAGE_HEADERS = {
+    'auto_navigation': ('🧭', 'auto_navigation', 'auto_navigation_intro', '🎯'),
+    'solution_generator': ('⚡', 'solution_generator', 'solution_generator_intro', '🎯'),
+    'virtual_portfolio': ('💼', 'virtual_portfolio', 'virtual_portfolio_intro', '📈'),
+    'subscription': ('💳', 'my_subscription', 'subscription_intro', '⭐'),
+    'settings': ('⚙️', 'settings', 'settings_intro', '🛠️')
+}
+
+for _page, _args in PAGE_HEADERS.items():
+    fragment_renderer(f'header_{_page}')(lambda t, _args=_args: page_header(t, *_args))
+
+def empty_state(icon, title, description):
+    return f'''
+    <div class="modern-card">
+        <div style="text-align: center; padding: 4rem 2rem;">
+            <div style="font-size: 5rem; margin-bottom: 2rem;">{icon}</div>
+            <h2 style="color: #ffffff; font-size: 2rem; font-weight: 700; margin-bottom: 1rem; font-family: 'Outfit', 'Noto Sans JP', sans-serif;">
+                {title}
+            </h2>
+            <p style="color: #c9d1d9; margin-bottom: 2.5rem; font-size: 1.1rem; line-height: 1.6;">
+                {description}
+            </p>
+        </div>
+    </div>
+    '''
+
+@fragment_renderer('no_solution')
+def _no_solution(t):
+    return empty_state('🎯', t['no_solution_title'], t['no_solution_desc'])
+
+@fragment_renderer('empty_portfolio')
+def _empty_portfolio(t):
+    return empty_state('💼', t['empty_portfolio_title'], t['empty_portfolio_desc'])
+
+# ====== Landing / 登入 ======
+@fragment_renderer('landing_hero')
+def _landing_hero(t):
+    logo_b64 = get_logo_base64()
+    if logo_b64:
+        hero_logo = f'<div class="hero-logo"><img src="{logo_b64}" alt="TENKI Logo" /></div>'
+    else:
+        hero_logo = '<div class="hero-logo">T</div>'
+    return f'''
+    <div class="hero-section">
+        <div class="hero-content">
+            <div class="hero-logo-container">
+                {hero_logo}
+                <h1 class="hero-title">TENKI</h1>
+                <p class="hero-subtitle">{t['app_subtitle']}</p>
+            </div>
+            <p class="hero-tagline">{t['slogan']}</p>
+            <div class="hero-description">
+                {t['hero_description']}
+            </div>
+        </div>
+    </div>
+    '''
+
+@fragment_renderer('landing_features_title')
+def _landing_features_title(t):
+    return f'<div class="modern-card"><div class="card-header"><h2 class="card-title">{t["features_title"]}</h2><div class="card-icon">⭐</div></div></div>'
+
+def feature_card(icon, title, description):
+    return f"""
+        <div class="feature-card">
+            <div class="feature-icon">{icon}</div>
+            <div class="feature-title">{title}</div>
+            <div class="feature-desc">{description}</div>
+        </div>
+        """
+
+@fragment_renderer('landing_features')
+def _landing_features(t):
+    # (左欄, 右欄)，每欄兩張卡片
+    return (
+        (feature_card('🤖', t['ai_insights'], t['ai_insights_desc']),
+         feature_card('🛡️', t['risk_control'], t['risk_control_desc'])),
+        (feature_card('💼', t['portfolio_management'], t['portfolio_management_desc']),
+         feature_card('📊', t['real_time_data'], t['real_time_data_desc']))
+    )
+
+@fragment_renderer('login_header')
+def _login_header(t):
+    logo_b64 = get_logo_base64()
+    if logo_b64:
+        logo_html = f'<img src="{logo_b64}" alt="TENKI Logo" style="width: 70px; height: 70px; border-radius: 50%; object-fit: cover;" />'
+    else:
+        logo_html = '<div class="nav-logo">T</div>'
+    return f'''
+        <div style="text-align: center; margin-bottom: 2.5rem;">
+            <div style="display: flex; justify-content: center; margin-bottom: 1.5rem;">
+                {logo_html}
+            </div>
+            <h1 style="font-family: 'Outfit', 'Noto Sans JP', sans-serif; font-size: 2.5rem; font-weight: 800; color: #ffffff; margin: 1rem 0 0.75rem; text-shadow: 0 2px 5px rgba(0,0,0,0.3);">TENKI</h1>
+            <p style="color: #c9d1d9; font-size: 1.1rem;">{t['tagline']}</p>
+        </div>
+        '''
+
+# ====== 訂閱 ======
+@fragment_renderer('subscription_status')
+def _subscription_status(t):
+    return f'<div class="status-indicator status-success">{t["subscription_active"]}</div>'
+
+def stat_item(label, value, description):
+    return f'''
+        <div class="stat-item">
+            <div class="stat-label">{label}</div>
+            <div class="stat-value">{value}</div>
+            <div class="stat-desc">{description}</div>
+        </div>
+        '''
+
+@fragment_renderer('subscription_stats')
+def _subscription_stats(t):
+    return (
+        stat_item(t['current_plan'], t['monthly_plan'], t['unlimited_access']),
+        stat_item(t['next_billing'], t['next_billing_date'], t['auto_renew']),
+        stat_item(t['payment_method'], '•••• •••• •••• 1234', t['card_type'])
+    )
+
+@fragment_renderer('subscription_features')
+def _subscription_features(t):
+    return tuple(f'''
+            <div style="display: flex; align-items: center; gap: 1rem; padding: 1rem; background: rgba(34, 197, 94, 0.1); border: 1px solid rgba(34, 197, 94, 0.3); border-radius: 12px; margin-bottom: 1rem;">
+                <div style="color: #22c55e; font-size: 1.25rem;">✅</div>
+                <div style="color: #e6edf3; font-size: 1rem;">{feature}</div>
+            </div>
+            ''' for feature in t['subscription_feature_list'])
+
+def usage_metric(label, value, description):
+    return f'''
+        <div class="metric-card">
+            <div class="metric-label">{label}</div>
+            <div class="metric-value">{value}</div>
+            <div style="color: #7d8590; font-size: 0.8rem; margin-top: 0.25rem;">{description}</div>
+        </div>
+        '''
+
+@fragment_renderer('subscription_usage')
+def _subscription_usage(t):
+    return (
+        usage_metric(t['solution_count'], 23, t['monthly_usage']),
+        usage_metric(t['portfolio_count'], 156, t['portfolios_created']),
+        usage_metric(t['usage_days'], 47, t['days_logged_in'])
+    )
@@ -0,0 +1,74 @@
+"""TENKI 顯示幣別
+
+價格一律以美元儲存與計算，只在顯示時換算：頁面每次 rerun 取得一次匯率（1 美元 = rate 顯示幣別），
+整欄數值以一次陣列乘法換算，不逐筆呼叫。
+匯率有自己的快取與存活時間（外匯幾乎全天交易，不跟隨股市交易時段），所有幣別在同一次批次請求中並行取得。
+取不到匯率時以美元顯示；失敗只快取 FX_RETRY_SECONDS 秒，上游恢復後很快改回顯示幣別。
+
+環境變數:
+    TENKI_FX_TTL=3600       匯率快取秒數
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import TTLCache
+from providers import get_provider
+
+FX_TTL = int(os.environ.get('TENKI_FX_TTL', '3600'))
+# 取不到匯率（None）時的快取秒數
+FX_RETRY_SECONDS = 60
+BASE_CURRENCY = 'USD'
+# 幣別 → 顯示符號與小數位數
+CURRENCIES = {
+    'USD': {'symbol': '$', 'decimals': 2},
+    'TWD': {'symbol': 'NT$', 'decimals': 0},
+    'JPY': {'symbol': '¥', 'decimals': 0}
+}
+# 語言 → 預設顯示幣別
+LANGUAGE_CURRENCIES = {'zh': 'TWD', 'en': 'USD', 'ja': 'JPY'}
+
+def _fetch_rate(currency, provider):
+    try:
+        rate = float(provider.fx_rate(currency))
+    except Exception:
+        return None
+    return rate if rate > 0 else None
+
+def rate_ttl(now, value=None):
+    """匯率的存活時間：失敗（None）也快取，避免上游故障時每次 rerun 都重新請求，但只快取 FX_RETRY_SECONDS 秒"""
+    return FX_RETRY_SECONDS if value is None else FX_TTL
+
+_rates = TTLCache('fx.rates', ttl=rate_ttl, maxsize=16)
+
+def get_rates(provider=None):
+    """所有顯示幣別的匯率 {幣別: 1 美元可換得的數量}（取不到的幣別不列入）"""
+    def fetch(missing):
+        source = provider or get_provider()
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            return dict(zip(missing, executor.map(lambda currency: _fetch_rate(currency, source), missing)))
+    currencies = [currency for currency in CURRENCIES if currency != BASE_CURRENCY]
+    rates = _rates.get_many_or_compute(currencies, fetch)
+    rates = {currency: rate for currency, rate in rates.items() if rate}
+    rates[BASE_CURRENCY] = 1.0
+    return rates
+
+def preferred_currency(selected, language):
+    """使用者選擇的顯示幣別（None 為依語言）"""
+    return selected or LANGUAGE_CURRENCIES.get(language, BASE_CURRENCY)
+
+def resolve_currency(selected, language, provider=None):
+    """實際顯示的幣別與匯率；取不到匯率時為 (USD, 1.0)"""
+    currency = preferred_currency(selected, language)
+    if currency == BASE_CURRENCY:
+        return BASE_CURRENCY, 1.0
+    rate = get_rates(provider).get(currency)
+    if rate is None:
+        return BASE_CURRENCY, 1.0
+    return currency, rate
+
+def money(value, currency, decimals=None, signed=False):
+    """金額文字（例: $1,234.56、+NT$39,500、¥94,000）；decimals 預設為幣別的小數位數"""
+    spec = CURRENCIES[currency]
+    decimals = spec['decimals'] if decimals is None else min(decimals, spec['decimals'])
+    sign = ('+' if value >= 0 else '-') if signed else ('-' if value < 0 else '')
+    return f"{sign}{spec['symbol']}{abs(value):,.{decimals}f}"
@@ -0,0 +1,764 @@
+"""TENKI 多語言文字
+
+所有介面文字都放在 TEXTS；啟動時編譯成每種語言一份唯讀目錄（CATALOG），
+缺少任何鍵都會在匯入時直接報錯，而不是在畫面上出現 KeyError。
+"""
+from types import MappingProxyType
+
+# ====== 多語言支援系統（增加日文） ======
+TEXTS = {
+    "zh": {
+        "app_name": "TENKI",
+        "app_subtitle": "転機",
+        "slogan": "Turning Insight into Opportunity",
+        "tagline": "將洞察力轉化為機會",
+        "login": "登入",
+        "register": "註冊", 
+        "get_started": "立即開始",
+        "email": "電子郵件",
+        "password": "密碼",
+        "google_login": "使用 Google 登入",
+        "apple_login": "使用 Apple 登入",
+        "dashboard": "儀表板",
+        "virtual_portfolio": "美股虛擬倉",
+        "my_subscription": "我的訂閱",
+        "settings": "設定",
+        "auto_navigation": "自動導航模式",
+        "solution_generator": "一鍵生成解決方案",
+        "market_overview": "市場概況",
+        "expert_insights": "專家洞察",
+        "recommended_targets": "建議標的",
+        "action_plan": "行動計劃",
+        "add_to_watchlist": "加入追蹤",
+        "logout": "登出",
+        "welcome": "歡迎回來",
+        "today_pnl": "今日損益",
+        "total_return": "總報酬",
+        "win_rate": "勝率",
+        "loading": "載入中...",
+        "generate_solution": "生成解決方案",
+        "risk_preference": "風險偏好",
+        "investment_goal": "投資目標",
+        "conservative": "保守型",
+        "moderate": "穩健型", 
+        "aggressive": "積極型",
+        "growth": "成長導向",
+        "income": "收益導向",
+        "balanced": "平衡配置",
+        "disclaimer": "免責聲明：本平台提供的資訊僅供參考，不構成任何投資建議。投資有風險，請謹慎決策。",
+        "features_title": "核心功能",
+        "ai_insights": "AI智能分析",
+        "ai_insights_desc": "運用人工智慧分析市場趨勢，提供個性化投資建議",
+        "portfolio_management": "投資組合管理",
+        "portfolio_management_desc": "專業的虛擬交易系統，零風險驗證投資策略",
+        "real_time_data": "即時市場數據",
+        "real_time_data_desc": "同步全球金融市場，掌握投資先機",
+        "risk_control": "智能風險控制",
+        "risk_control_desc": "多層次風險評估，保護您的投資安全",
+        "entry_point": "進場點位",
+        "exit_point": "出場點位",
+        "expected_return": "預期報酬",
+        "monthly_plan": "$22 美元/月",
+        "next_billing": "下次計費",
+        "payment_method": "付款方式",
+        "portfolio_value": "組合價值",
+        "risk_level": "風險等級",
+        "platform_usage": "平台使用",
+        "solution_count": "解決方案生成",
+        "portfolio_count": "投資組合追蹤",
+        "usage_days": "累計使用天數",
+        "hero_description": "專業投資決策支援平台 • 運用AI智能分析市場趨勢 • 在關鍵轉折點做出理想決策 • 實現資產穩健增值",
+        "fill_all_fields": "請填寫所有欄位",
+        "social_login": "或使用以下方式登入",
+        "back_home": "← 返回首頁",
+        "dashboard_intro": "準備好開始您今天的投資之旅了嗎？讓我們一起在市場的關鍵轉折點中，做出理想的投資決策。",
+        "today_suffix": "今日",
+        "total_suffix": "總計",
+        "improving": "↗ 持續提升",
+        "low_risk": "低風險",
+        "medium_risk": "中風險",
+        "high_risk": "高風險",
+        "volatility": "波動率",
+        "live_updates": "即時更新",
+        "stale_data": "離線資料",
+        "history_unavailable": "目前無法取得長期走勢資料",
+        "as_of": "資料時間",
+        "quick_actions": "快速操作",
+        "auto_navigation_intro": "根據您的投資偏好和目標，為您提供個性化的投資建議。我們的AI系統將分析您的風險承受能力和投資目標，生成最適合的投資組合配置。",
+        "solution_generated": "✅ 已生成個性化投資解決方案！",
+        "current_settings": "當前設定摘要",
+        "configured": "已配置",
+        "income_first": "收益優先",
+        "balanced_allocation": "平衡配置",
+        "growth_first": "成長優先",
+        "solution_generator_intro": "基於AI分析和專家洞察，為您生成個性化投資解決方案。我們的系統會根據當前市場環境、您的風險偏好和投資目標，提供詳細的投資建議和具體行動計劃。",
+        "market_opportunity": "市場機會",
+        "market_opportunity_value": "AI科技革命浪潮",
+        "moderate_risk": "中等風險",
+        "last_price": "現價",
+        "distance_to_level": "距點位",
+        "level_reached": "已達點位",
+        "screened_picks": "篩選器精選標的",
+        "momentum": "動能",
+        "dividend_yield": "殖利率",
+        "pe_ratio": "本益比",
+        "price_history": "長期價格走勢",
+        "history_symbol": "標的",
+        "history_period": "期間",
+        "history_zoom_hint": "在圖表上框選區域即可放大該區間",
+        "reset_zoom": "重設縮放",
+        "data_points": "資料點",
+        "suggested_horizon": "建議時程",
+        "suggested_horizon_value": "6-12個月",
+        "added_to_watchlist": "✅ 已加入追蹤清單！",
+        "add_to_portfolio": "加入虛擬組合",
+        "added_to_portfolio": "✅ 已加入虛擬投資組合！",
+        "no_solution_title": "尚無生成的投資解決方案",
+        "no_solution_desc": "請先前往自動導航模式設定您的投資偏好，<br/>我們將為您生成專業的投資建議",
+        "goto_auto_navigation": "前往自動導航設定",
+        "virtual_portfolio_intro": "無風險的虛擬交易環境，驗證您的投資策略。在這裡您可以模擬真實的投資操作，追蹤績效表現，並在實際投資前測試您的策略。",
+        "invested_cost": "投入成本",
+        "profitable": "獲利",
+        "position_count": "持倉數量",
+        "symbols_unit": "檔標的",
+        "holdings_detail": "持倉明細",
+        "shares_unit": "股",
+        "holding": "持有中",
+        "buy_price": "買入價",
+        "current_price": "現價",
+        "update_prices": "更新價格",
+        "prices_updated": "✅ 價格已更新！",
+        "generate_report": "生成報告",
+        "report_in_progress": "📄 績效報告功能開發中...",
+        "portfolio_compare": "組合比較",
+        "portfolio_name": "組合",
+        "select_portfolio": "檢視組合",
+        "default_portfolio": "我的組合",
+        "clear_portfolio": "清空組合",
+        "portfolio_cleared": "✅ 虛擬組合已清空！",
+        "empty_portfolio_title": "您的虛擬投資組合是空的",
+        "empty_portfolio_desc": "透過解決方案生成器建立您的第一個投資組合，<br/>開始無風險的投資策略驗證",
+        "goto_solution_generator": "前往解決方案生成器",
+        "subscription_intro": "管理您的訂閱方案和付款設定。享受專業級投資分析工具和個性化服務。",
+        "subscription_active": "訂閱有效",
+        "subscription_info": "訂閱資訊",
+        "current_plan": "當前方案",
+        "unlimited_access": "✅ 無限制使用所有功能",
+        "next_billing_date": "2025年11月22日",
+        "auto_renew": "自動續訂",
+        "card_type": "Visa 信用卡",
+        "subscription_features": "訂閱功能",
+        "subscription_feature_list": ("無限制解決方案生成", "專家投資組合追蹤", "即時市場數據推送", "個性化投資建議", "風險管理工具", "24/7 客戶支援"),
+        "usage_stats": "使用統計",
+        "monthly_usage": "本月使用次數",
+        "portfolios_created": "累計建立組合數",
+        "days_logged_in": "天（累計登入）",
+        "settings_intro": "個性化您的TENKI體驗設定，調整語言偏好、投資風格和通知設定。",
+        "display_currency": "顯示幣別",
+        "currency_follow_language": "依語言",
+        "fx_unavailable": "⚠ 無法取得匯率，以美元顯示",
+        "language_settings": "語言設定",
+        "investment_preferences": "投資偏好",
+        "save_settings": "儲存設定",
+        "settings_saved": "✅ 設定已儲存！",
+        "notification_settings": "通知設定",
+        "email_notifications": "電子郵件通知",
+        "push_notifications": "推播通知",
+        "sms_notifications": "簡訊通知",
+        "chart_market_title": "市場表現概況",
+        "chart_symbol_axis": "股票代碼",
+        "chart_change_axis": "變化率 (%)",
+        "chart_change_hover": "變化",
+        "chart_portfolio_title": "投資組合配置",
+        "chart_value_hover": "價值",
+        "chart_share_hover": "比例",
+        "chart_history_title": "長期走勢",
+        "chart_price_axis": "收盤價",
+        "chart_date_axis": "日期",
+        "chart_nav_title": "淨值與回撤",
+        "chart_correlation_title": "日報酬相關係數",
+        "chart_covariance_title": "日報酬共變異數（年化）",
+        "correlation": "相關係數",
+        "covariance": "共變異數",
+        "correlation_title": "報酬相關性",
+        "correlation_window": "期間",
+        "correlation_kind": "指標",
+        "correlation_caption": "個交易日的日報酬",
+        "correlation_unavailable": "可用的價格資料不足兩檔，無法計算相關性",
+        "correlation_missing": "無資料未列入",
+        "chart_exposure_treemap_title": "資產類別與產業曝險",
+        "exposure_by": "配置依據",
+        "exposure_symbol": "標的",
+        "exposure_asset_class": "資產類別",
+        "exposure_sector": "產業",
+        "exposure_region": "地區",
+        "exposure_other": "其他",
+        "region_north_america": "北美",
+        "region_europe": "歐洲",
+        "region_asia_pacific": "亞太",
+        "region_latin_america": "拉丁美洲",
+        "region_global": "全球",
+        "region_other": "其他",
+        "rebalance_title": "再平衡至目標配置",
+        "rebalance_note": "只調整權重偏離目標超過門檻帶的標的，股數取整到整手",
+        "rebalance_band": "門檻帶",
+        "rebalance_cash": "可投入現金",
+        "rebalance_within_band": "✅ 所有標的都在目標配置的範圍內，不需要交易",
+        "rebalance_action": "動作",
+        "rebalance_buy": "買進",
+        "rebalance_sell": "賣出",
+        "rebalance_shares": "股數",
+        "rebalance_value": "金額",
+        "admin_rebalance": "批次再平衡",
+        "admin_rebalance_run": "為所有組合計算再平衡",
+        "admin_rebalance_portfolios": "組合數",
+        "admin_rebalance_trades": "交易筆數",
+        "admin_rebalance_seconds": "耗時",
+        "admin_rebalance_throughput": "組合/秒",
+        "chart_nav_axis": "淨值",
+        "chart_return_axis": "累積報酬 (%)",
+        "chart_drawdown_axis": "回撤 (%)",
+        "watchlist": "追蹤清單",
+        "alert_above": "突破",
+        "alert_below": "跌破",
+        "alert_triggered": "已觸發",
+        "alerts_created": "個價格提醒已設定",
+        "alert_limit_reached": "已達價格提醒數量上限",
+        "remove_from_watchlist": "移除",
+        "price_alerts": "價格提醒",
+        "notifications_saved": "✅ 通知設定已儲存",
+        "admin_title": "資料層狀態",
+        "admin_upstream": "上游延遲與錯誤",
+        "admin_caches": "快取命中率",
+        "admin_sessions": "使用者狀態記憶體",
+        "admin_active_sessions": "在線使用者",
+        "admin_resident_sessions": "記憶體中的狀態",
+        "admin_quote_snapshot_age": "報價快照經過時間",
+        "admin_solution_snapshot_age": "解決方案快照經過時間",
+        "admin_latency_series": "延遲分佈",
+        "admin_raw_metrics": "所有指標（Prometheus）",
+        "admin_refresh": "重新整理",
+        "admin_no_data": "尚無資料",
+        "admin_token": "管理權杖",
+        "admin_unlock": "解鎖",
+        "admin_token_invalid": "權杖不正確",
+        "chart_latency_title": "上游延遲",
+        "chart_latency_axis": "延遲 (ms)",
+        "chart_count_axis": "次數",
+        "expense_ratio": "費用率",
+        "asset_equity": "個股",
+        "asset_equity_etf": "股票ETF",
+        "asset_bond_etf": "債券ETF",
+        "asset_real_estate_etf": "不動產ETF",
+        "asset_commodity_etf": "商品ETF"
+    },
+    "en": {
+        "app_name": "TENKI",
+        "app_subtitle": "転機",
+        "slogan": "Turning Insight into Opportunity",
+        "tagline": "Transform Market Intelligence into Investment Success",
+        "login": "Login",
+        "register": "Register",
+        "get_started": "Get Started",
+        "email": "Email",
+        "password": "Password",
+        "google_login": "Login with Google",
+        "apple_login": "Login with Apple",
+        "dashboard": "Dashboard",
+        "virtual_portfolio": "Virtual US Portfolio",
+        "my_subscription": "My Subscription",
+        "settings": "Settings",
+        "auto_navigation": "Auto-Navigation Mode",
+        "solution_generator": "Solution Generator",
+        "market_overview": "Market Overview",
+        "expert_insights": "Expert Insights",
+        "recommended_targets": "Recommended Targets",
+        "action_plan": "Action Plan",
+        "add_to_watchlist": "Add to Watchlist",
+        "logout": "Logout",
+        "welcome": "Welcome Back",
+        "today_pnl": "Today's P&L",
+        "total_return": "Total Return",
+        "win_rate": "Win Rate",
+        "loading": "Loading...",
+        "generate_solution": "Generate Solution",
+        "risk_preference": "Risk Preference",
+        "investment_goal": "Investment Goal",
+        "conservative": "Conservative",
+        "moderate": "Moderate",
+        "aggressive": "Aggressive",
+        "growth": "Growth-Oriented",
+        "income": "Income-Oriented",
+        "balanced": "Balanced",
+        "disclaimer": "Disclaimer: Information provided is for reference only, not investment advice.",
+        "features_title": "Core Features",
+        "ai_insights": "AI-Powered Insights",
+        "ai_insights_desc": "Leverage artificial intelligence to analyze market trends",
+        "portfolio_management": "Portfolio Management",
+        "portfolio_management_desc": "Professional virtual trading system",
+        "real_time_data": "Real-time Market Data",
+        "real_time_data_desc": "Synchronized global financial markets data",
+        "risk_control": "Intelligent Risk Control", 
+        "risk_control_desc": "Multi-layered risk assessment",
+        "entry_point": "Entry Point",
+        "exit_point": "Exit Point",
+        "expected_return": "Expected Return",
+        "monthly_plan": "$22 USD/month",
+        "next_billing": "Next Billing",
+        "payment_method": "Payment Method",
+        "portfolio_value": "Portfolio Value",
+        "risk_level": "Risk Level",
+        "platform_usage": "Platform Usage",
+        "solution_count": "Solutions Generated",
+        "portfolio_count": "Portfolios Tracked",
+        "usage_days": "Days Used",
+        "hero_description": "Professional investment decision platform • AI-driven market trend analysis • Make the right call at key turning points • Grow your assets steadily",
+        "fill_all_fields": "Please fill in all fields",
+        "social_login": "Or sign in with",
+        "back_home": "← Back to Home",
+        "dashboard_intro": "Ready to start today's investing journey? Let's make the right decisions together at the market's key turning points.",
+        "today_suffix": "today",
+        "total_suffix": "total",
+        "improving": "↗ Improving",
+        "low_risk": "Low Risk",
+        "medium_risk": "Medium Risk",
+        "high_risk": "High Risk",
+        "volatility": "Volatility",
+        "live_updates": "Live",
+        "stale_data": "Offline data",
+        "history_unavailable": "Long-term price history is unavailable right now",
+        "as_of": "as of",
+        "quick_actions": "Quick Actions",
+        "auto_navigation_intro": "Personalized investment advice based on your preferences and goals. Our AI analyzes your risk tolerance and objectives to build the portfolio allocation that suits you best.",
+        "solution_generated": "✅ Your personalized solution is ready!",
+        "current_settings": "Current Settings",
+        "configured": "Configured",
+        "income_first": "Income First",
+        "balanced_allocation": "Balanced Allocation",
+        "growth_first": "Growth First",
+        "solution_generator_intro": "Personalized investment solutions built from AI analysis and expert insight. Based on current market conditions, your risk preference and goals, we provide detailed recommendations and a concrete action plan.",
+        "market_opportunity": "Market Opportunity",
+        "market_opportunity_value": "AI technology wave",
+        "moderate_risk": "Moderate Risk",
+        "last_price": "Last",
+        "distance_to_level": "To level",
+        "level_reached": "Level reached",
+        "screened_picks": "Screener Picks",
+        "momentum": "Momentum",
+        "dividend_yield": "Dividend Yield",
+        "pe_ratio": "P/E",
+        "price_history": "Long-term Price History",
+        "history_symbol": "Symbol",
+        "history_period": "Period",
+        "history_zoom_hint": "Box-select a range on the chart to zoom in",
+        "reset_zoom": "Reset zoom",
+        "data_points": "points",
+        "suggested_horizon": "Suggested Horizon",
+        "suggested_horizon_value": "6-12 months",
+        "added_to_watchlist": "✅ Added to watchlist!",
+        "add_to_portfolio": "Add to Portfolio",
+        "added_to_portfolio": "✅ Added to your virtual portfolio!",
+        "no_solution_title": "No investment solution yet",
+        "no_solution_desc": "Set your investment preferences in Auto-Navigation first,<br/>and we will generate professional recommendations for you",
+        "goto_auto_navigation": "Go to Auto-Navigation",
+        "virtual_portfolio_intro": "A risk-free virtual trading environment to validate your strategy. Simulate real trades, track performance and test your ideas before investing real money.",
+        "invested_cost": "Cost basis",
+        "profitable": "profitable",
+        "position_count": "Positions",
+        "symbols_unit": "symbols",
+        "holdings_detail": "Holdings",
+        "shares_unit": "shares",
+        "holding": "Holding",
+        "buy_price": "Entry Price",
+        "current_price": "Current Price",
+        "update_prices": "Update Prices",
+        "prices_updated": "✅ Prices updated!",
+        "generate_report": "Generate Report",
+        "report_in_progress": "📄 Performance reports are coming soon...",
+        "portfolio_compare": "Portfolio Comparison",
+        "portfolio_name": "Portfolio",
+        "select_portfolio": "View portfolio",
+        "default_portfolio": "My Portfolio",
+        "clear_portfolio": "Clear Portfolio",
+        "portfolio_cleared": "✅ Virtual portfolio cleared!",
+        "empty_portfolio_title": "Your virtual portfolio is empty",
+        "empty_portfolio_desc": "Build your first portfolio with the Solution Generator<br/>and start validating strategies risk-free",
+        "goto_solution_generator": "Go to Solution Generator",
+        "subscription_intro": "Manage your plan and payment settings. Enjoy professional-grade analysis tools and personalized service.",
+        "subscription_active": "Active",
+        "subscription_info": "Subscription Details",
+        "current_plan": "Current Plan",
+        "unlimited_access": "✅ Unlimited access to every feature",
+        "next_billing_date": "Nov 22, 2025",
+        "auto_renew": "Auto-renews",
+        "card_type": "Visa credit card",
+        "subscription_features": "Plan Features",
+        "subscription_feature_list": ("Unlimited solution generation", "Expert portfolio tracking", "Real-time market data", "Personalized recommendations", "Risk management tools", "24/7 customer support"),
+        "usage_stats": "Usage",
+        "monthly_usage": "Uses this month",
+        "portfolios_created": "Portfolios created",
+        "days_logged_in": "days (logged in)",
+        "settings_intro": "Personalize your TENKI experience: language, investment style and notifications.",
+        "display_currency": "Display currency",
+        "currency_follow_language": "Follow language",
+        "fx_unavailable": "⚠ Exchange rate unavailable, showing USD",
+        "language_settings": "Language",
+        "investment_preferences": "Investment Preferences",
+        "save_settings": "Save Settings",
+        "settings_saved": "✅ Settings saved!",
+        "notification_settings": "Notifications",
+        "email_notifications": "Email notifications",
+        "push_notifications": "Push notifications",
+        "sms_notifications": "SMS notifications",
+        "chart_market_title": "Market Performance",
+        "chart_symbol_axis": "Symbol",
+        "chart_change_axis": "Change (%)",
+        "chart_change_hover": "Change",
+        "chart_portfolio_title": "Portfolio Allocation",
+        "chart_value_hover": "Value",
+        "chart_share_hover": "Share",
+        "chart_history_title": "Price History",
+        "chart_price_axis": "Close",
+        "chart_date_axis": "Date",
+        "chart_nav_title": "NAV & Drawdown",
+        "chart_correlation_title": "Daily Return Correlation",
+        "chart_covariance_title": "Daily Return Covariance (annualized)",
+        "correlation": "Correlation",
+        "covariance": "Covariance",
+        "correlation_title": "Return Correlation",
+        "correlation_window": "Window",
+        "correlation_kind": "Measure",
+        "correlation_caption": "trading days of daily returns",
+        "correlation_unavailable": "Fewer than two symbols have price data; correlation is unavailable",
+        "correlation_missing": "Left out (no data)",
+        "chart_exposure_treemap_title": "Asset Class & Sector Exposure",
+        "exposure_by": "Allocation by",
+        "exposure_symbol": "Symbol",
+        "exposure_asset_class": "Asset class",
+        "exposure_sector": "Sector",
+        "exposure_region": "Region",
+        "exposure_other": "Other",
+        "region_north_america": "North America",
+        "region_europe": "Europe",
+        "region_asia_pacific": "Asia Pacific",
+        "region_latin_america": "Latin America",
+        "region_global": "Global",
+        "region_other": "Other",
+        "rebalance_title": "Rebalance to Target",
+        "rebalance_note": "Only holdings whose weight is outside the target band are traded; shares are rounded to whole lots",
+        "rebalance_band": "Band",
+        "rebalance_cash": "Cash to invest",
+        "rebalance_within_band": "✅ All holdings are within their target bands; no trades needed",
+        "rebalance_action": "Action",
+        "rebalance_buy": "Buy",
+        "rebalance_sell": "Sell",
+        "rebalance_shares": "Shares",
+        "rebalance_value": "Amount",
+        "admin_rebalance": "Batch rebalancing",
+        "admin_rebalance_run": "Rebalance all portfolios",
+        "admin_rebalance_portfolios": "Portfolios",
+        "admin_rebalance_trades": "Trades",
+        "admin_rebalance_seconds": "Elapsed",
+        "admin_rebalance_throughput": "Portfolios/s",
+        "chart_nav_axis": "NAV",
+        "chart_return_axis": "Cumulative return (%)",
+        "chart_drawdown_axis": "Drawdown (%)",
+        "watchlist": "Watchlist",
+        "alert_above": "Above",
+        "alert_below": "Below",
+        "alert_triggered": "Triggered",
+        "alerts_created": "price alerts set",
+        "alert_limit_reached": "Price alert limit reached",
+        "remove_from_watchlist": "Remove",
+        "price_alerts": "Price alerts",
+        "notifications_saved": "✅ Notification settings saved",
+        "admin_title": "Data layer internals",
+        "admin_upstream": "Upstream latency & errors",
+        "admin_caches": "Cache hit ratio",
+        "admin_sessions": "User state memory",
+        "admin_active_sessions": "Active users",
+        "admin_resident_sessions": "Resident states",
+        "admin_quote_snapshot_age": "Quote snapshot age",
+        "admin_solution_snapshot_age": "Solution snapshot age",
+        "admin_latency_series": "Latency distribution",
+        "admin_raw_metrics": "All metrics (Prometheus)",
+        "admin_refresh": "Refresh",
+        "admin_no_data": "No data yet",
+        "admin_token": "Admin token",
+        "admin_unlock": "Unlock",
+        "admin_token_invalid": "Invalid token",
+        "chart_latency_title": "Upstream latency",
+        "chart_latency_axis": "Latency (ms)",
+        "chart_count_axis": "Count",
+        "expense_ratio": "Expense Ratio",
+        "asset_equity": "Stock",
+        "asset_equity_etf": "Equity ETF",
+        "asset_bond_etf": "Bond ETF",
+        "asset_real_estate_etf": "Real Estate ETF",
+        "asset_commodity_etf": "Commodity ETF"
+    },
+    "ja": {
+        "app_name": "TENKI",
+        "app_subtitle": "転機",
+        "slogan": "Turning Insight into Opportunity",
+        "tagline": "洞察力を機会に変える",
+        "login": "ログイン",
+        "register": "登録",
+        "get_started": "始める",
+        "email": "メール",
+        "password": "パスワード",
+        "google_login": "Googleでログイン",
+        "apple_login": "Appleでログイン",
+        "dashboard": "ダッシュボード",
+        "virtual_portfolio": "バーチャルポートフォリオ",
+        "my_subscription": "サブスクリプション",
+        "settings": "設定",
+        "auto_navigation": "自動ナビゲーション",
+        "solution_generator": "ソリューション生成",
+        "market_overview": "市場概況",
+        "expert_insights": "専門家の洞察",
+        "recommended_targets": "推奨銘柄",
+        "action_plan": "アクションプラン",
+        "add_to_watchlist": "ウォッチリストに追加",
+        "logout": "ログアウト",
+        "welcome": "おかえりなさい",
+        "today_pnl": "本日の損益",
+        "total_return": "総リターン",
+        "win_rate": "勝率",
+        "loading": "読み込み中...",
+        "generate_solution": "ソリューション生成",
+        "risk_preference": "リスク許容度",
+        "investment_goal": "投資目標",
+        "conservative": "保守的",
+        "moderate": "中程度",
+        "aggressive": "積極的",
+        "growth": "成長重視",
+        "income": "収益重視",
+        "balanced": "バランス",
+        "disclaimer": "免責事項：本プラットフォームの情報は参考のみであり、投資アドバイスではありません。投資にはリスクが伴います。",
+        "features_title": "主要機能",
+        "ai_insights": "AI分析",
+        "ai_insights_desc": "人工知能を活用した市場トレンド分析",
+        "portfolio_management": "ポートフォリオ管理",
+        "portfolio_management_desc": "プロフェッショナルな仮想取引システム",
+        "real_time_data": "リアルタイムデータ",
+        "real_time_data_desc": "グローバル金融市場データの同期",
+        "risk_control": "インテリジェントリスク管理",
+        "risk_control_desc": "多層リスク評価システム",
+        "entry_point": "エントリーポイント",
+        "exit_point": "エグジットポイント",
+        "expected_return": "期待リターン",
+        "monthly_plan": "月額 $22",
+        "next_billing": "次回請求",
+        "payment_method": "支払い方法",
+        "portfolio_value": "ポートフォリオ価値",
+        "risk_level": "リスクレベル",
+        "platform_usage": "プラットフォーム利用",
+        "solution_count": "生成ソリューション数",
+        "portfolio_count": "追跡ポートフォリオ数",
+        "usage_days": "利用日数",
+        "hero_description": "プロフェッショナル投資意思決定プラットフォーム • AIによる市場トレンド分析 • 重要な転換点で理想的な判断を • 資産の着実な成長を実現",
+        "fill_all_fields": "すべての項目を入力してください",
+        "social_login": "または以下の方法でログイン",
+        "back_home": "← ホームに戻る",
+        "dashboard_intro": "今日の投資を始める準備はできましたか？市場の重要な転換点で、一緒に理想的な投資判断を行いましょう。",
+        "today_suffix": "本日",
+        "total_suffix": "合計",
+        "improving": "↗ 上昇中",
+        "low_risk": "低リスク",
+        "medium_risk": "中リスク",
+        "high_risk": "高リスク",
+        "volatility": "ボラティリティ",
+        "live_updates": "リアルタイム更新",
+        "stale_data": "オフラインデータ",
+        "history_unavailable": "現在、長期価格推移を取得できません",
+        "as_of": "取得時刻",
+        "quick_actions": "クイック操作",
+        "auto_navigation_intro": "あなたの投資嗜好と目標に基づき、パーソナライズされた投資提案を行います。AIがリスク許容度と投資目標を分析し、最適なポートフォリオ配分を生成します。",
+        "solution_generated": "✅ パーソナライズされたソリューションを生成しました！",
+        "current_settings": "現在の設定",
+        "configured": "設定済み",
+        "income_first": "収益優先",
+        "balanced_allocation": "バランス配分",
+        "growth_first": "成長優先",
+        "solution_generator_intro": "AI分析と専門家の洞察に基づき、パーソナライズされた投資ソリューションを生成します。現在の市場環境、リスク許容度、投資目標に応じて、詳細な提案と具体的なアクションプランを提供します。",
+        "market_opportunity": "市場機会",
+        "market_opportunity_value": "AI技術革命の波",
+        "moderate_risk": "中程度のリスク",
+        "last_price": "現在値",
+        "distance_to_level": "目標まで",
+        "level_reached": "到達済み",
+        "screened_picks": "スクリーナー厳選銘柄",
+        "momentum": "モメンタム",
+        "dividend_yield": "配当利回り",
+        "pe_ratio": "PER",
+        "price_history": "長期価格推移",
+        "history_symbol": "銘柄",
+        "history_period": "期間",
+        "history_zoom_hint": "チャート上で範囲を選択すると拡大します",
+        "reset_zoom": "ズームをリセット",
+        "data_points": "データ点",
+        "suggested_horizon": "推奨期間",
+        "suggested_horizon_value": "6〜12ヶ月",
+        "added_to_watchlist": "✅ ウォッチリストに追加しました！",
+        "add_to_portfolio": "ポートフォリオに追加",
+        "added_to_portfolio": "✅ バーチャルポートフォリオに追加しました！",
+        "no_solution_title": "まだソリューションがありません",
+        "no_solution_desc": "まず自動ナビゲーションで投資嗜好を設定してください。<br/>プロフェッショナルな投資提案を生成します",
+        "goto_auto_navigation": "自動ナビゲーションへ",
+        "virtual_portfolio_intro": "リスクのない仮想取引環境で投資戦略を検証できます。実際の取引をシミュレーションし、パフォーマンスを追跡して、本番前に戦略をテストしましょう。",
+        "invested_cost": "投資元本",
+        "profitable": "利益",
+        "position_count": "保有数",
+        "symbols_unit": "銘柄",
+        "holdings_detail": "保有明細",
+        "shares_unit": "株",
+        "holding": "保有中",
+        "buy_price": "取得価格",
+        "current_price": "現在値",
+        "update_prices": "価格を更新",
+        "prices_updated": "✅ 価格を更新しました！",
+        "generate_report": "レポート生成",
+        "report_in_progress": "📄 パフォーマンスレポートは開発中です...",
+        "portfolio_compare": "ポートフォリオ比較",
+        "portfolio_name": "ポートフォリオ",
+        "select_portfolio": "表示するポートフォリオ",
+        "default_portfolio": "マイポートフォリオ",
+        "clear_portfolio": "ポートフォリオをクリア",
+        "portfolio_cleared": "✅ バーチャルポートフォリオをクリアしました！",
+        "empty_portfolio_title": "バーチャルポートフォリオは空です",
+        "empty_portfolio_desc": "ソリューション生成で最初のポートフォリオを作成し、<br/>リスクのない戦略検証を始めましょう",
+        "goto_solution_generator": "ソリューション生成へ",
+        "subscription_intro": "プランとお支払い設定を管理します。プロ仕様の分析ツールとパーソナライズされたサービスをご利用ください。",
+        "subscription_active": "有効",
+        "subscription_info": "サブスクリプション情報",
+        "current_plan": "現在のプラン",
+        "unlimited_access": "✅ すべての機能が無制限",
+        "next_billing_date": "2025年11月22日",
+        "auto_renew": "自動更新",
+        "card_type": "Visaクレジットカード",
+        "subscription_features": "プランの機能",
+        "subscription_feature_list": ("ソリューション無制限生成", "専門家ポートフォリオ追跡", "リアルタイム市場データ", "パーソナライズされた提案", "リスク管理ツール", "24時間年中無休サポート"),
+        "usage_stats": "利用状況",
+        "monthly_usage": "今月の利用回数",
+        "portfolios_created": "作成したポートフォリオ数",
+        "days_logged_in": "日（累計ログイン）",
+        "settings_intro": "言語、投資スタイル、通知設定を調整して、TENKIをあなた好みにカスタマイズできます。",
+        "display_currency": "表示通貨",
+        "currency_follow_language": "言語に合わせる",
+        "fx_unavailable": "⚠ 為替レートを取得できないため、米ドルで表示しています",
+        "language_settings": "言語設定",
+        "investment_preferences": "投資設定",
+        "save_settings": "設定を保存",
+        "settings_saved": "✅ 設定を保存しました！",
+        "notification_settings": "通知設定",
+        "email_notifications": "メール通知",
+        "push_notifications": "プッシュ通知",
+        "sms_notifications": "SMS通知",
+        "chart_market_title": "市場パフォーマンス",
+        "chart_symbol_axis": "銘柄コード",
+        "chart_change_axis": "変化率 (%)",
+        "chart_change_hover": "変化",
+        "chart_portfolio_title": "ポートフォリオ配分",
+        "chart_value_hover": "評価額",
+        "chart_share_hover": "比率",
+        "chart_history_title": "長期チャート",
+        "chart_price_axis": "終値",
+        "chart_date_axis": "日付",
+        "chart_nav_title": "純資産とドローダウン",
+        "chart_correlation_title": "日次リターンの相関係数",
+        "chart_covariance_title": "日次リターンの共分散（年率）",
+        "correlation": "相関係数",
+        "covariance": "共分散",
+        "correlation_title": "リターン相関",
+        "correlation_window": "期間",
+        "correlation_kind": "指標",
+        "correlation_caption": "営業日分の日次リターン",
+        "correlation_unavailable": "価格データのある銘柄が2つ未満のため、相関を計算できません",
+        "correlation_missing": "データなしのため除外",
+        "chart_exposure_treemap_title": "資産クラス・セクター別エクスポージャー",
+        "exposure_by": "配分の基準",
+        "exposure_symbol": "銘柄",
+        "exposure_asset_class": "資産クラス",
+        "exposure_sector": "セクター",
+        "exposure_region": "地域",
+        "exposure_other": "その他",
+        "region_north_america": "北米",
+        "region_europe": "欧州",
+        "region_asia_pacific": "アジア太平洋",
+        "region_latin_america": "中南米",
+        "region_global": "グローバル",
+        "region_other": "その他",
+        "rebalance_title": "目標配分へのリバランス",
+        "rebalance_note": "ウェイトが目標のバンドを外れた銘柄のみ売買し、株数は単元に丸めます",
+        "rebalance_band": "バンド",
+        "rebalance_cash": "投資可能な現金",
+        "rebalance_within_band": "✅ すべての銘柄が目標配分の範囲内です。売買は不要です",
+        "rebalance_action": "売買",
+        "rebalance_buy": "買い",
+        "rebalance_sell": "売り",
+        "rebalance_shares": "株数",
+        "rebalance_value": "金額",
+        "admin_rebalance": "一括リバランス",
+        "admin_rebalance_run": "全ポートフォリオをリバランス",
+        "admin_rebalance_portfolios": "ポートフォリオ数",
+        "admin_rebalance_trades": "取引数",
+        "admin_rebalance_seconds": "所要時間",
+        "admin_rebalance_throughput": "ポートフォリオ/秒",
+        "chart_nav_axis": "純資産",
+        "chart_return_axis": "累積リターン (%)",
+        "chart_drawdown_axis": "ドローダウン (%)",
+        "watchlist": "ウォッチリスト",
+        "alert_above": "上抜け",
+        "alert_below": "下抜け",
+        "alert_triggered": "発動済み",
+        "alerts_created": "件の価格アラートを設定しました",
+        "alert_limit_reached": "価格アラートの上限に達しました",
+        "remove_from_watchlist": "削除",
+        "price_alerts": "価格アラート",
+        "notifications_saved": "✅ 通知設定を保存しました",
+        "admin_title": "データ層の状態",
+        "admin_upstream": "上流のレイテンシとエラー",
+        "admin_caches": "キャッシュヒット率",
+        "admin_sessions": "ユーザー状態のメモリ",
+        "admin_active_sessions": "アクティブユーザー",
+        "admin_resident_sessions": "メモリ上の状態",
+        "admin_quote_snapshot_age": "相場スナップショットの経過時間",
+        "admin_solution_snapshot_age": "ソリューションスナップショットの経過時間",
+        "admin_latency_series": "レイテンシ分布",
+        "admin_raw_metrics": "全メトリクス（Prometheus）",
+        "admin_refresh": "更新",
+        "admin_no_data": "データがありません",
+        "admin_token": "管理トークン",
+        "admin_unlock": "ロック解除",
+        "admin_token_invalid": "トークンが正しくありません",
+        "chart_latency_title": "上流レイテンシ",
+        "chart_latency_axis": "レイテンシ (ms)",
+        "chart_count_axis": "回数",
+        "expense_ratio": "経費率",
+        "asset_equity": "個別株",
+        "asset_equity_etf": "株式ETF",
+        "asset_bond_etf": "債券ETF",
+        "asset_real_estate_etf": "不動産ETF",
+        "asset_commodity_etf": "コモディティETF"
+    }
+}
+
+LANGUAGES = tuple(TEXTS)
+DEFAULT_LANGUAGE = 'zh'
+
+def compile_catalog(texts):
+    """檢查各語言的鍵一致，並編譯為唯讀目錄"""
+    reference = set(texts[DEFAULT_LANGUAGE])
+    for language, entries in texts.items():
+        missing = reference - set(entries)
+        extra = set(entries) - reference
+        if missing or extra:
+            raise ValueError(f'catalog mismatch for {language!r}: missing={sorted(missing)} extra={sorted(extra)}')
+    return {language: MappingProxyType(dict(entries)) for language, entries in texts.items()}
+
+CATALOG = compile_catalog(TEXTS)
+
+def get_texts(language):
+    """取得語言目錄（未知語言使用預設語言）"""
+    return CATALOG.get(language, CATALOG[DEFAULT_LANGUAGE])
@@ -0,0 +1,275 @@
+"""TENKI 技術指標
+
+每個指標都有兩種模式:
+    批次  sma / ema / rsi / macd / bollinger / atr 對 標的 × 時間 矩陣一次計算（時間為最後一軸）
+    串流  IndicatorStream 每根新 K 棒以 O(1) 更新所有標的，狀態是少量固定大小的陣列，可寫入磁碟
+沒有中間缺值時兩種模式的結果一致：EMA 類以第一個有效值為起點，RSI / ATR 使用 Wilder 平滑，
+暖身期不足（SMA 視窗未滿、RSI / ATR 少於 period 個價差）的值為 NaN。
+只有收盤價時 ATR 以相鄰收盤價差作為真實波幅。
+"""
+import os
+import tempfile
+import warnings
+
+import numpy as np
+
+SHORT_WINDOW = 20
+LONG_WINDOW = 50
+EMA_SPAN = 20
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BOLLINGER_K = 2.0
+
+# ====== 批次 ======
+def _ewm(values, alpha):
+    """沿最後一軸的指數加權平均，以第一個有效值為起點，缺值沿用前值"""
+    values = np.asarray(values, dtype=np.float64)
+    x = values.reshape(-1, values.shape[-1])
+    out = np.empty_like(x)
+    prev = np.full(x.shape[0], np.nan)
+    for i in range(x.shape[1]):
+        col = x[:, i]
+        prev = np.where(np.isnan(prev), col, np.where(np.isnan(col), prev, prev + alpha * (col - prev)))
+        out[:, i] = prev
+    return out.reshape(values.shape)
+
+def _rolling_sums(values, window):
+    """沿最後一軸的視窗和、平方和與缺值數（前 window-1 個位置為 NaN）"""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    filled = np.where(missing, 0.0, values)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    csum = np.pad(np.cumsum(filled, axis=-1), pad)
+    csq = np.pad(np.cumsum(filled * filled, axis=-1), pad)
+    cmiss = np.pad(np.cumsum(missing, axis=-1), pad)
+    sums = np.full(values.shape, np.nan)
+    sumsq = np.full(values.shape, np.nan)
+    gaps = np.ones(values.shape, dtype=np.int64)
+    sums[..., window - 1:] = csum[..., window:] - csum[..., :-window]
+    sumsq[..., window - 1:] = csq[..., window:] - csq[..., :-window]
+    gaps[..., window - 1:] = cmiss[..., window:] - cmiss[..., :-window]
+    return sums, sumsq, gaps
+
+def _warmed(values, closes, period):
+    """有效收盤價不足 period + 1 個（少於 period 個價差）的位置設為 NaN"""
+    seen = np.cumsum(~np.isnan(closes), axis=-1)
+    return np.where(seen > period, values, np.nan)
+
+def _diff(closes):
+    closes = np.asarray(closes, dtype=np.float64)
+    change = np.full(closes.shape, np.nan)
+    change[..., 1:] = np.diff(closes, axis=-1)
+    return change
+
+def sma(closes, window=SHORT_WINDOW):
+    sums, _, gaps = _rolling_sums(closes, window)
+    return np.where(gaps == 0, sums / window, np.nan)
+
+def ema(closes, span=EMA_SPAN):
+    return _ewm(closes, 2 / (span + 1))
+
+def rsi(closes, period=RSI_PERIOD):
+    change = _diff(closes)
+    avg_gain = _ewm(np.where(np.isnan(change), np.nan, np.maximum(change, 0)), 1 / period)
+    avg_loss = _ewm(np.where(np.isnan(change), np.nan, np.maximum(-change, 0)), 1 / period)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        value = np.where(avg_loss > 0, 100 - 100 / (1 + avg_gain / avg_loss), 100.0)
+    return _warmed(value, closes, period)
+
+def macd(closes, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+    """回傳 (MACD 線, 訊號線, 柱狀圖)"""
+    line = ema(closes, fast) - ema(closes, slow)
+    signal_line = _ewm(line, 2 / (signal + 1))
+    return line, signal_line, line - signal_line
+
+def bollinger(closes, window=SHORT_WINDOW, k=BOLLINGER_K):
+    """回傳 (中軌, 上軌, 下軌)"""
+    sums, sumsq, gaps = _rolling_sums(closes, window)
+    mid = np.where(gaps == 0, sums / window, np.nan)
+    std = np.sqrt(np.maximum(sumsq / window - mid * mid, 0))
+    return mid, mid + k * std, mid - k * std
+
+def atr(closes, period=ATR_PERIOD, high=None, low=None):
+    """平均真實波幅；沒有最高/最低價時以 |收盤價差| 為真實波幅"""
+    change = _diff(closes)
+    if high is None or low is None:
+        true_range = np.abs(change)
+    else:
+        prev = np.asarray(closes, dtype=np.float64) - change
+        true_range = np.fmax(np.asarray(high) - np.asarray(low),
+                             np.fmax(np.abs(np.asarray(high) - prev), np.abs(np.asarray(low) - prev)))
+        true_range = np.where(np.isnan(change), np.nan, true_range)
+    return _warmed(_ewm(true_range, 1 / period), closes, period)
+
+def compute_all(closes):
+    """批次計算所有指標，鍵與 IndicatorStream.values() 相同"""
+    mid, upper, lower = bollinger(closes)
+    line, signal_line, hist = macd(closes)
+    return {
+        'sma_20': sma(closes, SHORT_WINDOW),
+        'sma_50': sma(closes, LONG_WINDOW),
+        'ema_20': ema(closes, EMA_SPAN),
+        'rsi': rsi(closes),
+        'macd': line,
+        'macd_signal': signal_line,
+        'macd_hist': hist,
+        'bollinger_mid': mid,
+        'bollinger_upper': upper,
+        'bollinger_lower': lower,
+        'atr': atr(closes)
+    }
+
+# ====== 串流 ======
+# 串流狀態欄位（每個標的一格；ring 為最近 LONG_WINDOW 根收盤價）
+STATE_COLUMNS = (
+    'prev_close', 'sum_short', 'sumsq_short', 'sum_long',
+    'ema', 'ema_fast', 'ema_slow', 'ema_signal', 'avg_gain', 'avg_loss', 'atr'
+)
+
+class IndicatorStream:
+    """所有標的共用的串流指標狀態，每根 K 棒 O(1) 更新"""
+
+    def __init__(self, symbols):
+        n = len(symbols)
+        self.symbols = np.asarray(symbols, dtype=str)
+        self.last_day = np.datetime64('NaT', 'D')
+        self.count = np.zeros(n, dtype=np.int64)
+        self.pos = np.zeros(n, dtype=np.int64)
+        self.ring = np.zeros((n, LONG_WINDOW))
+        self.state = {name: np.full(n, np.nan) for name in STATE_COLUMNS}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def nbytes(self):
+        return self.count.nbytes + self.pos.nbytes + self.ring.nbytes + sum(a.nbytes for a in self.state.values())
+
+    def update(self, bar, day=None):
+        """加入一根 K 棒（每個標的一個收盤價，NaN 表示該標的沒有新資料）"""
+        bar = np.asarray(bar, dtype=np.float64)
+        rows = np.flatnonzero(~np.isnan(bar))
+        if day is not None:
+            self.last_day = np.datetime64(day, 'D')
+        if not len(rows):
+            return
+        x = bar[rows]
+        s = {name: array[rows] for name, array in self.state.items()}
+        count = self.count[rows]
+        pos = self.pos[rows]
+        first = count == 0
+
+        # 視窗和：移出 LONG_WINDOW / SHORT_WINDOW 根前的收盤價
+        leaving_long = np.where(count >= LONG_WINDOW, self.ring[rows, pos], 0.0)
+        leaving_short = np.where(count >= SHORT_WINDOW, self.ring[rows, (pos - SHORT_WINDOW) % LONG_WINDOW], 0.0)
+        s['sum_long'] = np.where(first, 0.0, s['sum_long']) + x - leaving_long
+        s['sum_short'] = np.where(first, 0.0, s['sum_short']) + x - leaving_short
+        s['sumsq_short'] = np.where(first, 0.0, s['sumsq_short']) + x * x - leaving_short * leaving_short
+        self.ring[rows, pos] = x
+
+        # EMA / MACD
+        for name, alpha in (('ema', 2 / (EMA_SPAN + 1)), ('ema_fast', 2 / (MACD_FAST + 1)), ('ema_slow', 2 / (MACD_SLOW + 1))):
+            s[name] = np.where(first, x, s[name] + alpha * (x - s[name]))
+        line = s['ema_fast'] - s['ema_slow']
+        s['ema_signal'] = np.where(first, line, s['ema_signal'] + 2 / (MACD_SIGNAL + 1) * (line - s['ema_signal']))
+
+        # RSI / ATR（Wilder 平滑，以第一個價差為起點）
+        change = x - s['prev_close']
+        second = count == 1
+        for name, value, period in (('avg_gain', np.maximum(change, 0), RSI_PERIOD),
+                                    ('avg_loss', np.maximum(-change, 0), RSI_PERIOD),
+                                    ('atr', np.abs(change), ATR_PERIOD)):
+            s[name] = np.where(first, np.nan, np.where(second, value, s[name] + (value - s[name]) / period))
+        s['prev_close'] = x
+
+        for name, array in self.state.items():
+            array[rows] = s[name]
+        self.count[rows] = count + 1
+        self.pos[rows] = (pos + 1) % LONG_WINDOW
+
+        # 每繞完一圈以 ring 重新加總，避免浮點誤差累積（攤銷後仍為 O(1)）
+        wrapped = rows[self.pos[rows] == 0]
+        if len(wrapped):
+            self._resum(wrapped)
+
+    def _resum(self, rows):
+        ring = self.ring[rows]
+        short = ring[:, LONG_WINDOW - SHORT_WINDOW:]
+        self.state['sum_long'][rows] = ring.sum(axis=1)
+        self.state['sum_short'][rows] = short.sum(axis=1)
+        self.state['sumsq_short'][rows] = (short * short).sum(axis=1)
+
+    def seed(self, closes, days=None):
+        """以歷史收盤價矩陣（標的 × 時間）逐根建立狀態"""
+        closes = np.asarray(closes, dtype=np.float64)
+        for i in range(closes.shape[1]):
+            self.update(closes[:, i], None if days is None else days[i])
+
+    def values(self):
+        """目前所有標的的指標值（鍵與 compute_all 相同）"""
+        s = self.state
+        count = self.count
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mid = np.where(count >= SHORT_WINDOW, s['sum_short'] / SHORT_WINDOW, np.nan)
+            std = np.sqrt(np.maximum(s['sumsq_short'] / SHORT_WINDOW - mid * mid, 0))
+            rsi_value = np.where(s['avg_loss'] > 0, 100 - 100 / (1 + s['avg_gain'] / s['avg_loss']), 100.0)
+        line = s['ema_fast'] - s['ema_slow']
+        return {
+            'sma_20': mid,
+            'sma_50': np.where(count >= LONG_WINDOW, s['sum_long'] / LONG_WINDOW, np.nan),
+            'ema_20': s['ema'].copy(),
+            'rsi': np.where(count > RSI_PERIOD, rsi_value, np.nan),
+            'macd': line,
+            'macd_signal': s['ema_signal'].copy(),
+            'macd_hist': line - s['ema_signal'],
+            'bollinger_mid': mid,
+            'bollinger_upper': mid + BOLLINGER_K * std,
+            'bollinger_lower': mid - BOLLINGER_K * std,
+            'atr': np.where(count > ATR_PERIOD, s['atr'], np.nan)
+        }
+
+    def levels(self, symbols):
+        """指定標的的指標值 {symbol: {name: value}}（缺值省略）"""
+        values = self.values()
+        index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        out = {}
+        for symbol in symbols:
+            i = index.get(symbol)
+            if i is not None:
+                out[symbol] = {name: float(array[i]) for name, array in values.items() if not np.isnan(array[i])}
+        return out
+
+    # ====== 寫入 / 讀取 ======
+    def to_arrays(self):
+        arrays = {'symbol': self.symbols, 'last_day': np.array([self.last_day]),
+                  'count': self.count, 'pos': self.pos, 'ring': self.ring}
+        arrays.update(self.state)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        stream = cls([str(symbol) for symbol in arrays['symbol']])
+        stream.last_day = arrays['last_day'][0]
+        stream.count[:] = arrays['count']
+        stream.pos[:] = arrays['pos']
+        stream.ring[:] = arrays['ring']
+        for name in STATE_COLUMNS:
+            stream.state[name][:] = arrays[name]
+        return stream
+
+    def save(self, path):
+        """以 .npz 原子寫入"""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **self.to_arrays())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls.from_arrays(arrays)
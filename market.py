@@ -0,0 +1,223 @@
+"""TENKI 市場數據
+
+報價與長期走勢的快取存活時間依 NYSE 交易時段調整（market_calendar.MarketHoursTTL）：
+盤中定期更新，收盤後到下一次開盤前不再向上游取得。
+每次成功取得的報價合併寫入最後成功快照（TENKI_QUOTE_SNAPSHOT）；上游取不到的標的改用快照中的報價，
+並標記 stale 與取得時間 as_of，新啟動且沒有網路的行程也能立即顯示上一次的行情。
+長期走勢同樣在上游失敗或回傳空資料時改用本行程最後一次成功的結果（沒有時為空陣列）並標記 stale，
+這樣的結果只快取 QUOTE_TTL 秒，上游恢復後很快重新取得。
+
+環境變數:
+    TENKI_QUOTE_SNAPSHOT=<path>     最後成功快照（預設為系統暫存目錄下的 tenki-quotes.json）
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import metrics
+from cache import TTLCache, cached
+from downsample import downsample
+from market_calendar import MarketHoursTTL
+from providers import get_provider
+from tracing import span
+
+MARKET_SYMBOLS = ['SPY', 'QQQ', 'AAPL', 'MSFT', 'GOOGL', 'NVDA', 'TSLA', 'META']
+# 盤中的快取秒數
+QUOTE_TTL = 300
+HISTORY_TTL = 3600
+HISTORY_PERIOD = '10y'
+# 長期走勢圖送到瀏覽器的點數（約等於圖表寬度的像素數）
+HISTORY_POINTS = 800
+QUOTE_SNAPSHOT = os.environ.get('TENKI_QUOTE_SNAPSHOT', os.path.join(tempfile.gettempdir(), 'tenki-quotes.json'))
+
+metrics.describe('tenki_quotes_stale_total', 'Quotes served from the last-known-good snapshot because the upstream failed')
+metrics.describe('tenki_quote_snapshot_writes_total', 'Writes of the last-known-good quote snapshot')
+metrics.describe('tenki_history_stale_total', 'Long histories served from the last good result (or empty) because the upstream failed')
+
+logger = logging.getLogger(__name__)
+
+# ====== 市場數據 ======
+def summarize_quote(symbol, closes):
+    """由最近兩日收盤價計算報價與漲跌（as_of 為取得時間，stale 表示取自最後成功快照）"""
+    if len(closes) >= 2:
+        current = float(closes.iloc[-1])
+        previous = float(closes.iloc[-2])
+        change = current - previous
+        change_pct = (change / previous) * 100
+        return {
+            'symbol': symbol,
+            'price': current,
+            'change': change,
+            'change_pct': change_pct,
+            'as_of': time.time(),
+            'stale': False
+        }
+    return None
+
+def fetch_quote(symbol, provider=None):
+    """向上游取得單一標的報價，失敗回傳 None"""
+    try:
+        closes = (provider or get_provider()).history(symbol, period="2d")
+        return summarize_quote(symbol, closes)
+    except Exception:
+        return None
+
+def fetch_market_data(symbols=MARKET_SYMBOLS, provider=None):
+    """並行向上游取得所有標的報價（不經快取）"""
+    provider = provider or get_provider()
+    market_data = {}
+
+    with span('fetch_market_data'), ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(fetch_quote, symbol, provider) for symbol in symbols]
+        for future in futures:
+            result = future.result()
+            if result:
+                market_data[result['symbol']] = result
+
+    return market_data
+
+# ====== 最後成功快照 ======
+# 標的 → 最後一次成功取得的報價；第一次使用時由檔案載入
+_last_good = None
+_last_good_lock = threading.Lock()
+
+def load_snapshot(path=QUOTE_SNAPSHOT):
+    """讀取最後成功快照（沒有或無法讀取時為空）"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['quotes']
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning('ignoring unreadable quote snapshot %s: %r', path, e)
+        return {}
+
+def save_snapshot(quotes, path=QUOTE_SNAPSHOT):
+    """原子寫入最後成功快照"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': time.time(), 'quotes': quotes}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    metrics.inc('tenki_quote_snapshot_writes_total')
+
+def _snapshot_quotes():
+    global _last_good
+    if _last_good is None:
+        _last_good = load_snapshot()
+    return _last_good
+
+def remember_quotes(quotes):
+    """合併新取得的報價並寫入快照"""
+    global _last_good
+    if not quotes:
+        return
+    with _last_good_lock:
+        merged = dict(_snapshot_quotes())
+        merged.update(quotes)
+        try:
+            save_snapshot(merged)
+        except OSError as e:
+            logger.warning('could not write quote snapshot %s: %r', QUOTE_SNAPSHOT, e)
+        _last_good = merged
+
+def stale_quotes(symbols):
+    """快照中這些標的的報價（標記 stale）"""
+    with _last_good_lock:
+        snapshot = _snapshot_quotes()
+    found = {symbol: dict(snapshot[symbol], stale=True) for symbol in symbols if symbol in snapshot}
+    if found:
+        metrics.inc('tenki_quotes_stale_total', len(found))
+    return found
+
+def quote_snapshot_time():
+    """最後成功快照中最新一筆報價的時間（沒有快照時為 None）"""
+    with _last_good_lock:
+        snapshot = _snapshot_quotes()
+    return max((quote['as_of'] for quote in snapshot.values()), default=None)
+
+# 每個標的各自快取（共用後端中每個標的一個鍵），任意標的組合的批次請求都能共用
+_quote_cache = TTLCache('market.quotes', ttl=MarketHoursTTL(QUOTE_TTL), version=2)
+
+def get_quotes(symbols, provider=None):
+    """批次取得報價：已快取（本地或共用後端）的直接使用，其餘一次並行向上游取得。
+    取不到的標的改用最後成功快照（stale=True），快照中也沒有的不列入"""
+    def fetch(missing):
+        fetched = fetch_market_data(missing, provider)
+        remember_quotes(fetched)
+        # 失敗也快取（None），避免上游故障時每次 rerun 都重新請求
+        return {symbol: fetched.get(symbol) for symbol in missing}
+    quotes = _quote_cache.get_many_or_compute(symbols, fetch)
+    failed = [symbol for symbol in symbols if not quotes[symbol]]
+    stale = stale_quotes(failed) if failed else {}
+    return {symbol: quotes[symbol] or stale[symbol] for symbol in symbols if quotes[symbol] or symbol in stale}
+
+def get_market_data():
+    """獲取市場數據"""
+    return get_quotes(MARKET_SYMBOLS)
+
+# ====== 長期走勢 ======
+# days 為日期 datetime64[D] 陣列、closes 為收盤價陣列；stale 表示上游失敗而改用最後成功的結果（或空陣列）
+PriceHistory = namedtuple('PriceHistory', ['days', 'closes', 'stale'])
+# 降採樣後的單一區間，total 為區間內的原始點數
+WindowResult = namedtuple('WindowResult', ['days', 'closes', 'total', 'stale'])
+EMPTY_HISTORY = PriceHistory(np.empty(0, dtype='datetime64[D]'), np.empty(0), True)
+# 每個 (標的, 期間) 最後一次成功的結果數量上限
+LAST_GOOD_HISTORIES = 256
+
+class HistoryTTL(MarketHoursTTL):
+    """長期走勢的存活時間：stale 的結果只快取 QUOTE_TTL 秒"""
+
+    def __call__(self, now, value=None):
+        if value is not None and value.stale:
+            return QUOTE_TTL
+        return super().__call__(now, value)
+
+_last_good_histories = OrderedDict()
+_last_good_histories_lock = threading.Lock()
+
+@cached(ttl=HistoryTTL(HISTORY_TTL), version=2)
+def get_price_history(symbol, period=HISTORY_PERIOD):
+    """長期日收盤價 PriceHistory(days, closes, stale)；上游失敗時不拋出例外"""
+    key = (symbol, period)
+    try:
+        closes = get_provider().history(symbol, period=period).dropna()
+        if not len(closes):
+            raise ValueError(f'empty history for {symbol}')
+    except Exception as e:
+        logger.warning('history for %s unavailable, serving last good result: %r', symbol, e)
+        metrics.inc('tenki_history_stale_total')
+        with _last_good_histories_lock:
+            last = _last_good_histories.get(key)
+        return EMPTY_HISTORY if last is None else last._replace(stale=True)
+    history = PriceHistory(closes.index.values.astype('datetime64[D]'), closes.to_numpy(dtype=np.float64), False)
+    with _last_good_histories_lock:
+        _last_good_histories[key] = history
+        _last_good_histories.move_to_end(key)
+        while len(_last_good_histories) > LAST_GOOD_HISTORIES:
+            _last_good_histories.popitem(last=False)
+    return history
+
+def history_window(days, closes, start=None, end=None, points=HISTORY_POINTS, method='lttb'):
+    """取出 [start, end] 區間並降採樣到 points 個點，回傳 (日期, 收盤價, 原始點數)"""
+    lo = 0 if start is None else np.searchsorted(days, np.datetime64(start, 'D'))
+    hi = len(days) if end is None else np.searchsorted(days, np.datetime64(end, 'D'), side='right')
+    shown_days, shown_closes = downsample(days[lo:hi], closes[lo:hi], points, method)
+    return shown_days, shown_closes, hi - lo
+
+@cached(ttl=HistoryTTL(HISTORY_TTL), maxsize=256, version=2)
+def get_history_window(symbol, start=None, end=None, points=HISTORY_POINTS):
+    """單一縮放區間的降採樣結果 (日期, 收盤價, 原始點數, stale)（每個區間各自快取，縮放時只傳送該區間的點）"""
+    days, closes, stale = get_price_history(symbol)
+    return WindowResult(*history_window(days, closes, start, end, points), stale)
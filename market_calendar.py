@@ -0,0 +1,173 @@
+"""TENKI 交易日曆（NYSE，離線）
+
+休市日與半日市依交易所規則推算，不需要網路或逐年更新的日期表:
+    - 元旦、馬丁路德金恩紀念日（1998 起）、華盛頓誕辰、耶穌受難日、陣亡將士紀念日、
+      六月節（2022 起）、獨立紀念日、勞動節、感恩節、聖誕節
+    - 遇週六提前至週五、遇週日順延至週一休市；元旦遇週六時不補休
+    - 獨立紀念日前一天、感恩節翌日與平安夜在 13:00 提前收盤
+    - 臨時休市（國殤日、天災）列在 SPECIAL_CLOSURES
+時間一律以 epoch 秒表示，交易所時區由 pytz 換算（含夏令時間）。
+
+MarketHoursTTL 是依交易時段調整的快取存活時間：盤中為固定秒數，收盤後到下一次開盤前不再向上游取得資料。
+
+環境變數:
+    TENKI_ADAPTIVE_TTL=1        設為 0 時快取全天使用固定存活時間
+"""
+import datetime
+import functools
+import os
+
+import pytz
+
+ADAPTIVE_TTL = os.environ.get('TENKI_ADAPTIVE_TTL', '1') != '0'
+
+TIMEZONE = pytz.timezone('America/New_York')
+REGULAR_OPEN = datetime.time(9, 30)
+REGULAR_CLOSE = datetime.time(16, 0)
+EARLY_CLOSE = datetime.time(13, 0)
+# 收盤後繼續以盤中頻率更新的秒數（收盤競價與資料源延遲）
+CLOSE_SETTLE_SECONDS = 20 * 60
+
+SPECIAL_CLOSURES = {
+    datetime.date(2001, 9, 11): 'September 11',
+    datetime.date(2001, 9, 12): 'September 11',
+    datetime.date(2001, 9, 13): 'September 11',
+    datetime.date(2001, 9, 14): 'September 11',
+    datetime.date(2004, 6, 11): 'Day of Mourning (Reagan)',
+    datetime.date(2007, 1, 2): 'Day of Mourning (Ford)',
+    datetime.date(2012, 10, 29): 'Hurricane Sandy',
+    datetime.date(2012, 10, 30): 'Hurricane Sandy',
+    datetime.date(2018, 12, 5): 'Day of Mourning (G. H. W. Bush)',
+    datetime.date(2025, 1, 9): 'Day of Mourning (Carter)'
+}
+
+# ====== 規則 ======
+def _nth_weekday(year, month, weekday, n):
+    """某月第 n 個星期幾（n = -1 為最後一個；weekday 0 = 週一）"""
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+def _easter(year):
+    """西方復活節（格里曆，Meeus/Jones/Butcher 演算法）"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+def _observed(day):
+    """週六提前至週五、週日順延至週一"""
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+@functools.lru_cache(maxsize=64)
+def holidays(year):
+    """該年的休市日 {日期: 名稱}"""
+    days = {}
+    new_year = datetime.date(year, 1, 1)
+    # 元旦遇週六不補休（前一年 12/31 照常交易）
+    if new_year.weekday() != 5:
+        days[_observed(new_year)] = "New Year's Day"
+    if year >= 1998:
+        days[_nth_weekday(year, 1, 0, 3)] = 'Martin Luther King Jr. Day'
+    days[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+    days[_easter(year) - datetime.timedelta(days=2)] = 'Good Friday'
+    days[_nth_weekday(year, 5, 0, -1)] = 'Memorial Day'
+    if year >= 2022:
+        days[_observed(datetime.date(year, 6, 19))] = 'Juneteenth'
+    days[_observed(datetime.date(year, 7, 4))] = 'Independence Day'
+    days[_nth_weekday(year, 9, 0, 1)] = 'Labor Day'
+    days[_nth_weekday(year, 11, 3, 4)] = 'Thanksgiving Day'
+    days[_observed(datetime.date(year, 12, 25))] = 'Christmas Day'
+    days.update({day: name for day, name in SPECIAL_CLOSURES.items() if day.year == year})
+    return days
+
+@functools.lru_cache(maxsize=64)
+def early_closes(year):
+    """該年 13:00 提前收盤的交易日"""
+    days = {
+        datetime.date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + datetime.timedelta(days=1),
+        datetime.date(year, 12, 24)
+    }
+    return frozenset(day for day in days if day.weekday() < 5 and day not in holidays(year))
+
+def is_trading_day(day):
+    return day.weekday() < 5 and day not in holidays(day.year)
+
+def exchange_date(now):
+    """epoch 秒在交易所時區的日期"""
+    return datetime.datetime.fromtimestamp(now, TIMEZONE).date()
+
+def _timestamp(day, at):
+    return TIMEZONE.localize(datetime.datetime.combine(day, at)).timestamp()
+
+@functools.lru_cache(maxsize=1024)
+def session(day):
+    """交易日的 (開盤, 收盤) epoch 秒，休市日為 None"""
+    if not is_trading_day(day):
+        return None
+    close = EARLY_CLOSE if day in early_closes(day.year) else REGULAR_CLOSE
+    return _timestamp(day, REGULAR_OPEN), _timestamp(day, close)
+
+# ====== 查詢 ======
+def is_open(now):
+    hours = session(exchange_date(now))
+    return hours is not None and hours[0] <= now < hours[1]
+
+def next_open(now):
+    """下一次開盤（已開盤時為下一個交易日的開盤）"""
+    day = exchange_date(now)
+    while True:
+        hours = session(day)
+        if hours is not None and hours[0] > now:
+            return hours[0]
+        day += datetime.timedelta(days=1)
+
+def last_close(now):
+    """最近一次已經過的收盤"""
+    day = exchange_date(now)
+    while True:
+        hours = session(day)
+        if hours is not None and hours[1] <= now:
+            return hours[1]
+        day -= datetime.timedelta(days=1)
+
+def market_status(now):
+    """{'open': 是否開盤中, 'next_open': ..., 'next_close': ...（休市時為 None）}"""
+    hours = session(exchange_date(now))
+    if hours is not None and hours[0] <= now < hours[1]:
+        return {'open': True, 'next_open': next_open(now), 'next_close': hours[1]}
+    return {'open': False, 'next_open': next_open(now), 'next_close': None}
+
+# ====== 快取存活時間 ======
+class MarketHoursTTL:
+    """依交易時段調整的快取存活時間（可作為 TTLCache 的 ttl）
+
+    開盤中與收盤後 CLOSE_SETTLE_SECONDS 內為 base 秒；其餘時間存活到下一次開盤。
+    值為 None（上游取得失敗）時一律為 base 秒，上游恢復後不必等到開盤。
+    TTLCache 以 base 估計固定存活時間下會多出的上游呼叫次數。
+    """
+
+    def __init__(self, base):
+        self.base = base
+
+    def __call__(self, now, value=None):
+        if not ADAPTIVE_TTL or value is None or is_open(now) or now - last_close(now) < CLOSE_SETTLE_SECONDS:
+            return self.base
+        return max(1.0, next_open(now) - now)
+
+    def __repr__(self):
+        return f'MarketHoursTTL({self.base})'
@@ -0,0 +1,127 @@
+"""TENKI 行程內指標
+
+計數器、量表與延遲分佈都存放在本行程記憶體中，
+寫入只需一次加鎖的加法或 deque.append，抓取時才計算百分位數。
+"""
+import threading
+from collections import deque
+
+# 每個分佈保留的最近樣本數
+RESERVOIR_SIZE = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+_help = {}
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())) if labels else ())
+
+def describe(name, text):
+    """設定指標說明（Prometheus HELP）"""
+    _help[name] = text
+
+def inc(name, value=1, **labels):
+    """計數器累加"""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def set_gauge(name, value, **labels):
+    """設定量表數值"""
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+def remove_gauge(name, **labels):
+    """移除量表（例如 session 已被淘汰）"""
+    with _lock:
+        _gauges.pop(_key(name, labels), None)
+
+def observe(name, value, **labels):
+    """記錄一筆分佈樣本"""
+    key = _key(name, labels)
+    with _lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = {'count': 0, 'sum': 0.0, 'samples': deque(maxlen=RESERVOIR_SIZE)}
+        series['count'] += 1
+        series['sum'] += value
+        series['samples'].append(value)
+
+def quantile(sorted_samples, q):
+    """已排序樣本的百分位數（最近秩）"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(q * len(sorted_samples)))
+    return sorted_samples[index]
+
+def get_counter(name, **labels):
+    with _lock:
+        return _counters.get(_key(name, labels), 0)
+
+def get_gauge(name, default=None, **labels):
+    with _lock:
+        return _gauges.get(_key(name, labels), default)
+
+def get_samples(name, **labels):
+    """分佈最近樣本（已排序，沒有樣本時為空列表）"""
+    with _lock:
+        series = _histograms.get(_key(name, labels))
+        return sorted(series['samples']) if series else []
+
+def snapshot():
+    """所有指標的快照，供 Prometheus 文字輸出與管理頁面使用"""
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {key: (series['count'], series['sum'], sorted(series['samples']))
+                      for key, series in _histograms.items()}
+
+    summaries = {}
+    for key, (count, total, samples) in histograms.items():
+        summaries[key] = {
+            'count': count,
+            'sum': total,
+            'quantiles': {q: quantile(samples, q) for q in QUANTILES}
+        }
+    return {'counters': counters, 'gauges': gauges, 'summaries': summaries}
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + (list(extra) if extra else [])
+    if not items:
+        return ''
+    escaped = ['%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in items]
+    return '{' + ','.join(escaped) + '}'
+
+def render_prometheus():
+    """以 Prometheus 文字格式輸出所有指標"""
+    snap = snapshot()
+    lines = []
+
+    def header(name, kind, seen):
+        if name in seen:
+            return
+        seen.add(name)
+        if name in _help:
+            lines.append(f'# HELP {name} {_help[name]}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    seen = set()
+    for (name, labels), value in sorted(snap['counters'].items()):
+        header(name, 'counter', seen)
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+
+    for (name, labels), value in sorted(snap['gauges'].items()):
+        header(name, 'gauge', seen)
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+
+    for (name, labels), summary in sorted(snap['summaries'].items()):
+        header(name, 'summary', seen)
+        for q, value in summary['quantiles'].items():
+            lines.append(f'{name}{_format_labels(labels, [("quantile", q)])} {value:.6f}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {summary["sum"]:.6f}')
+        lines.append(f'{name}_count{_format_labels(labels)} {summary["count"]}')
+
+    return '\n'.join(lines) + '\n'
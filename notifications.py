@@ -0,0 +1,449 @@
+"""TENKI 通知
+
+價格提醒觸發時（alerts.on_fire）依使用者的通知設定，為每個啟用的管道各寫入一列到
+SQLite 佇列（outbox）後立即返回；寫入只是一次本機交易，不會阻塞 Streamlit 的 rerun。
+背景派送執行緒執行 asyncio 工作池:
+    - 同一使用者、同一管道的待送提醒合併成一則訊息。每列在寫入後等待
+      TENKI_NOTIFY_COALESCE_SECONDS 秒才到期，期間觸發的提醒會一起送出
+    - 每個管道各有一個 token bucket 限制發送速率（見 CHANNELS）
+    - 失敗時以指數退避重試，超過 MAX_ATTEMPTS 次標記為 failed
+    - 領取的列有 LEASE_SECONDS 秒的租約；租約過期仍未送完（領取的行程已結束）的列重新排入佇列，
+      多個副本共用同一個佇列時不會搶走其他副本正在發送的列
+    - 讀寫佇列失敗（例如 database is locked）時記錄並以指數退避重試，派送執行緒不會結束
+email 以 SMTP 寄出（本機測試可用 smtp_sink.py）；push 與 sms 尚未串接服務商，
+先寫入 TENKI_NOTIFY_LOG 的 JSON Lines 檔。
+
+環境變數:
+    TENKI_NOTIFY_DB=<path>               佇列與通知設定（預設為系統暫存目錄下的 tenki-notifications.sqlite3）
+    TENKI_NOTIFY_WORKERS=4               派送工作數，0 表示不啟動派送
+    TENKI_NOTIFY_COALESCE_SECONDS=10     合併等待秒數
+    TENKI_NOTIFY_LOG=<path>              push / sms 的輸出檔（預設為系統暫存目錄下的 tenki-notifications.jsonl）
+    TENKI_SMTP_HOST=127.0.0.1
+    TENKI_SMTP_PORT=1025
+    TENKI_SMTP_SENDER=alerts@tenki.local
+"""
+import asyncio
+import json
+import logging
+import os
+import smtplib
+import sqlite3
+import tempfile
+import threading
+import time
+from email.message import EmailMessage
+
+import metrics
+from alerts import on_fire
+from i18n import DEFAULT_LANGUAGE, get_texts
+
+NOTIFY_DB = os.environ.get('TENKI_NOTIFY_DB', os.path.join(tempfile.gettempdir(), 'tenki-notifications.sqlite3'))
+NOTIFY_WORKERS = int(os.environ.get('TENKI_NOTIFY_WORKERS', '4'))
+COALESCE_SECONDS = float(os.environ.get('TENKI_NOTIFY_COALESCE_SECONDS', '10'))
+NOTIFY_LOG = os.environ.get('TENKI_NOTIFY_LOG', os.path.join(tempfile.gettempdir(), 'tenki-notifications.jsonl'))
+SMTP_HOST = os.environ.get('TENKI_SMTP_HOST', '127.0.0.1')
+SMTP_PORT = int(os.environ.get('TENKI_SMTP_PORT', '1025'))
+SMTP_SENDER = os.environ.get('TENKI_SMTP_SENDER', 'alerts@tenki.local')
+
+# 管道 → 每秒發送數與可累積的突發量；default 為尚未設定時是否啟用（與設定頁的預設一致）
+CHANNELS = {
+    'email': {'rate': 10.0, 'burst': 20, 'default': True},
+    'push': {'rate': 50.0, 'burst': 100, 'default': True},
+    'sms': {'rate': 1.0, 'burst': 5, 'default': False}
+}
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 5
+POLL_SECONDS = 1.0
+# 讀寫佇列連續失敗時的最長等待秒數
+MAX_BACKOFF_SECONDS = 60
+# 領取後多久仍未完成視為領取的行程已結束（須大於最慢的限速管道送完一批的時間）
+LEASE_SECONDS = 600
+# 每次向佇列領取的 (使用者, 管道) 組數
+CLAIM_BATCH = 200
+
+metrics.describe('tenki_notification_queue_depth', 'Notification rows waiting to be sent')
+metrics.describe('tenki_notifications_enqueued_total', 'Notification rows written to the queue by channel')
+metrics.describe('tenki_notifications_sent_total', 'Messages delivered by channel')
+metrics.describe('tenki_notifications_failed_total', 'Delivery attempts that failed by channel')
+metrics.describe('tenki_notifications_coalesced_total', 'Alerts merged into another alert\'s message')
+metrics.describe('tenki_notification_latency_seconds', 'Time from alert to delivery by channel')
+metrics.describe('tenki_notification_poll_errors_total', 'Dispatcher polls that failed to read or write the queue')
+metrics.describe('tenki_notifications_recovered_total', 'Rows requeued after their claim lease expired')
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    due_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending'
+);
+-- status 為 sending 時 due_at 是租約到期時間
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, channel, due_at);
+CREATE INDEX IF NOT EXISTS outbox_user ON outbox (user, channel, status);
+CREATE TABLE IF NOT EXISTS preferences (
+    user TEXT PRIMARY KEY,
+    channels TEXT NOT NULL,
+    language TEXT NOT NULL
+);
+'''
+
+# ====== 佇列 ======
+class NotificationQueue:
+    """SQLite 佇列（WAL；每個執行緒一條連線）"""
+
+    def __init__(self, path=NOTIFY_DB):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # ====== 通知設定 ======
+    def preferences(self, user):
+        """使用者的通知設定 {'channels': [...], 'language': ...}"""
+        row = self._conn().execute('SELECT channels, language FROM preferences WHERE user = ?', (user,)).fetchone()
+        if row is None:
+            return {'channels': [name for name, spec in CHANNELS.items() if spec['default']], 'language': DEFAULT_LANGUAGE}
+        return {'channels': json.loads(row[0]), 'language': row[1]}
+
+    def set_preferences(self, user, channels, language):
+        self._conn().execute(
+            'INSERT INTO preferences (user, channels, language) VALUES (?, ?, ?) '
+            'ON CONFLICT (user) DO UPDATE SET channels = excluded.channels, language = excluded.language',
+            (user, json.dumps([channel for channel in CHANNELS if channel in channels]), language))
+
+    # ====== 寫入與領取 ======
+    def enqueue(self, user, payloads, now=None):
+        """為使用者啟用的每個管道寫入提醒，回傳寫入的列數"""
+        now = time.time() if now is None else now
+        channels = self.preferences(user)['channels']
+        rows = [(user, channel, json.dumps(payload), now, now + COALESCE_SECONDS)
+                for channel in channels for payload in payloads]
+        if rows:
+            conn = self._conn()
+            with conn:
+                conn.execute('BEGIN')
+                conn.executemany('INSERT INTO outbox (user, channel, payload, created_at, due_at) VALUES (?, ?, ?, ?, ?)', rows)
+            for channel in channels:
+                metrics.inc('tenki_notifications_enqueued_total', len(payloads), channel=channel)
+        return len(rows)
+
+    def claim(self, channel, now=None, limit=CLAIM_BATCH):
+        """領取管道中已到期的使用者，同一使用者的所有待送列（包含尚未到期的）一併領取
+
+        領取的列 due_at 改為租約到期時間（now + LEASE_SECONDS）。
+        """
+        now = time.time() if now is None else now
+        conn = self._conn()
+        groups = []
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            due = conn.execute(
+                "SELECT DISTINCT user, channel FROM outbox WHERE status = 'pending' AND channel = ? AND due_at <= ? LIMIT ?",
+                (channel, now, limit)).fetchall()
+            for user, channel in due:
+                rows = conn.execute(
+                    "UPDATE outbox SET status = 'sending', due_at = ? WHERE status = 'pending' AND user = ? AND channel = ? "
+                    "RETURNING id, payload, created_at, attempts", (now + LEASE_SECONDS, user, channel)).fetchall()
+                groups.append({
+                    'user': user,
+                    'channel': channel,
+                    'ids': [row[0] for row in rows],
+                    'payloads': [json.loads(row[1]) for row in rows],
+                    'created_at': [row[2] for row in rows],
+                    'attempts': max(row[3] for row in rows)
+                })
+        return groups
+
+    def complete(self, ids):
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN')
+            conn.executemany('DELETE FROM outbox WHERE id = ?', [(i,) for i in ids])
+
+    def retry(self, ids, attempts, now=None):
+        """發送失敗：以指數退避重新排入，超過 MAX_ATTEMPTS 標記為 failed"""
+        now = time.time() if now is None else now
+        attempts += 1
+        status = 'failed' if attempts >= MAX_ATTEMPTS else 'pending'
+        due_at = now + RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN')
+            conn.executemany('UPDATE outbox SET status = ?, attempts = ?, due_at = ? WHERE id = ?',
+                             [(status, attempts, due_at, i) for i in ids])
+
+    def recover(self, now=None):
+        """重新排入租約已過期的列（領取的行程在發送途中結束）；其他行程正在發送的列不受影響"""
+        now = time.time() if now is None else now
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN')
+            return conn.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending' AND due_at <= ?", (now,)).rowcount
+
+    def depth(self):
+        return self._conn().execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def counts(self):
+        """各狀態的列數"""
+        return dict(self._conn().execute('SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall())
+
+# ====== 訊息 ======
+def compose(payloads, language):
+    """合併一位使用者的多則提醒，回傳 (標題, 內文)"""
+    t = get_texts(language)
+    lines = []
+    for alert in payloads:
+        arrow = '↑' if alert['direction'] == 'above' else '↓'
+        label = t['alert_above'] if alert['direction'] == 'above' else t['alert_below']
+        lines.append(f"{alert['symbol']} {arrow} {label} ${alert['threshold']:,.2f} · "
+                     f"{t['alert_triggered']} ${alert['fired_price']:,.2f}")
+    symbols = ', '.join(dict.fromkeys(alert['symbol'] for alert in payloads))
+    return f"TENKI · {t['price_alerts']}: {symbols}", '\n'.join(lines)
+
+def user_address(user):
+    """使用者鍵中的電子郵件（未登入的 session 沒有）"""
+    return user[len('user:'):] if user.startswith('user:') else None
+
+# ====== 管道 ======
+class SmtpChannel:
+    """以 SMTP 寄送電子郵件"""
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, sender=SMTP_SENDER, timeout=10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.timeout = timeout
+
+    def send(self, user, subject, body):
+        address = user_address(user)
+        if address is None:
+            return False
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = address
+        message['Subject'] = subject
+        message.set_content(body)
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(message)
+        return True
+
+class LogChannel:
+    """尚未串接服務商的管道：以 JSON Lines 附加寫入檔案"""
+
+    def __init__(self, name, path=NOTIFY_LOG):
+        self.name = name
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, user, subject, body):
+        line = json.dumps({'ts': time.time(), 'channel': self.name, 'user': user, 'subject': subject, 'body': body},
+                          ensure_ascii=False)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+        return True
+
+def default_senders():
+    return {'email': SmtpChannel(), 'push': LogChannel('push'), 'sms': LogChannel('sms')}
+
+class TokenBucket:
+    """每秒補充 rate 個、最多累積 burst 個的 token bucket（asyncio）"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# ====== 派送 ======
+class Dispatcher:
+    """在背景執行緒執行 asyncio 派送工作池
+
+    每個管道有自己的工作佇列與 workers 個工作，被限速的管道（例如 sms）不會擋住其他管道。
+    """
+
+    def __init__(self, queue, senders=None, workers=NOTIFY_WORKERS, channels=CHANNELS, poll_seconds=POLL_SECONDS):
+        self.queue = queue
+        self.senders = senders or default_senders()
+        self.workers = workers
+        self.channels = channels
+        self.poll_seconds = poll_seconds
+        self._loop = None
+        self._wake = None
+        self._thread = None
+        self._started = threading.Event()
+
+    def start(self):
+        self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), name='tenki-notify', daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join()
+            self._loop = None
+
+    def wake(self):
+        """有新的列寫入：提早檢查佇列（可由任何執行緒呼叫）"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stop = asyncio.Event()
+        channels = [name for name in self.channels if name in self.senders]
+        jobs = {name: asyncio.Queue() for name in channels}
+        buckets = {name: TokenBucket(self.channels[name]['rate'], self.channels[name]['burst']) for name in channels}
+        tasks = [asyncio.create_task(self._worker(jobs[name], buckets[name])) for name in channels for _ in range(self.workers)]
+        self._started.set()
+        errors = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    claimed = await self._poll(channels, jobs)
+                    errors = 0
+                except Exception:
+                    # 一次失敗（例如 WAL 下的 database is locked）不結束派送，退避後再試
+                    errors += 1
+                    metrics.inc('tenki_notification_poll_errors_total')
+                    logger.exception('notification queue poll failed (%d in a row)', errors)
+                    await self._sleep(min(self.poll_seconds * 2 ** errors, MAX_BACKOFF_SECONDS), wake=False)
+                    continue
+                if claimed < CLAIM_BATCH:
+                    await self._sleep(self.poll_seconds)
+            for queue in jobs.values():
+                await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _poll(self, channels, jobs):
+        """重新排入租約過期的列並領取各管道到期的列，回傳單一管道最多領取的組數"""
+        recovered = await asyncio.to_thread(self.queue.recover)
+        if recovered:
+            metrics.inc('tenki_notifications_recovered_total', recovered)
+        claimed = 0
+        for name in channels:
+            # 工作佇列還有積壓時先不領取，讓列留在 SQLite 中繼續合併
+            if jobs[name].qsize() >= self.workers * 4:
+                continue
+            groups = await asyncio.to_thread(self.queue.claim, name)
+            for group in groups:
+                jobs[name].put_nowait(group)
+            claimed = max(claimed, len(groups))
+        metrics.set_gauge('tenki_notification_queue_depth', await asyncio.to_thread(self.queue.depth))
+        return claimed
+
+    async def _sleep(self, seconds, wake=True):
+        """等待 seconds 秒，停止（以及 wake 為 True 時有新的列寫入）時提早返回"""
+        self._wake.clear()
+        events = [self._wake, self._stop] if wake else [self._stop]
+        waiters = [asyncio.create_task(event.wait()) for event in events]
+        await asyncio.wait(waiters, timeout=seconds, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in waiters:
+            waiter.cancel()
+
+    async def _worker(self, jobs, bucket):
+        while True:
+            group = await jobs.get()
+            try:
+                await self._deliver(group, bucket)
+            except Exception:
+                logger.exception('notification delivery crashed')
+            finally:
+                jobs.task_done()
+
+    async def _deliver(self, group, bucket):
+        channel = group['channel']
+        language = (await asyncio.to_thread(self.queue.preferences, group['user']))['language']
+        subject, body = compose(group['payloads'], language)
+        await bucket.acquire()
+        try:
+            await asyncio.to_thread(self.senders[channel].send, group['user'], subject, body)
+        except Exception as e:
+            metrics.inc('tenki_notifications_failed_total', channel=channel)
+            logger.warning('%s notification to %s failed: %r', channel, group['user'], e)
+            await asyncio.to_thread(self.queue.retry, group['ids'], group['attempts'])
+            return
+        await asyncio.to_thread(self.queue.complete, group['ids'])
+        now = time.time()
+        metrics.inc('tenki_notifications_sent_total', channel=channel)
+        metrics.inc('tenki_notifications_coalesced_total', len(group['ids']) - 1)
+        for created_at in group['created_at']:
+            metrics.observe('tenki_notification_latency_seconds', now - created_at, channel=channel)
+
+# ====== 行程共用 ======
+_queue = None
+_dispatcher = None
+_lock = threading.Lock()
+
+def get_queue():
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = NotificationQueue()
+        return _queue
+
+@on_fire
+def enqueue_alerts(fired):
+    """提醒觸發：依使用者寫入佇列並喚醒派送"""
+    by_user = {}
+    for alert in fired:
+        by_user.setdefault(alert['user'], []).append(
+            {key: alert[key] for key in ('symbol', 'direction', 'threshold', 'fired_price', 'fired_ts')})
+    queue = get_queue()
+    written = sum(queue.enqueue(user, payloads) for user, payloads in by_user.items())
+    if written and _dispatcher is not None:
+        _dispatcher.wake()
+    return written
+
+def start_dispatcher(workers=None):
+    """啟動背景派送（每個行程只啟動一次）"""
+    global _dispatcher
+    workers = NOTIFY_WORKERS if workers is None else workers
+    if workers <= 0:
+        return None
+    queue = get_queue()
+    with _lock:
+        if _dispatcher is None:
+            _dispatcher = Dispatcher(queue, workers=workers).start()
+        return _dispatcher
+
+def stop_dispatcher():
+    global _dispatcher
+    with _lock:
+        if _dispatcher is not None:
+            _dispatcher.stop()
+            _dispatcher = None
@@ -0,0 +1,333 @@
+"""TENKI 虛擬投資組合計算
+
+持倉以欄位陣列（PositionBook）儲存：每筆持倉只佔固定的 36 bytes，
+標的代碼在整個行程共用一張字串表。總市值、總成本與獲利筆數隨每筆交易與價格變動累加更新（O(1)），
+彙總與組合比較直接讀取，不重新掃描持倉。
+每日淨值（NavSeries）同樣以欄位陣列儲存，每天一列、36 bytes。
+"""
+import threading
+import time
+
+import numpy as np
+
+# ====== 標的代碼表 ======
+SYMBOL_TABLE = []
+_symbol_codes = {}
+_symbol_lock = threading.Lock()
+
+def intern_symbol(symbol):
+    """取得標的在行程共用字串表中的代碼"""
+    code = _symbol_codes.get(symbol)
+    if code is None:
+        with _symbol_lock:
+            code = _symbol_codes.get(symbol)
+            if code is None:
+                code = _symbol_codes[symbol] = len(SYMBOL_TABLE)
+                SYMBOL_TABLE.append(symbol)
+    return code
+
+# ====== 持倉簿 ======
+COLUMNS = (
+    ('symbol_code', np.int32),
+    ('quantity', np.float64),
+    ('entry_price', np.float64),
+    ('current_price', np.float64),
+    ('entry_ts', np.int64)
+)
+
+class PositionBook:
+    """以欄位陣列儲存的持倉"""
+
+    def __init__(self, capacity=8):
+        self._size = 0
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS}
+        # 累加的彙總：總市值、總成本、現價高於進場價的筆數
+        self._value = 0.0
+        self._cost = 0.0
+        self._wins = 0
+
+    def __len__(self):
+        return self._size
+
+    def column(self, name):
+        return self._data[name][:self._size]
+
+    @property
+    def symbol_code(self):
+        return self.column('symbol_code')
+
+    @property
+    def quantity(self):
+        return self.column('quantity')
+
+    @property
+    def entry_price(self):
+        return self.column('entry_price')
+
+    @property
+    def current_price(self):
+        return self.column('current_price')
+
+    @property
+    def entry_ts(self):
+        return self.column('entry_ts')
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._data.values())
+
+    def _reserve(self, size):
+        capacity = len(self._data['quantity'])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, array in self._data.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._data[name] = grown
+
+    def append(self, symbol, quantity, entry_price, current_price, entry_ts):
+        """新增一筆持倉"""
+        self._reserve(self._size + 1)
+        i = self._size
+        self._data['symbol_code'][i] = intern_symbol(symbol)
+        self._data['quantity'][i] = quantity
+        self._data['entry_price'][i] = entry_price
+        self._data['current_price'][i] = current_price
+        self._data['entry_ts'][i] = entry_ts
+        self._size += 1
+        self._value += quantity * current_price
+        self._cost += quantity * entry_price
+        self._wins += int(current_price > entry_price)
+
+    def find(self, symbol):
+        """標的第一筆持倉的索引（沒有時為 None）"""
+        code = _symbol_codes.get(symbol)
+        if code is None:
+            return None
+        hits = np.flatnonzero(self.symbol_code == code)
+        return int(hits[0]) if len(hits) else None
+
+    def set_quantity(self, symbol, quantity, price, entry_ts):
+        """把標的的持倉調整到 quantity 股（沒有時新增一筆），回傳淨投入金額（買進為正、賣出為負）
+
+        加碼的部分以 price 成交並攤入進場價；減碼以原進場價扣除成本。彙總以差額更新。
+        """
+        i = self.find(symbol)
+        if i is None:
+            self.append(symbol, quantity, price, price, entry_ts)
+            return quantity * price
+        data = self._data
+        old = data['quantity'][i]
+        delta = quantity - old
+        if delta == 0:
+            return 0.0
+        entry = data['entry_price'][i]
+        self.set_price(i, price)
+        self._wins -= int(price > entry)
+        if delta > 0:
+            self._cost += delta * price
+            entry = (old * entry + delta * price) / quantity
+        else:
+            self._cost += delta * entry
+        self._value += delta * price
+        data['quantity'][i] = quantity
+        data['entry_price'][i] = entry
+        self._wins += int(price > entry)
+        return delta * price
+
+    def clear(self):
+        self._size = 0
+        self._value = 0.0
+        self._cost = 0.0
+        self._wins = 0
+
+    def set_price(self, i, price):
+        """更新單筆持倉的現價（彙總以差額更新）"""
+        old = self._data['current_price'][i]
+        entry = self._data['entry_price'][i]
+        self._value += self._data['quantity'][i] * (price - old)
+        self._wins += int(price > entry) - int(old > entry)
+        self._data['current_price'][i] = price
+
+    def _reaggregate(self):
+        quantity = self.quantity
+        self._value = float(quantity @ self.current_price)
+        self._cost = float(quantity @ self.entry_price)
+        self._wins = int(np.count_nonzero(self.current_price > self.entry_price))
+
+    def symbols(self):
+        return [SYMBOL_TABLE[code] for code in self.symbol_code]
+
+    def market_values(self):
+        return self.quantity * self.current_price
+
+    def cost_basis(self):
+        return self.quantity * self.entry_price
+
+    def apply_price_changes(self, change_pcts):
+        """以每筆持倉的漲跌幅更新現價（每筆都變動，彙總以一次向量運算重算）"""
+        self.current_price[:] *= 1 + np.asarray(change_pcts)
+        self._reaggregate()
+
+    def totals(self):
+        """(總市值, 總成本, 獲利筆數)"""
+        return self._value, self._cost, self._wins
+
+    def rows(self):
+        """逐筆持倉（供畫面顯示）"""
+        symbols = self.symbols()
+        for i in range(self._size):
+            yield {
+                'symbol': symbols[i],
+                'quantity': float(self.quantity[i]),
+                'entry_price': float(self.entry_price[i]),
+                'current_price': float(self.current_price[i]),
+                'entry_ts': int(self.entry_ts[i])
+            }
+
+    def copy(self):
+        """欄位與彙總一致的複本（在持有狀態的 lock 時取得，供畫面在 lock 外讀取）"""
+        book = PositionBook(capacity=max(self._size, 8))
+        for name, _ in COLUMNS:
+            book._data[name][:self._size] = self.column(name)
+        book._size = self._size
+        book._value, book._cost, book._wins = self._value, self._cost, self._wins
+        return book
+
+    def to_arrays(self, prefix=''):
+        """匯出為可寫入磁碟的陣列（標的以字串儲存）"""
+        arrays = {prefix + name: self.column(name).copy() for name, _ in COLUMNS if name != 'symbol_code'}
+        arrays[prefix + 'symbol'] = np.array(self.symbols(), dtype=str)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=''):
+        size = len(arrays[prefix + 'quantity'])
+        book = cls(capacity=max(size, 8))
+        book._data['symbol_code'][:size] = [intern_symbol(str(symbol)) for symbol in arrays[prefix + 'symbol']]
+        for name, _ in COLUMNS:
+            if name != 'symbol_code':
+                book._data[name][:size] = arrays[prefix + name]
+        book._size = size
+        book._reaggregate()
+        return book
+
+def summarize_portfolio(book):
+    """投資組合總價值、成本、損益與勝率（讀取累加的彙總，O(1)）"""
+    total_value, total_cost, win_count = book.totals()
+    total_pnl = total_value - total_cost
+    total_return_pct = (total_pnl / total_cost * 100) if total_cost > 0 else 0
+    position_count = len(book)
+    win_rate = (win_count / position_count) * 100 if position_count else 0
+    return {
+        'total_value': total_value,
+        'total_cost': total_cost,
+        'total_pnl': total_pnl,
+        'total_return_pct': total_return_pct,
+        'win_count': win_count,
+        'win_rate': win_rate,
+        'position_count': position_count
+    }
+
+# ====== 每日淨值 ======
+NAV_COLUMNS = (
+    ('day', np.int32),          # 自 1970-01-01 起的日數（UTC）
+    ('nav', np.float64),        # 當日收盤（最後一次記錄）的市值
+    ('flow', np.float64),       # 當日淨投入（買進為正、賣出為負）
+    ('index', np.float64),      # 時間加權單位淨值，第一天為 1
+    ('peak', np.float64)        # 到當日為止的最高單位淨值
+)
+
+def current_day(now=None):
+    return int((time.time() if now is None else now) // 86400)
+
+class NavSeries:
+    """每日淨值時間序列
+
+    每一天只由前一天的收盤列與當日的投入、市值算出，不從第一天重算；
+    同一天重複記錄時覆寫當日列。報酬扣除投入（時間加權），加碼或清倉不會被算成漲跌。
+    """
+
+    def __init__(self, capacity=32):
+        self._size = 0
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in NAV_COLUMNS}
+
+    def __len__(self):
+        return self._size
+
+    def column(self, name):
+        return self._data[name][:self._size]
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._data.values())
+
+    def _reserve(self, size):
+        capacity = len(self._data['nav'])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, array in self._data.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._data[name] = grown
+
+    def record(self, day, nav, flow=0.0):
+        """記錄某一天的市值並累加當日投入（day 不可早於最後一列）"""
+        data = self._data
+        i = self._size - 1
+        if i >= 0 and data['day'][i] > day:
+            raise ValueError(f'day {day} is before the last recorded day {int(data["day"][i])}')
+        if i < 0 or data['day'][i] < day:
+            self._reserve(self._size + 1)
+            i = self._size
+            self._size += 1
+            data['day'][i] = day
+            data['flow'][i] = 0.0
+        data['nav'][i] = nav
+        data['flow'][i] += flow
+        if i == 0:
+            data['index'][i] = data['peak'][i] = 1.0
+            return
+        prev_nav = data['nav'][i - 1]
+        # 前一天沒有持倉（尚未建倉或已清倉）時當日沒有報酬
+        growth = (nav - data['flow'][i]) / prev_nav if prev_nav > 0 else 1.0
+        data['index'][i] = data['index'][i - 1] * growth
+        data['peak'][i] = max(data['peak'][i - 1], data['index'][i])
+
+    def mark(self, book, flow=0.0, now=None):
+        """以持倉簿目前的市值記錄當天"""
+        self.record(current_day(now), book.totals()[0], flow)
+
+    def dates(self):
+        return self.column('day').astype('datetime64[D]')
+
+    def returns(self):
+        """自第一天起的累積報酬（比例）"""
+        index = self.column('index')
+        return index / index[0] - 1 if len(index) else index
+
+    def drawdown(self):
+        """相對歷史高點的回落（比例，0 或負數）"""
+        return self.column('index') / self.column('peak') - 1
+
+    def copy(self):
+        """複本（供畫面在 lock 外讀取）"""
+        nav = NavSeries(capacity=max(self._size, 32))
+        for name, _ in NAV_COLUMNS:
+            nav._data[name][:self._size] = self.column(name)
+        nav._size = self._size
+        return nav
+
+    def to_arrays(self, prefix='nav_'):
+        return {prefix + name: self.column(name).copy() for name, _ in NAV_COLUMNS}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix='nav_'):
+        size = len(arrays[prefix + 'day'])
+        series = cls(capacity=max(size, 32))
+        for name, _ in NAV_COLUMNS:
+            series._data[name][:size] = arrays[prefix + name]
+        series._size = size
+        return series
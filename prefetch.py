@@ -0,0 +1,74 @@
+"""TENKI 預先載入
+
+登入時在背景預先載入使用者接下來最可能看到的頁面：匯入頁面模組（連同 plotly 等依賴），
+再執行頁面註冊表中的 warm 函數，把報價、長期走勢、解決方案與圖表規格放進快取。
+頁面稍後以相同的鍵讀取；背景載入尚未完成時，快取的 single-flight 讓頁面等待同一次上游請求，不會重複取得。
+登入頁顯示時就先載入不分使用者的部分（儀表板的市場報價與圖表）。
+
+環境變數:
+    TENKI_WARMUP_WORKERS=2      預先載入執行緒數，0 表示停用
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from views import warm_page
+
+WARMUP_WORKERS = int(os.environ.get('TENKI_WARMUP_WORKERS', '2'))
+
+# 登入後依序預先載入的頁面（儀表板是登入後的第一個畫面，排在最前面）
+LOGIN_PAGES = ('dashboard', 'solution_generator', 'virtual_portfolio')
+# 登入前就能預先載入、不分使用者的頁面
+ANONYMOUS_PAGES = ('dashboard',)
+
+metrics.describe('tenki_warmup_seconds', 'Time to warm one page in the background by page')
+metrics.describe('tenki_warmup_failures_total', 'Background page warm-ups that raised by page')
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+# (頁面, 使用者, 語言) → 執行中的 Future；同一組合不重複排入
+_inflight = {}
+_lock = threading.Lock()
+
+def _warm(page_key, context):
+    t0 = time.perf_counter()
+    try:
+        warm_page(page_key, context)
+    except Exception:
+        metrics.inc('tenki_warmup_failures_total', page=page_key)
+        logger.exception('warm-up of %s failed', page_key)
+    finally:
+        metrics.observe('tenki_warmup_seconds', time.perf_counter() - t0, page=page_key)
+
+def start_warmup(pages, context):
+    """在背景預先載入頁面，回傳 Future 列表（停用時為空列表）
+
+    context: {'user_key': ... 或 None, 'language': ..., 'risk_preference': ..., 'investment_goal': ...}
+    """
+    global _executor
+    if WARMUP_WORKERS <= 0:
+        return []
+    futures, submitted = [], []
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WARMUP_WORKERS, thread_name_prefix='tenki-warmup')
+        for page_key in pages:
+            key = (page_key, context.get('user_key'), context.get('language'))
+            future = _inflight.get(key)
+            if future is None or future.done():
+                future = _inflight[key] = _executor.submit(_warm, page_key, context)
+                submitted.append((key, future))
+            futures.append(future)
+    # 已完成的 Future 會在 add_done_callback 內立即呼叫，必須在釋放 _lock 之後註冊
+    for key, future in submitted:
+        future.add_done_callback(lambda f, key=key: _forget(key, f))
+    return futures
+
+def _forget(key, future):
+    with _lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
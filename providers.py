@@ -0,0 +1,190 @@
+"""TENKI 行情資料來源
+
+所有上游行情（收盤價 history、殖利率與本益比 fundamentals、名稱與分類等基本資料 metadata、匯率 fx_rate）都經由 provider 取得，方便以錄製好的 fixture 離線執行基準測試與負載測試。
+行程共用的 provider 以 InstrumentedProvider 包裝，依標的記錄上游延遲、錯誤、逾時與空結果（管理頁面與 /metrics）。
+標的標籤只用已知的標的（標的池、隨附的基本資料與匯率幣別），其餘一律標為 other，
+公開 API 查詢任意字串時指標序列不會無限增加。
+
+環境變數:
+    TENKI_DATA_PROVIDER=yfinance          預設，使用 yfinance
+    TENKI_DATA_PROVIDER=fixture:<path>    使用錄製的 JSON fixture
+"""
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+import metrics
+
+UPSTREAM_SECONDS = 'tenki_upstream_seconds'
+UPSTREAM_ERRORS = 'tenki_upstream_errors_total'
+metrics.describe(UPSTREAM_SECONDS, 'Upstream call latency by call and symbol')
+metrics.describe(UPSTREAM_ERRORS, 'Upstream calls that failed by call, symbol and kind (error/timeout/empty)')
+
+# 各期間對應的交易日數
+PERIOD_DAYS = {'d': 1, 'wk': 5, 'mo': 21, 'y': 252}
+
+def period_to_days(period):
+    """將 yfinance 期間字串（2d、6mo、1y…）轉為交易日數，'max' 回傳 None"""
+    if period == 'max':
+        return None
+    for unit in ('mo', 'wk', 'y', 'd'):
+        if period.endswith(unit):
+            return int(period[:-len(unit)]) * PERIOD_DAYS[unit]
+    raise ValueError(f'unknown period: {period}')
+
+class YFinanceProvider:
+    """yfinance 上游"""
+    name = 'yfinance'
+
+    def history(self, symbol, period='2d'):
+        import yfinance as yf
+        return yf.Ticker(symbol).history(period=period)['Close']
+
+    def fundamentals(self, symbol):
+        import yfinance as yf
+        info = yf.Ticker(symbol).info
+        return {'dividend_yield': info.get('trailingAnnualDividendYield'), 'pe': info.get('trailingPE')}
+
+    def fx_rate(self, currency):
+        """1 美元可換得的 currency 數量（最近收盤）"""
+        import yfinance as yf
+        return yf.Ticker(f'{currency}=X').history(period='5d')['Close'].dropna().iloc[-1]
+
+    def metadata(self, symbol):
+        import yfinance as yf
+        info = yf.Ticker(symbol).info
+        expense_ratio = info.get('annualReportExpenseRatio')
+        if expense_ratio is None and info.get('netExpenseRatio') is not None:
+            # netExpenseRatio 以百分比表示
+            expense_ratio = info['netExpenseRatio'] / 100
+        return {
+            'name': info.get('longName') or info.get('shortName'),
+            'quote_type': info.get('quoteType'),
+            'sector': info.get('sector') or info.get('category'),
+            # ETF 沒有 country，沿用原有的地區
+            'country': info.get('country') if info.get('quoteType') != 'ETF' else None,
+            'expense_ratio': expense_ratio,
+            'dividend_yield': info.get('yield') if info.get('quoteType') == 'ETF' else info.get('trailingAnnualDividendYield')
+        }
+
+class FixtureProvider:
+    """錄製的收盤價 fixture（格式見 benchmarks/record_fixtures.py）"""
+    name = 'fixture'
+
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+        self.path = path
+        self.source = raw.get('source', 'unknown')
+        self.series = {
+            symbol: pd.Series(data['close'], index=pd.to_datetime(data['dates']), name='Close')
+            for symbol, data in raw['symbols'].items()
+        }
+        self._fundamentals = raw.get('fundamentals', {})
+        self._fx = raw.get('fx', {})
+
+    def symbols(self):
+        return list(self.series)
+
+    def history(self, symbol, period='2d'):
+        closes = self.series[symbol]
+        days = period_to_days(period)
+        return closes if days is None else closes.iloc[-days:]
+
+    def fundamentals(self, symbol):
+        return self._fundamentals[symbol]
+
+    def fx_rate(self, currency):
+        return self._fx[currency]
+
+    def metadata(self, symbol):
+        # fixture 只錄製殖利率；其餘欄位沿用隨附的基本資料
+        return {'dividend_yield': self._fundamentals[symbol].get('dividend_yield')}
+
+# ====== 指標標籤 ======
+OTHER_SYMBOL = 'other'
+_known_symbols = None
+
+def known_symbols():
+    """可作為指標標籤的標的（第一次使用時載入；在函數內匯入，避免與 symbols、screener、fx 循環匯入）"""
+    global _known_symbols
+    if _known_symbols is None:
+        from fx import CURRENCIES
+        from screener import read_universe
+        from symbols import SEED_FILE, read_records
+        _known_symbols = frozenset(read_universe()) | frozenset(read_records(SEED_FILE)) | frozenset(CURRENCIES)
+    return _known_symbols
+
+def symbol_label(symbol):
+    """指標的 symbol 標籤：未知的標的歸入 other"""
+    return symbol if symbol in known_symbols() else OTHER_SYMBOL
+
+def error_kind(error):
+    """上游例外的分類：逾時（socket、requests、curl_cffi 的 Timeout）或其他錯誤"""
+    if isinstance(error, TimeoutError) or 'Timeout' in type(error).__name__:
+        return 'timeout'
+    return 'error'
+
+class InstrumentedProvider:
+    """記錄每次上游呼叫延遲與失敗的 provider 包裝（每次呼叫只多一次計時與加鎖的累加）"""
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def __getattr__(self, name):
+        return getattr(self.provider, name)
+
+    def _call(self, call, symbol, *args, **kwargs):
+        label = symbol_label(symbol)
+        t0 = time.perf_counter()
+        try:
+            result = getattr(self.provider, call)(symbol, *args, **kwargs)
+        except Exception as e:
+            metrics.inc(UPSTREAM_ERRORS, call=call, symbol=label, kind=error_kind(e))
+            raise
+        finally:
+            metrics.observe(UPSTREAM_SECONDS, time.perf_counter() - t0, call=call, symbol=label)
+        # yfinance 在網路錯誤時常回傳空的 Series 而不是拋出例外
+        if call == 'history' and not len(result):
+            metrics.inc(UPSTREAM_ERRORS, call=call, symbol=label, kind='empty')
+        return result
+
+    def history(self, symbol, period='2d'):
+        return self._call('history', symbol, period=period)
+
+    def fundamentals(self, symbol):
+        return self._call('fundamentals', symbol)
+
+    def metadata(self, symbol):
+        return self._call('metadata', symbol)
+
+    def fx_rate(self, currency):
+        return self._call('fx_rate', currency)
+
+_provider = None
+_provider_lock = threading.Lock()
+
+def make_provider(spec):
+    """依設定字串建立 provider"""
+    if spec.startswith('fixture:'):
+        return FixtureProvider(spec[len('fixture:'):])
+    if spec == 'yfinance':
+        return YFinanceProvider()
+    raise ValueError(f'unknown data provider: {spec}')
+
+def get_provider():
+    """行程共用的 provider"""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = InstrumentedProvider(make_provider(os.environ.get('TENKI_DATA_PROVIDER', 'yfinance')))
+        return _provider
+
+def set_provider(provider):
+    """替換行程共用的 provider（基準測試與負載測試使用）"""
+    global _provider
+    with _provider_lock:
+        _provider = InstrumentedProvider(provider)
@@ -0,0 +1,176 @@
+"""TENKI 再平衡
+
+把組合的持倉調回解決方案目標配置（targets 的 allocation %）所需的最少交易。
+多個組合（所有使用者的策略組合）一次組成批次：持倉與目標權重以 (組合 × 標的) 矩陣表示
+（同一標的的多筆持倉以一次 np.bincount 合併），市值、偏離、交易股數與現金限制都是整批的陣列運算，不逐一組合計算。
+
+- 只交易權重偏離目標超過門檻帶的標的（帶內不動），交易後回到目標權重；
+- 股數取整到每手股數（向零取整，不超買也不超賣）；不在目標中且有價格的持倉不論偏離多少都整筆賣出；
+- 買進總額超過可用資金（現金 + 賣出所得）時，買進依比例縮減後再取整到整手；
+- 目標中的減碼所得原本要買進的標的沒有價格或一手買不起時，減碼依比例縮減（取整到整手時多賣不少賣），不留下閒置現金。
+
+環境變數:
+    TENKI_REBALANCE_BAND=0.05   門檻帶（權重偏離超過 ±5 個百分點才交易）
+    TENKI_REBALANCE_LOT=1       預設每手股數
+"""
+import os
+import time
+
+import numpy as np
+
+import metrics
+from market import get_quotes
+from portfolio import SYMBOL_TABLE, intern_symbol
+from session_store import get_store
+from solutions import get_solution, solution_key
+from strategies import STRATEGIES, strategy_symbols
+
+BAND = float(os.environ.get('TENKI_REBALANCE_BAND', '0.05'))
+DEFAULT_LOT = int(os.environ.get('TENKI_REBALANCE_LOT', '1'))
+# 每批最多的組合數（限制 (組合 × 標的) 矩陣的大小）
+BATCH_PORTFOLIOS = 10_000
+# 取整前的容許誤差（股數恰好是整手時不因浮點誤差少一手）
+_LOT_EPSILON = 1e-9
+
+metrics.describe('tenki_rebalance_portfolios_total', 'Portfolios planned by the batch rebalancing job')
+metrics.describe('tenki_rebalance_trades_total', 'Trades proposed by the batch rebalancing job')
+metrics.describe('tenki_rebalance_batch_seconds', 'Wall time of one batch rebalancing run')
+metrics.describe('tenki_rebalance_portfolios_per_second', 'Throughput of the last batch rebalancing run')
+
+def target_weights(solution):
+    """解決方案的目標權重 {標的: 比例}"""
+    return {target['symbol']: target['allocation'] / 100 for target in solution['targets']}
+
+# ====== 批次 ======
+def build_batch(portfolios, prices, lot_sizes=None):
+    """組成批次矩陣
+
+    portfolios 為 [(PositionBook, {標的: 目標權重}, 現金)]，prices 為 {標的: 價格}；
+    沒有報價的持倉以持倉簿的現價計，沒有報價也沒有持倉的目標標的不交易。
+    """
+    lot_sizes = lot_sizes or {}
+    count = len(portfolios)
+    books = [book for book, _, _ in portfolios]
+    held_columns = [(book.symbol_code, book.quantity, book.current_price) for book in books]
+    empty = (np.empty(0, dtype=np.int32), np.empty(0), np.empty(0))
+    codes, quantities, current = (np.concatenate(arrays) for arrays in zip(*held_columns, empty))
+    rows = np.repeat(np.arange(count), [len(book) for book in books])
+    # 目標權重通常由同一個解決方案共用：每組不同的目標只轉換一次，各組合以組別索引取列
+    groups = {}
+    group_of = np.array([groups.setdefault(id(targets), (len(groups), targets))[0] for _, targets, _ in portfolios], dtype=np.intp)
+    group_targets = [targets for _, targets in groups.values()]
+    target_codes = np.array([intern_symbol(symbol) for targets in group_targets for symbol in targets], dtype=np.int32)
+
+    columns = np.unique(np.concatenate([codes, target_codes]))
+    width = len(columns)
+    held = np.searchsorted(columns, codes)
+    quantity = np.bincount(rows * width + held, weights=quantities, minlength=count * width).reshape(count, width)
+    group_weights = np.zeros((len(group_targets), width))
+    group_rows = np.repeat(np.arange(len(group_targets)), [len(targets) for targets in group_targets])
+    group_weights[group_rows, np.searchsorted(columns, target_codes)] = [weight for targets in group_targets for weight in targets.values()]
+    weights = group_weights[group_of]
+    symbols = [SYMBOL_TABLE[code] for code in columns]
+    price = np.array([prices.get(symbol, np.nan) for symbol in symbols], dtype=np.float64)
+    fallback = np.full(width, np.nan)
+    fallback[held] = current
+    return {
+        'symbols': symbols,
+        'quantity': quantity,
+        'weights': weights,
+        'prices': np.where(np.isnan(price), fallback, price),
+        'lots': np.array([lot_sizes.get(symbol, DEFAULT_LOT) for symbol in symbols], dtype=np.float64),
+        'cash': np.array([cash for _, _, cash in portfolios], dtype=np.float64)
+    }
+
+def _round_lots(shares, lots):
+    """向零取整到整手"""
+    return np.trunc(shares / lots + np.copysign(_LOT_EPSILON, shares)) * lots
+
+def plan_rebalance(batch, band=BAND):
+    """整批計算交易股數：(組合 × 標的) 矩陣，正為買進、負為賣出"""
+    quantity, weights, lots, cash = batch['quantity'], batch['weights'], batch['lots'], batch['cash']
+    priced = batch['prices'] > 0
+    prices = np.where(priced, batch['prices'], 0.0)
+    value = quantity * prices
+    total = value.sum(axis=1) + cash
+    with np.errstate(invalid='ignore', divide='ignore'):
+        current = np.where(total[:, None] > 0, value / total[:, None], 0.0)
+        # 只交易偏離超過門檻帶且有價格的標的，調回目標市值
+        outside = (np.abs(current - weights) > band) & priced
+        shares = np.where(outside, (weights * total[:, None] - value) / np.where(priced, prices, 1.0), 0.0)
+    shares = _round_lots(shares, lots)
+    # 目標中沒有的標的不論是否在帶內都整筆賣出（零股也一併賣出）
+    liquidate = (weights == 0) & (quantity > 0) & priced
+    shares = np.where(liquidate, -quantity, shares)
+
+    # 可用資金不足時，買進依比例縮減後重新取整
+    buys = np.maximum(shares, 0.0)
+    cost = buys @ prices
+    sells = np.maximum(-shares, 0.0)
+    available = cash + sells @ prices
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scale = np.where(cost > available, np.maximum(available, 0.0) / cost, 1.0)
+    buys = np.floor(buys * scale[:, None] / lots + _LOT_EPSILON) * lots
+
+    # 偏低超過門檻帶的目標標的（含沒有價格的）應買未買的金額，由目標中的減碼少賣抵銷
+    with np.errstate(invalid='ignore'):
+        underweight = (weights - current > band) & (weights > 0)
+    blocked = np.where(underweight, weights * total[:, None] - value - buys * prices, 0.0).clip(min=0.0).sum(axis=1)
+    trims = np.where(liquidate, 0.0, sells)
+    proceeds = trims @ prices
+    spare = np.minimum(blocked, available - buys @ prices).clip(min=0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        keep = np.where(proceeds > 0, 1.0 - np.minimum(spare, proceeds) / proceeds, 1.0)
+    trims = np.minimum(np.ceil(trims * keep[:, None] / lots - _LOT_EPSILON) * lots, trims)
+    return np.where(shares > 0, buys, np.where(liquidate, shares, -trims))
+
+def trade_lists(batch, shares):
+    """各組合的交易清單（先賣後買），[{'symbol', 'side', 'quantity', 'price', 'value'}]"""
+    rows, cols = np.nonzero(shares)
+    quantities = shares[rows, cols]
+    values = quantities * batch['prices'][cols]
+    order = np.lexsort((values, rows))
+    rows, cols, quantities, values = rows[order], cols[order], quantities[order], values[order]
+    bounds = np.searchsorted(rows, np.arange(len(shares) + 1)).tolist()
+    # 先整批轉成 Python 數值，再依組合切開
+    symbols = [batch['symbols'][col] for col in cols.tolist()]
+    trades = [{'symbol': symbol, 'side': 'buy' if value > 0 else 'sell', 'quantity': abs(quantity), 'price': price, 'value': abs(value)}
+              for symbol, quantity, price, value in zip(symbols, quantities.tolist(), batch['prices'][cols].tolist(), values.tolist())]
+    return [trades[bounds[i]:bounds[i + 1]] for i in range(len(shares))]
+
+def rebalance_portfolio(book, targets, prices, cash=0.0, band=BAND, lot_sizes=None):
+    """單一組合的交易清單（一個組合的批次）"""
+    batch = build_batch([(book, targets, cash)], prices, lot_sizes)
+    return trade_lists(batch, plan_rebalance(batch, band))[0]
+
+# ====== 所有使用者 ======
+def rebalance_all(store=None, cash=None, band=BAND, lot_sizes=None):
+    """為記憶體中所有使用者的策略組合計算再平衡交易（每 BATCH_PORTFOLIOS 個組合一批）
+
+    cash 為 {(使用者鍵, 組合名稱): 現金}，預設為 0。
+    回傳 {(使用者鍵, 組合名稱): 交易清單}；不是以解決方案鍵命名的組合（例如舊版的 default）不列入。
+    """
+    t0 = time.perf_counter()
+    store = store or get_store()
+    cash = cash or {}
+    targets = {solution_key(risk, goal): target_weights(get_solution(solution_key(risk, goal))) for risk, goal in STRATEGIES}
+    entries = [(user_key, name, portfolio['book']) for user_key, name, portfolio in store.portfolios()
+               if name in targets and (len(portfolio['book']) or cash.get((user_key, name)))]
+    held = np.unique(np.concatenate([book.symbol_code for _, _, book in entries] + [np.empty(0, dtype=np.int32)]))
+    quotes = get_quotes(list(dict.fromkeys(strategy_symbols() + [SYMBOL_TABLE[code] for code in held])))
+    prices = {symbol: quote['price'] for symbol, quote in quotes.items()}
+
+    plans = {}
+    for start in range(0, len(entries), BATCH_PORTFOLIOS):
+        chunk = entries[start:start + BATCH_PORTFOLIOS]
+        batch = build_batch([(book, targets[name], cash.get((user_key, name), 0.0)) for user_key, name, book in chunk],
+                            prices, lot_sizes)
+        for (user_key, name, _), trades in zip(chunk, trade_lists(batch, plan_rebalance(batch, band))):
+            plans[(user_key, name)] = trades
+
+    elapsed = time.perf_counter() - t0
+    metrics.inc('tenki_rebalance_portfolios_total', len(plans))
+    metrics.inc('tenki_rebalance_trades_total', sum(len(trades) for trades in plans.values()))
+    metrics.observe('tenki_rebalance_batch_seconds', elapsed)
+    metrics.set_gauge('tenki_rebalance_portfolios_per_second', len(plans) / elapsed if elapsed > 0 else 0.0)
+    return plans
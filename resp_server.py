@@ -0,0 +1,190 @@
+"""TENKI 本機快取伺服器
+
+只實作共用快取用到的 Redis 指令子集（RESP2），供開發與負載測試在沒有 Redis 的環境
+以 TENKI_CACHE_BACKEND=redis://127.0.0.1:6380/0 執行多個副本:
+
+    python resp_server.py --port 6380
+
+支援 PING、ECHO、GET、MGET、SET（EX/PX/NX/XX）、DEL、EXISTS、PTTL、SCAN（MATCH/COUNT）、
+DBSIZE、FLUSHDB、SELECT 與 AUTH（兩者皆接受但不區分資料庫與密碼）。資料只存在記憶體中，
+過期的鍵在讀取或 SCAN 時刪除。正式環境請使用 Redis 或 Valkey。
+"""
+import argparse
+import fnmatch
+import socketserver
+import threading
+import time
+
+def _bulk(value):
+    if value is None:
+        return b'$-1\r\n'
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+def _array(items):
+    return b'*%d\r\n' % len(items) + b''.join(items)
+
+class Store:
+    """鍵 → (值, 到期時間 或 None)"""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def _alive(self, key, now):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            del self.data[key]
+            return None
+        return entry
+
+    def execute(self, args):
+        name = args[0].decode('ascii', 'replace').upper()
+        handler = COMMANDS.get(name)
+        if handler is None:
+            return b'-ERR unknown command \'%s\'\r\n' % name.encode('ascii', 'replace')
+        try:
+            with self.lock:
+                return handler(self, args[1:], time.time())
+        except (IndexError, ValueError):
+            return b'-ERR syntax error\r\n'
+
+    def ping(self, args, now):
+        return _bulk(args[0]) if args else b'+PONG\r\n'
+
+    def get(self, args, now):
+        entry = self._alive(args[0], now)
+        return _bulk(entry[0] if entry else None)
+
+    def mget(self, args, now):
+        entries = [self._alive(key, now) for key in args]
+        return _array([_bulk(entry[0] if entry else None) for entry in entries])
+
+    def set(self, args, now):
+        key, value = args[0], args[1]
+        expires_at, nx, xx = None, False, False
+        options = iter(args[2:])
+        for option in options:
+            option = option.upper()
+            if option == b'EX':
+                expires_at = now + int(next(options))
+            elif option == b'PX':
+                expires_at = now + int(next(options)) / 1000
+            elif option == b'NX':
+                nx = True
+            elif option == b'XX':
+                xx = True
+            else:
+                raise ValueError(option)
+        exists = self._alive(key, now) is not None
+        if (nx and exists) or (xx and not exists):
+            return _bulk(None)
+        self.data[key] = (value, expires_at)
+        return b'+OK\r\n'
+
+    def delete(self, args, now):
+        removed = 0
+        for key in args:
+            if self._alive(key, now) is not None:
+                del self.data[key]
+                removed += 1
+        return b':%d\r\n' % removed
+
+    def exists(self, args, now):
+        return b':%d\r\n' % sum(self._alive(key, now) is not None for key in args)
+
+    def pttl(self, args, now):
+        entry = self._alive(args[0], now)
+        if entry is None:
+            return b':-2\r\n'
+        return b':-1\r\n' if entry[1] is None else b':%d\r\n' % int((entry[1] - now) * 1000)
+
+    def scan(self, args, now):
+        # 一次回傳所有符合的鍵（游標固定回到 0）
+        pattern = b'*'
+        options = iter(args[1:])
+        for option in options:
+            option = option.upper()
+            if option == b'MATCH':
+                pattern = next(options)
+            elif option == b'COUNT':
+                next(options)
+        keys = [key for key in list(self.data) if self._alive(key, now) and fnmatch.fnmatchcase(key, pattern)]
+        return _array([_bulk(b'0'), _array([_bulk(key) for key in keys])])
+
+    def dbsize(self, args, now):
+        return b':%d\r\n' % sum(self._alive(key, now) is not None for key in list(self.data))
+
+    def flushdb(self, args, now):
+        self.data.clear()
+        return b'+OK\r\n'
+
+    def accept(self, args, now):
+        return b'+OK\r\n'
+
+COMMANDS = {
+    'PING': Store.ping, 'ECHO': Store.ping, 'GET': Store.get, 'MGET': Store.mget, 'SET': Store.set, 'DEL': Store.delete,
+    'EXISTS': Store.exists, 'PTTL': Store.pttl, 'SCAN': Store.scan, 'DBSIZE': Store.dbsize,
+    'FLUSHDB': Store.flushdb, 'FLUSHALL': Store.flushdb, 'SELECT': Store.accept, 'AUTH': Store.accept
+}
+
+def read_command(reader):
+    """讀取一個 RESP 陣列指令；連線關閉時回傳 None"""
+    line = reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b'*'):
+        # inline 指令（例如 telnet 輸入的 PING）
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        header = reader.readline()
+        length = int(header[1:])
+        args.append(reader.read(length + 2)[:-2])
+    return args
+
+class RespHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            try:
+                args = read_command(self.rfile)
+            except (ValueError, ConnectionError):
+                return
+            if args is None:
+                return
+            if args:
+                self.wfile.write(store.execute(args))
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, RespHandler)
+        self.store = Store()
+
+def make_server(host='127.0.0.1', port=6380):
+    """建立伺服器（port 0 使用任意可用埠，見 server.server_address）"""
+    return RespServer((host, port))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Minimal Redis-protocol cache server for local development')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6380)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port)
+    print(f'TENKI cache server listening on redis://{args.host}:{server.server_address[1]}/0')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""TENKI 標的篩選器
+
+整個標的池的收盤價載入為一個 標的 × 交易日 矩陣，動能、波動率、殖利率、本益比
+等因子對所有標的一次向量計算；篩選與排序也只是布林遮罩與 argsort。
+標的池與因子快取 TENKI_UNIVERSE_TTL 秒（設定共用快取後端時由所有副本共用）。
+
+環境變數:
+    TENKI_UNIVERSE_FILE=<path>    標的池清單（預設 data/universe.txt）
+    TENKI_UNIVERSE_TTL=3600       標的池快取秒數
+"""
+import os
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache import TTLCache
+from providers import get_provider
+from tracing import span
+
+UNIVERSE_FILE = os.environ.get('TENKI_UNIVERSE_FILE', os.path.join(os.path.dirname(__file__), 'data', 'universe.txt'))
+UNIVERSE_TTL = int(os.environ.get('TENKI_UNIVERSE_TTL', '3600'))
+TRADING_DAYS = 252
+# 動能排除最近一個月（12-1 動能）
+MOMENTUM_SKIP = 21
+
+def read_universe(path=UNIVERSE_FILE):
+    """讀取標的池清單（空白或換行分隔，# 為註解）"""
+    symbols = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            symbols.extend(line.split('#', 1)[0].split())
+    return list(dict.fromkeys(symbols))
+
+# ====== 標的池 ======
+def _fetch_symbol(symbol, provider, period):
+    try:
+        closes = provider.history(symbol, period=period)
+    except Exception:
+        return None
+    try:
+        fundamentals = provider.fundamentals(symbol)
+    except Exception:
+        fundamentals = {}
+    return symbol, closes, fundamentals
+
+def _number(value):
+    return np.nan if value is None else value
+
+def build_universe(symbols, closes, dividend_yield, pe, days=None):
+    """由收盤價矩陣與基本面陣列建立標的池，並一次計算所有因子"""
+    closes = np.asarray(closes, dtype=np.float64)
+    if days is None:
+        days = np.datetime64('today', 'D') - np.arange(closes.shape[1])[::-1]
+    universe = {
+        'symbols': np.asarray(symbols, dtype=str),
+        'closes': closes,
+        'days': np.asarray(days, dtype='datetime64[D]'),
+        'dividend_yield': np.asarray(dividend_yield, dtype=np.float64),
+        'pe': np.asarray(pe, dtype=np.float64),
+        'as_of': time.time()
+    }
+    universe['factors'] = compute_factors(universe['closes'], universe['dividend_yield'], universe['pe'])
+    return universe
+
+def load_universe(symbols=None, provider=None, period='1y'):
+    """向上游並行取得標的池的收盤價與基本面，對齊成矩陣（缺值為 NaN）"""
+    symbols = read_universe() if symbols is None else symbols
+    provider = provider or get_provider()
+    with span('load_universe'), ThreadPoolExecutor(max_workers=16) as executor:
+        results = [r for r in executor.map(lambda s: _fetch_symbol(s, provider, period), symbols) if r]
+    if not results:
+        return build_universe([], np.empty((0, 0)), [], [])
+    frame = pd.concat({symbol: closes for symbol, closes, _ in results}, axis=1).sort_index()
+    return build_universe(
+        list(frame.columns),
+        frame.to_numpy().T,
+        [_number(fundamentals.get('dividend_yield')) for _, _, fundamentals in results],
+        [_number(fundamentals.get('pe')) for _, _, fundamentals in results],
+        frame.index.values.astype('datetime64[D]')
+    )
+
+_universe_cache = TTLCache('screener.universe', ttl=UNIVERSE_TTL, maxsize=1)
+
+def get_universe(provider=None):
+    """TTL 快取的標的池"""
+    return _universe_cache.get_or_compute('universe', lambda: load_universe(provider=provider))
+
+# ====== 因子 ======
+def compute_factors(closes, dividend_yield, pe):
+    """所有標的的動能、年化波動率、殖利率、本益比與盈餘殖利率"""
+    n = closes.shape[0]
+    if n == 0 or closes.shape[1] < 2:
+        empty = np.full(n, np.nan)
+        return {'price': empty, 'momentum': empty, 'volatility': empty,
+                'dividend_yield': dividend_yield, 'pe': pe, 'value': empty}
+    rows = np.arange(n)
+    valid = ~np.isnan(closes)
+    first = closes[rows, valid.argmax(axis=1)]
+    last = closes[rows, closes.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)]
+    skip = min(MOMENTUM_SKIP, closes.shape[1] - 1)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        momentum = closes[:, -1 - skip] / first - 1
+        volatility = np.nanstd(np.diff(np.log(closes), axis=1), axis=1) * np.sqrt(TRADING_DAYS)
+        value = np.where(pe > 0, 1 / pe, np.nan)
+    return {
+        'price': last,
+        'momentum': momentum,
+        'volatility': volatility,
+        'dividend_yield': dividend_yield,
+        'pe': pe,
+        'value': value
+    }
+
+def zscore(values, mask):
+    """以遮罩內的標的計算 z 分數，缺值視為 0（中性）"""
+    selected = values[mask]
+    selected = selected[~np.isnan(selected)]
+    if len(selected) < 2 or not selected.std():
+        return np.zeros_like(values)
+    return np.nan_to_num((values - selected.mean()) / selected.std())
+
+# ====== 篩選 ======
+# 篩選條件鍵 → (因子, 比較方向)
+FILTERS = {
+    'min_momentum': ('momentum', np.greater_equal),
+    'max_volatility': ('volatility', np.less_equal),
+    'min_yield': ('dividend_yield', np.greater_equal),
+    'max_pe': ('pe', np.less_equal)
+}
+
+def screen(universe, spec, exclude=()):
+    """依篩選條件過濾並以加權 z 分數排序，回傳前 spec['top'] 名（exclude 中的標的不列入）
+
+    spec 例: {'min_yield': 0.02, 'max_volatility': 0.3, 'weights': {'dividend_yield': 1, 'volatility': -1}, 'top': 5}
+    """
+    factors = universe['factors']
+    mask = ~np.isnan(factors['price'])
+    for name, threshold in spec.items():
+        if name in FILTERS:
+            factor, compare = FILTERS[name]
+            mask &= compare(factors[factor], threshold)
+    if 'max_pe' in spec:
+        mask &= factors['pe'] > 0
+    if exclude:
+        mask &= ~np.isin(universe['symbols'], list(exclude))
+    candidates = np.flatnonzero(mask)
+    if not len(candidates):
+        return []
+    score = np.zeros(len(universe['symbols']))
+    for factor, weight in spec.get('weights', {}).items():
+        score += weight * zscore(factors[factor], mask)
+    ranked = candidates[np.argsort(-score[candidates], kind='stable')][:spec.get('top', 5)]
+    return [
+        {
+            'symbol': str(universe['symbols'][i]),
+            'score': float(score[i]),
+            'price': float(factors['price'][i]),
+            'momentum': float(factors['momentum'][i]),
+            'volatility': float(factors['volatility'][i]),
+            'dividend_yield': float(factors['dividend_yield'][i]),
+            'pe': float(factors['pe'][i])
+        }
+        for i in ranked
+    ]
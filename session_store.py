@@ -0,0 +1,249 @@
+"""TENKI 使用者狀態儲存
+
+具名的虛擬組合（各自的 PositionBook 與每日淨值 NavSeries）、已生成解決方案的鍵與追蹤清單不放在 st.session_state，
+而是放在行程共用的 SessionStore，以使用者（未登入時為 session）為鍵。
+由解決方案加入的組合以策略的解決方案鍵（例如 moderate/balanced）命名，每個策略一個組合。
+閒置超過 TENKI_SESSION_IDLE_SECONDS 的狀態會寫入磁碟並移出記憶體，
+使用者回來時再從磁碟還原。
+同一使用者的多個 session（分頁、裝置）共用同一份狀態，修改或走訪時持有狀態的 'lock'。
+/metrics 只匯出所有狀態的總量與最大值，不以使用者鍵（含電子郵件）作為標籤；各使用者的大小只在管理頁面顯示。
+
+環境變數:
+    TENKI_SESSION_IDLE_SECONDS=900      閒置多久後寫入磁碟
+    TENKI_SESSION_SPILL_DIR=<path>      寫入目錄（預設為系統暫存目錄下的 tenki-sessions）
+    TENKI_ADMIN_TOKEN=<secret>          開啟管理頁面（?page=admin）需輸入的權杖，預設為空（停用）
+"""
+import hashlib
+import hmac
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import metrics
+from portfolio import NavSeries, PositionBook
+
+IDLE_TIMEOUT = int(os.environ.get('TENKI_SESSION_IDLE_SECONDS', '900'))
+SPILL_DIR = os.environ.get('TENKI_SESSION_SPILL_DIR', os.path.join(tempfile.gettempdir(), 'tenki-sessions'))
+# 兩次閒置掃描之間的最短間隔（秒）
+EVICT_INTERVAL = 30
+# 視為同時在線的最近存取時間（秒）
+ACTIVE_WINDOW = 300
+# 舊版（只有單一組合）寫入的檔案還原後的組合名稱
+DEFAULT_PORTFOLIO = 'default'
+ADMIN_TOKEN = os.environ.get('TENKI_ADMIN_TOKEN', '')
+
+STATE_BYTES = 'tenki_session_state_bytes'
+STATE_BYTES_MAX = 'tenki_session_state_bytes_max'
+metrics.describe(STATE_BYTES, 'Approximate bytes held in memory by all resident user states')
+metrics.describe(STATE_BYTES_MAX, 'Approximate bytes held in memory by the largest resident user state')
+metrics.describe('tenki_sessions_resident', 'User states currently held in memory')
+metrics.describe('tenki_sessions_spilled_total', 'User states written to disk after going idle')
+metrics.describe('tenki_sessions_restored_total', 'User states restored from disk')
+
+def new_portfolio():
+    return {'book': PositionBook(), 'nav': NavSeries()}
+
+def new_state():
+    # portfolios: 組合名稱 → {'book': PositionBook, 'nav': NavSeries}；lock 不寫入磁碟
+    return {'portfolios': {}, 'solutions': [], 'watchlist': [], 'lock': threading.RLock()}
+
+def get_portfolio(state, name):
+    """取得（必要時建立）具名的組合"""
+    portfolio = state['portfolios'].get(name)
+    if portfolio is None:
+        portfolio = state['portfolios'][name] = new_portfolio()
+    return portfolio
+
+def state_nbytes(state):
+    """使用者狀態佔用的記憶體估計（bytes）"""
+    with state['lock']:
+        return (sum(portfolio['book'].nbytes + portfolio['nav'].nbytes + sys.getsizeof(name) for name, portfolio in state['portfolios'].items())
+                + sum(sys.getsizeof(key) for key in state['solutions'] + state['watchlist']))
+
+class SessionStore:
+    """行程共用、可將閒置狀態寫入磁碟的使用者狀態儲存"""
+
+    def __init__(self, spill_dir=SPILL_DIR, idle_timeout=IDLE_TIMEOUT):
+        self.spill_dir = spill_dir
+        self.idle_timeout = idle_timeout
+        self._states = {}
+        # 使用者鍵 → 上次量測的狀態大小（彙總成量表）
+        self._nbytes = {}
+        self._last_seen = {}
+        self._last_sweep = 0.0
+        # Streamlit session ID → 最後一次 rerun 的時間（同時在線數，未登入的 session 也計入）
+        self._sessions = {}
+        self._lock = threading.RLock()
+
+    def _spill_path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.spill_dir, f'{digest}.npz')
+
+    def get(self, key, now=None):
+        """取得（必要時還原或建立）使用者狀態並更新最後存取時間"""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._restore(key) or new_state()
+                self._states[key] = state
+                metrics.set_gauge('tenki_sessions_resident', len(self._states))
+            self._last_seen[key] = now
+        self.maybe_evict(now)
+        return state
+
+    def _publish_nbytes(self):
+        metrics.set_gauge(STATE_BYTES, sum(self._nbytes.values()))
+        metrics.set_gauge(STATE_BYTES_MAX, max(self._nbytes.values(), default=0))
+
+    def update_gauge(self, key):
+        """重新量測單一使用者的狀態大小並更新總量與最大值量表"""
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._nbytes[key] = state_nbytes(state)
+                self._publish_nbytes()
+        return state
+
+    def memory_bytes(self):
+        """各使用者目前在記憶體中的狀態大小"""
+        with self._lock:
+            return {key: state_nbytes(state) for key, state in self._states.items()}
+
+    def portfolios(self):
+        """記憶體中所有使用者的組合 [(使用者鍵, 組合名稱, 組合)]（已寫入磁碟的閒置狀態不列入）"""
+        with self._lock:
+            entries = []
+            for key, state in self._states.items():
+                with state['lock']:
+                    entries.extend((key, name, portfolio) for name, portfolio in state['portfolios'].items())
+            return entries
+
+    def record_rerun(self, session_id, now=None):
+        """記錄 session 的 rerun（每次 rerun 呼叫一次）"""
+        with self._lock:
+            self._sessions[session_id] = time.time() if now is None else now
+
+    def active_count(self, window=ACTIVE_WINDOW, now=None):
+        """最近 window 秒內有 rerun 的 session 數（同時在線）"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return sum(1 for seen in self._sessions.values() if now - seen <= window)
+
+    def maybe_evict(self, now=None):
+        """距上次掃描超過 EVICT_INTERVAL 時，將閒置狀態寫入磁碟"""
+        now = time.time() if now is None else now
+        if now - self._last_sweep < EVICT_INTERVAL:
+            return 0
+        return self.evict_idle(now)
+
+    def evict_idle(self, now=None):
+        """將閒置超過 idle_timeout 的狀態寫入磁碟並移出記憶體"""
+        now = time.time() if now is None else now
+        evicted = 0
+        with self._lock:
+            self._last_sweep = now
+            for session_id in [session_id for session_id, seen in self._sessions.items() if now - seen > self.idle_timeout]:
+                del self._sessions[session_id]
+            idle = [key for key, seen in self._last_seen.items() if now - seen > self.idle_timeout]
+            for key in idle:
+                self._spill(key, self._states.pop(key))
+                del self._last_seen[key]
+                self._nbytes.pop(key, None)
+                evicted += 1
+            self._publish_nbytes()
+            metrics.set_gauge('tenki_sessions_resident', len(self._states))
+        if evicted:
+            metrics.inc('tenki_sessions_spilled_total', evicted)
+        return evicted
+
+    def _spill(self, key, state):
+        with state['lock']:
+            self._write_spill(key, state)
+
+    def _write_spill(self, key, state):
+        if not state['portfolios'] and not state['solutions'] and not state['watchlist']:
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = self._spill_path(key)
+        # 第 i 個組合的欄位以 p{i}_ 為前綴
+        arrays = {'portfolio_names': np.array(list(state['portfolios']), dtype=str)}
+        for i, portfolio in enumerate(state['portfolios'].values()):
+            arrays.update(portfolio['book'].to_arrays(prefix=f'p{i}_'))
+            arrays.update(portfolio['nav'].to_arrays(prefix=f'p{i}_nav_'))
+        arrays['solutions'] = np.array(state['solutions'], dtype=str)
+        arrays['watchlist'] = np.array(state['watchlist'], dtype=str)
+        fd, tmp_path = tempfile.mkstemp(dir=self.spill_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _restore(self, key):
+        path = self._spill_path(key)
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as arrays:
+            if 'portfolio_names' in arrays.files:
+                portfolios = {
+                    str(name): {'book': PositionBook.from_arrays(arrays, prefix=f'p{i}_'), 'nav': NavSeries.from_arrays(arrays, prefix=f'p{i}_nav_')}
+                    for i, name in enumerate(arrays['portfolio_names'])
+                }
+            else:
+                # 舊版寫入的檔案只有單一組合（更早的版本沒有每日淨值）
+                portfolios = {DEFAULT_PORTFOLIO: {
+                    'book': PositionBook.from_arrays(arrays),
+                    'nav': NavSeries.from_arrays(arrays) if 'nav_day' in arrays.files else NavSeries()
+                }}
+            state = {
+                'portfolios': portfolios,
+                'solutions': [str(solution_key) for solution_key in arrays['solutions']],
+                # 舊版寫入的檔案沒有追蹤清單
+                'watchlist': [str(symbol) for symbol in arrays['watchlist']] if 'watchlist' in arrays.files else [],
+                'lock': threading.RLock()
+            }
+        os.remove(path)
+        metrics.inc('tenki_sessions_restored_total')
+        return state
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """行程共用的 SessionStore"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+        return _store
+
+def current_user_key():
+    """目前使用者的狀態鍵：登入後為電子郵件，否則為 session ID"""
+    import streamlit as st
+    from tracing import current_session_id
+    email = st.session_state.get('user_email')
+    return f'user:{email}' if email else f'session:{current_session_id()}'
+
+def admin_enabled():
+    """是否設定了管理權杖（未設定時管理頁面停用）"""
+    return bool(ADMIN_TOKEN)
+
+def is_admin(token):
+    """輸入的權杖是否與 TENKI_ADMIN_TOKEN 相符（登入的電子郵件不能作為管理權限）"""
+    return admin_enabled() and bool(token) and hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+def session_label(key):
+    """管理頁面顯示的狀態鍵：種類加上雜湊前綴，不顯示電子郵件或 session ID"""
+    kind, _, _ = key.partition(':')
+    return f"{kind}:{hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]}"
+
+def get_user_state():
+    """目前使用者的狀態（具名的虛擬組合與其每日淨值、解決方案鍵、追蹤清單）"""
+    return get_store().get(current_user_key())
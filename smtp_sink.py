@@ -0,0 +1,150 @@
+"""本機 SMTP 收件端
+
+開發與測試時代替郵件伺服器：接受所有寄件，存在記憶體中（可選擇寫成 .eml 檔），不會轉寄。
+只實作 notifications.SmtpChannel 需要的指令：HELO/EHLO、MAIL、RCPT、DATA、RSET、NOOP、QUIT。
+
+    python smtp_sink.py                    # 127.0.0.1:1025
+    python smtp_sink.py --port 2525 --maildir /tmp/tenki-mail
+"""
+import argparse
+import asyncio
+import email
+import os
+import threading
+import time
+from email import policy
+
+class Mailbox:
+    """收到的郵件 [(寄件者, 收件者清單, EmailMessage)]"""
+
+    def __init__(self, maildir=None):
+        self.messages = []
+        self.maildir = maildir
+        self._lock = threading.Lock()
+        if maildir:
+            os.makedirs(maildir, exist_ok=True)
+
+    def deliver(self, sender, recipients, data):
+        message = email.message_from_bytes(data, policy=policy.default)
+        with self._lock:
+            self.messages.append((sender, recipients, message))
+            count = len(self.messages)
+        if self.maildir:
+            with open(os.path.join(self.maildir, f'{time.time():.6f}-{count}.eml'), 'wb') as f:
+                f.write(data)
+
+    def __len__(self):
+        return len(self.messages)
+
+async def handle(reader, writer, mailbox):
+    """單一 SMTP 連線"""
+    async def reply(line):
+        writer.write(line.encode() + b'\r\n')
+        await writer.drain()
+
+    sender, recipients = None, []
+    await reply('220 tenki-sink ESMTP')
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command, _, argument = line.decode('utf-8', 'replace').strip().partition(' ')
+            command = command.upper()
+            if command in ('HELO', 'EHLO'):
+                await reply('250 tenki-sink')
+            elif command == 'MAIL':
+                sender, recipients = argument.partition(':')[2].strip().strip('<>'), []
+                await reply('250 OK')
+            elif command == 'RCPT':
+                if sender is None:
+                    await reply('503 need MAIL first')
+                    continue
+                recipients.append(argument.partition(':')[2].strip().strip('<>'))
+                await reply('250 OK')
+            elif command == 'DATA':
+                if not recipients:
+                    await reply('503 need RCPT first')
+                    continue
+                await reply('354 end with <CRLF>.<CRLF>')
+                lines = []
+                while True:
+                    data = await reader.readline()
+                    if not data or data in (b'.\r\n', b'.\n'):
+                        break
+                    # 去掉 dot-stuffing
+                    lines.append(data[1:] if data.startswith(b'..') else data)
+                mailbox.deliver(sender, recipients, b''.join(lines))
+                sender, recipients = None, []
+                await reply('250 OK')
+            elif command == 'RSET':
+                sender, recipients = None, []
+                await reply('250 OK')
+            elif command == 'NOOP':
+                await reply('250 OK')
+            elif command == 'QUIT':
+                await reply('221 bye')
+                break
+            else:
+                await reply('502 command not implemented')
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+class SinkServer:
+    """在背景執行緒執行的 SMTP 收件端（port 0 表示自動選擇）"""
+
+    def __init__(self, host='127.0.0.1', port=0, maildir=None):
+        self.host = host
+        self.port = port
+        self.mailbox = Mailbox(maildir)
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+
+    def start(self):
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), name='tenki-smtp-sink', daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._thread.join()
+            self._loop = None
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(
+            lambda reader, writer: handle(reader, writer, self.mailbox), self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TENKI local SMTP sink')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    parser.add_argument('--maildir', help='also write each message as an .eml file here')
+    args = parser.parse_args(argv)
+
+    sink = SinkServer(args.host, args.port, args.maildir).start()
+    print(f'tenki smtp sink on {args.host}:{sink.port}')
+    try:
+        while True:
+            count = len(sink.mailbox)
+            time.sleep(1)
+            if len(sink.mailbox) != count:
+                for sender, recipients, message in sink.mailbox.messages[count:]:
+                    print(f'{sender} -> {", ".join(recipients)}: {message["Subject"]}')
+    except KeyboardInterrupt:
+        sink.stop()
+
+if __name__ == '__main__':
+    main()
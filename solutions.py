@@ -0,0 +1,239 @@
+"""TENKI 投資解決方案
+
+解決方案由 strategies.STRATEGIES 產生，並以最新報價補上現價與距進出場點位的距離，
+以及篩選器依策略條件從標的池排序出的 picks；標的與 picks 附上本地資料庫的基本資料（symbols.get_metadata）。指標點位（例如 50 日均線）來自串流指標狀態，
+每個新交易日只以 O(1) 更新一次，狀態寫入磁碟供重新啟動後沿用。
+背景排程在盤中每 TENKI_SOLUTION_REFRESH_SECONDS 秒以最新快照重新計算全部組合（休市時等到下一次開盤），
+頁面只讀取預先計算好的結果。設定共用快取後端時，計算結果由所有副本共用。
+
+環境變數:
+    TENKI_SOLUTION_REFRESH_SECONDS=300   盤中重新計算間隔，0 表示不啟動排程
+    TENKI_INDICATOR_STATE=<path>         串流指標狀態檔（預設為系統暫存目錄下的 tenki-indicators.npz）
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import metrics
+from cache import TTLCache
+from indicators import IndicatorStream
+from market import get_quotes
+from market_calendar import MarketHoursTTL
+from screener import get_universe, screen
+from strategies import FALLBACK_STRATEGY, STRATEGIES, strategy_symbols
+from symbols import get_metadata
+from tracing import span
+
+REFRESH_SECONDS = int(os.environ.get('TENKI_SOLUTION_REFRESH_SECONDS', '300'))
+INDICATOR_STATE = os.environ.get('TENKI_INDICATOR_STATE', os.path.join(tempfile.gettempdir(), 'tenki-indicators.npz'))
+
+metrics.describe('tenki_solution_refresh_total', 'Scheduled recomputations of all strategy solutions')
+metrics.describe('tenki_solution_refresh_failures_total', 'Scheduled recomputations that raised')
+metrics.describe('tenki_indicator_bars_total', 'Daily bars folded into the streaming indicator state')
+metrics.describe('tenki_indicator_state_bytes', 'Bytes held by the streaming indicator state')
+
+logger = logging.getLogger(__name__)
+
+# ====== 點位距離 ======
+def resolve_rule(rule, levels):
+    """將指標點位（例如 {'below': 'sma_50'}）換成目前數值；指標尚未算出時回傳 None"""
+    if rule is None:
+        return None
+    resolved = {}
+    for op, level in rule.items():
+        if isinstance(level, str):
+            level = levels.get(level)
+            if level is None:
+                return None
+        resolved[op] = level
+    return resolved
+
+def indicator_level(rule, resolved):
+    """指標點位目前的數值（固定價格點位回傳 None）"""
+    if rule is None or resolved is None:
+        return None
+    for op in ('below', 'above'):
+        if isinstance(rule.get(op), str):
+            return resolved[op]
+    return None
+
+def level_distance(rule, price):
+    """現價到點位的距離（%）：正值需上漲、負值需下跌，已達點位為 0；無點位或無報價為 None"""
+    if rule is None or not price:
+        return None
+    if 'below' in rule:
+        return min(0.0, (rule['below'] - price) / price * 100)
+    if 'above' in rule:
+        return max(0.0, (rule['above'] - price) / price * 100)
+    low, high = rule['range']
+    if price < low:
+        return (low - price) / price * 100
+    if price > high:
+        return (high - price) / price * 100
+    return 0.0
+
+# ====== 投資解決方案 ======
+def solution_key(risk_pref, investment_goal):
+    return f'{risk_pref}/{investment_goal}'
+
+def generate_solution(risk_pref, investment_goal, quotes=None, universe=None, indicators=None):
+    """依策略註冊表生成投資解決方案
+
+    有報價時補上現價與點位距離，有標的池時附上篩選結果；
+    indicators 為 {symbol: {指標: 數值}}，用來換算指標點位。
+    """
+    if (risk_pref, investment_goal) not in STRATEGIES:
+        risk_pref, investment_goal = FALLBACK_STRATEGY
+    strategy = STRATEGIES[(risk_pref, investment_goal)]
+    quotes = quotes or {}
+    indicators = indicators or {}
+    targets = []
+    for target in strategy['targets']:
+        quote = quotes.get(target['symbol'])
+        price = quote['price'] if quote else None
+        levels = indicators.get(target['symbol'], {})
+        entry = resolve_rule(target['entry'], levels)
+        exit_ = resolve_rule(target['exit'], levels)
+        targets.append(dict(
+            target,
+            metadata=get_metadata(target['symbol']),
+            price=price,
+            entry_level=indicator_level(target['entry'], entry),
+            exit_level=indicator_level(target['exit'], exit_),
+            entry_distance_pct=level_distance(entry, price),
+            exit_distance_pct=level_distance(exit_, price)
+        ))
+    picks = []
+    if universe is not None:
+        picks = [dict(pick, metadata=get_metadata(pick['symbol']))
+                 for pick in screen(universe, strategy['screen'], exclude={target['symbol'] for target in targets})]
+    return {
+        'theme': strategy['theme'],
+        'insight': strategy['insight'],
+        'risk': risk_pref,
+        'goal': investment_goal,
+        'targets': targets,
+        'picks': picks
+    }
+
+def precompute_solutions(quotes, universe=None, indicators=None):
+    """以同一份報價快照、標的池與指標計算所有組合的解決方案"""
+    return {solution_key(risk_pref, investment_goal): generate_solution(risk_pref, investment_goal, quotes, universe, indicators)
+            for risk_pref, investment_goal in STRATEGIES}
+
+# ====== 串流指標 ======
+_stream = None
+_stream_lock = threading.Lock()
+
+def sync_indicators(universe, path=INDICATOR_STATE):
+    """以標的池中已收盤、尚未處理的交易日更新串流指標並寫入磁碟
+
+    第一次呼叫時先讀取磁碟上的狀態；標的池出現新標的時以歷史資料重新建立。
+    最後一個交易日視為盤中資料，不寫入狀態。
+    """
+    global _stream
+    symbols, days = universe['symbols'], universe['days']
+    with _stream_lock:
+        if _stream is None and os.path.exists(path):
+            try:
+                _stream = IndicatorStream.load(path)
+            except (OSError, ValueError, KeyError):
+                logger.warning('discarding unreadable indicator state %s', path)
+        if _stream is None or not np.isin(symbols, _stream.symbols).all():
+            _stream = IndicatorStream(symbols)
+        completed = days[:-1]
+        new_days = np.arange(len(completed)) if np.isnat(_stream.last_day) else np.flatnonzero(completed > _stream.last_day)
+        if len(new_days):
+            # 串流中但本次標的池缺少的標的對應到最後一列 NaN（視為沒有新資料）
+            index = {symbol: i for i, symbol in enumerate(symbols)}
+            rows = np.array([index.get(symbol, -1) for symbol in _stream.symbols], dtype=np.int64)
+            closes = np.vstack([universe['closes'], np.full((1, len(days)), np.nan)])
+            for i in new_days:
+                _stream.update(closes[rows, i], days[i])
+            _stream.save(path)
+            metrics.inc('tenki_indicator_bars_total', len(new_days))
+        metrics.set_gauge('tenki_indicator_state_bytes', _stream.nbytes)
+        return _stream
+
+# ====== 預先計算快取 ======
+# 行程共用，session 只保存鍵（例如 'moderate/balanced'）；整份快照一次替換。
+# 快照同時寫入快取（設定共用後端時所有副本共用），每個週期只由一個副本重新計算
+_snapshot = {'as_of': None, 'solutions': {}}
+_snapshots = TTLCache('solutions.snapshot', ttl=MarketHoursTTL(REFRESH_SECONDS or 300), maxsize=1, version=2)
+
+def get_solution(key):
+    """由預先計算的快取取得解決方案；排程尚未完成第一次計算時回傳不含報價的版本"""
+    solution = _snapshot['solutions'].get(key)
+    if solution is None:
+        risk_pref, investment_goal = key.split('/')
+        solution = generate_solution(risk_pref, investment_goal)
+    return solution
+
+def snapshot_time():
+    """目前快取所用報價快照的時間（尚未計算時為 None）"""
+    return _snapshot['as_of']
+
+def compute_snapshot(provider=None):
+    """取得策略標的的最新報價與標的池，重新計算所有解決方案"""
+    with span('refresh_solutions'):
+        quotes = get_quotes(strategy_symbols(), provider)
+        universe = get_universe(provider)
+        indicators = sync_indicators(universe).levels(strategy_symbols())
+        solutions = precompute_solutions(quotes, universe, indicators)
+    metrics.inc('tenki_solution_refresh_total')
+    return {'as_of': time.time(), 'solutions': solutions}
+
+def refresh_solutions(provider=None):
+    """重新計算所有解決方案並寫入快取"""
+    global _snapshot
+    _snapshot = compute_snapshot(provider)
+    _snapshots.set('current', _snapshot)
+    return _snapshot
+
+def sync_solutions(provider=None):
+    """取得這個週期的快照：其他副本已計算時直接使用，否則重新計算"""
+    global _snapshot
+    _snapshot = _snapshots.get_or_compute('current', lambda: compute_snapshot(provider))
+    return _snapshot
+
+# ====== 背景排程 ======
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_stop = threading.Event()
+
+def _run_scheduler(interval):
+    while not _stop.is_set():
+        try:
+            sync_solutions()
+        except Exception:
+            metrics.inc('tenki_solution_refresh_failures_total')
+            logger.exception('solution refresh failed')
+        # 在快照到期時醒來：各副本讀到同一份快照、幾乎同時到期，由取得鎖的副本重新計算
+        expires_at = _snapshots.expires_at('current')
+        _stop.wait(interval if expires_at is None else max(1.0, expires_at - time.time()))
+
+def start_scheduler(interval=None):
+    """啟動背景重新計算（每個行程只啟動一次）"""
+    global _scheduler
+    interval = REFRESH_SECONDS if interval is None else interval
+    if interval <= 0:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _snapshots.ttl = MarketHoursTTL(interval)
+            _stop.clear()
+            _scheduler = threading.Thread(target=_run_scheduler, args=(interval,), name='tenki-solutions', daemon=True)
+            _scheduler.start()
+        return _scheduler
+
+def stop_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _stop.set()
+            _scheduler.join()
+            _scheduler = None
@@ -0,0 +1,471 @@
+"""TENKI 投資策略註冊表
+
+每個 (風險偏好, 投資目標) 組合對應一個策略。標的的 entry / exit 為數值規則:
+    {'below': 380}              價格低於 380 時進場
+    {'range': (200, 220)}       價格落在 200–220 區間時進場
+    {'above': 560}              價格高於 560 時出場
+    {'below': 'sma_50'}         點位也可以是技術指標（見 indicators.compute_all 的鍵）
+    None                        無價格點位（定期定額、基本面條件等）
+entry_point / exit_point 為顯示用的文字說明。
+screen 為篩選器條件（見 screener.screen），篩選結果附在解決方案的 picks。
+"""
+
+RISK_LEVELS = ('conservative', 'moderate', 'aggressive')
+INVESTMENT_GOALS = ('income', 'balanced', 'growth')
+FALLBACK_STRATEGY = ('aggressive', 'growth')
+
+# ====== 策略註冊表 ======
+STRATEGIES = {
+    ('conservative', 'income'): {
+        'theme': '2025年防禦型收益投資策略',
+        'insight': '專注於穩定收益資產，包括高股息股票、政府債券和REIT基金，適合保守型投資者在當前市場環境下獲得穩健回報。',
+        'screen': {'min_yield': 0.025, 'max_volatility': 0.25, 'weights': {'dividend_yield': 1.0, 'volatility': -0.5}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'VYM',
+                'type': '高股息ETF',
+                'allocation': 40,
+                'entry': {'below': 115},
+                'entry_point': '$115以下分批進入',
+                'exit': None,
+                'exit_point': '股息率降至2.5%以下',
+                'expected_return': '5-7%',
+                'analysis': '追蹤高股息美股指數，涵蓋400多檔優質股票，提供穩定現金流，適合收益型投資者長期配置'
+            },
+            {
+                'symbol': 'TLT',
+                'type': '長期公債ETF',
+                'allocation': 35,
+                'entry': None,
+                'entry_point': '當前價位定期定額',
+                'exit': None,
+                'exit_point': 'Fed明確轉向升息',
+                'expected_return': '4-6%',
+                'analysis': '追蹤20年以上美國公債，在降息環境下表現優異，提供穩定收益和避險功能'
+            },
+            {
+                'symbol': 'VNQ',
+                'type': 'REIT ETF',
+                'allocation': 25,
+                'entry': {'below': 90},
+                'entry_point': '回調至$90以下',
+                'exit': None,
+                'exit_point': '利率大幅上升時',
+                'expected_return': '6-8%',
+                'analysis': '不動產投資信託ETF，提供租金收益分配，是通脹對沖的優質工具'
+            }
+        ]
+    },
+    ('conservative', 'balanced'): {
+        'theme': '2025年穩健防禦平衡策略',
+        'insight': '以債券為核心、搭配全市場股票與黃金，在控制波動的前提下參與股市長期成長，適合重視資本保全的投資者。',
+        'screen': {'max_volatility': 0.22, 'weights': {'volatility': -1.0, 'dividend_yield': 0.5, 'momentum': 0.5}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'BND',
+                'type': '綜合債券ETF',
+                'allocation': 40,
+                'entry': {'below': 73},
+                'entry_point': '$73以下分批進入',
+                'exit': None,
+                'exit_point': '長期持有',
+                'expected_return': '3-5%',
+                'analysis': '涵蓋美國投資級債券市場，波動低、配息穩定，是防禦型組合的核心部位'
+            },
+            {
+                'symbol': 'VTI',
+                'type': '全市場ETF',
+                'allocation': 30,
+                'entry': None,
+                'entry_point': '當前價位定期定額',
+                'exit': None,
+                'exit_point': '長期持有',
+                'expected_return': '7-10%',
+                'analysis': '全市場指數ETF，提供最佳分散效果，降低個股風險，適合核心配置'
+            },
+            {
+                'symbol': 'VYM',
+                'type': '高股息ETF',
+                'allocation': 20,
+                'entry': {'below': 115},
+                'entry_point': '$115以下分批進入',
+                'exit': None,
+                'exit_point': '股息率降至2.5%以下',
+                'expected_return': '5-7%',
+                'analysis': '高股息藍籌股組合，提供穩定現金流並降低組合整體波動'
+            },
+            {
+                'symbol': 'GLD',
+                'type': '黃金ETF',
+                'allocation': 10,
+                'entry': {'below': 240},
+                'entry_point': '$240以下分批進入',
+                'exit': {'above': 300},
+                'exit_point': '$300以上部分獲利了結',
+                'expected_return': '3-6%',
+                'analysis': '實體黃金ETF，在市場動盪與通膨升溫時提供避險效果'
+            }
+        ]
+    },
+    ('conservative', 'growth'): {
+        'theme': '2025年低波動成長策略',
+        'insight': '透過低波動與品質因子ETF參與大盤成長，在追求增值的同時限制下檔風險，適合保守但希望資產成長的投資者。',
+        'screen': {'max_volatility': 0.25, 'min_momentum': 0.0, 'weights': {'momentum': 1.0, 'volatility': -1.0}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'USMV',
+                'type': '低波動ETF',
+                'allocation': 35,
+                'entry': {'below': 88},
+                'entry_point': '$88以下分批進入',
+                'exit': None,
+                'exit_point': '長期持有',
+                'expected_return': '6-8%',
+                'analysis': '精選波動度較低的美股，在空頭市場中跌幅相對較小，長期報酬接近大盤'
+            },
+            {
+                'symbol': 'VOO',
+                'type': 'S&P 500 ETF',
+                'allocation': 35,
+                'entry': None,
+                'entry_point': '當前價位定期定額',
+                'exit': None,
+                'exit_point': '長期持有',
+                'expected_return': '7-10%',
+                'analysis': '追蹤S&P 500指數，費用率極低，是長期成長配置的基石'
+            },
+            {
+                'symbol': 'QUAL',
+                'type': '品質因子ETF',
+                'allocation': 20,
+                'entry': {'below': 170},
+                'entry_point': '$170以下分批進入',
+                'exit': None,
+                'exit_point': '品質因子明顯落後大盤時',
+                'expected_return': '7-9%',
+                'analysis': '篩選高ROE、低負債、盈餘穩定的企業，兼顧成長與防禦'
+            },
+            {
+                'symbol': 'BND',
+                'type': '綜合債券ETF',
+                'allocation': 10,
+                'entry': {'below': 73},
+                'entry_point': '$73以下分批進入',
+                'exit': None,
+                'exit_point': '長期持有',
+                'expected_return': '3-5%',
+                'analysis': '少量債券部位作為緩衝，降低股市回檔時的組合波動'
+            }
+        ]
+    },
+    ('moderate', 'income'): {
+        'theme': '2025年收益增強策略',
+        'insight': '以股息成長股為主軸，搭配投資級債券與REIT，在穩定配息的基礎上保留適度的資本增值空間。',
+        'screen': {'min_yield': 0.02, 'max_pe': 25, 'weights': {'dividend_yield': 1.0, 'value': 0.5}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'SCHD',
+                'type': '股息成長ETF',
+                'allocation': 35,
+                'entry': {'below': 27},
+                'entry_point': '$27以下分批進入',
+                'exit': None,
+                'exit_point': '股息成長停滯時',
+                'expected_return': '6-9%',
+                'analysis': '精選連續配息且財務體質穩健的企業，兼具股息成長與資本增值'
+            },
+            {
+                'symbol': 'VYM',
+                'type': '高股息ETF',
+                'allocation': 25,
+                'entry': {'below': 115},
+                'entry_point': '$115以下分批進入',
+                'exit': None,
+                'exit_point': '股息率降至2.5%以下',
+                'expected_return': '5-7%',
+                'analysis': '追蹤高股息美股指數，涵蓋400多檔優質股票，提供穩定現金流'
+            },
+            {
+                'symbol': 'LQD',
+                'type': '投資級債券',
+                'allocation': 25,
+                'entry': None,
+                'entry_point': '收益率4%以上時',
+                'exit': None,
+                'exit_point': 'Fed轉向升息時',
+                'expected_return': '4-5%',
+                'analysis': '投資級企業債券ETF，提供穩定收益，降低組合整體波動性'
+            },
+            {
+                'symbol': 'VNQ',
+                'type': 'REIT ETF',
+                'allocation': 15,
+                'entry': {'below': 90},
+                'entry_point': '回調至$90以下',
+                'exit': None,
+                'exit_point': '利率大幅上升時',
+                'expected_return': '6-8%',
+                'analysis': '不動產投資信託ETF，提供租金收益分配，是通脹對沖的優質工具'
+            }
+        ]
+    },
+    ('moderate', 'balanced'): {
+        'theme': '2025年AI科技平衡配置策略',
+        'insight': '結合科技成長股和防禦性資產，在AI浪潮中尋求平衡收益機會。重點關注AI產業鏈上下游機會，同時保持適度的債券配置。',
+        'screen': {'max_pe': 40, 'weights': {'momentum': 1.0, 'value': 0.5, 'volatility': -0.5}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'QQQ',
+                'type': '科技ETF',
+                'allocation': 30,
+                'entry': {'below': 380},
+                'entry_point': '$380以下分批進入',
+                'exit': None,
+                'exit_point': '估值過高時減碼',
+                'expected_return': '8-12%',
+                'analysis': '追蹤納斯達克100指數，科技股集中度高，受惠於AI浪潮和數位轉型趨勢'
+            },
+            {
+                'symbol': 'NVDA',
+                'type': 'AI晶片龍頭',
+                'allocation': 25,
+                'entry': {'below': 'sma_50'},
+                'entry_point': '回調至50日均線以下分批進入',
+                'exit': None,
+                'exit_point': '基本面轉弱時',
+                'expected_return': '15-25%',
+                'analysis': 'AI晶片絕對領導者，GPU在AI訓練和推理中不可替代，資料中心需求強勁'
+            },
+            {
+                'symbol': 'VTI',
+                'type': '全市場ETF',
+                'allocation': 25,
+                'entry': None,
+                'entry_point': '當前價位定期定額',
+                'exit': None,
+                'exit_point': '長期持有',
+                'expected_return': '7-10%',
+                'analysis': '全市場指數ETF，提供最佳分散效果，降低個股風險，適合核心配置'
+            },
+            {
+                'symbol': 'LQD',
+                'type': '投資級債券',
+                'allocation': 20,
+                'entry': None,
+                'entry_point': '收益率4%以上時',
+                'exit': None,
+                'exit_point': 'Fed轉向升息時',
+                'expected_return': '4-5%',
+                'analysis': '投資級企業債券ETF，提供穩定收益，降低組合整體波動性'
+            }
+        ]
+    },
+    ('moderate', 'growth'): {
+        'theme': '2025年核心成長配置策略',
+        'insight': '以大盤與科技指數為核心，搭配雲端龍頭個股與少量債券，在可承受的波動下追求中長期資本成長。',
+        'screen': {'min_momentum': 0.05, 'max_pe': 50, 'weights': {'momentum': 1.0, 'value': 0.3}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'VOO',
+                'type': 'S&P 500 ETF',
+                'allocation': 35,
+                'entry': None,
+                'entry_point': '當前價位定期定額',
+                'exit': None,
+                'exit_point': '長期持有',
+                'expected_return': '7-10%',
+                'analysis': '追蹤S&P 500指數，費用率極低，是長期成長配置的基石'
+            },
+            {
+                'symbol': 'QQQ',
+                'type': '科技ETF',
+                'allocation': 30,
+                'entry': {'below': 380},
+                'entry_point': '$380以下分批進入',
+                'exit': None,
+                'exit_point': '估值過高時減碼',
+                'expected_return': '8-12%',
+                'analysis': '追蹤納斯達克100指數，受惠於AI浪潮和數位轉型趨勢'
+            },
+            {
+                'symbol': 'MSFT',
+                'type': '雲端AI巨頭',
+                'allocation': 20,
+                'entry': {'below': 380},
+                'entry_point': '$380以下分批',
+                'exit': None,
+                'exit_point': '雲端成長明顯放緩',
+                'expected_return': '12-18%',
+                'analysis': 'Azure雲端服務和AI整合最完整，企業數位轉型的最大受惠者'
+            },
+            {
+                'symbol': 'LQD',
+                'type': '投資級債券',
+                'allocation': 15,
+                'entry': None,
+                'entry_point': '收益率4%以上時',
+                'exit': None,
+                'exit_point': 'Fed轉向升息時',
+                'expected_return': '4-5%',
+                'analysis': '投資級企業債券ETF，在股市修正時提供緩衝'
+            }
+        ]
+    },
+    ('aggressive', 'income'): {
+        'theme': '2025年高收益積極配置策略',
+        'insight': '透過備兌買權、高收益債與股息成長股取得高現金流，接受較高的信用與市場風險以換取更高的配息。',
+        'screen': {'min_yield': 0.03, 'weights': {'dividend_yield': 1.0, 'momentum': 0.5}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'JEPI',
+                'type': '備兌收益ETF',
+                'allocation': 30,
+                'entry': {'below': 56},
+                'entry_point': '$56以下分批進入',
+                'exit': None,
+                'exit_point': '月配息明顯下降時',
+                'expected_return': '7-10%',
+                'analysis': '以股票搭配賣出買權創造月配息，在盤整市況中表現穩定'
+            },
+            {
+                'symbol': 'HYG',
+                'type': '高收益債ETF',
+                'allocation': 25,
+                'entry': {'below': 78},
+                'entry_point': '$78以下分批進入',
+                'exit': {'above': 82},
+                'exit_point': '$82以上或信用利差收窄至歷史低點',
+                'expected_return': '6-8%',
+                'analysis': '非投資級公司債ETF，殖利率較高，需留意景氣轉弱時的信用風險'
+            },
+            {
+                'symbol': 'SCHD',
+                'type': '股息成長ETF',
+                'allocation': 25,
+                'entry': {'below': 27},
+                'entry_point': '$27以下分批進入',
+                'exit': None,
+                'exit_point': '股息成長停滯時',
+                'expected_return': '6-9%',
+                'analysis': '精選連續配息且財務體質穩健的企業，兼具股息成長與資本增值'
+            },
+            {
+                'symbol': 'VNQ',
+                'type': 'REIT ETF',
+                'allocation': 20,
+                'entry': {'below': 90},
+                'entry_point': '回調至$90以下',
+                'exit': None,
+                'exit_point': '利率大幅上升時',
+                'expected_return': '6-8%',
+                'analysis': '不動產投資信託ETF，提供租金收益分配，是通脹對沖的優質工具'
+            }
+        ]
+    },
+    ('aggressive', 'balanced'): {
+        'theme': '2025年科技成長與收益並進策略',
+        'insight': '以科技成長股追求超額報酬，同時配置股息成長股與長天期公債，在積極進攻中保留一定的防守能力。',
+        'screen': {'min_momentum': 0.0, 'weights': {'momentum': 1.0, 'dividend_yield': 0.5}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'QQQ',
+                'type': '科技ETF',
+                'allocation': 35,
+                'entry': {'below': 380},
+                'entry_point': '$380以下分批進入',
+                'exit': None,
+                'exit_point': '估值過高時減碼',
+                'expected_return': '8-12%',
+                'analysis': '追蹤納斯達克100指數，科技股集中度高，受惠於AI浪潮和數位轉型趨勢'
+            },
+            {
+                'symbol': 'NVDA',
+                'type': 'AI晶片龍頭',
+                'allocation': 25,
+                'entry': {'below': 'sma_50'},
+                'entry_point': '回調至50日均線以下分批進入',
+                'exit': None,
+                'exit_point': '基本面轉弱時',
+                'expected_return': '15-25%',
+                'analysis': 'AI晶片絕對領導者，GPU在AI訓練和推理中不可替代，資料中心需求強勁'
+            },
+            {
+                'symbol': 'SCHD',
+                'type': '股息成長ETF',
+                'allocation': 20,
+                'entry': {'below': 27},
+                'entry_point': '$27以下分批進入',
+                'exit': None,
+                'exit_point': '股息成長停滯時',
+                'expected_return': '6-9%',
+                'analysis': '股息成長股提供現金流，平衡科技部位的波動'
+            },
+            {
+                'symbol': 'TLT',
+                'type': '長期公債ETF',
+                'allocation': 20,
+                'entry': None,
+                'entry_point': '當前價位定期定額',
+                'exit': None,
+                'exit_point': 'Fed明確轉向升息',
+                'expected_return': '4-6%',
+                'analysis': '長天期公債在股市修正與降息循環中提供避險效果'
+            }
+        ]
+    },
+    ('aggressive', 'growth'): {
+        'theme': '2025年積極成長科技投資攻略',
+        'insight': '積極型投資者重點佈局具有顛覆性創新潛力的成長股。AI、雲端運算、電動車、生技等領域仍有巨大成長空間。',
+        'screen': {'min_momentum': 0.1, 'weights': {'momentum': 1.0, 'volatility': 0.3}, 'top': 3},
+        'targets': [
+            {
+                'symbol': 'ARKK',
+                'type': '創新ETF',
+                'allocation': 30,
+                'entry': {'below': 45},
+                'entry_point': '大幅回調至$45以下',
+                'exit': None,
+                'exit_point': '創新主題降溫時',
+                'expected_return': '15-30%',
+                'analysis': '專注顛覆性創新的主動型ETF，包含基因療法、自動駕駛、太空探索等前沿領域'
+            },
+            {
+                'symbol': 'TSLA',
+                'type': '電動車龍頭',
+                'allocation': 25,
+                'entry': {'range': (200, 220)},
+                'entry_point': '$200-220區間',
+                'exit': None,
+                'exit_point': '自動駕駛進展停滯時',
+                'expected_return': '20-40%',
+                'analysis': '電動車和自動駕駛雙重領導者，受惠於能源轉型和智慧駕駛技術發展'
+            },
+            {
+                'symbol': 'MSFT',
+                'type': '雲端AI巨頭',
+                'allocation': 25,
+                'entry': {'below': 380},
+                'entry_point': '$380以下分批',
+                'exit': None,
+                'exit_point': '雲端成長明顯放緩',
+                'expected_return': '12-18%',
+                'analysis': 'Azure雲端服務和AI整合最完整，企業數位轉型的最大受惠者'
+            },
+            {
+                'symbol': 'SOXX',
+                'type': '半導體ETF',
+                'allocation': 20,
+                'entry': {'below': 'bollinger_lower'},
+                'entry_point': '跌破布林通道下軌（產業週期低點）進入',
+                'exit': {'above': 'bollinger_upper'},
+                'exit_point': '觸及布林通道上軌（產業週期高點）減碼',
+                'expected_return': '18-25%',
+                'analysis': '半導體產業ETF，AI基礎設施建設的核心受惠標的，週期性成長強勁'
+            }
+        ]
+    }
+}
+
+def strategy_symbols():
+    """所有策略用到的標的（排序後）"""
+    return sorted({target['symbol'] for strategy in STRATEGIES.values() for target in strategy['targets']})
@@ -0,0 +1,710 @@
+"""TENKI 設計系統與Logo"""
+import base64
+import functools
+
+import streamlit as st
+
+from tracing import traced
+
+# ====== Logo系統 ======
+@traced()
+@functools.lru_cache(maxsize=None)
+def get_logo_base64():
+    """獲取Logo Base64（只讀取一次檔案）"""
+    logo_files = ["IMG_0640.jpeg", "IMG_0639.jpeg", "IMG_0638.png"]
+    
+    for logo_file in logo_files:
+        try:
+            with open(logo_file, "rb") as f:
+                image_data = f.read()
+                image_b64 = base64.b64encode(image_data).decode()
+                image_type = "png" if logo_file.endswith('.png') else "jpeg"
+                return f'data:image/{image_type};base64,{image_b64}'
+        except:
+            continue
+    
+    return None
+
+# ====== 修正後的設計系統 ======
+@traced()
+def load_css():
+    """載入修正後的CSS樣式"""
+    st.markdown("""
+    <style>
+        /* 字體導入 - 包含日文字體 */
+        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
+        @import url('https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@300;400;500;600;700;800&display=swap');
+        @import url('https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;500;600;700;800;900&display=swap');
+        @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@300;400;500;600;700;800;900&display=swap');
+        
+        /* 基礎設定 - 修正背景和字體 */
+        .main .block-container {
+            padding: 1rem !important;
+            max-width: 1200px !important;
+            background: linear-gradient(135deg, #0a0b0f 0%, #1c2128 100%) !important;
+            font-family: 'Inter', 'Noto Sans JP', sans-serif !important;
+            color: #ffffff !important; /* 加強字體對比度 */
+        }
+        
+        #MainMenu, footer, header, .stDeployButton, .stDecoration {
+            display: none !important;
+        }
+        
+        .stApp {
+            background: linear-gradient(135deg, #0a0b0f 0%, #1c2128 100%) !important;
+        }
+        
+        /* 修正Hero Section - 解決Logo歪斜問題 */
+        .hero-section {
+            text-align: center;
+            padding: 4rem 2rem;
+            background: linear-gradient(135deg, rgba(14, 165, 233, 0.08), rgba(139, 92, 246, 0.08));
+            border-radius: 24px;
+            margin-bottom: 3rem;
+            border: 1px solid rgba(255, 255, 255, 0.15);
+            position: relative;
+            overflow: hidden;
+        }
+        
+        .hero-section::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            background: 
+                radial-gradient(circle at 20% 20%, rgba(14, 165, 233, 0.1) 0%, transparent 50%),
+                radial-gradient(circle at 80% 80%, rgba(139, 92, 246, 0.1) 0%, transparent 50%);
+            z-index: 0;
+        }
+        
+        .hero-content {
+            position: relative;
+            z-index: 10;
+        }
+        
+        /* 修正Logo顯示 - 防止歪斜 */
+        .hero-logo-container {
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            margin-bottom: 2rem;
+        }
+        
+        .hero-logo {
+            width: 100px;
+            height: 100px;
+            margin: 0 auto 1.5rem;
+            border-radius: 50%;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            background: linear-gradient(135deg, #0ea5e9, #8b5cf6);
+            box-shadow: 0 0 40px rgba(14, 165, 233, 0.4);
+            animation: gentle-pulse 3s infinite;
+            /* 防止變形 */
+            flex-shrink: 0;
+            object-fit: cover;
+            overflow: hidden;
+        }
+        
+        .hero-logo img {
+            width: 100%;
+            height: 100%;
+            border-radius: 50%;
+            object-fit: cover;
+            /* 防止圖片變形 */
+            transform: none !important;
+        }
+        
+        @keyframes gentle-pulse {
+            0%, 100% { 
+                transform: scale(1);
+                box-shadow: 0 0 40px rgba(14, 165, 233, 0.4);
+            }
+            50% { 
+                transform: scale(1.02);
+                box-shadow: 0 0 50px rgba(14, 165, 233, 0.5);
+            }
+        }
+        
+        /* 修正標題字體 - 提高清晰度 */
+        .hero-title {
+            font-family: 'Outfit', 'Noto Sans JP', sans-serif;
+            font-size: clamp(2.5rem, 8vw, 4.5rem);
+            font-weight: 800;
+            margin-bottom: 1rem;
+            /* 增強字體對比度 */
+            color: #ffffff;
+            text-shadow: 0 2px 10px rgba(0, 0, 0, 0.5);
+            background: linear-gradient(135deg, #ffffff, #0ea5e9);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            background-clip: text;
+            letter-spacing: -0.02em;
+            line-height: 1.1;
+        }
+        
+        .hero-subtitle {
+            font-family: 'Noto Sans JP', serif;
+            font-size: 1.5rem;
+            color: #e6edf3;
+            margin-bottom: 1rem;
+            font-style: italic;
+            font-weight: 300;
+            letter-spacing: 0.1em;
+            text-shadow: 0 1px 5px rgba(0, 0, 0, 0.3);
+        }
+        
+        .hero-tagline {
+            font-size: 1.25rem;
+            color: #c9d1d9;
+            margin-bottom: 1rem;
+            font-weight: 500;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+        }
+        
+        .hero-description {
+            font-size: 1.1rem;
+            color: #c9d1d9;
+            line-height: 1.7;
+            margin-bottom: 3rem;
+            max-width: 700px;
+            margin-left: auto;
+            margin-right: auto;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+        }
+        
+        /* 修正現代卡片 */
+        .modern-card {
+            background: linear-gradient(135deg, rgba(33, 38, 45, 0.95), rgba(45, 51, 59, 0.95));
+            border: 1px solid rgba(255, 255, 255, 0.15);
+            border-radius: 20px;
+            padding: 2rem;
+            margin-bottom: 2rem;
+            box-shadow: 0 20px 25px -5px rgba(0, 0, 0, 0.5);
+            backdrop-filter: blur(10px);
+            transition: all 0.3s ease;
+            position: relative;
+            overflow: hidden;
+        }
+        
+        .modern-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            height: 3px;
+            background: linear-gradient(135deg, #0ea5e9, #8b5cf6);
+            opacity: 0.9;
+        }
+        
+        .modern-card:hover {
+            transform: translateY(-4px);
+            box-shadow: 0 25px 50px -12px rgba(14, 165, 233, 0.3);
+            border-color: rgba(14, 165, 233, 0.3);
+        }
+        
+        /* 增強卡片標題清晰度 */
+        .card-title {
+            font-family: 'Outfit', 'Noto Sans JP', sans-serif;
+            font-size: 1.75rem;
+            font-weight: 700;
+            color: #ffffff;
+            margin-bottom: 1rem;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+        }
+        
+        .card-header {
+            display: flex;
+            align-items: center;
+            justify-content: space-between;
+            margin-bottom: 1.5rem;
+            flex-wrap: wrap;
+            gap: 1rem;
+        }
+        
+        .card-icon {
+            font-size: 2.5rem;
+            opacity: 0.8;
+            text-shadow: 0 2px 5px rgba(0, 0, 0, 0.3);
+        }
+        
+        /* 修正指標卡片 */
+        .metric-card {
+            background: linear-gradient(135deg, rgba(33, 38, 45, 0.9), rgba(45, 51, 59, 0.9));
+            border: 1px solid rgba(255, 255, 255, 0.15);
+            border-radius: 16px;
+            padding: 1.5rem;
+            text-align: center;
+            margin-bottom: 1rem;
+            transition: all 0.3s ease;
+            backdrop-filter: blur(10px);
+        }
+        
+        .metric-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            height: 2px;
+            background: linear-gradient(135deg, #0ea5e9, #8b5cf6);
+            opacity: 0.6;
+        }
+        
+        .metric-card:hover {
+            transform: translateY(-2px);
+            border-color: rgba(14, 165, 233, 0.4);
+            box-shadow: 0 10px 25px rgba(14, 165, 233, 0.2);
+        }
+        
+        .metric-value {
+            font-family: 'JetBrains Mono', monospace;
+            font-size: 2.25rem;
+            font-weight: 700;
+            color: #ffffff;
+            margin-bottom: 0.5rem;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+        }
+        
+        .metric-label {
+            color: #c9d1d9;
+            font-size: 0.875rem;
+            font-weight: 600;
+            text-transform: uppercase;
+            letter-spacing: 0.05em;
+            margin-bottom: 0.5rem;
+        }
+        
+        .positive { 
+            color: #22c55e !important;
+            text-shadow: 0 1px 3px rgba(34, 197, 94, 0.3);
+        }
+        .negative { 
+            color: #ef4444 !important; 
+            text-shadow: 0 1px 3px rgba(239, 68, 68, 0.3);
+        }
+        
+        /* 修正導航 */
+        .nav-container {
+            background: rgba(33, 38, 45, 0.98);
+            backdrop-filter: blur(20px);
+            border: 1px solid rgba(255, 255, 255, 0.15);
+            border-radius: 20px;
+            padding: 1.5rem;
+            margin-bottom: 2rem;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            flex-wrap: wrap;
+            gap: 1rem;
+            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.3);
+        }
+        
+        .nav-brand {
+            display: flex;
+            align-items: center;
+            gap: 1rem;
+        }
+        
+        .nav-logo {
+            width: 50px;
+            height: 50px;
+            border-radius: 50%;
+            background: linear-gradient(135deg, #0ea5e9, #8b5cf6);
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            font-weight: 800;
+            font-size: 1.5rem;
+            color: white;
+            box-shadow: 0 0 20px rgba(14, 165, 233, 0.4);
+        }
+        
+        .nav-logo img {
+            width: 100%;
+            height: 100%;
+            border-radius: 50%;
+            object-fit: cover;
+        }
+        
+        .nav-title {
+            font-family: 'Outfit', 'Noto Sans JP', sans-serif;
+            font-weight: 800;
+            font-size: 1.5rem;
+            color: #ffffff;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+        }
+        
+        /* 修正按鈕樣式 */
+        .stButton > button {
+            background: linear-gradient(135deg, #0ea5e9, #8b5cf6) !important;
+            border: none !important;
+            border-radius: 12px !important;
+            color: #ffffff !important;
+            font-weight: 600 !important;
+            padding: 0.875rem 1.75rem !important;
+            transition: all 0.3s ease !important;
+            font-family: 'Inter', 'Noto Sans JP', sans-serif !important;
+            font-size: 1rem !important;
+            box-shadow: 0 4px 15px rgba(14, 165, 233, 0.3) !important;
+            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.2) !important;
+        }
+        
+        .stButton > button:hover {
+            transform: translateY(-2px) scale(1.02) !important;
+            box-shadow: 0 8px 25px rgba(14, 165, 233, 0.4) !important;
+        }
+        
+        .stButton > button:active {
+            transform: translateY(0) scale(0.98) !important;
+        }
+        
+        /* 修正表單元件 */
+        .stTextInput > div > div > input,
+        .stPasswordInput > div > div > input {
+            background: rgba(33, 38, 45, 0.9) !important;
+            border: 2px solid rgba(255, 255, 255, 0.15) !important;
+            border-radius: 10px !important;
+            color: #ffffff !important;
+            font-size: 1rem !important;
+            padding: 0.75rem !important;
+        }
+        
+        .stTextInput > div > div > input:focus,
+        .stPasswordInput > div > div > input:focus {
+            border-color: #0ea5e9 !important;
+            box-shadow: 0 0 0 3px rgba(14, 165, 233, 0.1) !important;
+        }
+        
+        .stSelectbox > div > div {
+            background: rgba(33, 38, 45, 0.9) !important;
+            border: 2px solid rgba(255, 255, 255, 0.15) !important;
+            border-radius: 10px !important;
+            color: #ffffff !important;
+        }
+        
+        /* 功能卡片 */
+        .feature-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+            gap: 2rem;
+            margin-top: 2rem;
+        }
+        
+        .feature-card {
+            text-align: center;
+            padding: 2.5rem 2rem;
+            background: rgba(33, 38, 45, 0.8);
+            border-radius: 20px;
+            border: 1px solid rgba(255, 255, 255, 0.15);
+            transition: all 0.3s ease;
+            backdrop-filter: blur(10px);
+        }
+        
+        .feature-card:hover {
+            transform: translateY(-6px);
+            background: rgba(33, 38, 45, 0.95);
+            border-color: rgba(14, 165, 233, 0.4);
+            box-shadow: 0 15px 35px rgba(14, 165, 233, 0.2);
+        }
+        
+        .feature-icon {
+            font-size: 4rem;
+            margin-bottom: 1.5rem;
+            display: block;
+            text-shadow: 0 2px 10px rgba(0, 0, 0, 0.3);
+        }
+        
+        .feature-title {
+            color: #ffffff;
+            font-size: 1.375rem;
+            font-weight: 700;
+            margin-bottom: 1rem;
+            font-family: 'Outfit', 'Noto Sans JP', sans-serif;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+        }
+        
+        .feature-desc {
+            color: #c9d1d9;
+            line-height: 1.6;
+            font-size: 1rem;
+        }
+        
+        /* 解決方案卡片 */
+        .solution-card {
+            background: linear-gradient(135deg, rgba(33, 38, 45, 0.95), rgba(45, 51, 59, 0.95));
+            border: 1px solid rgba(255, 255, 255, 0.15);
+            border-radius: 24px;
+            padding: 3rem;
+            margin-bottom: 2rem;
+            position: relative;
+            overflow: hidden;
+            backdrop-filter: blur(15px);
+        }
+        
+        .solution-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            height: 4px;
+            background: linear-gradient(135deg, #0ea5e9, #8b5cf6);
+        }
+        
+        .solution-theme {
+            font-family: 'Outfit', 'Noto Sans JP', sans-serif;
+            font-size: 2.25rem;
+            font-weight: 800;
+            color: #ffffff;
+            margin-bottom: 1.5rem;
+            text-shadow: 0 2px 5px rgba(0, 0, 0, 0.3);
+        }
+        
+        .solution-insight {
+            color: #e6edf3;
+            line-height: 1.7;
+            margin-bottom: 2rem;
+            font-size: 1.125rem;
+        }
+        
+        .target-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
+            gap: 2rem;
+            margin-bottom: 2rem;
+        }
+        
+        .target-card {
+            background: rgba(33, 38, 45, 0.9);
+            border: 1px solid rgba(255, 255, 255, 0.15);
+            border-radius: 18px;
+            padding: 2rem;
+            transition: all 0.3s ease;
+            backdrop-filter: blur(10px);
+        }
+        
+        .target-card:hover {
+            background: rgba(33, 38, 45, 1);
+            border-color: rgba(14, 165, 233, 0.4);
+            transform: translateY(-3px);
+            box-shadow: 0 15px 35px rgba(14, 165, 233, 0.2);
+        }
+        
+        .target-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: flex-start;
+            margin-bottom: 1rem;
+        }
+        
+        .target-symbol {
+            font-family: 'JetBrains Mono', monospace;
+            font-size: 1.5rem;
+            font-weight: 800;
+            color: #ffffff;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+        }
+        
+        .target-type {
+            background: rgba(139, 92, 246, 0.25);
+            color: #c4b5fd;
+            padding: 0.375rem 1rem;
+            border-radius: 12px;
+            font-size: 0.75rem;
+            font-weight: 600;
+            text-transform: uppercase;
+            letter-spacing: 0.05em;
+            border: 1px solid rgba(139, 92, 246, 0.3);
+        }
+        
+        .target-allocation {
+            font-family: 'JetBrains Mono', monospace;
+            font-size: 2.25rem;
+            font-weight: 800;
+            color: #22c55e;
+            text-shadow: 0 2px 5px rgba(34, 197, 94, 0.3);
+        }
+        
+        .target-analysis {
+            color: #c9d1d9;
+            font-size: 1rem;
+            line-height: 1.6;
+            margin-bottom: 1.5rem;
+        }
+        
+        .target-details {
+            display: grid;
+            grid-template-columns: repeat(3, 1fr);
+            gap: 1rem;
+        }
+        
+        .detail-item {
+            text-align: center;
+            padding: 1rem;
+            background: rgba(0, 0, 0, 0.2);
+            border-radius: 12px;
+        }
+        
+        .detail-label {
+            color: #7d8590;
+            font-size: 0.75rem;
+            font-weight: 600;
+            margin-bottom: 0.5rem;
+            text-transform: uppercase;
+            letter-spacing: 0.05em;
+        }
+        
+        .detail-value {
+            color: #ffffff;
+            font-size: 0.875rem;
+            font-weight: 700;
+        }
+        
+        /* 狀態指示器 */
+        .status-indicator {
+            display: inline-flex;
+            align-items: center;
+            gap: 0.5rem;
+            padding: 0.5rem 1rem;
+            border-radius: 20px;
+            font-size: 0.875rem;
+            font-weight: 600;
+            backdrop-filter: blur(10px);
+        }
+        
+        .status-success {
+            background: rgba(34, 197, 94, 0.2);
+            color: #22c55e;
+            border: 1px solid rgba(34, 197, 94, 0.3);
+        }
+        
+        .status-success::before {
+            content: '●';
+            animation: gentle-pulse-dot 2s infinite;
+        }
+
+        .status-warning {
+            background: rgba(245, 158, 11, 0.2);
+            color: #f59e0b;
+            border: 1px solid rgba(245, 158, 11, 0.3);
+        }
+        
+        @keyframes gentle-pulse-dot {
+            0%, 100% { opacity: 1; }
+            50% { opacity: 0.6; }
+        }
+        
+        /* 訂閱統計 */
+        .subscription-stats {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 2rem;
+            margin: 2rem 0;
+        }
+        
+        .stat-item {
+            text-align: center;
+            padding: 2rem 1.5rem;
+            background: rgba(33, 38, 45, 0.8);
+            border-radius: 18px;
+            border: 1px solid rgba(255, 255, 255, 0.15);
+            backdrop-filter: blur(10px);
+            transition: all 0.3s ease;
+        }
+        
+        .stat-item:hover {
+            transform: translateY(-3px);
+            border-color: rgba(14, 165, 233, 0.3);
+            box-shadow: 0 10px 25px rgba(14, 165, 233, 0.2);
+        }
+        
+        .stat-label {
+            color: #c9d1d9;
+            font-size: 0.875rem;
+            margin-bottom: 0.75rem;
+            text-transform: uppercase;
+            font-weight: 600;
+            letter-spacing: 0.05em;
+        }
+        
+        .stat-value {
+            color: #ffffff;
+            font-size: 1.75rem;
+            font-weight: 800;
+            margin-bottom: 0.5rem;
+            font-family: 'JetBrains Mono', monospace;
+            text-shadow: 0 1px 3px rgba(0, 0, 0, 0.3);
+        }
+        
+        .stat-desc {
+            color: #7d8590;
+            font-size: 0.75rem;
+        }
+        
+        /* 免責聲明 */
+        .disclaimer {
+            background: rgba(239, 68, 68, 0.15);
+            border: 1px solid rgba(239, 68, 68, 0.3);
+            border-radius: 15px;
+            padding: 1.5rem;
+            color: #fca5a5;
+            font-size: 0.95rem;
+            margin: 2rem 0;
+            text-align: center;
+            backdrop-filter: blur(10px);
+            line-height: 1.6;
+        }
+        
+        /* 響應式設計 */
+        @media (max-width: 768px) {
+            .hero-title { 
+                font-size: clamp(2rem, 10vw, 3rem) !important; 
+            }
+            .hero-section { 
+                padding: 3rem 1.5rem; 
+            }
+            .modern-card { 
+                padding: 1.5rem; 
+                margin-bottom: 1.5rem; 
+            }
+            .target-details { 
+                grid-template-columns: 1fr; 
+                gap: 0.75rem; 
+            }
+            .nav-container {
+                padding: 1rem;
+                flex-direction: column;
+                gap: 1rem;
+            }
+            .feature-grid {
+                grid-template-columns: 1fr;
+                gap: 1.5rem;
+            }
+            .metric-value {
+                font-size: 1.75rem;
+            }
+        }
+        
+        @media (max-width: 480px) {
+            .hero-logo {
+                width: 80px;
+                height: 80px;
+            }
+            .hero-description {
+                font-size: 1rem;
+            }
+            .card-title {
+                font-size: 1.5rem;
+            }
+            .modern-card,
+            .solution-card {
+                padding: 1.25rem;
+            }
+        }
+    </style>
+    """, unsafe_allow_html=True)
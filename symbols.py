@@ -0,0 +1,222 @@
+"""TENKI 標的基本資料
+
+名稱、資產類別、產業（ETF 為晨星分類）、地區、費用率與殖利率存放在本地資料庫：
+隨附的 data/symbols.json 為初始資料，背景每 TENKI_SYMBOL_REFRESH_SECONDS 秒向上游批次更新一次整個標的池，
+結果原子寫入 TENKI_SYMBOL_DB，重新啟動後沿用。頁面、圖表與解決方案查詢的是記憶體中的 dict，
+繪製時不需要任何網路請求。
+
+環境變數:
+    TENKI_SYMBOL_DB=<path>                  更新後的基本資料（預設為系統暫存目錄下的 tenki-symbols.json）
+    TENKI_SYMBOL_REFRESH_SECONDS=86400      批次更新間隔，0 表示不啟動背景更新
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from providers import get_provider
+from screener import read_universe
+from tracing import span
+
+SEED_FILE = os.path.join(os.path.dirname(__file__), 'data', 'symbols.json')
+SYMBOL_DB = os.environ.get('TENKI_SYMBOL_DB', os.path.join(tempfile.gettempdir(), 'tenki-symbols.json'))
+REFRESH_SECONDS = int(os.environ.get('TENKI_SYMBOL_REFRESH_SECONDS', '86400'))
+FIELDS = ('name', 'asset_class', 'sector', 'region', 'expense_ratio', 'dividend_yield')
+# 資產類別 → TEXTS 鍵
+ASSET_CLASSES = {
+    'equity': 'asset_equity',
+    'equity_etf': 'asset_equity_etf',
+    'bond_etf': 'asset_bond_etf',
+    'real_estate_etf': 'asset_real_estate_etf',
+    'commodity_etf': 'asset_commodity_etf'
+}
+# 地區 → TEXTS 鍵（個股以公司所在國家推斷，ETF 依投資範圍）
+REGIONS = {
+    'north_america': 'region_north_america',
+    'europe': 'region_europe',
+    'asia_pacific': 'region_asia_pacific',
+    'latin_america': 'region_latin_america',
+    'global': 'region_global',
+    'other': 'region_other'
+}
+COUNTRY_REGIONS = {
+    'United States': 'north_america', 'Canada': 'north_america',
+    'United Kingdom': 'europe', 'Ireland': 'europe', 'Netherlands': 'europe', 'Switzerland': 'europe',
+    'Germany': 'europe', 'France': 'europe', 'Denmark': 'europe', 'Luxembourg': 'europe',
+    'Japan': 'asia_pacific', 'China': 'asia_pacific', 'Hong Kong': 'asia_pacific', 'Taiwan': 'asia_pacific',
+    'South Korea': 'asia_pacific', 'Singapore': 'asia_pacific', 'India': 'asia_pacific', 'Australia': 'asia_pacific',
+    'Uruguay': 'latin_america', 'Argentina': 'latin_america', 'Brazil': 'latin_america', 'Mexico': 'latin_america'
+}
+
+metrics.describe('tenki_symbol_refresh_total', 'Bulk refreshes of the symbol metadata database')
+metrics.describe('tenki_symbol_refresh_failures_total', 'Symbols whose metadata could not be fetched during a bulk refresh')
+metrics.describe('tenki_symbol_metadata_entries', 'Symbols in the in-memory metadata database')
+
+logger = logging.getLogger(__name__)
+
+def classify(quote_type, sector):
+    """由上游的 quoteType 與分類推斷資產類別"""
+    if quote_type != 'ETF':
+        return 'equity'
+    sector = (sector or '').lower()
+    if any(word in sector for word in ('bond', 'government', 'treasury', 'muni', 'inflation')):
+        return 'bond_etf'
+    if 'real estate' in sector:
+        return 'real_estate_etf'
+    if 'commodit' in sector or 'precious metals' in sector:
+        return 'commodity_etf'
+    return 'equity_etf'
+
+def region_of(country):
+    """由公司所在國家推斷地區"""
+    return COUNTRY_REGIONS.get(country, 'other')
+
+# ====== 資料庫 ======
+def read_records(path):
+    """讀取 {symbol: 基本資料}（沒有或無法讀取時為空）"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['symbols']
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning('ignoring unreadable symbol metadata %s: %r', path, e)
+        return {}
+
+def write_records(records, path=SYMBOL_DB):
+    """原子寫入基本資料"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'source': 'refresh', 'refreshed_at': time.time(), 'symbols': records}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+# 標的 → 基本資料；第一次查詢時由初始資料與更新後的資料庫載入，更新時整份替換
+_records = None
+_records_lock = threading.Lock()
+# 每次替換基本資料時遞增，依基本資料彙總的結果（exposure.py）以此判斷是否需要重建
+_generation = 0
+
+def _load():
+    global _records, _generation
+    with _records_lock:
+        if _records is None:
+            records = read_records(SEED_FILE)
+            # 逐欄合併：舊版資料庫沒有的欄位（例如 region）沿用初始資料
+            for symbol, record in read_records(SYMBOL_DB).items():
+                records[symbol] = {**records.get(symbol, {}), **record}
+            _records = records
+            _generation += 1
+            metrics.set_gauge('tenki_symbol_metadata_entries', len(records))
+        return _records
+
+def get_metadata(symbol):
+    """單一標的的基本資料（沒有資料時為 None）"""
+    return (_records if _records is not None else _load()).get(symbol)
+
+def generation():
+    """基本資料的版本（每次整份替換時遞增）"""
+    if _records is None:
+        _load()
+    return _generation
+
+def display_name(symbol):
+    """標的名稱（沒有資料時為代碼）"""
+    record = get_metadata(symbol)
+    return record['name'] if record and record.get('name') else symbol
+
+def asset_label(t, record):
+    """資產類別 · 產業的顯示文字（沒有資料時為空字串）"""
+    if not record:
+        return ''
+    label = t[ASSET_CLASSES[record['asset_class']]] if record.get('asset_class') in ASSET_CLASSES else ''
+    return ' · '.join(part for part in (label, record.get('sector')) if part)
+
+# ====== 批次更新 ======
+def _fetch(symbol, provider):
+    try:
+        return symbol, provider.metadata(symbol)
+    except Exception:
+        return symbol, None
+
+def refresh(symbols=None, provider=None, path=SYMBOL_DB):
+    """向上游並行取得所有標的的基本資料，合併後整份替換並寫入資料庫；回傳取得失敗的標的
+
+    上游沒有提供的欄位（None）沿用原有資料。
+    """
+    global _records, _generation
+    symbols = read_universe() if symbols is None else symbols
+    provider = provider or get_provider()
+    with span('refresh_symbols'), ThreadPoolExecutor(max_workers=16) as executor:
+        fetched = dict(executor.map(lambda symbol: _fetch(symbol, provider), symbols))
+    records = dict(_load())
+    failed = []
+    for symbol, raw in fetched.items():
+        if raw is None:
+            failed.append(symbol)
+            continue
+        record = dict(records.get(symbol) or dict.fromkeys(FIELDS))
+        record.update({field: raw[field] for field in FIELDS if raw.get(field) is not None})
+        if raw.get('quote_type') is not None:
+            record['asset_class'] = classify(raw['quote_type'], record.get('sector'))
+        if raw.get('country') is not None:
+            record['region'] = region_of(raw['country'])
+        records[symbol] = record
+    try:
+        write_records(records, path)
+    except OSError as e:
+        logger.warning('could not write symbol metadata %s: %r', path, e)
+    with _records_lock:
+        _records = records
+        _generation += 1
+    metrics.inc('tenki_symbol_refresh_total')
+    metrics.inc('tenki_symbol_refresh_failures_total', len(failed))
+    metrics.set_gauge('tenki_symbol_metadata_entries', len(records))
+    return failed
+
+# ====== 背景更新 ======
+_refresher = None
+_refresher_lock = threading.Lock()
+_stop = threading.Event()
+
+def _run_refresher(interval, path):
+    # 資料庫仍在更新間隔內時（例如剛重新啟動）不立即更新
+    try:
+        wait = max(0.0, os.path.getmtime(path) + interval - time.time())
+    except OSError:
+        wait = 0.0
+    while not _stop.wait(wait):
+        try:
+            refresh(path=path)
+        except Exception:
+            logger.exception('symbol metadata refresh failed')
+        wait = interval
+
+def start_refresher(interval=None, path=SYMBOL_DB):
+    """啟動背景批次更新（每個行程只啟動一次）"""
+    global _refresher
+    interval = REFRESH_SECONDS if interval is None else interval
+    if interval <= 0:
+        return None
+    with _refresher_lock:
+        if _refresher is None:
+            _stop.clear()
+            _refresher = threading.Thread(target=_run_refresher, args=(interval, path), name='tenki-symbols', daemon=True)
+            _refresher.start()
+        return _refresher
+
+def stop_refresher():
+    global _refresher
+    with _refresher_lock:
+        if _refresher is not None:
+            _stop.set()
+            _refresher.join()
+            _refresher = None
@@ -0,0 +1,168 @@
+"""TENKI 每次 rerun 的追蹤
+
+每次 rerun 產生一個 trace，內含各階段（load_css、get_market_data、圖表、頁面函數…）的 span。
+trace 結束時以一行 JSON 寫入 tenki.trace 日誌，階段耗時同時寫入 metrics，
+由本機 sidecar 以 Prometheus 文字格式提供 p50/p95/p99。
+
+環境變數:
+    TENKI_TRACING=0           關閉追蹤
+    TENKI_TRACE_LOG=<path>    JSON 日誌輸出檔案（預設 stderr）
+    TENKI_METRICS_PORT=9464   sidecar 連接埠，0 表示不啟動
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import metrics
+
+ENABLED = os.environ.get('TENKI_TRACING', '1') != '0'
+METRICS_PORT = int(os.environ.get('TENKI_METRICS_PORT', '9464'))
+STAGE_METRIC = 'tenki_stage_duration_seconds'
+RERUN_METRIC = 'tenki_rerun_duration_seconds'
+
+metrics.describe(STAGE_METRIC, 'Duration of each traced stage of a rerun')
+metrics.describe(RERUN_METRIC, 'Total duration of a Streamlit rerun')
+
+_current_trace = contextvars.ContextVar('tenki_trace', default=None)
+
+# ====== JSON 日誌 ======
+logger = logging.getLogger('tenki.trace')
+if not logger.handlers:
+    log_path = os.environ.get('TENKI_TRACE_LOG')
+    handler = logging.FileHandler(log_path, encoding='utf-8') if log_path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def current_session_id():
+    """目前 Streamlit session 的 ID（非 Streamlit 執行環境回傳 'local'）"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        ctx = None
+    return ctx.session_id if ctx else 'local'
+
+# ====== Trace / Span ======
+def start_trace(page, session_id=None):
+    """開始一次 rerun 的 trace"""
+    if not ENABLED:
+        return None
+    trace = {
+        'trace_id': uuid.uuid4().hex[:16],
+        'session_id': session_id or current_session_id(),
+        'page': page,
+        'start': time.time(),
+        't0': time.perf_counter(),
+        'spans': []
+    }
+    _current_trace.set(trace)
+    return trace
+
+def set_page(page):
+    """更新目前 trace 的頁面標籤（路由決定後呼叫）"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace['page'] = page
+
+def end_trace():
+    """結束 trace，輸出 JSON 日誌並記錄總耗時"""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    _current_trace.set(None)
+    duration = time.perf_counter() - trace['t0']
+    metrics.observe(RERUN_METRIC, duration, page=trace['page'])
+    record = {
+        'event': 'rerun',
+        'trace_id': trace['trace_id'],
+        'session_id': trace['session_id'],
+        'page': trace['page'],
+        'ts': round(trace['start'], 3),
+        'duration_ms': round(duration * 1000, 3),
+        'spans': trace['spans']
+    }
+    logger.info(json.dumps(record, ensure_ascii=False))
+    return record
+
+class span:
+    """記錄一個階段耗時的 context manager"""
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not ENABLED:
+            return False
+        duration = time.perf_counter() - self.t0
+        trace = _current_trace.get()
+        page = trace['page'] if trace is not None else ''
+        metrics.observe(STAGE_METRIC, duration, stage=self.stage, page=page)
+        if trace is not None:
+            trace['spans'].append({
+                'stage': self.stage,
+                'offset_ms': round((self.t0 - trace['t0']) * 1000, 3),
+                'duration_ms': round(duration * 1000, 3),
+                'error': exc_type.__name__ if exc_type else None
+            })
+        return False
+
+def traced(stage=None):
+    """以 span 包裝函數的裝飾器"""
+    def decorator(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# ====== Prometheus sidecar ======
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+_server_lock = threading.Lock()
+
+def start_metrics_server(port=None, host='127.0.0.1'):
+    """啟動本機 /metrics sidecar（每個行程只啟動一次）"""
+    global _server
+    port = METRICS_PORT if port is None else port
+    if not ENABLED or port == 0:
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            logging.getLogger(__name__).warning('metrics sidecar not started on %s:%s: %s', host, port, e)
+            _server = False
+            return None
+        threading.Thread(target=_server.serve_forever, name='tenki-metrics', daemon=True).start()
+        return _server
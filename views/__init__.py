@@ -0,0 +1,106 @@
+"""TENKI 頁面註冊表
+
+每個頁面都是獨立模組，只有在第一次造訪時才會被匯入，
+未造訪的頁面（以及其 plotly / yfinance 等依賴）不會佔用啟動時間與記憶體。
+"""
+import importlib
+
+# ====== 頁面註冊表 ======
+# module: 頁面模組路徑; render: 頁面函數名稱; auth: 是否需要登入（'admin' 表示設定了管理權杖才開放，頁面內驗證權杖）;
+# nav: 導航列 (圖示, TEXTS鍵)，None 表示不顯示於導航列;
+# warm: 預先載入函數名稱（參數為 prefetch 的 context），None 表示只預先匯入模組
+PAGES = {
+    'landing': {
+        'module': 'views.landing',
+        'render': 'show_landing_page',
+        'auth': False,
+        'nav': None,
+        'warm': None
+    },
+    'login': {
+        'module': 'views.login',
+        'render': 'show_login_page',
+        'auth': False,
+        'nav': None,
+        'warm': None
+    },
+    'dashboard': {
+        'module': 'views.dashboard',
+        'render': 'show_dashboard',
+        'auth': True,
+        'nav': ('🏠', 'dashboard'),
+        'warm': 'warm_dashboard'
+    },
+    'auto_navigation': {
+        'module': 'views.auto_navigation',
+        'render': 'show_auto_navigation',
+        'auth': True,
+        'nav': ('🧭', 'auto_navigation'),
+        'warm': None
+    },
+    'solution_generator': {
+        'module': 'views.solution_generator',
+        'render': 'show_solution_generator',
+        'auth': True,
+        'nav': ('⚡', 'solution_generator'),
+        'warm': 'warm_solution_generator'
+    },
+    'virtual_portfolio': {
+        'module': 'views.virtual_portfolio',
+        'render': 'show_virtual_portfolio',
+        'auth': True,
+        'nav': ('💼', 'virtual_portfolio'),
+        'warm': 'warm_virtual_portfolio'
+    },
+    'subscription': {
+        'module': 'views.subscription',
+        'render': 'show_subscription',
+        'auth': True,
+        'nav': ('💳', 'my_subscription'),
+        'warm': None
+    },
+    'settings': {
+        'module': 'views.settings',
+        'render': 'show_settings',
+        'auth': True,
+        'nav': ('⚙️', 'settings'),
+        'warm': None
+    },
+    'admin': {
+        'module': 'views.admin',
+        'render': 'show_admin',
+        'auth': 'admin',
+        'nav': None,
+        'warm': None
+    }
+}
+
+DEFAULT_PAGE = 'dashboard'
+
+def nav_pages():
+    """導航列頁面 (page_key, 圖示, TEXTS鍵)"""
+    return [(key, page['nav'][0], page['nav'][1]) for key, page in PAGES.items() if page['nav']]
+
+def resolve_page(page_key, logged_in, admin=False):
+    """依登入狀態決定實際要顯示的頁面（未設定管理權杖時看不到管理頁面）"""
+    page = PAGES.get(page_key)
+    if page is not None and not page['auth']:
+        return page_key
+    if logged_in:
+        if page is None or (page['auth'] == 'admin' and not admin):
+            return DEFAULT_PAGE
+        return page_key
+    return 'landing'
+
+def load_page(page_key):
+    """延遲匯入頁面模組並回傳頁面函數"""
+    page = PAGES[page_key]
+    module = importlib.import_module(page['module'])
+    return getattr(module, page['render'])
+
+def warm_page(page_key, context):
+    """匯入頁面模組並執行其預先載入函數（在背景執行緒呼叫）"""
+    page = PAGES[page_key]
+    module = importlib.import_module(page['module'])
+    if page['warm'] is not None:
+        getattr(module, page['warm'])(context)
@@ -0,0 +1,180 @@
+"""管理頁面：資料層的即時內部狀態
+
+全部來自行程內指標（metrics）與 SessionStore，開啟頁面時才彙總，不增加資料路徑的負擔；
+批次再平衡只在按下按鈕時執行一次。
+以 ?page=admin 開啟後須輸入 TENKI_ADMIN_TOKEN（見 session_store.py），驗證前不顯示任何內部狀態；
+使用者狀態只以雜湊後的鍵列出。
+"""
+import time
+
+import pandas as pd
+import streamlit as st
+
+import metrics
+from charts import create_latency_chart
+from i18n import get_texts
+from market import quote_snapshot_time
+from providers import UPSTREAM_ERRORS, UPSTREAM_SECONDS
+from rebalance import rebalance_all
+from session_store import get_store, is_admin, session_label
+from solutions import snapshot_time
+
+def format_age(ts, now=None):
+    """距今多久（None 為 —）"""
+    if ts is None:
+        return '—'
+    age = max(0.0, (time.time() if now is None else now) - ts)
+    if age < 120:
+        return f'{age:.0f} s'
+    if age < 7200:
+        return f'{age / 60:.0f} min'
+    return f'{age / 3600:.1f} h'
+
+def upstream_rows(snap):
+    """每個 (呼叫, 標的) 一列：次數、延遲百分位數（ms）與各類失敗次數"""
+    rows = {}
+    for (name, labels), summary in snap['summaries'].items():
+        if name != UPSTREAM_SECONDS:
+            continue
+        labels = dict(labels)
+        quantiles = summary['quantiles']
+        rows[(labels['call'], labels['symbol'])] = {
+            'call': labels['call'], 'symbol': labels['symbol'], 'calls': summary['count'],
+            'mean ms': summary['sum'] / summary['count'] * 1000,
+            'p50 ms': quantiles[0.5] * 1000, 'p95 ms': quantiles[0.95] * 1000, 'p99 ms': quantiles[0.99] * 1000,
+            'errors': 0, 'timeouts': 0, 'empty': 0
+        }
+    columns = {'error': 'errors', 'timeout': 'timeouts', 'empty': 'empty'}
+    for (name, labels), value in snap['counters'].items():
+        if name != UPSTREAM_ERRORS:
+            continue
+        labels = dict(labels)
+        row = rows.get((labels['call'], labels['symbol']))
+        if row is not None:
+            row[columns[labels['kind']]] += value
+    return sorted(rows.values(), key=lambda row: -row['p95 ms'])
+
+def cache_rows(snap):
+    """每個快取一列：本地命中、共用後端命中、未命中（向上游取得）的比例"""
+    rows = {}
+    for (name, labels), value in snap['counters'].items():
+        labels = dict(labels)
+        if 'cache' not in labels:
+            continue
+        row = rows.setdefault(labels['cache'], {'cache': labels['cache'], 'hit': 0, 'shared_hit': 0, 'miss': 0,
+                                                'lock waits': 0, 'fetches saved': 0})
+        if name == 'tenki_cache_requests_total':
+            row[labels['result']] += value
+        elif name == 'tenki_cache_lock_waits_total':
+            row['lock waits'] += value
+        elif name == 'tenki_cache_fetches_saved_total':
+            row['fetches saved'] += value
+    for row in rows.values():
+        total = row['hit'] + row['shared_hit'] + row['miss']
+        row['entries'] = snap['gauges'].get(('tenki_cache_entries', (('cache', row['cache']),)), 0)
+        row['local %'] = row['hit'] / total * 100 if total else 0.0
+        row['shared %'] = row['shared_hit'] / total * 100 if total else 0.0
+        row['hit ratio %'] = row['local %'] + row['shared %']
+    return sorted(rows.values(), key=lambda row: row['cache'])
+
+def show_admin():
+    """管理頁面"""
+    language = st.session_state.language
+    t = get_texts(language)
+    
+    st.markdown(f'''
+    <div class="modern-card">
+        <div class="card-header">
+            <h2 class="card-title">🛠️ {t['admin_title']}</h2>
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    # 權杖只存在這個 session，每次繪製都重新比對
+    if not is_admin(st.session_state.get('admin_token')):
+        with st.form("admin_token_form_main"):
+            token = st.text_input(t['admin_token'], type="password", key="admin_token_input_main")
+            if st.form_submit_button(t['admin_unlock']):
+                if is_admin(token):
+                    st.session_state.admin_token = token
+                    st.rerun()
+                st.error(t['admin_token_invalid'])
+        return
+    
+    if st.button(f"🔄 {t['admin_refresh']}", key="admin_refresh_main"):
+        st.rerun()
+    
+    snap = metrics.snapshot()
+    store = get_store()
+    now = time.time()
+    
+    # 概況
+    cards = [
+        (t['admin_active_sessions'], store.active_count(now=now)),
+        (t['admin_resident_sessions'], len(store.memory_bytes())),
+        (t['admin_quote_snapshot_age'], format_age(quote_snapshot_time(), now)),
+        (t['admin_solution_snapshot_age'], format_age(snapshot_time(), now))
+    ]
+    for col, (label, value) in zip(st.columns(len(cards)), cards):
+        with col:
+            st.markdown(f'''
+            <div class="metric-card">
+                <div class="metric-label">{label}</div>
+                <div class="metric-value">{value}</div>
+            </div>
+            ''', unsafe_allow_html=True)
+    
+    # 上游
+    st.markdown(f"### 🌐 {t['admin_upstream']}")
+    upstream = upstream_rows(snap)
+    if upstream:
+        st.dataframe(pd.DataFrame(upstream).round(1), hide_index=True, use_container_width=True)
+        series = st.selectbox(t['admin_latency_series'], [f"{row['call']} · {row['symbol']}" for row in upstream],
+                              key="admin_latency_series_main")
+        call, symbol = series.split(' · ')
+        chart = create_latency_chart(metrics.get_samples(UPSTREAM_SECONDS, call=call, symbol=symbol), series, language)
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+    else:
+        st.info(t['admin_no_data'])
+    
+    # 快取
+    st.markdown(f"### 🗄️ {t['admin_caches']}")
+    caches = cache_rows(snap)
+    if caches:
+        st.dataframe(pd.DataFrame(caches).round(1), hide_index=True, use_container_width=True)
+    else:
+        st.info(t['admin_no_data'])
+    
+    # 使用者狀態
+    st.markdown(f"### 👥 {t['admin_sessions']}")
+    sessions = sorted(store.memory_bytes().items(), key=lambda item: -item[1])
+    if sessions:
+        st.dataframe(pd.DataFrame([{'session': session_label(key), 'KiB': nbytes / 1024} for key, nbytes in sessions]).round(1),
+                     hide_index=True, use_container_width=True)
+    else:
+        st.info(t['admin_no_data'])
+    
+    # 批次再平衡（按下時才以記憶體中所有使用者的策略組合執行一次）
+    st.markdown(f"### 🎯 {t['admin_rebalance']}")
+    if st.button(t['admin_rebalance_run'], key="admin_rebalance_main"):
+        t0 = time.perf_counter()
+        plans = rebalance_all(store)
+        elapsed = time.perf_counter() - t0
+        cards = [
+            (t['admin_rebalance_portfolios'], len(plans)),
+            (t['admin_rebalance_trades'], sum(len(trades) for trades in plans.values())),
+            (t['admin_rebalance_seconds'], f'{elapsed * 1000:.1f} ms'),
+            (t['admin_rebalance_throughput'], f'{len(plans) / elapsed:,.0f}')
+        ]
+        for col, (label, value) in zip(st.columns(len(cards)), cards):
+            with col:
+                st.markdown(f'''
+                <div class="metric-card">
+                    <div class="metric-label">{label}</div>
+                    <div class="metric-value">{value}</div>
+                </div>
+                ''', unsafe_allow_html=True)
+    
+    with st.expander(t['admin_raw_metrics']):
+        st.code(metrics.render_prometheus(), language='text')
@@ -0,0 +1,86 @@
+"""自動導航模式"""
+import streamlit as st
+
+from fragments import show
+from i18n import get_texts
+from session_store import get_user_state
+from solutions import solution_key
+
+def show_auto_navigation():
+    """自動導航模式"""
+    language = st.session_state.language
+    t = get_texts(language)
+    
+    show('header_auto_navigation', language)
+    
+    # 偏好設定
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        risk_pref = st.selectbox(
+            t['risk_preference'],
+            options=['conservative', 'moderate', 'aggressive'],
+            format_func=lambda x: {
+                'conservative': t['conservative'], 
+                'moderate': t['moderate'], 
+                'aggressive': t['aggressive']
+            }[x],
+            index=['conservative', 'moderate', 'aggressive'].index(st.session_state.risk_preference),
+            key="risk_select_main"
+        )
+        st.session_state.risk_preference = risk_pref
+    
+    with col2:
+        invest_goal = st.selectbox(
+            t['investment_goal'],
+            options=['income', 'balanced', 'growth'],
+            format_func=lambda x: {
+                'income': t['income'], 
+                'balanced': t['balanced'], 
+                'growth': t['growth']
+            }[x],
+            index=['income', 'balanced', 'growth'].index(st.session_state.investment_goal),
+            key="goal_select_main"
+        )
+        st.session_state.investment_goal = invest_goal
+    
+    # 生成解決方案
+    if st.button(f"🎯 {t['generate_solution']}", key="generate_auto_main", use_container_width=True, type="primary"):
+        # 解決方案已由背景排程預先計算，這裡只記錄鍵
+        state = get_user_state()
+        with state['lock']:
+            state['solutions'] = [solution_key(risk_pref, invest_goal)]
+        
+        st.success(t['solution_generated'])
+        st.session_state.current_page = 'solution_generator'
+        st.rerun()
+    
+    # 當前設定
+    st.markdown(f'''
+    <div class="modern-card">
+        <div class="card-header">
+            <h3 class="card-title">⚙️ {t['current_settings']}</h3>
+            <div class="status-indicator status-success">{t['configured']}</div>
+        </div>
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 2rem; margin-top: 1rem;">
+            <div class="stat-item">
+                <div class="stat-label">{t['risk_preference']}</div>
+                <div class="stat-value">
+                    {t['conservative'] if risk_pref == 'conservative' else t['moderate'] if risk_pref == 'moderate' else t['aggressive']}
+                </div>
+                <div class="stat-desc">
+                    {t['low_risk'] if risk_pref == 'conservative' else t['medium_risk'] if risk_pref == 'moderate' else t['high_risk']}
+                </div>
+            </div>
+            <div class="stat-item">
+                <div class="stat-label">{t['investment_goal']}</div>
+                <div class="stat-value">
+                    {t['income'] if invest_goal == 'income' else t['balanced'] if invest_goal == 'balanced' else t['growth']}
+                </div>
+                <div class="stat-desc">
+                    {t['income_first'] if invest_goal == 'income' else t['balanced_allocation'] if invest_goal == 'balanced' else t['growth_first']}
+                </div>
+            </div>
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
@@ -0,0 +1,270 @@
+"""儀表板"""
+import time
+
+import numpy as np
+import streamlit as st
+
+from charts import chart_spec, create_correlation_heatmap, create_history_chart, create_market_chart
+from correlation import DEFAULT_WINDOW, WINDOWS, get_matrices
+from fx import BASE_CURRENCY, money, preferred_currency, resolve_currency
+from i18n import get_texts
+from market import MARKET_SYMBOLS, get_history_window, get_market_data, get_price_history
+from symbols import display_name
+from tracing import span
+
+# 長期走勢期間（日曆日，None 為全部歷史）
+HISTORY_WINDOWS = {'1M': 31, '6M': 183, '1Y': 365, '5Y': 1826, 'MAX': None}
+DEFAULT_HISTORY_PERIOD = '1Y'
+
+def _format_as_of(ts):
+    """最後成功快照的報價時間（本地時間）"""
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))
+
+def _clear_history_zoom():
+    st.session_state.pop('history_zoom', None)
+
+def history_range(days, period):
+    """期間對應的 (start, end)，以最後一個交易日往前推算"""
+    window = HISTORY_WINDOWS[period]
+    return (None if window is None else str(days[-1] - np.timedelta64(window, 'D'))), None
+
+def history_chart(symbol, start, end, language, currency=BASE_CURRENCY, rate=1.0):
+    """降採樣後的長期走勢圖規格（收盤價換算為 currency），回傳 (規格或 None, 顯示點數, 原始點數, stale)"""
+    shown_days, shown_closes, total, stale = get_history_window(symbol, start, end)
+    if not len(shown_days):
+        return None, 0, total, stale
+    chart = chart_spec('history', (symbol, start, end, total, str(shown_days[-1]), language, currency, rate),
+                       lambda: create_history_chart(shown_days, shown_closes * rate, symbol, language, currency))
+    return chart, len(shown_closes), total, stale
+
+def market_chart(market_data, language):
+    """市場概況圖規格（報價相同時共用快取）"""
+    return chart_spec('market', (language,) + tuple(
+        (symbol, data['price'], data['change_pct']) for symbol, data in market_data.items()
+    ), lambda: create_market_chart(market_data, language))
+
+def warm_dashboard(context):
+    """登入時預先載入：市場報價、匯率、預設標的與期間的長期走勢、市場標的的報酬相關性，以及兩張圖表的規格"""
+    language = context['language']
+    # 登入時尚未選擇幣別，依語言
+    currency, rate = resolve_currency(None, language)
+    market_data = get_market_data()
+    if market_data:
+        market_chart(market_data, language)
+    symbol = MARKET_SYMBOLS[0]
+    days = get_price_history(symbol).days
+    if len(days):
+        history_chart(symbol, *history_range(days, DEFAULT_HISTORY_PERIOD), language, currency, rate)
+    get_matrices(MARKET_SYMBOLS, DEFAULT_WINDOW)
+
+def show_price_history(t, language, currency, rate):
+    """長期走勢：先顯示所選期間，框選後只載入該區間的降採樣資料"""
+    st.markdown(f'''
+    <div class="modern-card">
+        <div class="card-header">
+            <h2 class="card-title">📈 {t['price_history']}</h2>
+        </div>
+        <p style="color: #7d8590; font-size: 0.9rem;">{t['history_zoom_hint']}</p>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        symbol = st.selectbox(t['history_symbol'], MARKET_SYMBOLS, key="history_symbol_main", on_change=_clear_history_zoom)
+    with col2:
+        period = st.radio(t['history_period'], list(HISTORY_WINDOWS), index=list(HISTORY_WINDOWS).index(DEFAULT_HISTORY_PERIOD), horizontal=True,
+                          key="history_period_main", on_change=_clear_history_zoom)
+    
+    # 上游取不到且沒有最後成功的結果時顯示提示，不中斷頁面
+    with span('get_price_history'):
+        days = get_price_history(symbol).days
+    if not len(days):
+        st.info(t['history_unavailable'])
+        return
+    
+    zoom = st.session_state.get('history_zoom')
+    start, end = zoom if zoom else history_range(days, period)
+    
+    chart, shown, total, stale = history_chart(symbol, start, end, language, currency, rate)
+    if chart is None:
+        st.info(t['history_unavailable'])
+        return
+    # 每個區間使用不同的 key，換區間時清除上一次的框選
+    event = st.plotly_chart(chart, use_container_width=True, key=f"history_chart_{symbol}_{start}_{end}",
+                            on_select="rerun", selection_mode="box")
+    st.caption(f"{shown:,} / {total:,} {t['data_points']}" + (f" · ⚠ {t['stale_data']} · {t['as_of']} {days[-1]}" if stale else ''))
+    
+    boxes = event.selection.get('box', []) if event else []
+    if boxes and len(boxes[0].get('x', [])) == 2:
+        x0, x1 = sorted(str(x)[:10] for x in boxes[0]['x'])
+        st.session_state.history_zoom = (x0, x1)
+        st.rerun()
+    if zoom and st.button(f"🔍 {t['reset_zoom']}", key="history_reset_main"):
+        _clear_history_zoom()
+        st.rerun()
+
+def show_correlation(t, language, symbols, key):
+    """一組標的的日報酬相關係數或共變異數熱圖（儀表板的市場標的、虛擬組合的持倉共用）"""
+    st.markdown(f'''
+    <div class="modern-card">
+        <div class="card-header">
+            <h2 class="card-title">🔗 {t['correlation_title']}</h2>
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        window = st.radio(t['correlation_window'], list(WINDOWS), index=list(WINDOWS).index(DEFAULT_WINDOW), horizontal=True,
+                          key=f"{key}_window")
+    with col2:
+        kind = st.radio(t['correlation_kind'], ['correlation', 'covariance'], format_func=lambda x: t[x], horizontal=True,
+                        key=f"{key}_kind")
+    
+    with span('get_correlation'):
+        matrices = get_matrices(symbols, window)
+    # 可用的標的不足兩檔（上游取不到或資料太短）時顯示提示，不中斷頁面
+    if matrices is None:
+        st.info(t['correlation_unavailable'])
+        return
+    chart = chart_spec('correlation', (tuple(matrices['symbols']), window, kind, matrices['as_of'], language),
+                       lambda: create_correlation_heatmap(matrices['symbols'], matrices[kind], kind, language))
+    if chart:
+        st.plotly_chart(chart, use_container_width=True)
+        st.caption(f"{matrices['returns']} {t['correlation_caption']} · {t['as_of']} {matrices['as_of']}"
+                   + (f" · ⚠ {t['correlation_missing']}: {', '.join(matrices['missing'])}" if matrices['missing'] else ''))
+
+def show_dashboard():
+    """修正後的儀表板"""
+    language = st.session_state.language
+    t = get_texts(language)
+    currency, rate = resolve_currency(st.session_state.display_currency, language)
+    
+    # 歡迎標題
+    st.markdown(f'''
+    <div class="modern-card">
+        <div class="card-header">
+            <h1 class="card-title">{t['welcome']}, {st.session_state.user_email.split('@')[0]}! 🎉</h1>
+            <div class="card-icon">🚀</div>
+        </div>
+        <p style="color: #c9d1d9; font-size: 1.1rem; line-height: 1.6;">{t['dashboard_intro']}</p>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    if currency != preferred_currency(st.session_state.display_currency, language):
+        st.caption(t['fx_unavailable'])
+    
+    # 績效指標（美元示意數字，依顯示幣別換算）
+    today_pnl, total_return = np.array([1234.0, 12567.0]) * rate
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f'''
+        <div class="metric-card">
+            <div class="metric-label">{t['today_pnl']}</div>
+            <div class="metric-value positive">{money(today_pnl, currency, 0, signed=True)}</div>
+            <div style="color: #22c55e; font-size: 0.875rem; margin-top: 0.25rem;">+2.3% {t['today_suffix']}</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f'''
+        <div class="metric-card">
+            <div class="metric-label">{t['total_return']}</div>
+            <div class="metric-value positive">{money(total_return, currency, 0, signed=True)}</div>
+            <div style="color: #22c55e; font-size: 0.875rem; margin-top: 0.25rem;">+15.6% {t['total_suffix']}</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f'''
+        <div class="metric-card">
+            <div class="metric-label">{t['win_rate']}</div>
+            <div class="metric-value">68.5%</div>
+            <div style="color: #c9d1d9; font-size: 0.875rem; margin-top: 0.25rem;">{t['improving']}</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f'''
+        <div class="metric-card">
+            <div class="metric-label">{t['risk_level']}</div>
+            <div class="metric-value positive">{t['low_risk']}</div>
+            <div style="color: #c9d1d9; font-size: 0.875rem; margin-top: 0.25rem;">{t['volatility']}: 12.3%</div>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    # 市場數據
+    with st.spinner(t['loading']), span('get_market_data'):
+        market_data = get_market_data()
+    
+    # 上游取不到而改用最後成功快照時，標示資料時間
+    stale = [data['as_of'] for data in market_data.values() if data.get('stale')]
+    if stale:
+        status = f'<div class="status-indicator status-warning">{t["stale_data"]} · {t["as_of"]} {_format_as_of(min(stale))}</div>'
+    else:
+        status = f'<div class="status-indicator status-success">{t["live_updates"]}</div>'
+    st.markdown(f'''
+    <div class="modern-card">
+        <div class="card-header">
+            <h2 class="card-title">📊 {t['market_overview']}</h2>
+            {status}
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    if market_data:
+        # 修正後的市場圖表
+        chart = market_chart(market_data, language)
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+        
+        # 市場數據表格：價格與漲跌以一次陣列乘法換算
+        prices, changes = np.array([(data['price'], data['change']) for data in market_data.values()]).T * rate
+        cols = st.columns(len(market_data))
+        for i, (symbol, data) in enumerate(market_data.items()):
+            with cols[i]:
+                change_class = "positive" if data['change_pct'] >= 0 else "negative"
+                stale_note = f'<div style="color: #d29922; font-size: 0.75rem; margin-top: 0.25rem;">⚠ {t["as_of"]} {_format_as_of(data["as_of"])}</div>' if data.get('stale') else ''
+                st.markdown(f'''
+                <div class="metric-card">
+                    <div class="metric-label">{symbol}</div>
+                    <div style="color: #7d8590; font-size: 0.75rem; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;" title="{display_name(symbol)}">{display_name(symbol)}</div>
+                    <div class="metric-value">{money(prices[i], currency)}</div>
+                    <div class="metric-value {change_class}" style="font-size: 1rem; margin-top: 0.25rem;">{money(changes[i], currency, signed=True)} ({data['change_pct']:+.2f}%)</div>
+                    {stale_note}
+                </div>
+                ''', unsafe_allow_html=True)
+    
+    # 長期走勢
+    show_price_history(t, language, currency, rate)
+    
+    # 報酬相關性
+    show_correlation(t, language, MARKET_SYMBOLS, "correlation_market")
+    
+    # 快速操作
+    st.markdown(f'''
+    <div class="modern-card">
+        <div class="card-header">
+            <h2 class="card-title">⚡ {t['quick_actions']}</h2>
+            <div class="card-icon">🎯</div>
+        </div>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button(f"🧭 {t['auto_navigation']}", key="quick_nav_main", use_container_width=True):
+            st.session_state.current_page = 'auto_navigation'
+            st.rerun()
+    
+    with col2:
+        if st.button(f"⚡ {t['generate_solution']}", key="quick_solution_main", use_container_width=True):
+            st.session_state.current_page = 'solution_generator'
+            st.rerun()
+    
+    with col3:
+        if st.button(f"💼 {t['virtual_portfolio']}", key="quick_portfolio_main", use_container_width=True):
+            st.session_state.current_page = 'virtual_portfolio'
+            st.rerun()
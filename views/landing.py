@@ -0,0 +1,55 @@
+"""Landing Page"""
+import streamlit as st
+
+from fragments import fragment, show
+from i18n import get_texts
+
+def show_landing_page():
+    """修正後的Landing Page"""
+    language = st.session_state.language
+    t = get_texts(language)
+    
+    # 修正後的Hero Section
+    show('landing_hero', language)
+    
+    # 語言切換 - 增加日文
+    col1, col2, col3 = st.columns([1,2,1])
+    with col2:
+        lang_col1, lang_col2, lang_col3 = st.columns(3)
+        
+        with lang_col1:
+            if st.button("🇹🇼 中文", key="lang_zh_main", use_container_width=True, 
+                        type="primary" if st.session_state.language == 'zh' else "secondary"):
+                st.session_state.language = 'zh'
+                st.rerun()
+        
+        with lang_col2:
+            if st.button("🇺🇸 English", key="lang_en_main", use_container_width=True,
+                        type="primary" if st.session_state.language == 'en' else "secondary"):
+                st.session_state.language = 'en'
+                st.rerun()
+        
+        with lang_col3:
+            if st.button("🇯🇵 日本語", key="lang_ja_main", use_container_width=True,
+                        type="primary" if st.session_state.language == 'ja' else "secondary"):
+                st.session_state.language = 'ja'
+                st.rerun()
+        
+        st.markdown("---")
+        
+        # CTA按鈕
+        if st.button(f"🚀 {t['get_started']}", key="get_started_main", use_container_width=True, type="primary"):
+            st.session_state.current_page = 'login'
+            st.rerun()
+    
+    # 核心功能
+    show('landing_features_title', language)
+    
+    # 使用Grid佈局展示功能
+    for column, cards in zip(st.columns(2), fragment('landing_features', language)):
+        with column:
+            for card in cards:
+                st.markdown(card, unsafe_allow_html=True)
+    
+    # 免責聲明
+    show('disclaimer', language)
@@ -0,0 +1,69 @@
+"""登入頁面"""
+import streamlit as st
+
+from fragments import show
+from i18n import get_texts
+from prefetch import ANONYMOUS_PAGES, LOGIN_PAGES, start_warmup
+from session_store import current_user_key
+
+def warmup_context():
+    """預先載入所需的使用者資訊（背景執行緒無法讀取 st.session_state）"""
+    return {
+        'user_key': current_user_key() if st.session_state.user_logged_in else None,
+        'language': st.session_state.language,
+        'risk_preference': st.session_state.risk_preference,
+        'investment_goal': st.session_state.investment_goal
+    }
+
+def log_in(email):
+    """登入並切換到儀表板；先開始背景預先載入，儀表板第一次繪製時快取已在載入中"""
+    st.session_state.user_logged_in = True
+    st.session_state.user_email = email
+    st.session_state.current_page = 'dashboard'
+    start_warmup(LOGIN_PAGES, warmup_context())
+    st.rerun()
+
+def show_login_page():
+    """登入頁面"""
+    language = st.session_state.language
+    t = get_texts(language)
+    
+    # 使用者很可能即將登入：先載入不分使用者的儀表板資料
+    start_warmup(ANONYMOUS_PAGES, warmup_context())
+    
+    col1, col2, col3 = st.columns([1,2,1])
+    with col2:
+        # Logo和標題
+        show('login_header', language)
+        
+        # 登入表單
+        with st.form("login_form_main", clear_on_submit=False):
+            email = st.text_input(t['email'], placeholder="your@email.com", key="login_email_main")
+            password = st.text_input(t['password'], type="password", placeholder="••••••••", key="login_password_main")
+            
+            col_a, col_b = st.columns(2)
+            with col_a:
+                login_btn = st.form_submit_button(t['login'], use_container_width=True)
+            with col_b:
+                register_btn = st.form_submit_button(t['register'], use_container_width=True)
+            
+            if login_btn or register_btn:
+                if email and password:
+                    log_in(email)
+                else:
+                    st.error(t['fill_all_fields'])
+        
+        # 社群登入
+        st.markdown(f"**{t['social_login']}**")
+        col_x, col_y = st.columns(2)
+        with col_x:
+            if st.button(f"🔍 {t['google_login']}", key="google_login_main", use_container_width=True):
+                log_in("user@gmail.com")
+        with col_y:
+            if st.button(f"🍎 {t['apple_login']}", key="apple_login_main", use_container_width=True):
+                log_in("user@icloud.com")
+        
+        # 返回首頁
+        if st.button(t['back_home'], key="back_home_main", use_container_width=True):
+            st.session_state.current_page = 'landing'
+            st.rerun()
@@ -0,0 +1,115 @@
+"""設定頁面"""
+import streamlit as st
+
+from fragments import show
+from fx import CURRENCIES
+from i18n import get_texts
+from notifications import get_queue
+from session_store import current_user_key
+
+def _set_display_currency():
+    st.session_state.display_currency = st.session_state.settings_currency_main
+
+def show_settings():
+    """設定頁面"""
+    language = st.session_state.language
+    t = get_texts(language)
+    
+    show('header_settings', language)
+    
+    # 語言設定 - 包含日文
+    st.markdown(f"### 🌐 {t['language_settings']}")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("🇹🇼 繁體中文", key="set_zh_main",
+                     use_container_width=True,
+                     type="primary" if st.session_state.language == 'zh' else "secondary"):
+            st.session_state.language = 'zh'
+            st.rerun()
+    
+    with col2:
+        if st.button("🇺🇸 English", key="set_en_main",
+                     use_container_width=True,
+                     type="primary" if st.session_state.language == 'en' else "secondary"):
+            st.session_state.language = 'en'
+            st.rerun()
+    
+    with col3:
+        if st.button("🇯🇵 日本語", key="set_ja_main",
+                     use_container_width=True,
+                     type="primary" if st.session_state.language == 'ja' else "secondary"):
+            st.session_state.language = 'ja'
+            st.rerun()
+    
+    # 顯示幣別（None 為依語言），金額在頁面上以匯率換算
+    st.markdown(f"### 💱 {t['display_currency']}")
+    
+    currency_options = [None] + list(CURRENCIES)
+    st.selectbox(
+        t['display_currency'],
+        options=currency_options,
+        format_func=lambda x: t['currency_follow_language'] if x is None else f"{x} ({CURRENCIES[x]['symbol']})",
+        index=currency_options.index(st.session_state.display_currency),
+        key="settings_currency_main",
+        on_change=_set_display_currency,
+        label_visibility="collapsed"
+    )
+    
+    # 投資偏好
+    st.markdown(f"### 🎯 {t['investment_preferences']}")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        new_risk_pref = st.selectbox(
+            t['risk_preference'],
+            options=['conservative', 'moderate', 'aggressive'],
+            format_func=lambda x: {
+                'conservative': t['conservative'], 
+                'moderate': t['moderate'], 
+                'aggressive': t['aggressive']
+            }[x],
+            index=['conservative', 'moderate', 'aggressive'].index(st.session_state.risk_preference),
+            key="settings_risk_main"
+        )
+    
+    with col2:
+        new_invest_goal = st.selectbox(
+            t['investment_goal'],
+            options=['income', 'balanced', 'growth'],
+            format_func=lambda x: {
+                'income': t['income'], 
+                'balanced': t['balanced'], 
+                'growth': t['growth']
+            }[x],
+            index=['income', 'balanced', 'growth'].index(st.session_state.investment_goal),
+            key="settings_goal_main"
+        )
+    
+    if st.button(f"💾 {t['save_settings']}", key="save_settings_main", use_container_width=True, type="primary"):
+        st.session_state.risk_preference = new_risk_pref
+        st.session_state.investment_goal = new_invest_goal
+        st.success(t['settings_saved'])
+    
+    # 通知設定
+    st.markdown(f"### 🔔 {t['notification_settings']}")
+    
+    queue = get_queue()
+    user_key = current_user_key()
+    preferences = queue.preferences(user_key)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        email_notifications = st.checkbox(f"📧 {t['email_notifications']}", value='email' in preferences['channels'], key="email_notif_main")
+    with col2:
+        push_notifications = st.checkbox(f"📱 {t['push_notifications']}", value='push' in preferences['channels'], key="push_notif_main")
+    with col3:
+        sms_notifications = st.checkbox(f"📞 {t['sms_notifications']}", value='sms' in preferences['channels'], key="sms_notif_main")
+    
+    # 勾選變更或切換語言時寫入，派送時依此決定管道與訊息語言
+    channels = [channel for channel, enabled in (('email', email_notifications), ('push', push_notifications), ('sms', sms_notifications)) if enabled]
+    if channels != preferences['channels'] or language != preferences['language']:
+        queue.set_preferences(user_key, channels, language)
+        if channels != preferences['channels']:
+            st.success(t['notifications_saved'])
@@ -0,0 +1,259 @@
+"""解決方案生成器"""
+import time
+
+import numpy as np
+import streamlit as st
+
+from alerts import get_engine, level_alerts
+from fragments import show
+from i18n import get_texts
+from market import get_quotes
+from session_store import current_user_key, get_portfolio, get_store, get_user_state
+from solutions import get_solution, snapshot_time, solution_key, sync_solutions
+from symbols import asset_label, display_name
+
+RISK_LABELS = {'conservative': 'low_risk', 'moderate': 'moderate_risk', 'aggressive': 'high_risk'}
+
+def warm_solution_generator(context):
+    """登入時預先載入：已生成（或依偏好設定）的解決方案與追蹤清單的報價"""
+    if context.get('user_key') is None:
+        return
+    state = get_store().get(context['user_key'])
+    # 排程尚未完成第一次計算時由這裡計算（與排程共用同一次計算）
+    if snapshot_time() is None:
+        sync_solutions()
+    for key in state['solutions'] or [solution_key(context['risk_preference'], context['investment_goal'])]:
+        get_solution(key)
+    with state['lock']:
+        watchlist = list(state['watchlist'])
+    if watchlist:
+        get_quotes(watchlist)
+
+def level_note(t, level, distance):
+    """指標點位數值與距離說明（無點位或無報價時為空字串）"""
+    if distance is None:
+        return ''
+    text = t['level_reached'] if distance == 0 else f"{t['distance_to_level']} {distance:+.1f}%"
+    if level is not None:
+        text = f'${level:,.2f} · {text}'
+    return f'<div style="color: #7d8590; font-size: 0.8rem; margin-top: 0.25rem;">{text}</div>'
+
+def metadata_details(t, record):
+    """費用率與殖利率（沒有資料的欄位不顯示）"""
+    items = []
+    for field in ('expense_ratio', 'dividend_yield'):
+        if record and record.get(field) is not None:
+            items.append(f'''
+                    <div class="detail-item">
+                        <div class="detail-label">{t[field]}</div>
+                        <div class="detail-value">{record[field] * 100:.2f}%</div>
+                    </div>''')
+    return ''.join(items)
+
+def name_note(t, record):
+    """名稱與資產類別 · 產業的小字說明（沒有資料時為空字串）"""
+    if not record:
+        return ''
+    return f'<div style="color: #7d8590; font-size: 0.8rem;">{record["name"]} · {asset_label(t, record)}</div>'
+
+def pick_metric(label, value, spec, suffix=''):
+    """篩選結果的單一指標（缺值顯示 —）"""
+    text = '—' if np.isnan(value) else f'{value:{spec}}{suffix}'
+    return f'<div style="text-align: center;"><div style="color: #ffffff; font-weight: 700;">{text}</div><div style="color: #7d8590; font-size: 0.8rem;">{label}</div></div>'
+
+def watch_targets(state, user_key, targets):
+    """將建議標的加入追蹤清單，並以進出場點位建立價格提醒；回傳建立的提醒數"""
+    engine = get_engine()
+    count = 0
+    for target in targets:
+        with state['lock']:
+            if target['symbol'] not in state['watchlist']:
+                state['watchlist'].append(target['symbol'])
+        for rule, level in ((target['entry'], target['entry_level']), (target['exit'], target['exit_level'])):
+            for direction, threshold in level_alerts(rule, level, target['price']):
+                engine.add(user_key, target['symbol'], direction, threshold)
+                count += 1
+    return count
+
+def alert_badge(t, alert):
+    """單一提醒的標籤（已觸發的附上觸發價）"""
+    arrow = '↑' if alert['direction'] == 'above' else '↓'
+    label = t['alert_above'] if alert['direction'] == 'above' else t['alert_below']
+    text = f"{arrow} {label} ${alert['threshold']:,.2f}"
+    if alert['active']:
+        return f'<span class="status-indicator status-success" style="margin-right: 0.5rem;">{text}</span>'
+    return f'<span class="status-indicator status-warning" style="margin-right: 0.5rem;">🔔 {text} · {t["alert_triggered"]} ${alert["fired_price"]:,.2f}</span>'
+
+def show_watchlist(t, state, user_key):
+    """追蹤清單：現價與各標的的價格提醒"""
+    with state['lock']:
+        watchlist = list(state['watchlist'])
+    quotes = get_quotes(watchlist)
+    engine = get_engine()
+    # 先套用頁面取得的最新報價，不必等背景檢查（最後成功快照的舊報價不觸發提醒）
+    engine.update({symbol: quote['price'] for symbol, quote in quotes.items() if not quote.get('stale')})
+    alerts = {}
+    for alert in engine.user_alerts(user_key):
+        alerts.setdefault(alert['symbol'], []).append(alert)
+    
+    st.markdown(f'<div class="modern-card"><h3 class="card-title">📌 {t["watchlist"]}</h3></div>', unsafe_allow_html=True)
+    for symbol in watchlist:
+        quote = quotes.get(symbol)
+        price_html = f'${quote["price"]:,.2f}' if quote else '—'
+        if quote and quote.get('stale'):
+            price_html += f' <span style="color: #d29922; font-size: 0.75rem;">⚠ {t["stale_data"]}</span>'
+        badges = ''.join(alert_badge(t, alert) for alert in alerts.get(symbol, []))
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            st.markdown(f'''
+            <div class="modern-card" style="padding: 1rem 1.5rem; margin-bottom: 0.75rem;">
+                <div style="display: flex; justify-content: space-between; align-items: center;">
+                    <div>
+                        <div style="font-family: 'JetBrains Mono', monospace; font-weight: 800; font-size: 1.1rem; color: #ffffff;">{symbol}</div>
+                        <div style="color: #7d8590; font-size: 0.8rem;">{display_name(symbol)}</div>
+                    </div>
+                    <div style="color: #ffffff; font-weight: 700;">{price_html}</div>
+                </div>
+                <div style="margin-top: 0.5rem;">{badges}</div>
+            </div>
+            ''', unsafe_allow_html=True)
+        with col2:
+            if st.button(t['remove_from_watchlist'], key=f"unwatch_{symbol}", use_container_width=True):
+                with state['lock']:
+                    if symbol in state['watchlist']:
+                        state['watchlist'].remove(symbol)
+                engine.remove_symbol(user_key, symbol)
+                st.rerun()
+
+def show_solution_generator():
+    """解決方案生成器"""
+    language = st.session_state.language
+    t = get_texts(language)
+    
+    show('header_solution_generator', language)
+    
+    state = get_user_state()
+    if state['solutions']:
+        solution = get_solution(state['solutions'][0])
+        
+        st.markdown(f'''
+        <div class="solution-card">
+            <h2 class="solution-theme">🎯 {solution['theme']}</h2>
+            <p class="solution-insight">{solution['insight']}</p>
+            
+            <div style="margin: 2rem 0;">
+                <h3 style="color: #ffffff; margin-bottom: 1rem; font-family: 'Outfit', 'Noto Sans JP', sans-serif; font-size: 1.5rem;">💡 {t['expert_insights']}</h3>
+                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1.5rem;">
+                    <div style="text-align: center; padding: 1.5rem; background: rgba(14, 165, 233, 0.1); border: 1px solid rgba(14, 165, 233, 0.3); border-radius: 16px; backdrop-filter: blur(10px);">
+                        <div style="color: #0ea5e9; font-weight: 700; margin-bottom: 0.5rem; font-size: 1rem;">{t['market_opportunity']}</div>
+                        <div style="color: #22c55e; font-weight: 600; font-size: 0.9rem;">{t['market_opportunity_value']}</div>
+                    </div>
+                    <div style="text-align: center; padding: 1.5rem; background: rgba(245, 158, 11, 0.1); border: 1px solid rgba(245, 158, 11, 0.3); border-radius: 16px; backdrop-filter: blur(10px);">
+                        <div style="color: #f59e0b; font-weight: 700; margin-bottom: 0.5rem; font-size: 1rem;">{t['risk_level']}</div>
+                        <div style="color: #f59e0b; font-weight: 600; font-size: 0.9rem;">{t[RISK_LABELS[solution['risk']]]}</div>
+                    </div>
+                    <div style="text-align: center; padding: 1.5rem; background: rgba(139, 92, 246, 0.1); border: 1px solid rgba(139, 92, 246, 0.3); border-radius: 16px; backdrop-filter: blur(10px);">
+                        <div style="color: #8b5cf6; font-weight: 700; margin-bottom: 0.5rem; font-size: 1rem;">{t['suggested_horizon']}</div>
+                        <div style="color: #8b5cf6; font-weight: 600; font-size: 0.9rem;">{t['suggested_horizon_value']}</div>
+                    </div>
+                </div>
+            </div>
+            
+            <h3 style="color: #ffffff; margin-bottom: 1.5rem; font-family: 'Outfit', 'Noto Sans JP', sans-serif; font-size: 1.5rem;">📊 {t['recommended_targets']}</h3>
+        </div>
+        ''', unsafe_allow_html=True)
+        
+        # 建議標的
+        for target in solution['targets']:
+            price_html = f'<div class="target-type">{t["last_price"]} ${target["price"]:,.2f}</div>' if target['price'] else ''
+            # 有本地基本資料時顯示名稱與資產類別，否則沿用策略中的說明
+            metadata = target.get('metadata')
+            type_text = f"{metadata['name']} · {asset_label(t, metadata)}" if metadata else target['type']
+            st.markdown(f'''
+            <div class="target-card">
+                <div class="target-header">
+                    <div>
+                        <div class="target-symbol">{target['symbol']}</div>
+                        <div class="target-type">{type_text}</div>
+                        {price_html}
+                    </div>
+                    <div class="target-allocation">{target['allocation']}%</div>
+                </div>
+                <div class="target-analysis">{target['analysis']}</div>
+                <div class="target-details">
+                    <div class="detail-item">
+                        <div class="detail-label">{t['entry_point']}</div>
+                        <div class="detail-value">{target['entry_point']}</div>
+                        {level_note(t, target['entry_level'], target['entry_distance_pct'])}
+                    </div>
+                    <div class="detail-item">
+                        <div class="detail-label">{t['exit_point']}</div>
+                        <div class="detail-value">{target['exit_point']}</div>
+                        {level_note(t, target['exit_level'], target['exit_distance_pct'])}
+                    </div>
+                    <div class="detail-item">
+                        <div class="detail-label">{t['expected_return']}</div>
+                        <div class="detail-value">{target['expected_return']}</div>
+                    </div>{metadata_details(t, metadata)}
+                </div>
+            </div>
+            ''', unsafe_allow_html=True)
+        
+        # 篩選器精選標的
+        if solution['picks']:
+            st.markdown(f'<div class="modern-card"><h3 class="card-title">🔍 {t["screened_picks"]}</h3></div>', unsafe_allow_html=True)
+            for pick in solution['picks']:
+                st.markdown(f'''
+                <div class="modern-card" style="padding: 1rem 1.5rem; margin-bottom: 0.75rem;">
+                    <div style="display: grid; grid-template-columns: 1.5fr 1fr 1fr 1fr 1fr; gap: 1rem; align-items: center;">
+                        <div>
+                            <div style="font-family: 'JetBrains Mono', monospace; font-weight: 800; font-size: 1.1rem; color: #ffffff;">{pick['symbol']}</div>
+                            {name_note(t, pick.get('metadata'))}
+                        </div>
+                        {pick_metric(t['momentum'], pick['momentum'] * 100, '+.1f', '%')}
+                        {pick_metric(t['volatility'], pick['volatility'] * 100, '.1f', '%')}
+                        {pick_metric(t['dividend_yield'], pick['dividend_yield'] * 100, '.2f', '%')}
+                        {pick_metric(t['pe_ratio'], pick['pe'], '.1f')}
+                    </div>
+                </div>
+                ''', unsafe_allow_html=True)
+        
+        # 操作按鈕
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(f"📌 {t['add_to_watchlist']}", key="add_watchlist_main", use_container_width=True):
+                try:
+                    count = watch_targets(state, current_user_key(), solution['targets'])
+                    st.success(f"{t['added_to_watchlist']} {count} {t['alerts_created']}")
+                except ValueError:
+                    st.warning(t['alert_limit_reached'])
+        
+        with col2:
+            if st.button(f"💼 {t['add_to_portfolio']}", key="add_portfolio_main", use_container_width=True):
+                # 每個策略一個組合，以解決方案鍵命名；加入後虛擬組合頁面顯示該組合
+                # 各標的調整到目標股數（已持有時不重複建倉），淨值只記錄淨投入
+                name = state['solutions'][0]
+                st.session_state.active_portfolio = name
+                with state['lock']:
+                    portfolio = get_portfolio(state, name)
+                    book = portfolio['book']
+                    flow = 0.0
+                    for target in solution['targets']:
+                        # 有報價時以現價成交，否則沿用持倉的現價或模擬價格
+                        held = book.find(target['symbol'])
+                        price = target['price'] or (book.current_price[held] if held is not None else np.random.uniform(100, 500))
+                        flow += book.set_quantity(target['symbol'], target['allocation'] * 10, price, int(time.time()))
+                    if flow or not len(portfolio['nav']):
+                        portfolio['nav'].mark(book, flow=flow)
+                
+                st.success(t['added_to_portfolio'])
+    
+    else:
+        show('no_solution', language)
+        
+        if st.button(f"🧭 {t['goto_auto_navigation']}", key="goto_nav_main", use_container_width=True, type="primary"):
+            st.session_state.current_page = 'auto_navigation'
+            st.rerun()
+    
+    if state['watchlist']:
+        show_watchlist(t, state, current_user_key())
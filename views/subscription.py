@@ -0,0 +1,37 @@
+"""訂閱管理"""
+import streamlit as st
+
+from fragments import fragment, show
+from i18n import get_texts
+
+def show_subscription():
+    """訂閱管理（整頁只依賴語言，所有 HTML 皆由片段快取提供）"""
+    language = st.session_state.language
+    t = get_texts(language)
+    
+    show('header_subscription', language)
+    
+    # 訂閱狀態
+    show('subscription_status', language)
+    
+    st.markdown(f"### 📋 {t['subscription_info']}")
+    
+    # 使用Streamlit原生組件顯示訂閱資訊
+    for column, html in zip(st.columns(3), fragment('subscription_stats', language)):
+        with column:
+            st.markdown(html, unsafe_allow_html=True)
+    
+    # 訂閱功能
+    st.markdown(f"### 🎯 {t['subscription_features']}")
+    
+    cols = st.columns(2)
+    for i, html in enumerate(fragment('subscription_features', language)):
+        with cols[i % 2]:
+            st.markdown(html, unsafe_allow_html=True)
+    
+    # 使用統計
+    st.markdown(f"### 📊 {t['usage_stats']}")
+    
+    for column, html in zip(st.columns(3), fragment('subscription_usage', language)):
+        with column:
+            st.markdown(html, unsafe_allow_html=True)
@@ -0,0 +1,309 @@
+"""虛擬投資組合"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from charts import chart_spec, create_exposure_chart, create_exposure_treemap, create_nav_chart, create_portfolio_chart
+from downsample import minmax
+from exposure import OTHER, get_exposure
+from fx import CURRENCIES, get_rates, money, preferred_currency, resolve_currency
+from fragments import show
+from i18n import get_texts
+from market import HISTORY_POINTS, get_quotes
+from portfolio import summarize_portfolio
+from rebalance import BAND, rebalance_portfolio, target_weights
+from session_store import DEFAULT_PORTFOLIO, current_user_key, get_store, get_user_state
+from solutions import get_solution
+from strategies import STRATEGIES
+from symbols import ASSET_CLASSES, REGIONS, display_name
+from views.dashboard import show_correlation
+
+def warm_virtual_portfolio(context):
+    """登入時預先載入：匯率與持倉標的的報價"""
+    get_rates()
+    if context.get('user_key') is None:
+        return
+    state = get_store().get(context['user_key'])
+    with state['lock']:
+        symbols = [symbol for portfolio in state['portfolios'].values() for symbol in portfolio['book'].symbols()]
+    if symbols:
+        get_quotes(list(dict.fromkeys(symbols)))
+
+def portfolio_label(t, name):
+    """組合的顯示名稱：策略組合為「風險偏好 · 投資目標」"""
+    if name == DEFAULT_PORTFOLIO:
+        return t['default_portfolio']
+    risk, _, goal = name.partition('/')
+    return f"{t[risk]} · {t[goal]}" if risk in t and goal in t else name
+
+# 曝險維度 → 群組名稱的 TEXTS 鍵（產業直接顯示上游的分類名稱）
+GROUP_TEXTS = {'asset_class': ASSET_CLASSES, 'region': REGIONS}
+
+def group_label(t, dimension, group):
+    """曝險群組的顯示名稱"""
+    if group == OTHER:
+        return t['exposure_other']
+    keys = GROUP_TEXTS.get(dimension)
+    return t[keys[group]] if keys and group in keys else group
+
+def show_allocation(t, language, name, book, load_exposure, currency, rate):
+    """配置圖：依標的，或依資產類別、產業、地區的曝險彙總（圓餅圖與 資產類別 → 產業 樹狀圖）
+
+    book 為持倉簿的複本；曝險彙總以 load_exposure() 在持有狀態 lock 時對原本的持倉簿增量同步。
+    """
+    dimension = st.radio(t['exposure_by'], ['symbol', 'asset_class', 'sector', 'region'], format_func=lambda x: t[f'exposure_{x}'],
+                         horizontal=True, key="exposure_dimension_main")
+    if dimension == 'symbol':
+        chart = create_portfolio_chart(book, language, currency, rate)
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+        return
+    
+    exposure = load_exposure()
+    # 所有群組的市值以一次陣列乘法換算
+    groups = list(exposure[dimension])
+    values = np.array(list(exposure[dimension].values())) * rate
+    pie = {group_label(t, dimension, group): float(value) for group, value in zip(groups, values)}
+    title = f"{t['chart_portfolio_title']} · {t[f'exposure_{dimension}']}"
+    chart = chart_spec('exposure', (current_user_key(), name, dimension, tuple(pie.items()), currency, language),
+                       lambda: create_exposure_chart(pie, title, language, currency))
+    
+    pairs = [group.split('/', 1) for group in exposure['asset_class_sector']]
+    values = np.array(list(exposure['asset_class_sector'].values())) * rate
+    tree = {(group_label(t, 'asset_class', asset_class), group_label(t, 'sector', sector)): float(value)
+            for (asset_class, sector), value in zip(pairs, values)}
+    treemap = chart_spec('exposure_treemap', (current_user_key(), name, tuple(tree.items()), currency, language),
+                         lambda: create_exposure_treemap(tree, language, currency))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
+    with col2:
+        if treemap:
+            st.plotly_chart(treemap, use_container_width=True)
+
+def show_rebalance(t, name, book, currency, rate):
+    """策略組合調回解決方案目標配置的交易清單（現金以顯示幣別輸入）"""
+    st.markdown(f'<div class="modern-card"><h3 class="card-title">🎯 {t["rebalance_title"]}</h3></div>', unsafe_allow_html=True)
+    st.caption(f"{t['rebalance_note']} · {t['rebalance_band']} ±{BAND * 100:.0f}%")
+    cash = st.number_input(f"{t['rebalance_cash']} ({currency})", min_value=0.0, value=0.0, step=1000.0, key="rebalance_cash_main")
+    
+    targets = target_weights(get_solution(name))
+    quotes = get_quotes(list(dict.fromkeys(book.symbols() + list(targets))))
+    trades = rebalance_portfolio(book, targets, {symbol: quote['price'] for symbol, quote in quotes.items()}, cash / rate)
+    if not trades:
+        st.success(t['rebalance_within_band'])
+        return
+    
+    # 價格與金額兩欄以一次陣列乘法換算
+    amounts = np.array([[trade['price'], trade['value']] for trade in trades]) * rate
+    decimals = CURRENCIES[currency]['decimals']
+    rows = [{
+        t['exposure_symbol']: trade['symbol'],
+        t['rebalance_action']: t[f"rebalance_{trade['side']}"],
+        t['rebalance_shares']: trade['quantity'],
+        f"{t['current_price']} ({currency})": round(price, 2),
+        f"{t['rebalance_value']} ({currency})": round(value, decimals)
+    } for trade, (price, value) in zip(trades, amounts)]
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+def _select_portfolio():
+    st.session_state.active_portfolio = st.session_state.portfolio_select_main
+
+def show_comparison(t, summaries, names, currency, rate):
+    """組合比較：各組合累加的彙總（summaries 為 {組合名稱: summarize_portfolio}），不重新掃描持倉"""
+    summaries = [summaries[name] for name in names]
+    amounts = np.array([[summary['total_value'], summary['total_cost'], summary['total_pnl']] for summary in summaries]) * rate
+    decimals = CURRENCIES[currency]['decimals']
+    rows = [{
+        t['portfolio_name']: portfolio_label(t, name),
+        f"{t['portfolio_value']} ({currency})": round(value, decimals),
+        f"{t['invested_cost']} ({currency})": round(cost, decimals),
+        f"{t['total_return']} ({currency})": round(pnl, decimals),
+        f"{t['total_return']} (%)": round(summary['total_return_pct'], 2),
+        f"{t['win_rate']} (%)": round(summary['win_rate'], 1),
+        t['position_count']: summary['position_count']
+    } for name, summary, (value, cost, pnl) in zip(names, summaries, amounts)]
+    
+    st.markdown(f'<div class="modern-card"><h3 class="card-title">⚖️ {t["portfolio_compare"]}</h3></div>', unsafe_allow_html=True)
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+def show_virtual_portfolio():
+    """虛擬投資組合"""
+    language = st.session_state.language
+    t = get_texts(language)
+    currency, rate = resolve_currency(st.session_state.display_currency, language)
+    
+    show('header_virtual_portfolio', language)
+    
+    state = get_user_state()
+    portfolios = state['portfolios']
+    # 同一使用者的其他 session 可能同時加入組合或更新持倉：在 lock 內取得持倉、淨值與彙總的複本，
+    # 畫面只讀取複本；修改（更新價格、清倉）才使用原本的持倉簿
+    with state['lock']:
+        names = [name for name, portfolio in portfolios.items() if len(portfolio['book'])]
+        if names:
+            name = st.session_state.active_portfolio if st.session_state.active_portfolio in names else names[0]
+            live_book = portfolios[name]['book']
+            live_nav = portfolios[name]['nav']
+            # 記錄今天的淨值（同一天重複記錄只覆寫當日）
+            live_nav.mark(live_book)
+            book = live_book.copy()
+            nav = live_nav.copy()
+            summaries = {key: summarize_portfolio(portfolios[key]['book']) for key in names}
+    if names:
+        def load_exposure():
+            with state['lock']:
+                return get_exposure(live_book)
+        
+        if currency != preferred_currency(st.session_state.display_currency, language):
+            st.caption(t['fx_unavailable'])
+        
+        if len(names) > 1:
+            show_comparison(t, summaries, names, currency, rate)
+            st.selectbox(t['select_portfolio'], names, index=names.index(name), format_func=lambda key: portfolio_label(t, key),
+                         key="portfolio_select_main", on_change=_select_portfolio)
+        
+        # 計算總績效（以美元計算，顯示前換算）
+        summary = summaries[name]
+        total_value, total_cost, total_pnl = np.array([summary['total_value'], summary['total_cost'], summary['total_pnl']]) * rate
+        total_return_pct = summary['total_return_pct']
+        
+        # 績效指標
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.markdown(f'''
+            <div class="metric-card">
+                <div class="metric-label">{t['portfolio_value']}</div>
+                <div class="metric-value">{money(total_value, currency, 0)}</div>
+                <div style="color: #7d8590; font-size: 0.8rem; margin-top: 0.25rem;">{t['invested_cost']}: {money(total_cost, currency, 0)}</div>
+            </div>
+            ''', unsafe_allow_html=True)
+        
+        with col2:
+            pnl_class = "positive" if total_pnl >= 0 else "negative"
+            st.markdown(f'''
+            <div class="metric-card">
+                <div class="metric-label">{t['total_return']}</div>
+                <div class="metric-value {pnl_class}">{money(total_pnl, currency, 0, signed=True)}</div>
+                <div class="metric-value {pnl_class}" style="font-size: 1rem; margin-top: 0.25rem;">{total_return_pct:+.2f}%</div>
+            </div>
+            ''', unsafe_allow_html=True)
+        
+        with col3:
+            win_count = summary['win_count']
+            win_rate = summary['win_rate']
+            st.markdown(f'''
+            <div class="metric-card">
+                <div class="metric-label">{t['win_rate']}</div>
+                <div class="metric-value">{win_rate:.1f}%</div>
+                <div style="color: #7d8590; font-size: 0.8rem; margin-top: 0.25rem;">{win_count}/{summary['position_count']} {t['profitable']}</div>
+            </div>
+            ''', unsafe_allow_html=True)
+        
+        with col4:
+            st.markdown(f'''
+            <div class="metric-card">
+                <div class="metric-label">{t['position_count']}</div>
+                <div class="metric-value">{summary['position_count']}</div>
+                <div style="color: #7d8590; font-size: 0.8rem; margin-top: 0.25rem;">{t['symbols_unit']}</div>
+            </div>
+            ''', unsafe_allow_html=True)
+        
+        # 配置（依標的或依曝險群組）
+        show_allocation(t, language, name, book, load_exposure, currency, rate)
+        
+        # 每日淨值、累積報酬與回撤（至少兩天的紀錄）；淨值沒有變動時沿用快取的圖表規格，
+        # 長期紀錄以回撤的區間極值降採樣，保留最深的回落
+        def build_nav_chart():
+            drawdown = nav.drawdown()
+            keep = minmax(drawdown, HISTORY_POINTS // 2 - 1)
+            return create_nav_chart(nav.dates()[keep], nav.column('nav')[keep] * rate, nav.returns()[keep], drawdown[keep], language, currency)
+        
+        last = len(nav) - 1
+        nav_chart = chart_spec('nav', (current_user_key(), name, len(nav), float(nav.column('nav')[last]), float(nav.column('index')[last]), language,
+                                       currency, rate),
+                               build_nav_chart)
+        if nav_chart:
+            st.plotly_chart(nav_chart, use_container_width=True)
+        
+        # 持倉的報酬相關性（至少兩個標的）
+        holdings = list(dict.fromkeys(book.symbols()))
+        if len(holdings) > 1:
+            show_correlation(t, language, holdings, "correlation_holdings")
+        
+        # 策略組合：調回目標配置的交易
+        if tuple(name.split('/')) in STRATEGIES:
+            show_rebalance(t, name, book, currency, rate)
+        
+        # 持倉明細
+        st.markdown(f'<div class="modern-card"><h3 class="card-title">📊 {t["holdings_detail"]}</h3></div>', unsafe_allow_html=True)
+        
+        # 買進價、現價與損益三欄以一次陣列乘法換算
+        entry_prices, current_prices, pnls = np.vstack([
+            book.entry_price, book.current_price, (book.current_price - book.entry_price) * book.quantity
+        ]) * rate
+        for i, item in enumerate(book.rows()):
+            pnl = pnls[i]
+            pnl_pct = ((item['current_price'] - item['entry_price']) / item['entry_price'] * 100) if item['entry_price'] > 0 else 0
+            pnl_color = "#22c55e" if pnl >= 0 else "#ef4444"
+            
+            st.markdown(f'''
+            <div class="modern-card" style="padding: 1.5rem; margin-bottom: 1rem;">
+                <div style="display: grid; grid-template-columns: 2fr 1fr 1fr 1fr; gap: 1.5rem; align-items: center;">
+                    <div>
+                        <div style="font-family: 'JetBrains Mono', monospace; font-weight: 800; font-size: 1.25rem; color: #ffffff; margin-bottom: 0.25rem;">{item['symbol']}</div>
+                        <div style="color: #7d8590; font-size: 0.8rem; margin-bottom: 0.25rem;">{display_name(item['symbol'])}</div>
+                        <div style="color: #c9d1d9; font-size: 0.9rem;">{item['quantity']:.0f} {t['shares_unit']}</div>
+                        <div style="margin-top: 0.5rem;">
+                            <span style="background: rgba(14, 165, 233, 0.2); color: #0ea5e9; padding: 0.25rem 0.75rem; border-radius: 12px; font-size: 0.75rem; font-weight: 600;">{t['holding']}</span>
+                        </div>
+                    </div>
+                    <div style="text-align: center;">
+                        <div style="color: #ffffff; font-weight: 700; font-size: 1.1rem;">{money(entry_prices[i], currency)}</div>
+                        <div style="color: #7d8590; font-size: 0.8rem; margin-top: 0.25rem;">{t['buy_price']}</div>
+                    </div>
+                    <div style="text-align: center;">
+                        <div style="color: #ffffff; font-weight: 700; font-size: 1.1rem;">{money(current_prices[i], currency)}</div>
+                        <div style="color: #7d8590; font-size: 0.8rem; margin-top: 0.25rem;">{t['current_price']}</div>
+                    </div>
+                    <div style="text-align: center;">
+                        <div style="font-family: 'JetBrains Mono', monospace; font-weight: 800; color: {pnl_color}; font-size: 1.1rem;">{money(pnl, currency, 0, signed=True)}</div>
+                        <div style="font-family: 'JetBrains Mono', monospace; font-weight: 700; color: {pnl_color}; font-size: 0.9rem; margin-top: 0.25rem;">{pnl_pct:+.2f}%</div>
+                    </div>
+                </div>
+            </div>
+            ''', unsafe_allow_html=True)
+        
+        # 操作按鈕
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if st.button(f"🔄 {t['update_prices']}", key="update_prices_main", use_container_width=True):
+                with state['lock']:
+                    live_book.apply_price_changes(np.random.uniform(-0.05, 0.05, len(live_book)))
+                    live_nav.mark(live_book)
+                st.success(t['prices_updated'])
+                st.rerun()
+        
+        with col2:
+            if st.button(f"📊 {t['generate_report']}", key="generate_report_main", use_container_width=True):
+                st.info(t['report_in_progress'])
+        
+        with col3:
+            if st.button(f"🗑️ {t['clear_portfolio']}", key="clear_portfolio_main", use_container_width=True):
+                # 清倉視為賣出全部持倉
+                with state['lock']:
+                    proceeds = live_book.totals()[0]
+                    live_book.clear()
+                    live_nav.mark(live_book, flow=-proceeds)
+                st.success(t['portfolio_cleared'])
+                st.rerun()
+    
+    else:
+        show('empty_portfolio', language)
+        
+        if st.button(f"⚡ {t['goto_solution_generator']}", key="goto_solution_main", use_container_width=True, type="primary"):
+            st.session_state.current_page = 'solution_generator'
+            st.rerun()